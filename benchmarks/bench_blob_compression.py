@@ -0,0 +1,120 @@
+"""Compression ratio and CPU cost per MB of the blob storage codecs.
+
+Samples are synthetic: plain text and HTML built from random words (what text resumes look like to a compressor)
+and random bytes (an already compressed PDF/DOCX, which is what skipping compression saves us from).
+Use the numbers to tune BLOB_STORAGE_COMPRESSION_CODEC, _LEVEL and _MIN_SIZE.
+
+Run: PYTHONPATH=. python benchmarks/bench_blob_compression.py
+"""
+
+import argparse
+import os
+import random
+import time
+
+from service.services.blob_storage.compression import BlobCodec, create_compressor, create_decompressor
+
+_WORDS = [
+    'experience',
+    'attorney',
+    'immigration',
+    'visa',
+    'petition',
+    'client',
+    'university',
+    'research',
+    'publication',
+    'award',
+    'engineer',
+    'managed',
+    'developed',
+    'led',
+    'team',
+    'project',
+    'software',
+    'analysis',
+    'data',
+    'international',
+    'conference',
+    'reviewer',
+    'patent',
+    'python',
+    'senior',
+    'years',
+    'responsible',
+    'collaborated',
+    'designed',
+    'implemented',
+    'improved',
+    'customers',
+    'growth',
+]
+
+_CHUNK_SIZE = 256 * 1024
+
+
+def _text_sample(size: int) -> bytes:
+    words = []
+    length = 0
+    while length < size:
+        word = random.choice(_WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return ' '.join(words).encode()[:size]
+
+
+def _html_sample(size: int) -> bytes:
+    paragraphs = []
+    length = 0
+    while length < size:
+        paragraph = f'<p class="section"><span>{_text_sample(random.randint(100, 400)).decode()}</span></p>\n'
+        paragraphs.append(paragraph)
+        length += len(paragraph)
+    return f'<html><body>{"".join(paragraphs)}</body></html>'.encode()[:size]
+
+
+def _measure(codec: BlobCodec, level: int, data: bytes, repeat: int) -> tuple[float, float, float]:
+    compressed = b''
+    started_at = time.process_time()
+    for _ in range(repeat):
+        compressor = create_compressor(codec, level)
+        parts = [
+            compressor.compress(data[offset : offset + _CHUNK_SIZE]) for offset in range(0, len(data), _CHUNK_SIZE)
+        ]
+        parts.append(compressor.flush())
+        compressed = b''.join(parts)
+    compress_time = (time.process_time() - started_at) / repeat
+
+    started_at = time.process_time()
+    for _ in range(repeat):
+        decompressor = create_decompressor(codec)
+        assert decompressor.decompress(compressed) + decompressor.flush() == data
+    decompress_time = (time.process_time() - started_at) / repeat
+
+    megabytes = len(data) / (1024 * 1024)
+    return len(data) / len(compressed), compress_time * 1000 / megabytes, decompress_time * 1000 / megabytes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size', type=int, default=1024 * 1024, help='Sample size in bytes')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    random.seed(0)
+    samples = {
+        'text': _text_sample(args.size),
+        'html': _html_sample(args.size),
+        'random': os.urandom(args.size),
+    }
+    settings = [(BlobCodec.ZSTD, 1), (BlobCodec.ZSTD, 3), (BlobCodec.ZSTD, 9), (BlobCodec.GZIP, 1), (BlobCodec.GZIP, 6)]
+
+    print(f'{"sample":>8} {"codec":>8} {"ratio":>7} {"compress ms/MB":>15} {"decompress ms/MB":>17}')
+    for name, data in samples.items():
+        for codec, level in settings:
+            ratio, compress_ms, decompress_ms = _measure(codec, level, data, args.repeat)
+            print(f'{name:>8} {f"{codec}:{level}":>8} {ratio:7.2f} {compress_ms:15.2f} {decompress_ms:17.2f}')
+
+
+if __name__ == '__main__':
+    main()
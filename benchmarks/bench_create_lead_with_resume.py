@@ -0,0 +1,70 @@
+"""Latency of LeadService.create_lead_with_resume with sequential vs speculative resume upload.
+
+The duplicate check and the blob upload are replaced with fakes that sleep for a log-normally distributed time,
+and the database session with a no-op one, so only the orchestration of the two calls is measured.
+
+Run: PYTHONPATH=. python benchmarks/bench_create_lead_with_resume.py
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from unittest.mock import patch
+
+from service.services.leads.service import LeadCreateWithResume, LeadService
+
+
+class _NoopSession:
+    def add(self, instance) -> None:
+        pass
+
+    async def commit(self) -> None:
+        pass
+
+    async def refresh(self, instance) -> None:
+        pass
+
+
+def _latency(median_ms: float, sigma: float = 0.5) -> float:
+    return random.lognormvariate(0, sigma) * median_ms / 1000
+
+
+async def _measure(speculative_upload: bool, requests: int, check_ms: float, upload_ms: float) -> list[float]:
+    async def _check_lead_exists(db_session, email) -> bool:
+        await asyncio.sleep(_latency(check_ms))
+        return False
+
+    async def _upload(data: bytes) -> str:
+        await asyncio.sleep(_latency(upload_ms))
+        return 'https://blob-storage.example.com/benchmark'
+
+    lead_data = LeadCreateWithResume(first_name='Bench', last_name='Mark', email='bench@example.com', resume=b'x')
+    timings = []
+    with (
+        patch.object(LeadService, '_check_lead_exists', _check_lead_exists),
+        patch('service.services.leads.service.BlobStorageService.upload', _upload),
+    ):
+        for _ in range(requests):
+            started_at = time.perf_counter()
+            await LeadService.create_lead_with_resume(_NoopSession(), lead_data, speculative_upload=speculative_upload)
+            timings.append((time.perf_counter() - started_at) * 1000)
+    return timings
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=300)
+    parser.add_argument('--check-ms', type=float, default=5.0, help='Median duplicate check latency')
+    parser.add_argument('--upload-ms', type=float, default=20.0, help='Median blob upload latency')
+    args = parser.parse_args()
+
+    for name, speculative_upload in (('sequential', False), ('speculative', True)):
+        timings = await _measure(speculative_upload, args.requests, args.check_ms, args.upload_ms)
+        percentiles = statistics.quantiles(timings, n=100)
+        print(f'{name:>12}: p50={percentiles[49]:.2f}ms p99={percentiles[98]:.2f}ms')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
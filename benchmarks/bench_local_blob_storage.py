@@ -0,0 +1,84 @@
+"""Throughput of the local filesystem blob storage backend for small and large resumes.
+
+Distinct blobs are uploaded with upload (one buffer) and upload_stream (256KB chunks), then read back with get.
+The duplicate rows upload data that is already stored, which only hashes it and bumps the reference count.
+Uploads are fsynced, so the numbers depend heavily on the disk behind --dir.
+
+Run: PYTHONPATH=. python benchmarks/bench_local_blob_storage.py [--dir /path/on/target/disk]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from service.services.blob_storage.local import LocalBlobStorageBackend
+from service.settings import BlobStorageSettings
+
+_STREAM_CHUNK_SIZE = 256 * 1024
+
+
+async def _chunks(data: bytes):
+    for offset in range(0, len(data), _STREAM_CHUNK_SIZE):
+        yield data[offset : offset + _STREAM_CHUNK_SIZE]
+
+
+def _report(name: str, size: int, count: int, elapsed: float) -> None:
+    megabytes = size * count / (1024 * 1024)
+    print(f'{name:>24}: {count / elapsed:8.1f} blobs/s {megabytes / elapsed:8.1f} MB/s')
+
+
+async def _measure(backend: LocalBlobStorageBackend, label: str, size: int, count: int, concurrency: int) -> None:
+    data = os.urandom(size)
+    # Blobs are content-addressed, so every upload needs different data to be written
+    blobs = [index.to_bytes(8) + data[8:] for index in range(count)]
+    stream_blobs = [(count + index).to_bytes(8) + data[8:] for index in range(count)]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _bounded(coro):
+        async with semaphore:
+            return await coro
+
+    print(f'{label} ({size // 1024}KB x {count}, concurrency {concurrency})')
+
+    started_at = time.perf_counter()
+    urls = await asyncio.gather(*(_bounded(backend.upload(blob)) for blob in blobs))
+    _report('upload', size, count, time.perf_counter() - started_at)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(_bounded(backend.upload_stream(_chunks(blob))) for blob in stream_blobs))
+    _report('upload_stream', size, count, time.perf_counter() - started_at)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(_bounded(backend.upload(blob)) for blob in blobs))
+    _report('duplicate upload', size, count, time.perf_counter() - started_at)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(_bounded(backend.upload_stream(_chunks(blob))) for blob in stream_blobs))
+    _report('duplicate upload_stream', size, count, time.perf_counter() - started_at)
+
+    started_at = time.perf_counter()
+    stored_blobs = await asyncio.gather(*(_bounded(backend.get(url)) for url in urls))
+    _report('get', size, count, time.perf_counter() - started_at)
+    assert stored_blobs == blobs
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--dir', default=None, help='Directory to store blobs in, a temporary one by default')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--small-size', type=int, default=64 * 1024)
+    parser.add_argument('--small-count', type=int, default=500)
+    parser.add_argument('--large-size', type=int, default=10 * 1024 * 1024)
+    parser.add_argument('--large-count', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as local_dir:
+        backend = LocalBlobStorageBackend(BlobStorageSettings(backend='local', local_dir=local_dir))
+        await _measure(backend, 'small', args.small_size, args.small_count, args.concurrency)
+        await _measure(backend, 'large', args.large_size, args.large_count, args.concurrency)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,145 @@
+"""Memory and throughput of send_emails_to_leads and dispatch_outbox_emails over a large backlog of registered leads.
+
+Seeds --leads registered leads and --attorneys attorneys with INSERT ... SELECT generate_series, then compares the
+peak Python memory of loading every registered lead as ORM objects at once, as send_emails_to_leads used to, with a
+run of it, which claims the leads in chunks of SCHEDULER_SEND_EMAILS_CHUNK_SIZE and queues their emails in the
+outbox. A run of dispatch_outbox_emails then sends the queued emails. Emails are not sent for real: the email
+service is replaced with a fake that sleeps for --send-ms, 0 by default, so without a latency the numbers are the
+database and ORM work per email. Memory is traced with tracemalloc, which slows every measurement down about as
+much.
+
+With a send latency, the dispatcher's throughput follows --concurrency, SCHEDULER_SEND_EMAILS_CONCURRENCY by
+default: compare e.g. --leads 5000 --send-ms 50 with --concurrency 1, 10 and 50.
+
+Use a scratch database: registered leads already in it are processed too. Seeded rows are deleted afterwards and
+the attorney counters reconciled.
+
+Run: PYTHONPATH=. python benchmarks/bench_send_emails_to_leads.py [--leads 1000000] [--send-ms 50] [--concurrency 10]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+import tracemalloc
+
+import sqlalchemy as sa
+
+from service.container import MainContainer
+from service.database import get_session_context
+from service.database.models.attorneys import Attorney
+from service.database.models.lead_events import LeadEvent
+from service.database.models.leads import Lead, LeadStatus
+from service.tasks.dispatch_emails import dispatch_outbox_emails
+from service.tasks.send_email import send_emails_to_leads
+
+_EMAIL_DOMAIN = 'benchmark.example.com'
+
+
+async def _seed(container: MainContainer, leads: int, attorneys: int) -> None:
+    async with get_session_context(container.database) as db_session:
+        await db_session.execute(
+            sa.text(
+                """
+                INSERT INTO attorneys (id, email, is_active, reached_out_count, created_at, updated_at)
+                SELECT gen_random_uuid(), 'attorney-' || n || '@' || :domain, true, 0, now(), now()
+                FROM generate_series(1, :attorneys) AS n
+                """
+            ),
+            {'domain': _EMAIL_DOMAIN, 'attorneys': attorneys},
+        )
+        await db_session.execute(
+            sa.text(
+                """
+                INSERT INTO leads (id, first_name, last_name, email, resume_url, status, created_at, updated_at)
+                SELECT gen_random_uuid(), 'Bench', 'Mark', 'lead-' || n || '@' || :domain,
+                    'https://blob-storage.example.com/' || n || '.pdf', :status,
+                    now() + n * interval '1 microsecond', now()
+                FROM generate_series(1, :leads) AS n
+                """
+            ),
+            {'domain': _EMAIL_DOMAIN, 'status': str(LeadStatus.REGISTERED), 'leads': leads},
+        )
+        await db_session.commit()
+
+
+async def _cleanup(container: MainContainer) -> None:
+    async with get_session_context(container.database) as db_session:
+        lead_ids = sa.select(Lead.id).where(Lead.email.like(f'%@{_EMAIL_DOMAIN}'))
+        await db_session.execute(sa.delete(LeadEvent).where(LeadEvent.lead_id.in_(lead_ids)))
+        await db_session.execute(sa.delete(Lead).where(Lead.email.like(f'%@{_EMAIL_DOMAIN}')))
+        await db_session.execute(sa.delete(Attorney).where(Attorney.email.like(f'%@{_EMAIL_DOMAIN}')))
+        await db_session.commit()
+    async with get_session_context(container.database) as db_session:
+        await container.attorney_service.reconcile_reached_out_counts(db_session)
+        await db_session.commit()
+
+
+async def _load_all(container: MainContainer) -> int:
+    async with get_session_context(container.database) as db_session:
+        query = sa.select(Lead).where(Lead.status == LeadStatus.REGISTERED)
+        return len((await db_session.execute(query)).scalars().all())
+
+
+def _report(name: str, count: int, elapsed: float, peak: int) -> None:
+    print(f'{name:>20}: {count} leads in {elapsed:.1f}s ({count / elapsed:.0f} leads/s), peak {peak / 2**20:.1f} MiB')
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--leads', type=int, default=1_000_000)
+    parser.add_argument('--attorneys', type=int, default=50)
+    parser.add_argument('--send-ms', type=float, default=0)
+    parser.add_argument('--concurrency', type=int)
+    args = parser.parse_args()
+
+    # One line per lead is logged otherwise
+    logging.basicConfig(level=logging.WARNING)
+
+    async with MainContainer() as container:
+
+        async def _send(sender: str, receiver: str, text: str, subject: str) -> None:
+            await asyncio.sleep(args.send_ms / 1000)
+
+        container.email_service.send = _send
+        if args.concurrency is not None:
+            container.scheduler_settings.send_emails_concurrency = args.concurrency
+
+        started_at = time.perf_counter()
+        await _seed(container, args.leads, args.attorneys)
+        print(f'Seeded {args.leads} registered leads in {time.perf_counter() - started_at:.1f}s')
+        try:
+            tracemalloc.start()
+
+            started_at = time.perf_counter()
+            count = await _load_all(container)
+            _report('load all', count, time.perf_counter() - started_at, tracemalloc.get_traced_memory()[1])
+
+            tracemalloc.reset_peak()
+            started_at = time.perf_counter()
+            await send_emails_to_leads(container)
+            await container.lead_event_writer.flush()
+            _report(
+                f'chunks of {container.scheduler_settings.send_emails_chunk_size}',
+                count,
+                time.perf_counter() - started_at,
+                tracemalloc.get_traced_memory()[1],
+            )
+
+            tracemalloc.reset_peak()
+            started_at = time.perf_counter()
+            await dispatch_outbox_emails(container)
+            _report(
+                f'dispatch x{container.scheduler_settings.send_emails_concurrency}',
+                count,
+                time.perf_counter() - started_at,
+                tracemalloc.get_traced_memory()[1],
+            )
+
+            tracemalloc.stop()
+        finally:
+            await _cleanup(container)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -7,3 +7,4 @@ class HttpServiceException(Exception):
     status_code: int
     message: str
     error_items: list[Hashable] | None = None
+    headers: dict[str, str] | None = None
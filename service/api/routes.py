@@ -0,0 +1,76 @@
+from collections.abc import AsyncGenerator, AsyncIterable, Callable, Coroutine
+from typing import Any
+
+from fastapi import HTTPException, Request, Response, status
+from fastapi.routing import APIRoute
+from starlette.types import Receive, Scope
+
+from service.api.errors import HttpServiceException
+
+
+class RequestBodyTooLargeError(HTTPException):
+    # Subclasses HTTPException so FastAPI re-raises it instead of reporting a generic body parsing error
+    def __init__(self, max_body_size: int):
+        super().__init__(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f'Request body exceeds the maximum size of {max_body_size} bytes',
+        )
+
+
+class ResumeTooLargeError(HTTPException):
+    def __init__(self, max_size: int):
+        super().__init__(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f'Resume exceeds the maximum size of {max_size} bytes',
+        )
+
+
+async def iter_size_limited(chunks: AsyncIterable[bytes], max_size: int) -> AsyncGenerator[bytes]:
+    """Pass a streamed resume through, raising ResumeTooLargeError as soon as it grows above max_size.
+
+    The request body limit is sized for base64 encoded JSON, so it lets raw resumes through that are a third larger.
+    """
+    received_size = 0
+    async for chunk in chunks:
+        received_size += len(chunk)
+        if received_size > max_size:
+            raise ResumeTooLargeError(max_size)
+        yield chunk
+
+
+class BodySizeLimitedRequest(Request):
+    """Request that stops reading its body as soon as it grows above max_body_size."""
+
+    def __init__(self, scope: Scope, receive: Receive, max_body_size: int):
+        super().__init__(scope, receive)
+        self.max_body_size = max_body_size
+
+    async def stream(self) -> AsyncGenerator[bytes]:
+        received_size = 0
+        async for chunk in super().stream():
+            received_size += len(chunk)
+            if received_size > self.max_body_size:
+                raise RequestBodyTooLargeError(self.max_body_size)
+            yield chunk
+
+
+class ResumeUploadRoute(APIRoute):
+    """Route that rejects request bodies which cannot hold a resume within the configured size limit.
+
+    The limit is enforced while the body is being received, before it is parsed as JSON or multipart.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        route_handler = super().get_route_handler()
+
+        async def size_limited_route_handler(request: Request) -> Response:
+            max_body_size = request.app.state.container.resume_settings.max_request_body_size
+            content_length = request.headers.get('content-length')
+            try:
+                if content_length and content_length.isdigit() and int(content_length) > max_body_size:
+                    raise RequestBodyTooLargeError(max_body_size)
+                return await route_handler(BodySizeLimitedRequest(request.scope, request.receive, max_body_size))
+            except (RequestBodyTooLargeError, ResumeTooLargeError) as e:
+                raise HttpServiceException(status_code=e.status_code, message=e.detail)
+
+        return size_limited_route_handler
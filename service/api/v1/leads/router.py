@@ -1,22 +1,36 @@
+import hashlib
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.status import HTTP_409_CONFLICT
 
 from service.api.errors import HttpServiceException
+from service.api.routes import ResumeUploadRoute, iter_size_limited
 from service.api.v1.leads.schemas import (
+    LeadEventResponse,
+    LeadEventsListResponse,
     LeadResponse,
+    LeadSearchResponse,
+    LeadSearchResult,
     LeadsListResponse,
 )
+from service.services.blob_storage.errors import BlobStorageBaseError
 from service.services.leads.errors import LeadServiceDuplicateLeadError
-from service.services.leads.service import LeadCreateWithResume, LeadUpdate
+from service.services.resume_uploads.service import PENDING_RESUME_URL_PREFIX
+from service.services.resume_validation.errors import ResumeValidationError, ResumeValidationUnavailableError
+from service.services.leads.service import LeadCreateForm, LeadCreateWithResume, LeadUpdate
 from service.container import MainContainer
 from service.deps import get_container, get_database_session
 from service.general.auth import auth_jwt
+from service.utils.http_range import RangeNotSatisfiableError, parse_range_header
+from service.utils.multipart import MultipartField, MultipartFile, MultipartStreamError, MultipartStreamReader
 
 router = APIRouter(prefix='/internal', tags=['Internal leads'])
-public_router = APIRouter(prefix='/leads', tags=['Leads'])
+public_router = APIRouter(prefix='/leads', tags=['Leads'], route_class=ResumeUploadRoute)
 
 
 @public_router.post(
@@ -31,9 +45,111 @@ async def create_lead(
 ):
     """Create a new lead with resume (public endpoint, no auth required)."""
     try:
-        lead = await container.lead_service.create_lead_with_resume(db_session, lead_data)
+        if container.resume_settings.deferred_upload_enabled:
+            lead = await container.lead_service.create_lead_with_staged_resume(
+                db_session,
+                lead_data,
+                lead_data.resume,
+                container.resume_upload_service,
+                resume_validator=container.resume_validation_service,
+            )
+        else:
+            lead = await container.lead_service.create_lead_with_resume(
+                db_session, lead_data, resume_validator=container.resume_validation_service
+            )
+    except ResumeValidationError as e:
+        raise HttpServiceException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, message=str(e))
+    except ResumeValidationUnavailableError:
+        raise HttpServiceException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, message='Resume validation is unavailable, try again later'
+        )
     except LeadServiceDuplicateLeadError:
         raise HttpServiceException(status_code=HTTP_409_CONFLICT, message='Application already exists')
+    except BlobStorageBaseError:
+        raise HttpServiceException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, message='Resume storage is unavailable, try again later'
+        )
+    return LeadResponse.model_validate(lead)
+
+
+@public_router.post(
+    '/multipart',
+    response_model=LeadResponse,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra={
+        'requestBody': {
+            'required': True,
+            'content': {
+                'multipart/form-data': {
+                    'schema': {
+                        'type': 'object',
+                        'required': ['first_name', 'last_name', 'email', 'resume'],
+                        'properties': {
+                            'first_name': {'type': 'string'},
+                            'last_name': {'type': 'string'},
+                            'email': {'type': 'string', 'format': 'email'},
+                            'resume': {'type': 'string', 'format': 'binary'},
+                        },
+                    }
+                }
+            },
+        }
+    },
+)
+async def create_lead_multipart(
+    request: Request,
+    db_session: AsyncSession = Depends(get_database_session),
+    container: MainContainer = Depends(get_container),
+):
+    """Create a new lead with resume sent as multipart/form-data (public endpoint, no auth required).
+
+    The resume part is streamed to blob storage as it arrives, so the form fields must precede it in the body. Its
+    format is sniffed from the first bytes; with deferred uploads the staged resume is validated in full. The body
+    after the resume part is not read, so nothing in it can fail a request whose lead was already created.
+    """
+    fields = {}
+    lead = None
+    reader = MultipartStreamReader(request.headers, request.stream())
+    try:
+        async for part in reader.iter_parts():
+            if isinstance(part, MultipartField):
+                fields[part.name] = part.value
+            elif isinstance(part, MultipartFile) and part.name == 'resume':
+                try:
+                    lead_data = LeadCreateForm.model_validate(fields)
+                except ValidationError as e:
+                    raise RequestValidationError(e.errors())
+                resume_chunks = iter_size_limited(part.chunks, container.resume_settings.max_size)
+                if container.resume_settings.deferred_upload_enabled:
+                    lead = await container.lead_service.create_lead_with_staged_resume(
+                        db_session,
+                        lead_data,
+                        resume_chunks,
+                        container.resume_upload_service,
+                        resume_validator=container.resume_validation_service,
+                    )
+                else:
+                    lead = await container.lead_service.create_lead_with_resume_stream(
+                        db_session, lead_data, resume_chunks, resume_validator=container.resume_validation_service
+                    )
+                break
+    except MultipartStreamError as e:
+        raise HttpServiceException(status_code=status.HTTP_400_BAD_REQUEST, message=str(e))
+    except ResumeValidationError as e:
+        raise HttpServiceException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, message=str(e))
+    except ResumeValidationUnavailableError:
+        raise HttpServiceException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, message='Resume validation is unavailable, try again later'
+        )
+    except LeadServiceDuplicateLeadError:
+        raise HttpServiceException(status_code=HTTP_409_CONFLICT, message='Application already exists')
+    except BlobStorageBaseError:
+        raise HttpServiceException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, message='Resume storage is unavailable, try again later'
+        )
+
+    if lead is None:
+        raise HttpServiceException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, message='Resume file is required')
     return LeadResponse.model_validate(lead)
 
 
@@ -63,6 +179,31 @@ async def get_leads(
     )
 
 
+@router.get(
+    '/leads/search',
+    response_model=LeadSearchResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def search_leads(
+    q: str = Query(..., min_length=1, max_length=256, description='Words, "quoted phrases", OR and -excluded words'),
+    page: int = Query(1, ge=1, description='Page number'),
+    page_size: int = Query(10, ge=1, le=100, description='Number of items per page'),
+    db_session: AsyncSession = Depends(get_database_session),
+    container: MainContainer = Depends(get_container),
+    user_id: str = Depends(auth_jwt),
+):
+    """Search leads by the text of their resumes, best matches first (requires authentication)."""
+    results = await container.resume_text_service.search_leads(
+        db_session, q, offset=(page - 1) * page_size, limit=page_size
+    )
+
+    return LeadSearchResponse(
+        items=[LeadSearchResult(**LeadResponse.model_validate(lead).model_dump(), rank=rank) for lead, rank in results],
+        page_size=page_size,
+        page=page,
+    )
+
+
 @router.get(
     '/leads/{lead_id}',
     response_model=LeadResponse,
@@ -98,5 +239,110 @@ async def update_lead_status(
     user_id: str = Depends(auth_jwt),
 ):
     """Update lead status and reach out information (requires authentication)."""
-    lead = await container.lead_service.update_lead(db_session, lead_id, update_data)
+    lead = await container.lead_service.update_lead(
+        db_session, lead_id, update_data, event_writer=container.lead_event_writer, actor=user_id
+    )
     return LeadResponse.model_validate(lead)
+
+
+@router.get(
+    '/leads/{lead_id}/events',
+    response_model=LeadEventsListResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_lead_events(
+    lead_id: UUID,
+    limit: int = Query(50, ge=1, le=100, description='Number of events per page'),
+    after_id: int | None = Query(None, ge=0, description='ID of the last event of the previous page'),
+    db_session: AsyncSession = Depends(get_database_session),
+    container: MainContainer = Depends(get_container),
+    user_id: str = Depends(auth_jwt),
+):
+    """Get the status history of a lead, oldest first (requires authentication)."""
+    events, next_after_id = await container.lead_event_service.get_lead_events(
+        db_session, lead_id, limit=limit, after_id=after_id
+    )
+
+    return LeadEventsListResponse(
+        items=[LeadEventResponse.model_validate(event) for event in events],
+        next_after_id=next_after_id,
+    )
+
+
+@router.get(
+    '/leads/{lead_id}/resume',
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {'content': {'application/octet-stream': {}}},
+        status.HTTP_206_PARTIAL_CONTENT: {'description': 'Requested byte range of the resume'},
+        status.HTTP_304_NOT_MODIFIED: {'description': 'The resume matches If-None-Match'},
+        status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE: {'description': 'The range is outside the resume'},
+    },
+)
+async def get_lead_resume(
+    lead_id: UUID,
+    request: Request,
+    db_session: AsyncSession = Depends(get_database_session),
+    container: MainContainer = Depends(get_container),
+    user_id: str = Depends(auth_jwt),
+):
+    """Stream the resume of a lead, honouring a single-range Range header (requires authentication)."""
+    lead = await container.lead_service.get_lead_by_id(db_session, lead_id)
+    if not lead:
+        raise HttpServiceException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            message='Lead not found',
+        )
+
+    blob = None
+    if not lead.resume_url.startswith(PENDING_RESUME_URL_PREFIX):
+        try:
+            blob = await container.blob_storage_service.get_stream(lead.resume_url)
+        except BlobStorageBaseError:
+            raise HttpServiceException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                message='Resume storage is unavailable, try again later',
+            )
+    if blob is None:
+        raise HttpServiceException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            message='Resume not found',
+        )
+
+    # Stored blobs never change, so the URL identifies the content
+    etag = f'"{hashlib.sha256(lead.resume_url.encode()).hexdigest()[:32]}"'
+    headers = {
+        'Accept-Ranges': 'bytes',
+        'Cache-Control': f'private, max-age={container.resume_settings.download_cache_max_age}',
+        'ETag': etag,
+    }
+    if request.headers.get('if-none-match') == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    byte_range = None
+    range_header = request.headers.get('range')
+    # If-Range asks for the whole resume when the client's copy is outdated
+    if range_header and request.headers.get('if-range', etag) == etag:
+        try:
+            byte_range = parse_range_header(range_header, blob.size)
+        except RangeNotSatisfiableError:
+            raise HttpServiceException(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                message='Requested range not satisfiable',
+                headers={'Content-Range': f'bytes */{blob.size}'},
+            )
+
+    start, end = byte_range or (0, blob.size)
+    headers['Content-Length'] = str(end - start)
+    status_code = status.HTTP_200_OK
+    if byte_range is not None:
+        headers['Content-Range'] = f'bytes {start}-{end - 1}/{blob.size}'
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+
+    return StreamingResponse(
+        blob.iter_range(start, end),
+        status_code=status_code,
+        headers=headers,
+        media_type='application/octet-stream',
+    )
@@ -3,6 +3,7 @@ from uuid import UUID
 
 from pydantic import BaseModel
 
+from service.database.models.lead_events import LeadEventBase
 from service.database.models.leads import LeadBase
 
 
@@ -21,3 +22,31 @@ class LeadsListResponse(BaseModel):
     total: int
     page_size: int
     page: int
+
+
+class LeadSearchResult(LeadResponse):
+    """Schema for a lead found by resume text search."""
+
+    rank: float
+
+
+class LeadSearchResponse(BaseModel):
+    """Schema for a page of resume search results, best matches first."""
+
+    items: list[LeadSearchResult]
+    page_size: int
+    page: int
+
+
+class LeadEventResponse(LeadEventBase):
+    """Schema for a lead status transition."""
+
+    id: int
+    created_at: dt.datetime
+
+
+class LeadEventsListResponse(BaseModel):
+    """Schema for a page of lead events; pass next_after_id as after_id to get the next page."""
+
+    items: list[LeadEventResponse]
+    next_after_id: int | None
@@ -7,13 +7,26 @@ from sqlalchemy.ext.asyncio import AsyncEngine
 
 from service.database import Database, create_engine
 from service.services.attorneys.service import AttorneyService
+from service.services.blob_gc import BlobGcService
 from service.services.blob_storage.service import BlobStorageService
+from service.services.email_outbox import EmailOutboxService
+from service.services.email_service.registry import EmailTemplateRegistry
 from service.services.email_service.service import EmailService
 from service.services.healthcheck.service import HealthCheckService
+from service.services.lead_events import LeadEventService, LeadEventWriter
 from service.services.leads.service import LeadService
+from service.services.resume_texts import ResumeTextService
+from service.services.resume_uploads.service import ResumeUploadService
+from service.services.resume_validation import ResumeValidationService
 from service.settings import (
     DatabaseSettings,
     AppSettings,
+    EmailSettings,
+    BlobGcSettings,
+    LeadEventSettings,
+    ResumeSettings,
+    ResumeTextSettings,
+    SchedulerSettings,
     SentrySettings,
 )
 
@@ -23,7 +36,7 @@ logger = logging.getLogger(__name__)
 
 class MainContainer:
     async def __aenter__(self) -> Self:
-        self.start()
+        await self.start()
         return self
 
     async def __aexit__(
@@ -32,12 +45,23 @@ class MainContainer:
         exc: BaseException | None,
         tb: TracebackType | None,
     ) -> None:
-        self.stop()
-
-    def start(self):
+        await self.stop()
+
+    async def start(self):
+        await self.blob_storage_service.start()
+        await self.resume_validation_service.start()
+        await self.resume_text_service.start()
+        await self.lead_event_writer.start()
+        self.email_template_registry.load()
+        await self.email_service.start()
         logger.info('Service: initialized')
 
-    def stop(self):
+    async def stop(self):
+        await self.email_service.stop()
+        await self.lead_event_writer.stop()
+        await self.resume_text_service.stop()
+        await self.resume_validation_service.stop()
+        await self.blob_storage_service.stop()
         logger.info('Service: disposed')
 
     @cached_property
@@ -48,6 +72,30 @@ class MainContainer:
     def sentry_settings(self) -> SentrySettings:
         return SentrySettings()
 
+    @cached_property
+    def resume_settings(self) -> ResumeSettings:
+        return ResumeSettings()
+
+    @cached_property
+    def resume_text_settings(self) -> ResumeTextSettings:
+        return ResumeTextSettings()
+
+    @cached_property
+    def blob_gc_settings(self) -> BlobGcSettings:
+        return BlobGcSettings()
+
+    @cached_property
+    def lead_event_settings(self) -> LeadEventSettings:
+        return LeadEventSettings()
+
+    @cached_property
+    def scheduler_settings(self) -> SchedulerSettings:
+        return SchedulerSettings()
+
+    @cached_property
+    def email_settings(self) -> EmailSettings:
+        return EmailSettings()
+
     @cached_property
     def database_settings(self) -> DatabaseSettings:
         return DatabaseSettings()
@@ -68,13 +116,45 @@ class MainContainer:
     def blob_storage_service(self) -> BlobStorageService:
         return BlobStorageService()
 
+    @cached_property
+    def blob_gc_service(self) -> BlobGcService:
+        return BlobGcService()
+
     @cached_property
     def lead_service(self) -> LeadService:
         return LeadService()
 
+    @cached_property
+    def lead_event_service(self) -> LeadEventService:
+        return LeadEventService()
+
+    @cached_property
+    def lead_event_writer(self) -> LeadEventWriter:
+        return LeadEventWriter(self.database, self.lead_event_settings)
+
+    @cached_property
+    def resume_upload_service(self) -> ResumeUploadService:
+        return ResumeUploadService(self.resume_settings)
+
+    @cached_property
+    def resume_validation_service(self) -> ResumeValidationService:
+        return ResumeValidationService(self.resume_settings)
+
+    @cached_property
+    def resume_text_service(self) -> ResumeTextService:
+        return ResumeTextService(self.resume_text_settings)
+
     @cached_property
     def email_service(self) -> EmailService:
-        return EmailService()
+        return EmailService(self.email_settings)
+
+    @cached_property
+    def email_outbox_service(self) -> EmailOutboxService:
+        return EmailOutboxService(self.email_settings)
+
+    @cached_property
+    def email_template_registry(self) -> EmailTemplateRegistry:
+        return EmailTemplateRegistry()
 
     @cached_property
     def attorney_service(self) -> AttorneyService:
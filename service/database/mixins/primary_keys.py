@@ -1,6 +1,7 @@
 import uuid
 
 from pydantic import BaseModel
+import sqlalchemy as sa
 import sqlmodel as sm
 
 
@@ -14,3 +15,12 @@ class PkIncrementalIdMixin(BaseModel):
         primary_key=True,
         description='Autoincrementing integer primary key',
     )
+
+
+class PkBigIncrementalIdMixin(BaseModel):
+    id: int | None = sm.Field(
+        default=None,
+        sa_type=sa.BigInteger,
+        primary_key=True,
+        description='Autoincrementing 64-bit integer primary key',
+    )
@@ -1,5 +1,10 @@
 from service.database.models.attorneys import Attorney
+from service.database.models.email_outbox import OutboxEmail
 from service.database.models.healthchecks import HealthCheck
+from service.database.models.job_checkpoints import JobCheckpoint
+from service.database.models.lead_events import LeadEvent
 from service.database.models.leads import Lead
+from service.database.models.resume_texts import ResumeText
+from service.database.models.resume_uploads import ResumeUpload
 
-__all__ = ['HealthCheck', 'Lead', 'Attorney']
+__all__ = ['HealthCheck', 'Lead', 'LeadEvent', 'Attorney', 'ResumeUpload', 'ResumeText', 'JobCheckpoint', 'OutboxEmail']
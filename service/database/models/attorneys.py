@@ -9,6 +9,14 @@ from service.database.models.base import SqlModelBase
 
 class Attorney(SqlModelBase, PkUuidMixin, CreatedAtMixin, UpdatedAtMixin, table=True):
     __tablename__ = 'attorneys'
+    __table_args__ = (
+        # Least busy active attorney as an index-ordered LIMIT 1, ties broken by ID
+        sa.Index('ix_attorneys_is_active_reached_out_count_id', 'is_active', 'reached_out_count', 'id'),
+    )
 
     email: EmailStr = sm.Field(sa_type=sa.String(), index=True, unique=True)
     is_active: bool = sm.Field(sa_type=sa.Boolean(), nullable=True, default=True)
+    # Number of reached out leads, kept by LeadService in the transaction that changes them
+    reached_out_count: int = sm.Field(
+        sa_type=sa.Integer(), nullable=False, default=0, sa_column_kwargs={'server_default': '0'}
+    )
@@ -0,0 +1,45 @@
+import datetime as dt
+import enum
+import uuid
+
+import sqlalchemy as sa
+import sqlmodel as sm
+
+from service.database.mixins.metadata import CreatedAtMixin, UpdatedAtMixin
+from service.database.mixins.primary_keys import PkUuidMixin
+from service.database.models.base import SqlModelBase
+from service.database.models.types import EnumString
+from service.utils.date_utils import get_utc_now
+
+
+class OutboxEmailState(str, enum.Enum):
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class OutboxEmailStateString(EnumString):
+    enum_type_class = OutboxEmailState
+    cache_ok = True
+
+
+class OutboxEmail(SqlModelBase, PkUuidMixin, CreatedAtMixin, UpdatedAtMixin, table=True):
+    """Outbox row for an email queued together with the status change of its lead and sent by the dispatcher."""
+
+    __tablename__ = 'email_outbox'
+    __table_args__ = (sa.Index('ix_email_outbox_state_next_attempt_at', 'state', 'next_attempt_at'),)
+
+    lead_id: uuid.UUID = sm.Field(sa_type=sa.UUID, nullable=False, foreign_key='leads.id', ondelete='CASCADE')
+    sender: str = sm.Field(sa_type=sa.String(), nullable=False)
+    receiver: str = sm.Field(sa_type=sa.String(), nullable=False)
+    subject: str = sm.Field(sa_type=sa.String(), nullable=False)
+    text: str = sm.Field(sa_type=sa.String(), nullable=False)
+    state: OutboxEmailState = sm.Field(sa_type=OutboxEmailStateString, nullable=False)
+    attempts: int = sm.Field(sa_type=sa.Integer(), nullable=False, default=0)
+    next_attempt_at: dt.datetime = sm.Field(
+        sa_type=sa.DateTime(timezone=True), nullable=False, default_factory=get_utc_now
+    )
+    last_error: str | None = sm.Field(sa_type=sa.String(), nullable=True, default=None)
@@ -20,6 +20,7 @@ class ServiceType(str, enum.Enum):
 
 class ServiceTypeString(EnumString):
     enum_type_class = ServiceType
+    cache_ok = True
 
 
 class HealthCheckBase(SqlModelBase):
@@ -0,0 +1,14 @@
+import sqlalchemy as sa
+import sqlmodel as sm
+
+from service.database.mixins.metadata import UpdatedAtMixin
+from service.database.models.base import SqlModelBase
+
+
+class JobCheckpoint(SqlModelBase, UpdatedAtMixin, table=True):
+    """Progress of a scheduled job that walks a large table in batches, so a restarted job resumes where it stopped."""
+
+    __tablename__ = 'job_checkpoints'
+
+    name: str = sm.Field(sa_type=sa.String(), primary_key=True)
+    position: str | None = sm.Field(sa_type=sa.String(), nullable=True, default=None)
@@ -0,0 +1,24 @@
+import uuid
+
+import sqlalchemy as sa
+import sqlmodel as sm
+
+from service.database.mixins.metadata import CreatedAtMixin
+from service.database.mixins.primary_keys import PkBigIncrementalIdMixin
+from service.database.models.base import SqlModelBase
+from service.database.models.leads import LeadStatus, LeadStatusString
+
+
+class LeadEventBase(SqlModelBase):
+    lead_id: uuid.UUID = sm.Field(sa_type=sa.UUID, nullable=False)
+    from_status: LeadStatus | None = sm.Field(sa_type=LeadStatusString, nullable=True, default=None)
+    to_status: LeadStatus = sm.Field(sa_type=LeadStatusString, nullable=False)
+    reached_out_by: uuid.UUID | None = sm.Field(sa_type=sa.UUID, nullable=True, default=None)
+    actor: str | None = sm.Field(sa_type=sa.String(), nullable=True, default=None)
+
+
+class LeadEvent(LeadEventBase, PkBigIncrementalIdMixin, CreatedAtMixin, table=True):
+    """Append-only history of lead status transitions."""
+
+    __tablename__ = 'lead_events'
+    __table_args__ = (sa.Index('ix_lead_events_lead_id_id', 'lead_id', 'id'),)
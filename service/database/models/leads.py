@@ -24,6 +24,7 @@ class LeadStatus(str, enum.Enum):
 
 class LeadStatusString(EnumString):
     enum_type_class = LeadStatus
+    cache_ok = True
 
 
 class LeadBase(SqlModelBase):
@@ -39,3 +40,11 @@ class LeadBase(SqlModelBase):
 
 class Lead(LeadBase, PkUuidMixin, CreatedAtMixin, UpdatedAtMixin, table=True):
     __tablename__ = 'leads'
+    __table_args__ = (
+        # Keyset order of jobs that pick up new and changed leads
+        sa.Index('ix_leads_updated_at_id', 'updated_at', 'id'),
+        # Anti-join of the orphaned blob collector
+        sa.Index('ix_leads_resume_url', 'resume_url'),
+        # Oldest leads of a status first, for outreach claims
+        sa.Index('ix_leads_status_created_at_id', 'status', 'created_at', 'id'),
+    )
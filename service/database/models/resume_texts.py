@@ -0,0 +1,47 @@
+import enum
+import uuid
+
+import sqlalchemy as sa
+import sqlmodel as sm
+from sqlalchemy.dialects import postgresql
+
+from service.database.mixins.metadata import CreatedAtMixin, UpdatedAtMixin
+from service.database.models.base import SqlModelBase
+from service.database.models.types import EnumString
+
+# Text search configuration of resume_texts.search_vector; queries must use the same one to hit the GIN index
+RESUME_TEXT_SEARCH_CONFIG = 'english'
+
+
+class ResumeTextState(str, enum.Enum):
+    INDEXED = 'indexed'
+    FAILED = 'failed'
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class ResumeTextStateString(EnumString):
+    enum_type_class = ResumeTextState
+    cache_ok = True
+
+
+class ResumeText(SqlModelBase, CreatedAtMixin, UpdatedAtMixin, table=True):
+    """Text extracted from a lead resume and its full-text search vector."""
+
+    __tablename__ = 'resume_texts'
+    __table_args__ = (sa.Index('ix_resume_texts_search_vector', 'search_vector', postgresql_using='gin'),)
+
+    lead_id: uuid.UUID = sm.Field(sa_type=sa.UUID, primary_key=True, foreign_key='leads.id', ondelete='CASCADE')
+    resume_url: str = sm.Field(sa_type=sa.String(), nullable=False)  # the resume the text was extracted from
+    state: ResumeTextState = sm.Field(sa_type=ResumeTextStateString, nullable=False)
+    content: str = sm.Field(sa_type=sa.Text(), nullable=False, default='')
+    error: str | None = sm.Field(sa_type=sa.String(), nullable=True, default=None)
+    search_vector: str | None = sm.Field(
+        default=None,
+        sa_column=sa.Column(
+            postgresql.TSVECTOR(),
+            sa.Computed(f"to_tsvector('{RESUME_TEXT_SEARCH_CONFIG}', content)", persisted=True),
+            nullable=True,
+        ),
+    )
@@ -0,0 +1,42 @@
+import datetime as dt
+import enum
+import uuid
+
+import sqlalchemy as sa
+import sqlmodel as sm
+
+from service.database.mixins.metadata import CreatedAtMixin, UpdatedAtMixin
+from service.database.mixins.primary_keys import PkUuidMixin
+from service.database.models.base import SqlModelBase
+from service.database.models.types import EnumString
+from service.utils.date_utils import get_utc_now
+
+
+class ResumeUploadState(str, enum.Enum):
+    PENDING = 'pending'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class ResumeUploadStateString(EnumString):
+    enum_type_class = ResumeUploadState
+    cache_ok = True
+
+
+class ResumeUpload(SqlModelBase, PkUuidMixin, CreatedAtMixin, UpdatedAtMixin, table=True):
+    """Outbox row for a resume staged on local disk and waiting to be uploaded to blob storage."""
+
+    __tablename__ = 'resume_uploads'
+    __table_args__ = (sa.Index('ix_resume_uploads_state_next_attempt_at', 'state', 'next_attempt_at'),)
+
+    lead_id: uuid.UUID = sm.Field(sa_type=sa.UUID, nullable=False, foreign_key='leads.id', ondelete='CASCADE')
+    staged_path: str = sm.Field(sa_type=sa.String(), nullable=False)
+    state: ResumeUploadState = sm.Field(sa_type=ResumeUploadStateString, nullable=False)
+    attempts: int = sm.Field(sa_type=sa.Integer(), nullable=False, default=0)
+    next_attempt_at: dt.datetime = sm.Field(
+        sa_type=sa.DateTime(timezone=True), nullable=False, default_factory=get_utc_now
+    )
+    last_error: str | None = sm.Field(sa_type=sa.String(), nullable=True, default=None)
@@ -10,6 +10,8 @@ logger = logging.getLogger(__name__)
 
 class EnumString(sa.types.TypeDecorator):
     impl = sa.String()
+    # Subclasses also set cache_ok = True, which SQLAlchemy does not inherit, so that statements using them are
+    # compiled once; their only state is the enum class
     enum_type_class: Type[enum.Enum]
 
     def process_bind_param(self, value, dialect) -> str | None:
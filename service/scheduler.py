@@ -15,8 +15,14 @@ from service.container import MainContainer
 from service import settings
 from service.database.models.healthchecks import ServiceType
 from service.settings import SchedulerSettings
+from service.tasks.collect_orphaned_blobs import collect_orphaned_blobs
+from service.tasks.compact_blob_storage import compact_blob_storage
+from service.tasks.dispatch_emails import dispatch_outbox_emails
 from service.tasks.healthcheck import update_healthcheck_data
+from service.tasks.index_resume_texts import index_resume_texts
+from service.tasks.reconcile_attorney_workloads import reconcile_attorney_workloads
 from service.tasks.send_email import send_emails_to_leads
+from service.tasks.upload_resumes import upload_staged_resumes
 from service.utils.loggers import prepare_logger
 from service.utils.sentry import init_sentry
 
@@ -69,6 +75,85 @@ class SchedulerContainer:
                 args=(container,),
             )
 
+        # Email outbox job; emails queued by send_emails_to_leads are sent and failed ones retried with backoff
+        if self.scheduler_settings.dispatch_emails_enabled:
+            logger.info(
+                f'Enable dispatch_outbox_emails by schedule: {self.scheduler_settings.dispatch_emails_schedule}'
+            )
+            self.scheduler.add_job(
+                dispatch_outbox_emails,
+                trigger=CronTrigger.from_crontab(self.scheduler_settings.dispatch_emails_schedule),
+                id='dispatch_outbox_emails',
+                replace_existing=True,
+                args=(container,),
+            )
+
+        # Staged resume upload job
+        if self.scheduler_settings.upload_resumes_enabled:
+            logger.info(f'Enable upload_staged_resumes by schedule: {self.scheduler_settings.upload_resumes_schedule}')
+            self.scheduler.add_job(
+                upload_staged_resumes,
+                trigger=CronTrigger.from_crontab(self.scheduler_settings.upload_resumes_schedule),
+                id='upload_staged_resumes',
+                replace_existing=True,
+                args=(container,),
+            )
+
+        # Resume text indexing job; one run at a time, a backfill continues from its checkpoint on the next run
+        if self.scheduler_settings.index_resume_texts_enabled:
+            logger.info(f'Enable index_resume_texts by schedule: {self.scheduler_settings.index_resume_texts_schedule}')
+            self.scheduler.add_job(
+                index_resume_texts,
+                trigger=CronTrigger.from_crontab(self.scheduler_settings.index_resume_texts_schedule),
+                id='index_resume_texts',
+                replace_existing=True,
+                max_instances=1,
+                args=(container,),
+            )
+
+        # Blob storage compaction job; a run copies blobs for a while, so runs never overlap
+        if self.scheduler_settings.compact_blob_storage_enabled:
+            logger.info(
+                f'Enable compact_blob_storage by schedule: {self.scheduler_settings.compact_blob_storage_schedule}'
+            )
+            self.scheduler.add_job(
+                compact_blob_storage,
+                trigger=CronTrigger.from_crontab(self.scheduler_settings.compact_blob_storage_schedule),
+                id='compact_blob_storage',
+                replace_existing=True,
+                max_instances=1,
+                args=(container,),
+            )
+
+        # Orphaned blob collection job; one run at a time, a pass over all blobs continues from its checkpoint
+        if self.scheduler_settings.collect_orphaned_blobs_enabled:
+            logger.info(
+                f'Enable collect_orphaned_blobs by schedule: {self.scheduler_settings.collect_orphaned_blobs_schedule}'
+            )
+            self.scheduler.add_job(
+                collect_orphaned_blobs,
+                trigger=CronTrigger.from_crontab(self.scheduler_settings.collect_orphaned_blobs_schedule),
+                id='collect_orphaned_blobs',
+                replace_existing=True,
+                max_instances=1,
+                args=(container,),
+            )
+
+        # Attorney workload reconciliation job; it recounts all reached out leads, so runs never overlap
+        if self.scheduler_settings.reconcile_attorney_workloads_enabled:
+            logger.info(
+                'Enable reconcile_attorney_workloads by schedule: '
+                f'{self.scheduler_settings.reconcile_attorney_workloads_schedule}'
+            )
+            self.scheduler.add_job(
+                reconcile_attorney_workloads,
+                trigger=CronTrigger.from_crontab(self.scheduler_settings.reconcile_attorney_workloads_schedule),
+                id='reconcile_attorney_workloads',
+                replace_existing=True,
+                max_instances=1,
+                args=(container,),
+            )
+
         logger.info('Jobs added')
 
     async def __aenter__(self) -> 'SchedulerContainer':
@@ -76,7 +161,7 @@ class SchedulerContainer:
         init_sentry(sentry_settings=self._container.sentry_settings, service_type='scheduler')
         logger.info('SchedulerContainer: initialized')
 
-        self._container.start()
+        await self._container.start()
         self.scheduler.start()
         self.add_jobs(self._container)
         return self
@@ -88,7 +173,7 @@ class SchedulerContainer:
         tb: TracebackType | None,
     ) -> None:
         logger.info('SchedulerContainer: disposed')
-        self._container.stop()
+        await self._container.stop()
         self.scheduler.shutdown()
 
 
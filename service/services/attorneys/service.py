@@ -1,12 +1,31 @@
+import collections
+from collections.abc import Sequence
 from uuid import UUID
 
 import sqlalchemy as sa
 import sqlmodel as sm
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from service.database.helpers import get_model_by_id_or_none
 from service.database.models.attorneys import Attorney
 from service.database.models.leads import Lead, LeadStatus
+from service.services.attorneys.workload import AttorneyWorkloadIndex
+from service.utils.date_utils import get_utc_now
+
+
+def _unnest(name: str, **columns: tuple[type[sa.types.TypeEngine], list]) -> sa.TableValuedAlias:
+    """Rows zipped from one array parameter per column, for UPDATE ... FROM.
+
+    Unlike a VALUES list, the statement does not change with the number of rows, so it is compiled once and cached,
+    and the rows are not limited by the number of bind parameters per statement.
+    """
+    arrays = [sa.cast(values, postgresql.ARRAY(type_)) for type_, values in columns.values()]
+    return (
+        sa.func.unnest(*arrays)
+        .table_valued(*(sa.column(column, type_) for column, (type_, _) in columns.items()))
+        .render_derived(name=name)
+    )
 
 
 class AttorneyService:
@@ -27,6 +46,15 @@ class AttorneyService:
             id_value=attorney_id,
         )
 
+    @classmethod
+    def _get_workloads_query(cls) -> sa.Select:
+        """Active attorneys with their number of reached out leads, least busy first, ties broken by ID."""
+        return (
+            sa.select(Attorney, sm.col(Attorney.reached_out_count))
+            .where(sm.col(Attorney.is_active) == True)  # noqa: E712
+            .order_by(sm.col(Attorney.reached_out_count).asc(), sm.col(Attorney.id).asc())
+        )
+
     @classmethod
     async def get_least_busy_attorney(cls, db_session: AsyncSession) -> Attorney:
         """Get the attorney with the least number of leads that have been reached out to.
@@ -40,25 +68,197 @@ class AttorneyService:
         Raises:
             ValueError: If no active attorneys are found
         """
+        result = await db_session.execute(cls._get_workloads_query().limit(1))
+        row = result.first()
+
+        if not row:
+            raise ValueError('No active attorneys found')
+
+        return row[0]  # Return the Attorney object (first element of the tuple)
+
+    @classmethod
+    async def move_reached_out_lead(
+        cls, db_session: AsyncSession, from_attorney_id: UUID | None, to_attorney_id: UUID | None
+    ) -> None:
+        """Move a reached out lead between the counters of two attorneys, without committing.
+
+        Args:
+            db_session: Database session of the transaction that changes the lead
+            from_attorney_id: Attorney that the lead no longer counts for, if any
+            to_attorney_id: Attorney that the lead counts for from now on, if any
+        """
+        if from_attorney_id == to_attorney_id:
+            return
+
+        deltas = {from_attorney_id: -1, to_attorney_id: 1}
+        # Rows are locked in ID order, so concurrent moves between the same attorneys cannot deadlock
+        for attorney_id in sorted(attorney_id for attorney_id in deltas if attorney_id is not None):
+            await db_session.execute(
+                sa.update(Attorney)
+                .where(sm.col(Attorney.id) == attorney_id)
+                .values(reached_out_count=sm.col(Attorney.reached_out_count) + deltas[attorney_id])
+            )
+
+    @classmethod
+    async def reconcile_reached_out_counts(cls, db_session: AsyncSession) -> int:
+        """Recount the reached out leads of all attorneys and repair the counters that drifted, without committing.
+
+        The recount runs in a repeatable read transaction, so a counter moved by a concurrent lead update after the
+        leads were counted fails the statement with a serialization error instead of being overwritten.
+
+        Args:
+            db_session: Database session without a transaction in progress
+
+        Returns:
+            Number of repaired counters
+        """
+        await db_session.connection(execution_options={'isolation_level': 'REPEATABLE READ'})
+
         reached_out_leads_count = (
             sa.select(Lead.reached_out_by.label('attorney_id'), sa.func.count(Lead.id).label('lead_count'))
             .where(Lead.status == LeadStatus.REACHED_OUT)
             .group_by(Lead.reached_out_by)
             .subquery()
         )
-
-        query = (
-            sa.select(Attorney, sa.func.coalesce(reached_out_leads_count.c.lead_count, 0).label('lead_count'))
+        lead_counts = (
+            sa.select(
+                sm.col(Attorney.id).label('attorney_id'),
+                sa.func.coalesce(reached_out_leads_count.c.lead_count, 0).label('lead_count'),
+            )
             .outerjoin(reached_out_leads_count, Attorney.id == reached_out_leads_count.c.attorney_id)
-            .where(sm.col(Attorney.is_active) == True)  # noqa: E712
-            .order_by(sa.func.coalesce(reached_out_leads_count.c.lead_count, 0).asc())
-            .limit(1)
+            .cte('lead_counts')
         )
+        result = await db_session.execute(
+            sa.update(Attorney)
+            .where(
+                sm.col(Attorney.id) == lead_counts.c.attorney_id,
+                sm.col(Attorney.reached_out_count) != lead_counts.c.lead_count,
+            )
+            .values(reached_out_count=lead_counts.c.lead_count)
+            .returning(Attorney.id)
+            .execution_options(synchronize_session=False)
+        )
+        return len(result.all())
 
-        result = await db_session.execute(query)
-        row = result.first()
+    @classmethod
+    async def plan_batch(
+        cls, db_session: AsyncSession, lead_ids: Sequence[UUID], lock: bool = False
+    ) -> dict[UUID, Attorney]:
+        """Balance leads over the active attorneys as if each went to the least busy attorney in turn.
 
-        if not row:
-            raise ValueError('No active attorneys found')
+        Nothing is written: the plan is applied with apply_batch. Without lock the plan is based on the counters as
+        they are now, so batches planned concurrently may favour the same attorneys; the counters still end up exact.
 
-        return row[0]  # Return the Attorney object (first element of the tuple)
+        Args:
+            db_session: Database session
+            lead_ids: IDs of the leads to reach out to
+            lock: Lock the active attorneys until the transaction ends, so concurrent batches are planned one after
+                another
+
+        Returns:
+            Attorney assigned to each lead by lead ID
+
+        Raises:
+            ValueError: If there are leads but no active attorneys
+        """
+        query = cls._get_workloads_query()
+        if lock:
+            # Locked in ID order, the order in which move_reached_out_lead locks attorneys. FOR NO KEY UPDATE, as
+            # the foreign key of every lead update holds a key share lock on its attorney
+            query = query.order_by(None).order_by(sm.col(Attorney.id)).with_for_update(key_share=True)
+        workload = AttorneyWorkloadIndex((await db_session.execute(query)).all())
+        return dict(zip(lead_ids, workload.add_leads(len(lead_ids))))
+
+    @classmethod
+    async def apply_batch(cls, db_session: AsyncSession, assignments: dict[UUID, Attorney]) -> set[UUID]:
+        """Mark leads as reached out to by their assigned attorneys and move the counters, without committing.
+
+        The leads and the counters are updated with one UPDATE ... FROM unnest(...) statement each. Leads that have
+        been reached out to in the meantime are left as they are. Lead instances in the session are not refreshed.
+
+        Args:
+            db_session: Database session
+            assignments: Attorney assigned to each lead by lead ID, e.g. from plan_batch
+
+        Returns:
+            IDs of the leads that were updated
+        """
+        assignment_rows = _unnest(
+            'assignments',
+            lead_id=(sa.UUID, list(assignments)),
+            attorney_id=(sa.UUID, [attorney.id for attorney in assignments.values()]),
+        )
+        result = await db_session.execute(
+            sa.update(Lead)
+            .where(sm.col(Lead.id) == assignment_rows.c.lead_id, Lead.status != LeadStatus.REACHED_OUT)
+            .values(
+                status=LeadStatus.REACHED_OUT, reached_out_by=assignment_rows.c.attorney_id, updated_at=get_utc_now()
+            )
+            .returning(Lead.id, Lead.reached_out_by)
+            .execution_options(synchronize_session=False)
+        )
+        reached_out_by = dict(result.all())
+
+        lead_counts = collections.Counter(reached_out_by.values())
+        if not lead_counts:
+            return set()
+
+        # Locked in ID order first, as UPDATE ... FROM locks rows in no particular order. FOR NO KEY UPDATE, the lock
+        # the UPDATE takes, does not conflict with the key share locks of the leads just updated in other batches
+        attorney_ids = sorted(lead_counts)
+        await db_session.execute(
+            sa.select(Attorney.id)
+            .where(sm.col(Attorney.id) == sa.any_(sa.cast(attorney_ids, postgresql.ARRAY(sa.UUID))))
+            .order_by(sm.col(Attorney.id))
+            .with_for_update(key_share=True)
+        )
+        count_rows = _unnest(
+            'counts',
+            attorney_id=(sa.UUID, attorney_ids),
+            lead_count=(sa.Integer, [lead_counts[attorney_id] for attorney_id in attorney_ids]),
+        )
+        await db_session.execute(
+            sa.update(Attorney)
+            .where(sm.col(Attorney.id) == count_rows.c.attorney_id)
+            .values(reached_out_count=sm.col(Attorney.reached_out_count) + count_rows.c.lead_count)
+            .execution_options(synchronize_session=False)
+        )
+        return set(reached_out_by)
+
+    @classmethod
+    async def assign_batch(cls, db_session: AsyncSession, leads: Sequence[Lead]) -> dict[UUID, Attorney]:
+        """Reach out to leads at once, balanced over the active attorneys, without committing.
+
+        The assignment ends with the same number of leads per attorney as calling get_least_busy_attorney for each
+        lead in turn. The leads and the active attorneys are locked, so concurrent batches are balanced one after
+        another. Leads that have already been reached out to are left as they are.
+
+        Args:
+            db_session: Database session
+            leads: Leads to reach out to
+
+        Returns:
+            Attorney assigned to each lead reached out to, by lead ID
+
+        Raises:
+            ValueError: If no active attorneys are found
+        """
+        lead_ids = (
+            (
+                await db_session.execute(
+                    sa.select(Lead.id)
+                    .where(
+                        sm.col(Lead.id)
+                        == sa.any_(sa.cast(sorted(lead.id for lead in leads), postgresql.ARRAY(sa.UUID))),
+                        Lead.status != LeadStatus.REACHED_OUT,
+                    )
+                    .order_by(sm.col(Lead.id))
+                    .with_for_update()
+                )
+            )
+            .scalars()
+            .all()
+        )
+        assignments = await cls.plan_batch(db_session, lead_ids, lock=True)
+        reached_out_lead_ids = await cls.apply_batch(db_session, assignments)
+        return {lead_id: attorney for lead_id, attorney in assignments.items() if lead_id in reached_out_lead_ids}
@@ -0,0 +1,60 @@
+from collections.abc import Iterable
+from uuid import UUID
+
+from service.database.models.attorneys import Attorney
+
+
+class AttorneyWorkloadIndex:
+    """Active attorneys by the number of leads they reached out to, for balancing a batch of leads over them.
+
+    Ties are broken by attorney ID, as in AttorneyService.get_least_busy_attorney. Assignments made by other
+    processes in the meantime are not seen, so an index is meant to live for a single batch.
+    """
+
+    def __init__(self, workloads: Iterable[tuple[Attorney, int]]):
+        self._attorneys: dict[UUID, Attorney] = {}
+        self._counts: dict[UUID, int] = {}
+        for attorney, lead_count in workloads:
+            self._attorneys[attorney.id] = attorney
+            self._counts[attorney.id] = lead_count
+
+    def get_lead_count(self, attorney_id: UUID) -> int:
+        return self._counts[attorney_id]
+
+    def add_leads(self, lead_count: int) -> list[Attorney]:
+        """Count lead_count leads at once, spread as if each went to the least busy attorney in turn.
+
+        The counts are water-filled: attorneys below a common level are raised to it and the leads left over go to
+        the attorneys at that level with the lowest IDs. Costs O(attorneys log attorneys) however many leads there
+        are.
+
+        Returns:
+            The attorney of each lead, grouped by attorney
+
+        Raises:
+            ValueError: If there are leads but no active attorneys
+        """
+        if lead_count <= 0:
+            return []
+        if not self._counts:
+            raise ValueError('No active attorneys found')
+
+        ordered = sorted(self._counts.items(), key=lambda item: (item[1], item[0]))
+        # Grow the group of the least busy attorneys until the next one is above the level the leads fill them up to
+        filled_count = 0
+        for group_size, (_, count) in enumerate(ordered, start=1):
+            filled_count += count
+            level = (lead_count + filled_count) // group_size
+            if group_size == len(ordered) or level <= ordered[group_size][1]:
+                break
+        left_count = lead_count + filled_count - level * group_size
+
+        assigned = []
+        for attorney_id, count in sorted(self._counts.items(), key=lambda item: item[0]):
+            new_count = max(count, level)
+            if new_count == level and left_count:
+                new_count += 1
+                left_count -= 1
+            assigned.extend([self._attorneys[attorney_id]] * (new_count - count))
+            self._counts[attorney_id] = new_count
+        return assigned
@@ -0,0 +1,3 @@
+from .service import BlobGcService
+
+__all__ = ['BlobGcService']
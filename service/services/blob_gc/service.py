@@ -0,0 +1,44 @@
+import sqlalchemy as sa
+import sqlmodel as sm
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from service.database.models.leads import Lead
+
+# Per connection; its rows are gone when the transaction commits
+_candidates = sa.Table(
+    'blob_gc_candidates',
+    sa.MetaData(),
+    sa.Column('url', sa.String(), primary_key=True),
+    prefixes=['TEMPORARY'],
+    postgresql_on_commit='DELETE ROWS',
+)
+
+
+class BlobGcService:
+    @classmethod
+    async def find_orphans(cls, db_session: AsyncSession, urls: list[str]) -> list[str]:
+        """Get the blob URLs that no lead references as its resume.
+
+        The batch is loaded into a temporary table and anti-joined against leads.resume_url in one query, instead
+        of a query per URL.
+
+        Args:
+            db_session: Database session; the temporary table is emptied when it commits
+            urls: Blob URLs to check
+
+        Returns:
+            The unreferenced URLs, in order
+        """
+        if not urls:
+            return []
+
+        await db_session.execute(sa.schema.CreateTable(_candidates, if_not_exists=True))
+        # Rows left by an earlier call in the same transaction
+        await db_session.execute(sa.delete(_candidates))
+        await db_session.execute(sa.insert(_candidates), [{'url': url} for url in set(urls)])
+        query = (
+            sa.select(_candidates.c.url)
+            .where(~sa.exists().where(sm.col(Lead.resume_url) == _candidates.c.url))
+            .order_by(_candidates.c.url)
+        )
+        return list((await db_session.execute(query)).scalars().all())
@@ -0,0 +1,46 @@
+import abc
+import dataclasses
+from collections.abc import AsyncIterable, AsyncIterator, Callable
+
+
+@dataclasses.dataclass
+class BlobStream:
+    """A blob found by get_stream; its data is only read while an iter_range iterator is consumed."""
+
+    size: int
+    # Yields the blob bytes from start up to end (exclusive)
+    iter_range: Callable[[int, int], AsyncIterator[bytes]]
+
+
+async def iter_bytes_range(data: bytes, start: int, end: int, chunk_size: int = 256 * 1024) -> AsyncIterator[bytes]:
+    for offset in range(start, end, chunk_size):
+        yield data[offset : min(offset + chunk_size, end)]
+
+
+class BlobStorageBackend(abc.ABC):
+    """Storage behind BlobStorageService; URLs returned by upload are passed back to get and delete."""
+
+    async def start(self) -> None:
+        """Acquire resources such as network connections; called once on service startup."""
+
+    async def stop(self) -> None:
+        """Release resources acquired by start; called once on service shutdown."""
+
+    @abc.abstractmethod
+    async def upload(self, data: bytes) -> str: ...
+
+    @abc.abstractmethod
+    async def upload_stream(self, chunks: AsyncIterable[bytes]) -> str: ...
+
+    @abc.abstractmethod
+    async def delete(self, url: str) -> bool: ...
+
+    @abc.abstractmethod
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def get_stream(self, key: str) -> BlobStream | None:
+        """Backends that can read part of a blob override this; by default the whole blob is read into memory."""
+        data = await self.get(key)
+        if data is None:
+            return None
+        return BlobStream(size=len(data), iter_range=lambda start, end: iter_bytes_range(data, start, end))
@@ -0,0 +1,53 @@
+import collections
+import dataclasses
+
+
+@dataclasses.dataclass
+class BlobCacheStats:
+    hits: int = 0
+    misses: int = 0
+    bypasses: int = 0  # blobs too large to be cached
+    evictions: int = 0
+    hit_bytes: int = 0  # bytes served from the cache
+    size_bytes: int = 0  # bytes currently held
+
+
+class BlobCache:
+    """In-process LRU cache of blob data bounded by the total size of the cached blobs.
+
+    Blob keys are immutable (random or content-addressed), so entries never go stale and are only dropped by
+    eviction or by delete.
+    """
+
+    def __init__(self, max_bytes: int, max_item_size: int):
+        self._max_bytes = max_bytes
+        self._max_item_size = min(max_item_size, max_bytes)
+        self._items: collections.OrderedDict[str, bytes] = collections.OrderedDict()
+        self.stats = BlobCacheStats()
+
+    def get(self, key: str) -> bytes | None:
+        data = self._items.get(key)
+        if data is None:
+            self.stats.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.stats.hits += 1
+        self.stats.hit_bytes += len(data)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        if len(data) > self._max_item_size:
+            self.stats.bypasses += 1
+            return
+        self.pop(key)
+        self._items[key] = data
+        self.stats.size_bytes += len(data)
+        while self.stats.size_bytes > self._max_bytes:
+            _, evicted = self._items.popitem(last=False)
+            self.stats.size_bytes -= len(evicted)
+            self.stats.evictions += 1
+
+    def pop(self, key: str) -> None:
+        data = self._items.pop(key, None)
+        if data is not None:
+            self.stats.size_bytes -= len(data)
@@ -0,0 +1,71 @@
+import enum
+import logging
+import zlib
+from typing import Protocol
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is a regular dependency, gzip keeps working without it
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Formats that are compressed already and do not shrink any further: zip (also DOCX/XLSX/ODT), gzip, zstd, 7z,
+# PNG, JPEG and GIF
+_COMPRESSED_SIGNATURES = (
+    b'PK\x03\x04',
+    b'\x1f\x8b',
+    b'\x28\xb5\x2f\xfd',
+    b"7z\xbc\xaf'\x1c",
+    b'\x89PNG',
+    b'\xff\xd8\xff',
+    b'GIF8',
+)
+
+
+class BlobCodec(str, enum.Enum):
+    ZSTD = 'zstd'
+    GZIP = 'gzip'
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+
+class Decompressor(Protocol):
+    def decompress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+
+def get_codec(name: str) -> BlobCodec | None:
+    """Get the codec configured by BlobStorageSettings.compression_codec, falling back to gzip without zstandard."""
+    if name == 'none':
+        return None
+    if name == BlobCodec.ZSTD and zstandard is None:
+        logger.warning('zstandard is not installed, compressing blobs with gzip')
+        return BlobCodec.GZIP
+    return BlobCodec(name)
+
+
+def is_compressible(head: bytes) -> bool:
+    """Guess from the first bytes of a blob whether compressing it is worth the CPU."""
+    return not head.startswith(_COMPRESSED_SIGNATURES)
+
+
+def create_compressor(codec: BlobCodec, level: int) -> Compressor:
+    if codec == BlobCodec.ZSTD:
+        return zstandard.ZstdCompressor(level=level).compressobj()
+    # wbits=31 writes a gzip header and trailer
+    return zlib.compressobj(level, zlib.DEFLATED, 31)
+
+
+def create_decompressor(codec: BlobCodec) -> Decompressor:
+    if codec == BlobCodec.ZSTD:
+        return zstandard.ZstdDecompressor().decompressobj()
+    return zlib.decompressobj(31)
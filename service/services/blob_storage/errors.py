@@ -0,0 +1,10 @@
+class BlobStorageBaseError(Exception):
+    pass
+
+
+class BlobStorageTimeoutError(BlobStorageBaseError):
+    pass
+
+
+class BlobStorageUnavailableError(BlobStorageBaseError):
+    pass
@@ -0,0 +1,30 @@
+import random
+import string
+import uuid
+from collections.abc import AsyncIterable
+
+from service.services.blob_storage.base import BlobStorageBackend
+
+
+class FakeBlobStorageBackend(BlobStorageBackend):
+    """Stores nothing: upload fabricates a URL and get returns random bytes."""
+
+    async def upload(self, data: bytes) -> str:
+        # Generate a random URL string for demonstration
+        random_id = str(uuid.uuid4())
+        return f'https://blob-storage.example.com/{random_id}'
+
+    async def upload_stream(self, chunks: AsyncIterable[bytes]) -> str:
+        async for _ in chunks:
+            pass
+
+        random_id = str(uuid.uuid4())
+        return f'https://blob-storage.example.com/{random_id}'
+
+    async def delete(self, url: str) -> bool:
+        return bool(url)
+
+    async def get(self, key: str) -> bytes | None:
+        # Generate random bytes (simulating stored data)
+        random_size = random.randint(100, 1000)
+        return bytes(''.join(random.choices(string.ascii_letters + string.digits, k=random_size)), 'utf-8')
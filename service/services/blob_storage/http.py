@@ -0,0 +1,127 @@
+import re
+import uuid
+from collections.abc import AsyncIterable, AsyncIterator
+
+import httpx
+
+from service.services.blob_storage.base import BlobStorageBackend, BlobStream
+from service.settings import BlobStorageSettings
+
+_KEY_PATTERN = re.compile(r'[0-9a-f]{32,64}')
+
+
+class HttpBlobStorageBackend(BlobStorageBackend):
+    """Stores blobs in an HTTP object store: PUT, GET (with Range), HEAD and DELETE on {http_base_url}/{key}.
+
+    A single httpx.AsyncClient is shared by all calls, so connections are kept alive and reused between requests.
+    The client is created by start and closed by stop, which MainContainer calls on startup and shutdown.
+    """
+
+    def __init__(self, settings: BlobStorageSettings):
+        self._settings = settings
+        self._base_url = settings.http_base_url.rstrip('/')
+        self._client: httpx.AsyncClient | None = None
+
+    async def start(self) -> None:
+        if self._client is not None:
+            return
+
+        headers = {}
+        if self._settings.http_auth_token is not None:
+            headers['Authorization'] = f'Bearer {self._settings.http_auth_token.get_secret_value()}'
+        self._client = httpx.AsyncClient(
+            headers=headers,
+            limits=httpx.Limits(
+                max_connections=self._settings.http_max_connections,
+                max_keepalive_connections=self._settings.http_max_keepalive_connections,
+                keepalive_expiry=self._settings.http_keepalive_expiry,
+            ),
+            # Per-call and overall deadlines are enforced by ResilientBlobStorageBackend
+            timeout=httpx.Timeout(
+                self._settings.call_timeout,
+                connect=self._settings.http_connect_timeout,
+                pool=self._settings.http_pool_timeout,
+            ),
+        )
+
+    async def stop(self) -> None:
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            raise RuntimeError('HttpBlobStorageBackend is not started')
+        return self._client
+
+    def get_url(self, key: str) -> str:
+        return f'{self._base_url}/{key}'
+
+    def parse_key(self, url: str) -> str | None:
+        """Return the key of a URL returned by upload; a bare key is accepted as well."""
+        key = url.removeprefix(f'{self._base_url}/')
+        return key if _KEY_PATTERN.fullmatch(key) else None
+
+    async def upload(self, data: bytes) -> str:
+        # Objects are not reference counted by the store, so every upload gets its own random key: with content
+        # addressed keys, deleting one lead's blob would delete every other lead's identical blob
+        key = uuid.uuid4().hex
+        response = await self.client.put(self.get_url(key), content=data)
+        response.raise_for_status()
+        return self.get_url(key)
+
+    async def upload_stream(self, chunks: AsyncIterable[bytes]) -> str:
+        key = uuid.uuid4().hex
+        # An async iterable body is sent with chunked transfer encoding without being buffered
+        response = await self.client.put(self.get_url(key), content=chunks)
+        response.raise_for_status()
+        return self.get_url(key)
+
+    async def delete(self, url: str) -> bool:
+        if (key := self.parse_key(url)) is None:
+            return False
+
+        response = await self.client.delete(self.get_url(key))
+        if response.status_code == httpx.codes.NOT_FOUND:
+            return False
+        response.raise_for_status()
+        return True
+
+    async def get(self, key: str) -> bytes | None:
+        if (key := self.parse_key(key)) is None:
+            return None
+
+        response = await self.client.get(self.get_url(key))
+        if response.status_code == httpx.codes.NOT_FOUND:
+            return None
+        response.raise_for_status()
+        return response.content
+
+    async def _iter_range(self, key: str, start: int, end: int) -> AsyncIterator[bytes]:
+        if start >= end:
+            return
+
+        headers = {'Range': f'bytes={start}-{end - 1}'}
+        async with self.client.stream('GET', self.get_url(key), headers=headers) as response:
+            response.raise_for_status()
+            # A server that ignores Range sends the whole blob; skip up to start and stop at end
+            offset = start if response.status_code == httpx.codes.PARTIAL_CONTENT else 0
+            async for chunk in response.aiter_bytes(self._settings.read_chunk_size):
+                chunk_end = offset + len(chunk)
+                if chunk_end > start:
+                    yield chunk[max(start - offset, 0) : end - offset]
+                offset = chunk_end
+                if offset >= end:
+                    break
+
+    async def get_stream(self, key: str) -> BlobStream | None:
+        if (key := self.parse_key(key)) is None:
+            return None
+
+        response = await self.client.head(self.get_url(key))
+        if response.status_code == httpx.codes.NOT_FOUND:
+            return None
+        response.raise_for_status()
+        size = int(response.headers['Content-Length'])
+        return BlobStream(size=size, iter_range=lambda start, end: self._iter_range(key, start, end))
@@ -0,0 +1,557 @@
+import asyncio
+import contextlib
+import dataclasses
+import datetime as dt
+import fcntl
+import functools
+import hashlib
+import io
+import json
+import os
+import pathlib
+import re
+import time
+import uuid
+from collections.abc import AsyncIterable, AsyncIterator, Iterator
+from typing import BinaryIO
+
+from service.services.blob_storage.base import BlobStorageBackend, BlobStream
+from service.services.blob_storage.compression import (
+    BlobCodec,
+    Compressor,
+    create_compressor,
+    create_decompressor,
+    get_codec,
+    is_compressible,
+)
+from service.services.blob_storage.packs import PackCompactionStats, PackEntry, PackStore
+from service.settings import BlobStorageSettings
+
+LOCAL_BLOB_URL_PREFIX = 'local://'
+
+_KEY_PATTERN = re.compile(r'[0-9a-f]{32,64}')
+
+
+@dataclasses.dataclass
+class BlobMetadata:
+    refs: int = 1
+    codec: BlobCodec | None = None
+    size: int | None = None  # uncompressed size, None for blobs stored before metadata was recorded
+
+
+@dataclasses.dataclass
+class BlobInfo:
+    """A stored blob as listed by list_blobs."""
+
+    key: str
+    url: str
+    stored_size: int
+    updated_at: dt.datetime  # when the blob was stored or its reference count last changed
+
+
+class _BlobWriter:
+    """Hashes a blob and writes it to a temporary file, compressed if it is large and compressible enough.
+
+    The decision is made once the first compression_min_size bytes have been seen, so the blob is never buffered
+    beyond that. Used from worker threads only.
+    """
+
+    def __init__(self, temp_file: BinaryIO, codec: BlobCodec | None, settings: BlobStorageSettings):
+        self._temp_file = temp_file
+        self._settings = settings
+        self._digest = hashlib.sha256()
+        self._head = bytearray()
+        self._is_started = False
+        self._compressor: Compressor | None = None
+        self._available_codec = codec
+        self.codec: BlobCodec | None = None
+        self.size = 0
+
+    def _start(self) -> None:
+        if (
+            self._available_codec is not None
+            and len(self._head) >= self._settings.compression_min_size
+            and is_compressible(bytes(self._head[:16]))
+        ):
+            self.codec = self._available_codec
+            self._compressor = create_compressor(self.codec, self._settings.compression_level)
+        self._is_started = True
+        head, self._head = bytes(self._head), bytearray()
+        self._write(head)
+
+    def _write(self, data: bytes) -> None:
+        if self._compressor is not None:
+            data = self._compressor.compress(data)
+        if data:
+            self._temp_file.write(data)
+
+    def write(self, chunk: bytes) -> None:
+        self._digest.update(chunk)
+        self.size += len(chunk)
+        if self._is_started:
+            self._write(chunk)
+            return
+        self._head += chunk
+        if len(self._head) >= self._settings.compression_min_size:
+            self._start()
+
+    def finish(self) -> str:
+        """Write whatever is buffered and return the blob key."""
+        if not self._is_started:
+            self._start()
+        if self._compressor is not None:
+            self._temp_file.write(self._compressor.flush())
+        return self._digest.hexdigest()
+
+
+class LocalBlobStorageBackend(BlobStorageBackend):
+    """Blobs stored as files under BlobStorageSettings.local_dir.
+
+    Blobs are content-addressed: the key is the SHA-256 digest of the data, computed while the data is written.
+    Uploading data that is already stored skips the write and increments the reference count kept in the
+    ``<key>.meta`` file next to the blob; delete only removes the blob when the last reference is gone.
+    Reference counts are changed under an flock on the shard directory, so the web app and the scheduler can share
+    the same directory.
+
+    Blobs of at least compression_min_size bytes that do not look compressed already are compressed while they
+    are written. The codec is recorded in the metadata and get decompresses transparently.
+
+    A blob is written to a temporary file, fsynced and renamed into place, so readers never see a partial blob.
+    Blobs are spread over hash-sharded directories (``ab/cd/abcd...``) to keep each directory small.
+
+    compact moves small and aged blobs out of their own files into append-only pack segments under ``.packs``
+    (see PackStore), which keeps the number of files bounded; a blob is looked up in the packs when it has no file.
+    All file I/O runs in worker threads.
+    """
+
+    def __init__(self, settings: BlobStorageSettings):
+        self._settings = settings
+        self._root = pathlib.Path(settings.local_dir)
+        # Inside the root so the final rename never crosses filesystems
+        self._tmp_dir = self._root / '.tmp'
+        self._codec = get_codec(settings.compression_codec)
+        self._packs = PackStore(self._root / '.packs', settings.pack_segment_size)
+
+    def get_path(self, key: str) -> pathlib.Path:
+        shards = [key[i * 2 : i * 2 + 2] for i in range(self._settings.local_shard_depth)]
+        return self._root.joinpath(*shards, key)
+
+    @staticmethod
+    def get_url(key: str) -> str:
+        return f'{LOCAL_BLOB_URL_PREFIX}{key}'
+
+    @staticmethod
+    def parse_key(url: str) -> str | None:
+        """Get the blob key from a URL returned by upload, None if it is not a valid local blob URL."""
+        key = url.removeprefix(LOCAL_BLOB_URL_PREFIX)
+        # Keys are plain hex, which also rules out path traversal
+        return key if _KEY_PATTERN.fullmatch(key) else None
+
+    def _open_temp(self) -> tuple[pathlib.Path, BinaryIO]:
+        self._tmp_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = self._tmp_dir / uuid.uuid4().hex
+        return temp_path, temp_path.open('xb')
+
+    def _get_metadata_path(self, key: str) -> pathlib.Path:
+        return self.get_path(key).with_name(f'{key}.meta')
+
+    @contextlib.contextmanager
+    def _lock_shard(self, key: str) -> Iterator[None]:
+        lock_path = self.get_path(key).with_name('.lock')
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with lock_path.open('ab') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_metadata(self, key: str) -> BlobMetadata:
+        try:
+            data = json.loads(self._get_metadata_path(key).read_bytes())
+        except FileNotFoundError:
+            # Blobs stored before metadata was recorded are uncompressed and have a single reference
+            return BlobMetadata()
+        codec = data.get('codec')
+        return BlobMetadata(refs=data['refs'], codec=BlobCodec(codec) if codec else None, size=data.get('size'))
+
+    def _write_metadata(self, key: str, metadata: BlobMetadata) -> None:
+        metadata_path = self._get_metadata_path(key)
+        temp_metadata_path = metadata_path.with_name(f'{metadata_path.name}.tmp')
+        temp_metadata_path.write_text(json.dumps(dataclasses.asdict(metadata)))
+        os.replace(temp_metadata_path, metadata_path)
+
+    def _add_ref(self, key: str) -> None:
+        """Must be called under the shard lock."""
+        metadata = self._read_metadata(key)
+        metadata.refs += 1
+        self._write_metadata(key, metadata)
+
+    def _add_ref_if_exists(self, key: str) -> bool:
+        with self._lock_shard(key):
+            if not self.get_path(key).exists():
+                return self._packs.change_refs(key, 1)
+            self._add_ref(key)
+            return True
+
+    def _commit_temp(self, temp_path: pathlib.Path, temp_file: BinaryIO, key: str, writer: _BlobWriter) -> None:
+        path = self.get_path(key)
+        temp_file.flush()
+        # A temporary file that duplicates a stored blob is thrown away, so it is not worth an fsync
+        is_synced = not path.exists()
+        if is_synced:
+            os.fsync(temp_file.fileno())
+        with self._lock_shard(key):
+            if path.exists():
+                temp_file.close()
+                temp_path.unlink()
+                self._add_ref(key)
+            elif self._packs.change_refs(key, 1):
+                temp_file.close()
+                temp_path.unlink()
+            else:
+                if not is_synced:
+                    # The stored blob was deleted in the meantime
+                    os.fsync(temp_file.fileno())
+                temp_file.close()
+                # Metadata goes first, so a reader never finds the blob without its codec
+                self._write_metadata(key, BlobMetadata(refs=1, codec=writer.codec, size=writer.size))
+                os.replace(temp_path, path)
+
+    @staticmethod
+    def _discard_temp(temp_path: pathlib.Path, temp_file: BinaryIO) -> None:
+        temp_file.close()
+        temp_path.unlink(missing_ok=True)
+
+    def _write_bytes(self, data: bytes) -> str:
+        key = hashlib.sha256(data).hexdigest()
+        if self._add_ref_if_exists(key):
+            return key
+
+        temp_path, temp_file = self._open_temp()
+        try:
+            writer = _BlobWriter(temp_file, self._codec, self._settings)
+            writer.write(data)
+            writer.finish()
+            self._commit_temp(temp_path, temp_file, key, writer)
+        except BaseException:
+            self._discard_temp(temp_path, temp_file)
+            raise
+        return key
+
+    async def upload(self, data: bytes) -> str:
+        key = await asyncio.to_thread(self._write_bytes, data)
+        return self.get_url(key)
+
+    async def upload_stream(self, chunks: AsyncIterable[bytes]) -> str:
+        temp_path, temp_file = await asyncio.to_thread(self._open_temp)
+        try:
+            writer = _BlobWriter(temp_file, self._codec, self._settings)
+            async for chunk in chunks:
+                await asyncio.to_thread(writer.write, chunk)
+            key = await asyncio.to_thread(writer.finish)
+            await asyncio.to_thread(self._commit_temp, temp_path, temp_file, key, writer)
+        except BaseException:
+            await asyncio.to_thread(self._discard_temp, temp_path, temp_file)
+            raise
+        return self.get_url(key)
+
+    def _delete(self, key: str) -> bool:
+        with self._lock_shard(key):
+            path = self.get_path(key)
+            if not path.exists():
+                return self._packs.change_refs(key, -1)
+            metadata = self._read_metadata(key)
+            if metadata.refs > 1:
+                metadata.refs -= 1
+                self._write_metadata(key, metadata)
+                return True
+            path.unlink()
+            self._get_metadata_path(key).unlink(missing_ok=True)
+            return True
+
+    async def delete(self, url: str) -> bool:
+        key = self.parse_key(url)
+        if key is None:
+            return False
+        return await asyncio.to_thread(self._delete, key)
+
+    def _read(self, key: str) -> bytes | None:
+        metadata = self._read_metadata(key)
+        try:
+            blob_file = self.get_path(key).open('rb', buffering=0)
+        except FileNotFoundError:
+            return self._read_packed(key)
+        with blob_file:
+            # get returns the whole blob, so it is read in one call; get_stream reads large blobs in chunks instead
+            data = blob_file.readall()
+        if metadata.codec is None:
+            return data
+        decompressor = create_decompressor(metadata.codec)
+        return decompressor.decompress(data) + decompressor.flush()
+
+    def _read_packed(self, key: str) -> bytes | None:
+        packed = self._packs.read_blob(key)
+        if packed is None:
+            return None
+        entry, data = packed
+        if entry.codec is None:
+            return data
+        decompressor = create_decompressor(entry.codec)
+        return decompressor.decompress(data) + decompressor.flush()
+
+    async def get(self, key: str) -> bytes | None:
+        blob_key = self.parse_key(key)
+        if blob_key is None:
+            return None
+        return await asyncio.to_thread(self._read, blob_key)
+
+    def _stat(self, key: str) -> tuple[BlobMetadata, int, PackEntry | None] | None:
+        metadata = self._read_metadata(key)
+        try:
+            stored_size = self.get_path(key).stat().st_size
+        except FileNotFoundError:
+            entry = self._packs.get(key)
+            if entry is None:
+                return None
+            return BlobMetadata(refs=entry.refs, codec=entry.codec, size=entry.size), entry.length, entry
+        return metadata, stored_size, None
+
+    async def _iter_range(
+        self, key: str, entry: PackEntry | None, stored_size: int, codec: BlobCodec | None, start: int, end: int
+    ) -> AsyncIterator[bytes]:
+        chunk_size = self._settings.read_chunk_size
+        if entry is not None:
+            path, base_offset = self._packs.get_segment_path(entry.segment), entry.offset
+        else:
+            path, base_offset = self.get_path(key), 0
+        blob_file = await asyncio.to_thread(io.FileIO, path, 'rb')
+        try:
+            if codec is None:
+                offset = start
+                while offset < end:
+                    chunk = await asyncio.to_thread(
+                        os.pread, blob_file.fileno(), min(chunk_size, end - offset), base_offset + offset
+                    )
+                    if not chunk:
+                        break
+                    offset += len(chunk)
+                    yield chunk
+                return
+
+            # Compressed blobs can only be read from the start; data before the range is decompressed and dropped
+            decompressor = create_decompressor(codec)
+            position = 0
+            stored_offset = 0
+            while position < end and stored_offset < stored_size:
+                compressed = await asyncio.to_thread(
+                    os.pread,
+                    blob_file.fileno(),
+                    min(chunk_size, stored_size - stored_offset),
+                    base_offset + stored_offset,
+                )
+                if not compressed:
+                    break
+                stored_offset += len(compressed)
+                data = await asyncio.to_thread(decompressor.decompress, compressed)
+                chunk = data[max(start - position, 0) : max(end - position, 0)]
+                position += len(data)
+                if chunk:
+                    yield chunk
+        finally:
+            await asyncio.to_thread(blob_file.close)
+
+    async def get_stream(self, key: str) -> BlobStream | None:
+        blob_key = self.parse_key(key)
+        if blob_key is None:
+            return None
+        stat = await asyncio.to_thread(self._stat, blob_key)
+        if stat is None:
+            return None
+        metadata, stored_size, entry = stat
+        size = stored_size if metadata.codec is None else metadata.size
+        return BlobStream(
+            size=size, iter_range=functools.partial(self._iter_range, blob_key, entry, stored_size, metadata.codec)
+        )
+
+    def _get_metadata(self, key: str) -> BlobMetadata | None:
+        if self.get_path(key).exists():
+            return self._read_metadata(key)
+        entry = self._packs.get(key)
+        if entry is None:
+            return None
+        return BlobMetadata(refs=entry.refs, codec=entry.codec, size=entry.size)
+
+    async def get_metadata(self, url: str) -> BlobMetadata | None:
+        """Get the reference count, codec and uncompressed size of a blob, None if it does not exist."""
+        key = self.parse_key(url)
+        if key is None:
+            return None
+        return await asyncio.to_thread(self._get_metadata, key)
+
+    def _get_updated_at(self, key: str) -> float:
+        """Unix time a blob file was stored or its reference count last changed, which rewrites its metadata."""
+        try:
+            return self._get_metadata_path(key).stat().st_mtime
+        except FileNotFoundError:
+            return self.get_path(key).stat().st_mtime
+
+    def _iter_blob_keys(self, directory: pathlib.Path, depth: int, after: str, is_bounded: bool) -> Iterator[str]:
+        """Yield keys of blob files greater than after, in key order, skipping shards that only hold smaller ones."""
+        try:
+            names = sorted(os.listdir(directory))
+        except FileNotFoundError:
+            return
+        if depth == self._settings.local_shard_depth:
+            yield from (name for name in names if name > after and _KEY_PATTERN.fullmatch(name))
+            return
+
+        lower = after[depth * 2 : depth * 2 + 2] if is_bounded else ''
+        for name in names:
+            # Shard directories are two hex digits, which leaves out .tmp and .packs
+            if len(name) == 2 and not name.startswith('.') and name >= lower:
+                yield from self._iter_blob_keys(directory / name, depth + 1, after, is_bounded and name == lower)
+
+    def _list_blobs(self, after: str, limit: int) -> list[BlobInfo]:
+        blobs = {}
+        for key in self._iter_blob_keys(self._root, 0, after, is_bounded=True):
+            try:
+                stored_size = self.get_path(key).stat().st_size
+                updated_at = self._get_updated_at(key)
+            except FileNotFoundError:
+                continue
+            blobs[key] = (stored_size, updated_at)
+            if len(blobs) >= limit:
+                break
+        for key, entry in self._packs.list_entries(after, limit):
+            # A blob being packed has a file and an index record for a moment; the file is what counts
+            blobs.setdefault(key, (entry.length, entry.updated_at or 0.0))
+
+        return [
+            BlobInfo(
+                key=key,
+                url=self.get_url(key),
+                stored_size=stored_size,
+                updated_at=dt.datetime.fromtimestamp(updated_at, dt.UTC),
+            )
+            for key, (stored_size, updated_at) in sorted(blobs.items())[:limit]
+        ]
+
+    async def list_blobs(self, after: str | None, limit: int) -> list[BlobInfo]:
+        """Get up to limit blobs, files and packed ones, with keys greater than after, in key order.
+
+        Listing from the last key returned walks all blobs, one page per call, without keeping anything between calls.
+        """
+        return await asyncio.to_thread(self._list_blobs, after or '', limit)
+
+    def _delete_orphan(self, key: str, updated_before: float) -> bool:
+        with self._lock_shard(key):
+            path = self.get_path(key)
+            if not path.exists():
+                return self._packs.remove(key, updated_before)
+            if self._get_updated_at(key) >= updated_before:
+                return False
+            path.unlink()
+            self._get_metadata_path(key).unlink(missing_ok=True)
+            return True
+
+    async def delete_orphan(self, url: str, updated_before: dt.datetime) -> bool:
+        """Delete a blob with all its references, unless it was stored or referenced again at or after updated_before.
+
+        An upload of data that is already stored adds a reference and so keeps the blob, even if the lead it was
+        uploaded for has not been committed yet.
+
+        Returns:
+            True if the blob was deleted
+        """
+        key = self.parse_key(url)
+        if key is None:
+            return False
+        return await asyncio.to_thread(self._delete_orphan, key, updated_before.timestamp())
+
+    def _find_blobs_to_pack(self) -> list[tuple[str, pathlib.Path]]:
+        now = time.time()
+        blobs = []
+        for directory, subdirectories, file_names in os.walk(self._root):
+            # Skips .tmp and .packs
+            subdirectories[:] = sorted(name for name in subdirectories if not name.startswith('.'))
+            for name in file_names:
+                if not _KEY_PATTERN.fullmatch(name):
+                    continue
+                path = pathlib.Path(directory, name)
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                age = now - stat.st_mtime
+                is_small = stat.st_size <= self._settings.pack_small_blob_size
+                if (is_small and age >= self._settings.pack_min_age) or age >= self._settings.pack_aged_blob_age:
+                    blobs.append((name, path))
+                    if len(blobs) >= self._settings.pack_max_blobs_per_run:
+                        return blobs
+        return blobs
+
+    def _pack_blob(self, key: str, segment: int, offset: int, length: int) -> bool:
+        """Index a blob appended to a segment and remove its file, unless it was deleted in the meantime."""
+        with self._lock_shard(key):
+            try:
+                stored_size = self.get_path(key).stat().st_size
+            except FileNotFoundError:
+                return False
+            if stored_size != length:
+                # Deleted and stored again with other settings, e.g. another codec; it is packed by a later run
+                return False
+            # The reference count is read under the shard lock, so no upload or delete of the blob is lost
+            metadata = self._read_metadata(key)
+            entry = PackEntry(
+                segment=segment,
+                offset=offset,
+                length=length,
+                codec=metadata.codec,
+                size=metadata.size,
+                refs=metadata.refs,
+                updated_at=self._get_updated_at(key),
+            )
+            self._packs.add(key, entry)
+            self.get_path(key).unlink()
+            self._get_metadata_path(key).unlink(missing_ok=True)
+            return True
+
+    def _compact(self) -> PackCompactionStats | None:
+        with self._packs.open_writer() as writer:
+            if writer is None:
+                return None
+
+            stats = PackCompactionStats()
+            locations = {}
+            for key, path in self._find_blobs_to_pack():
+                try:
+                    blob_file = path.open('rb')
+                except FileNotFoundError:
+                    continue
+                with blob_file:
+                    length = os.fstat(blob_file.fileno()).st_size
+                    locations[key] = (*writer.append(blob_file, length), length)
+            # Blob files are only removed once their copies are durable
+            writer.sync()
+            for key, (segment, offset, length) in locations.items():
+                if self._pack_blob(key, segment, offset, length):
+                    stats.packed_blobs += 1
+                    stats.packed_bytes += length
+
+            for segment in self._packs.find_sparse_segments(self._settings.pack_max_dead_ratio, exclude=writer.segment):
+                stats.reclaimed_bytes += self._packs.rewrite_segment(writer, segment)
+                stats.rewritten_segments += 1
+            self._packs.rewrite_index()
+            return stats
+
+    async def compact(self) -> PackCompactionStats | None:
+        """Move small and aged blobs into pack segments and rewrite segments taken up mostly by deleted blobs.
+
+        Blobs stay readable throughout. Runs in a single worker thread, so it belongs to a background job rather
+        than a request.
+
+        Returns:
+            What was packed and reclaimed, None if another process is compacting
+        """
+        return await asyncio.to_thread(self._compact)
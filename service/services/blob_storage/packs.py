@@ -0,0 +1,377 @@
+import bisect
+import collections
+import contextlib
+import dataclasses
+import fcntl
+import json
+import os
+import pathlib
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any, BinaryIO
+
+from service.services.blob_storage.compression import BlobCodec
+
+_COPY_CHUNK_SIZE = 1024 * 1024
+# The index is only rewritten once it holds this many outdated records and more outdated than live ones
+_INDEX_REWRITE_MIN_RECORDS = 1000
+
+
+@dataclasses.dataclass(frozen=True)
+class PackEntry:
+    """A packed blob: length stored bytes at offset in a segment file."""
+
+    segment: int
+    offset: int
+    length: int
+    codec: BlobCodec | None
+    size: int | None  # uncompressed size, None for blobs stored before metadata was recorded
+    refs: int
+    updated_at: float | None = None  # unix time the blob was stored or its reference count last changed
+
+
+@dataclasses.dataclass
+class PackCompactionStats:
+    packed_blobs: int = 0
+    packed_bytes: int = 0  # stored bytes moved from blob files into segments
+    rewritten_segments: int = 0
+    reclaimed_bytes: int = 0  # bytes of deleted blobs freed by rewriting segments
+
+
+def _fsync_directory(path: pathlib.Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class PackWriter:
+    """Appends blobs to the newest segment, starting a new segment once it reaches segment_size.
+
+    Created by PackStore.open_writer for a single compaction run; appended bytes are only durable after sync.
+    """
+
+    def __init__(self, store: 'PackStore', segment_size: int):
+        self._store = store
+        self._segment_size = segment_size
+        self._file: BinaryIO | None = None
+        segments = store.list_segments()
+        newest = segments[-1] if segments else 0
+        if not segments or store.get_segment_path(newest).stat().st_size >= segment_size:
+            newest += 1
+        self.segment = newest
+        self._open(newest)
+
+    def _open(self, segment: int) -> None:
+        path = self._store.get_segment_path(segment)
+        self._file = path.open('ab')
+        _fsync_directory(path.parent)
+        self.segment = segment
+
+    def append(self, source: BinaryIO, length: int) -> tuple[int, int]:
+        """Copy length bytes from the current position of source and return the segment and offset they start at."""
+        if self._file.tell() >= self._segment_size:
+            self.sync()
+            self._file.close()
+            self._open(self.segment + 1)
+
+        offset = self._file.tell()
+        remaining = length
+        while remaining:
+            chunk = source.read(min(_COPY_CHUNK_SIZE, remaining))
+            if not chunk:
+                raise EOFError(f'Blob ended {remaining} bytes early')
+            self._file.write(chunk)
+            remaining -= len(chunk)
+        return self.segment, offset
+
+    def sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class PackStore:
+    """Append-only pack segments with an offset index, shared by processes through flocks.
+
+    Segment files (``segment-00000001.pack``) only grow: a blob is packed by appending its stored bytes to the
+    newest segment, syncing it and then appending an index record with the segment, offset and length. Reading a
+    packed blob is a single positioned read.
+
+    The index is a log of JSON lines, one per packed blob or reference count change. Each process replays it into
+    memory and re-reads it from the last replayed position when it grows, so blobs packed or deleted by other
+    processes are seen on the next lookup. Index records are appended under ``lock``; callers holding a shard lock
+    of the local backend must take it first.
+
+    Space of deleted blobs is reclaimed by rewriting a sealed segment: its live blobs are appended to the newest
+    segment, indexed at their new location and the old file is removed. The index itself is replaced by one record
+    per live blob once most of its records are outdated. Used from worker threads only.
+    """
+
+    def __init__(self, root: pathlib.Path, segment_size: int):
+        self._root = root
+        self._segment_size = segment_size
+        self._index_path = root / 'index'
+        self._state_lock = threading.Lock()
+        self._entries: dict[str, PackEntry] = {}
+        self._index_id: tuple[int, int] | None = None  # device and inode of the replayed index file
+        self._index_position = 0  # bytes of complete records replayed
+        self._index_records = 0
+        self._sorted_keys: list[str] | None = None  # built on demand for listing; may hold deleted keys
+
+    def get_segment_path(self, segment: int) -> pathlib.Path:
+        return self._root / f'segment-{segment:08d}.pack'
+
+    def list_segments(self) -> list[int]:
+        return sorted(int(path.stem.removeprefix('segment-')) for path in self._root.glob('segment-*.pack'))
+
+    @contextlib.contextmanager
+    def _flock(self, name: str, blocking: bool = True) -> Iterator[bool]:
+        self._root.mkdir(parents=True, exist_ok=True)
+        with (self._root / name).open('ab') as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @contextlib.contextmanager
+    def lock(self) -> Iterator[None]:
+        """Lock the index for writing, across processes."""
+        with self._flock('.lock'):
+            yield
+
+    @contextlib.contextmanager
+    def open_writer(self) -> Iterator[PackWriter | None]:
+        """Start a compaction run; yields None while another process is compacting.
+
+        Only one writer exists at a time, so a segment older than the writer's segment is never appended to again.
+        """
+        with self._flock('.compaction.lock', blocking=False) as is_locked:
+            if not is_locked:
+                yield None
+                return
+            writer = PackWriter(self, self._segment_size)
+            try:
+                yield writer
+            finally:
+                writer.close()
+
+    def _reset(self, index_id: tuple[int, int] | None) -> None:
+        self._entries.clear()
+        self._index_id = index_id
+        self._index_position = 0
+        self._index_records = 0
+        self._sorted_keys = None
+
+    def _apply(self, record: dict[str, Any]) -> None:
+        self._index_records += 1
+        key = record['key']
+        if 'segment' in record:
+            codec = record['codec']
+            entry = PackEntry(
+                segment=record['segment'],
+                offset=record['offset'],
+                length=record['length'],
+                codec=BlobCodec(codec) if codec else None,
+                size=record['size'],
+                refs=record['refs'],
+                updated_at=record.get('updated_at'),
+            )
+        elif (current := self._entries.get(key)) is not None:
+            entry = dataclasses.replace(current, refs=record['refs'], updated_at=record.get('updated_at'))
+        else:
+            return
+        if entry.refs > 0:
+            if key not in self._entries:
+                self._sorted_keys = None
+            self._entries[key] = entry
+        else:
+            self._entries.pop(key, None)
+
+    def _refresh(self) -> None:
+        """Replay index records written since the last refresh; must be called under _state_lock."""
+        try:
+            stat = self._index_path.stat()
+        except FileNotFoundError:
+            self._reset(None)
+            return
+        if (stat.st_dev, stat.st_ino) == self._index_id and stat.st_size == self._index_position:
+            return
+
+        try:
+            index_file = self._index_path.open('rb')
+        except FileNotFoundError:
+            self._reset(None)
+            return
+        with index_file:
+            stat = os.fstat(index_file.fileno())
+            if (stat.st_dev, stat.st_ino) != self._index_id:
+                # The index was replaced, it is replayed from the start
+                self._reset((stat.st_dev, stat.st_ino))
+            index_file.seek(self._index_position)
+            data = index_file.read(stat.st_size - self._index_position)
+        # A record only counts once its line is complete; a line torn by a crashed writer is cut off by the next one
+        data = data[: data.rfind(b'\n') + 1]
+        for line in data.splitlines():
+            self._apply(json.loads(line))
+        self._index_position += len(data)
+
+    def _append_records(self, records: list[dict[str, Any]], sync: bool) -> None:
+        """Must be called under lock and _state_lock, right after _refresh."""
+        is_new = self._index_id is None
+        with self._index_path.open('ab') as index_file:
+            index_file.truncate(self._index_position)
+            index_file.write(b''.join(json.dumps(record).encode() + b'\n' for record in records))
+            index_file.flush()
+            if sync:
+                os.fsync(index_file.fileno())
+            stat = os.fstat(index_file.fileno())
+        if is_new:
+            _fsync_directory(self._root)
+            self._index_id = (stat.st_dev, stat.st_ino)
+        for record in records:
+            self._apply(record)
+        self._index_position = stat.st_size
+
+    @staticmethod
+    def _get_put_record(key: str, entry: PackEntry) -> dict[str, Any]:
+        record = dataclasses.asdict(entry)
+        record['key'] = key
+        return record
+
+    def get(self, key: str) -> PackEntry | None:
+        with self._state_lock:
+            self._refresh()
+            return self._entries.get(key)
+
+    def read(self, entry: PackEntry, offset: int = 0, length: int | None = None) -> bytes:
+        """Read the stored bytes of a packed blob, or length of them from offset, with a single positioned read."""
+        fd = os.open(self.get_segment_path(entry.segment), os.O_RDONLY)
+        try:
+            return os.pread(fd, entry.length - offset if length is None else length, entry.offset + offset)
+        finally:
+            os.close(fd)
+
+    def read_blob(self, key: str) -> tuple[PackEntry, bytes] | None:
+        """Get a packed blob and its stored bytes, None if it is not packed."""
+        entry = self.get(key)
+        if entry is None:
+            return None
+        try:
+            return entry, self.read(entry)
+        except FileNotFoundError:
+            # The segment has just been rewritten, the blob is found at its new location
+            entry = self.get(key)
+            return (entry, self.read(entry)) if entry is not None else None
+
+    def add(self, key: str, entry: PackEntry) -> None:
+        """Index a blob whose bytes have been appended and synced by a PackWriter."""
+        with self.lock(), self._state_lock:
+            self._refresh()
+            self._append_records([self._get_put_record(key, entry)], sync=True)
+
+    def change_refs(self, key: str, delta: int) -> bool:
+        """Change the reference count of a packed blob, False if it is not packed; at zero the blob is deleted."""
+        with self.lock(), self._state_lock:
+            self._refresh()
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            self._append_records([{'key': key, 'refs': entry.refs + delta, 'updated_at': time.time()}], sync=False)
+            return True
+
+    def remove(self, key: str, updated_before: float) -> bool:
+        """Delete a packed blob with all its references unless they changed at or after updated_before."""
+        with self.lock(), self._state_lock:
+            self._refresh()
+            entry = self._entries.get(key)
+            if entry is None or (entry.updated_at or 0.0) >= updated_before:
+                return False
+            self._append_records([{'key': key, 'refs': 0, 'updated_at': time.time()}], sync=False)
+            return True
+
+    def list_entries(self, after: str, limit: int) -> list[tuple[str, PackEntry]]:
+        """Get up to limit packed blobs with keys greater than after, in key order."""
+        with self._state_lock:
+            self._refresh()
+            if self._sorted_keys is None:
+                self._sorted_keys = sorted(self._entries)
+            entries = []
+            for index in range(bisect.bisect_right(self._sorted_keys, after), len(self._sorted_keys)):
+                key = self._sorted_keys[index]
+                if (entry := self._entries.get(key)) is not None:
+                    entries.append((key, entry))
+                    if len(entries) >= limit:
+                        break
+            return entries
+
+    def find_sparse_segments(self, max_dead_ratio: float, exclude: int) -> list[int]:
+        """Get segments where deleted blobs take more than max_dead_ratio of the file."""
+        with self._state_lock:
+            self._refresh()
+            live_bytes = collections.Counter()
+            for entry in self._entries.values():
+                live_bytes[entry.segment] += entry.length
+        segments = []
+        for segment in self.list_segments():
+            size = self.get_segment_path(segment).stat().st_size
+            if segment != exclude and size and (size - live_bytes[segment]) / size > max_dead_ratio:
+                segments.append(segment)
+        return segments
+
+    def rewrite_segment(self, writer: PackWriter, segment: int) -> int:
+        """Move the live blobs of a segment to the writer's segment, remove the file and return the bytes freed."""
+        with self._state_lock:
+            self._refresh()
+            entries = {key: entry for key, entry in self._entries.items() if entry.segment == segment}
+
+        path = self.get_segment_path(segment)
+        locations = {}
+        with path.open('rb') as segment_file:
+            for key, entry in entries.items():
+                segment_file.seek(entry.offset)
+                locations[key] = writer.append(segment_file, entry.length)
+        writer.sync()
+
+        with self.lock(), self._state_lock:
+            self._refresh()
+            records = []
+            for key, (new_segment, offset) in locations.items():
+                entry = self._entries.get(key)
+                # Blobs deleted in the meantime are left behind
+                if entry is not None and entry.segment == segment:
+                    moved = dataclasses.replace(entry, segment=new_segment, offset=offset)
+                    records.append(self._get_put_record(key, moved))
+            if records:
+                self._append_records(records, sync=True)
+            size = path.stat().st_size
+            path.unlink()
+        return size - sum(entry.length for entry in entries.values())
+
+    def rewrite_index(self) -> bool:
+        """Replace the index with one record per live blob if most of its records are outdated."""
+        with self.lock(), self._state_lock:
+            self._refresh()
+            outdated = self._index_records - len(self._entries)
+            if outdated < max(len(self._entries), _INDEX_REWRITE_MIN_RECORDS):
+                return False
+
+            temp_path = self._index_path.with_name('index.tmp')
+            with temp_path.open('wb') as temp_file:
+                for key, entry in self._entries.items():
+                    temp_file.write(json.dumps(self._get_put_record(key, entry)).encode() + b'\n')
+                temp_file.flush()
+                os.fsync(temp_file.fileno())
+            os.replace(temp_path, self._index_path)
+            _fsync_directory(self._root)
+            self._refresh()
+            return True
@@ -0,0 +1,270 @@
+import asyncio
+import contextlib
+import dataclasses
+import enum
+import logging
+import random
+import time
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable
+from typing import TypeVar
+
+from service.services.blob_storage.base import BlobStorageBackend, BlobStream
+from service.services.blob_storage.errors import BlobStorageTimeoutError, BlobStorageUnavailableError
+from service.settings import BlobStorageSettings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+@dataclasses.dataclass
+class BlobStorageMetrics:
+    calls: int = 0
+    failures: int = 0  # calls that failed after all attempts
+    timeouts: int = 0  # attempts cut off by call_timeout or the deadline
+    retries: int = 0
+    hedged_reads: int = 0  # duplicate reads started after the hedge delay
+    hedge_wins: int = 0  # reads answered by the duplicate
+    circuit_opened: int = 0
+    circuit_rejections: int = 0  # calls failed fast while the circuit was open
+
+
+class CircuitState(str, enum.Enum):
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class CircuitBreaker:
+    """Opens after failure_threshold consecutive failures and lets a single trial call through after reset_timeout."""
+
+    def __init__(self, failure_threshold: int, reset_timeout: float, clock: Callable[[], float] = time.monotonic):
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at = 0.0
+        self._is_trial_running = False
+        self.state = CircuitState.CLOSED
+
+    def allow(self) -> bool:
+        if self.state == CircuitState.CLOSED:
+            return True
+        if self.state == CircuitState.OPEN and self._clock() - self._opened_at >= self._reset_timeout:
+            self.state = CircuitState.HALF_OPEN
+        if self.state == CircuitState.HALF_OPEN and not self._is_trial_running:
+            self._is_trial_running = True
+            return True
+        return False
+
+    def release_trial(self) -> None:
+        """Free the trial slot of a call that ended without an outcome, such as a cancelled one."""
+        self._is_trial_running = False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._is_trial_running = False
+        self.state = CircuitState.CLOSED
+
+    def record_failure(self) -> bool:
+        """Count a failed call and return True if it opened the circuit."""
+        self._failures += 1
+        self._is_trial_running = False
+        if self.state == CircuitState.HALF_OPEN or self._failures >= self._failure_threshold:
+            was_open = self.state == CircuitState.OPEN
+            self.state = CircuitState.OPEN
+            self._opened_at = self._clock()
+            return not was_open
+        return False
+
+
+class _InputStream:
+    """Chunks passed to upload_stream, remembering whether a failure came from the input rather than the store."""
+
+    def __init__(self, chunks: AsyncIterable[bytes]):
+        self._chunks = aiter(chunks)
+        self._is_waiting = False
+        self._has_failed = False
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        return self
+
+    async def __anext__(self) -> bytes:
+        self._is_waiting = True
+        try:
+            chunk = await anext(self._chunks)
+        except StopAsyncIteration:
+            self._is_waiting = False
+            raise
+        except Exception:
+            self._has_failed = True
+            raise
+        self._is_waiting = False
+        return chunk
+
+    def is_input_error(self, error: BaseException) -> bool:
+        # A timeout that fired while waiting for the next chunk was caused by a slow client, not by the store
+        return self._has_failed or (self._is_waiting and isinstance(error, BlobStorageTimeoutError))
+
+
+class ResilientBlobStorageBackend(BlobStorageBackend):
+    """Wraps a backend with per-call deadlines, jittered retries, hedged reads and a circuit breaker.
+
+    Every attempt is limited to call_timeout seconds and the whole call, retries included, to deadline seconds.
+    Only reads are retried. A timed out attempt keeps running in its worker thread, so a repeated upload could add a
+    second reference to a local blob, which would then never be collected; upload_stream also consumes its input and
+    delete decrements a reference count, so all writes run once. A read that has not finished after the p95 of recent
+    read latencies is duplicated and the first answer wins. While the circuit is open calls fail fast with
+    BlobStorageUnavailableError instead of holding request coroutines and database sessions. Errors raised by the
+    chunks given to upload_stream, such as an oversized or malformed request body or a stalled client, are re-raised
+    without counting against the store.
+    """
+
+    def __init__(self, backend: BlobStorageBackend, settings: BlobStorageSettings):
+        self._backend = backend
+        self._settings = settings
+        self._read_latencies: deque[float] = deque(maxlen=settings.hedge_latency_window)
+        self.circuit_breaker = CircuitBreaker(settings.circuit_failure_threshold, settings.circuit_reset_timeout)
+        self.metrics = BlobStorageMetrics()
+
+    @property
+    def backend(self) -> BlobStorageBackend:
+        """The wrapped backend, for maintenance calls that bypass deadlines and retries."""
+        return self._backend
+
+    @property
+    def hedge_delay(self) -> float:
+        """p95 of recent read latencies, the configured hedge_delay until there are enough samples."""
+        if len(self._read_latencies) < self._settings.hedge_min_samples:
+            return self._settings.hedge_delay
+        latencies = sorted(self._read_latencies)
+        return latencies[int(len(latencies) * 0.95) - 1]
+
+    def _get_retry_delay(self, attempt: int) -> float:
+        # Full jitter keeps retrying clients from hitting a recovering store in lockstep
+        return random.uniform(0, min(self._settings.retry_max_delay, self._settings.retry_base_delay * 2**attempt))
+
+    async def _attempt(self, call: Callable[[], Awaitable[T]], deadline: float, call_timeout: float) -> T:
+        timeout = min(call_timeout, deadline - time.monotonic())
+        try:
+            async with asyncio.timeout(timeout):
+                return await call()
+        except TimeoutError:
+            self.metrics.timeouts += 1
+            raise BlobStorageTimeoutError(f'Blob storage call timed out after {timeout:.2f}s') from None
+
+    async def _hedged_attempt(self, call: Callable[[], Awaitable[T]], deadline: float) -> T:
+        started_at = time.monotonic()
+        first = asyncio.create_task(self._attempt(call, deadline, self._settings.call_timeout))
+        tasks = {first}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_delay)
+            if not done and time.monotonic() < deadline:
+                self.metrics.hedged_reads += 1
+                tasks.add(asyncio.create_task(self._attempt(call, deadline, self._settings.call_timeout)))
+
+            while True:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    tasks.discard(task)
+                    if task.exception() is None:
+                        if task is not first:
+                            self.metrics.hedge_wins += 1
+                        self._read_latencies.append(time.monotonic() - started_at)
+                        return task.result()
+                    if not tasks:
+                        return task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+            for task in tasks:
+                with contextlib.suppress(BaseException):
+                    await task
+
+    async def _call(
+        self,
+        call: Callable[[], Awaitable[T]],
+        is_retryable: bool = False,
+        is_read: bool = False,
+        call_timeout: float | None = None,
+        is_input_error: Callable[[BaseException], bool] | None = None,
+    ) -> T:
+        self.metrics.calls += 1
+        if not self.circuit_breaker.allow():
+            self.metrics.circuit_rejections += 1
+            raise BlobStorageUnavailableError('Blob storage is unavailable')
+
+        is_trial = self.circuit_breaker.state == CircuitState.HALF_OPEN
+        try:
+            return await self._call_with_retries(call, is_retryable, is_read, call_timeout, is_input_error)
+        except BaseException:
+            # A cancelled trial says nothing about the store, but must not keep the slot and block every later call
+            if is_trial:
+                self.circuit_breaker.release_trial()
+            raise
+
+    async def _call_with_retries(
+        self,
+        call: Callable[[], Awaitable[T]],
+        is_retryable: bool,
+        is_read: bool,
+        call_timeout: float | None,
+        is_input_error: Callable[[BaseException], bool] | None,
+    ) -> T:
+        deadline = time.monotonic() + self._settings.deadline
+        max_attempts = self._settings.retry_max_attempts if is_retryable else 1
+        attempt = 0
+        while True:
+            try:
+                if is_read and self._settings.hedge_enabled:
+                    result = await self._hedged_attempt(call, deadline)
+                else:
+                    result = await self._attempt(call, deadline, call_timeout or self._settings.call_timeout)
+            except Exception as e:
+                if is_input_error is not None and is_input_error(e):
+                    raise
+                attempt += 1
+                retry_delay = self._get_retry_delay(attempt)
+                if attempt >= max_attempts or time.monotonic() + retry_delay >= deadline:
+                    self.metrics.failures += 1
+                    if self.circuit_breaker.record_failure():
+                        self.metrics.circuit_opened += 1
+                        logger.warning(f'Blob storage circuit opened after error: {e!s}')
+                    raise
+                self.metrics.retries += 1
+                await asyncio.sleep(retry_delay)
+                continue
+
+            self.circuit_breaker.record_success()
+            return result
+
+    async def start(self) -> None:
+        await self._backend.start()
+
+    async def stop(self) -> None:
+        await self._backend.stop()
+
+    async def upload(self, data: bytes) -> str:
+        return await self._call(lambda: self._backend.upload(data))
+
+    async def upload_stream(self, chunks: AsyncIterable[bytes]) -> str:
+        # The stream is usually fed by a request body, so a slow client must not be cut off by call_timeout
+        input_stream = _InputStream(chunks)
+        return await self._call(
+            lambda: self._backend.upload_stream(input_stream),
+            call_timeout=self._settings.deadline,
+            is_input_error=input_stream.is_input_error,
+        )
+
+    async def delete(self, url: str) -> bool:
+        return await self._call(lambda: self._backend.delete(url))
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._call(lambda: self._backend.get(key), is_retryable=True, is_read=True)
+
+    async def get_stream(self, key: str) -> BlobStream | None:
+        return await self._call(lambda: self._backend.get_stream(key), is_retryable=True, is_read=True)
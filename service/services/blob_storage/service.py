@@ -1,9 +1,61 @@
-import random
-import string
-import uuid
+import datetime as dt
+import functools
+from collections.abc import AsyncIterable
+
+from service.services.blob_storage.base import BlobStorageBackend, BlobStream, iter_bytes_range
+from service.services.blob_storage.cache import BlobCache, BlobCacheStats
+from service.services.blob_storage.fake import FakeBlobStorageBackend
+from service.services.blob_storage.http import HttpBlobStorageBackend
+from service.services.blob_storage.local import BlobInfo, LocalBlobStorageBackend
+from service.services.blob_storage.packs import PackCompactionStats
+from service.services.blob_storage.resilience import BlobStorageMetrics, ResilientBlobStorageBackend
+from service.settings import BlobStorageSettings
+
+
+@functools.cache
+def get_blob_storage_backend() -> BlobStorageBackend:
+    settings = BlobStorageSettings()
+    backend: BlobStorageBackend
+    if settings.backend == 'local':
+        backend = LocalBlobStorageBackend(settings)
+    elif settings.backend == 'http':
+        backend = HttpBlobStorageBackend(settings)
+    else:
+        backend = FakeBlobStorageBackend()
+    if settings.resilience_enabled:
+        backend = ResilientBlobStorageBackend(backend, settings)
+    return backend
+
+
+def _get_local_backend() -> LocalBlobStorageBackend | None:
+    """The local backend behind the resilience wrapper, for maintenance jobs; None for other backends."""
+    backend = get_blob_storage_backend()
+    if isinstance(backend, ResilientBlobStorageBackend):
+        backend = backend.backend
+    return backend if isinstance(backend, LocalBlobStorageBackend) else None
+
+
+@functools.cache
+def get_blob_cache() -> BlobCache | None:
+    settings = BlobStorageSettings()
+    if settings.cache_max_bytes <= 0:
+        return None
+    return BlobCache(settings.cache_max_bytes, settings.cache_max_item_size)
 
 
 class BlobStorageService:
+    """Blob storage facade; the backend is selected by BlobStorageSettings.backend."""
+
+    @classmethod
+    async def start(cls) -> None:
+        """Open backend resources such as the pooled HTTP client; called by MainContainer.start."""
+        await get_blob_storage_backend().start()
+
+    @classmethod
+    async def stop(cls) -> None:
+        """Close backend resources opened by start; called by MainContainer.stop."""
+        await get_blob_storage_backend().stop()
+
     @classmethod
     async def upload(cls, data: bytes) -> str:
         """Upload bytes data and return a URL string.
@@ -14,24 +66,136 @@ class BlobStorageService:
         Returns:
             A string representing the URL of the uploaded data
         """
-        # Generate a random URL string for demonstration
-        random_id = str(uuid.uuid4())
-        return f'https://blob-storage.example.com/{random_id}'
+        return await get_blob_storage_backend().upload(data)
+
+    @classmethod
+    async def upload_stream(cls, chunks: AsyncIterable[bytes]) -> str:
+        """Upload data from an async stream of byte chunks and return a URL string.
+
+        Chunks are consumed one at a time, so memory usage does not depend on the total size of the data.
+
+        Args:
+            chunks: The async iterable producing the bytes data to upload
+
+        Returns:
+            A string representing the URL of the uploaded data
+        """
+        return await get_blob_storage_backend().upload_stream(chunks)
+
+    @classmethod
+    async def delete(cls, url: str) -> bool:
+        """Delete the data stored under the given URL.
+
+        Args:
+            url: The URL returned by upload or upload_stream
+
+        Returns:
+            True if the data was deleted, False if there was nothing to delete
+        """
+        if (cache := get_blob_cache()) is not None:
+            cache.pop(url)
+        return await get_blob_storage_backend().delete(url)
 
     @classmethod
     async def get(cls, key: str) -> bytes | None:
         """Get bytes data by the given string key.
 
+        Recently read blobs are served from an in-process LRU cache bounded by BlobStorageSettings.cache_max_bytes.
+
         Args:
-            key: The string key to retrieve data for
+            key: The string key to retrieve data for, or the URL returned by upload
 
         Returns:
-            Random bytes data or None if not found
+            Stored bytes data or None if not found
         """
-        # Return random bytes for demonstration
         if not key:
             return None
 
-        # Generate random bytes (simulating stored data)
-        random_size = random.randint(100, 1000)
-        return bytes(''.join(random.choices(string.ascii_letters + string.digits, k=random_size)), 'utf-8')
+        cache = get_blob_cache()
+        if cache is not None and (data := cache.get(key)) is not None:
+            return data
+
+        data = await get_blob_storage_backend().get(key)
+        if cache is not None and data is not None:
+            cache.put(key, data)
+        return data
+
+    @classmethod
+    async def get_stream(cls, key: str) -> BlobStream | None:
+        """Get a blob for streaming by the given string key.
+
+        Unlike get, the blob is not loaded into memory: its size is known up front and any byte range of it is read
+        chunk by chunk while the iterator returned by BlobStream.iter_range is consumed.
+
+        Args:
+            key: The string key to retrieve data for, or the URL returned by upload
+
+        Returns:
+            Blob size and range reader or None if not found
+        """
+        if not key:
+            return None
+
+        cache = get_blob_cache()
+        if cache is not None and (data := cache.get(key)) is not None:
+            return BlobStream(size=len(data), iter_range=lambda start, end: iter_bytes_range(data, start, end))
+
+        return await get_blob_storage_backend().get_stream(key)
+
+    @classmethod
+    def get_cache_stats(cls) -> BlobCacheStats | None:
+        """Get hit, miss and size counters of the get cache, None if the cache is disabled."""
+        cache = get_blob_cache()
+        return cache.stats if cache is not None else None
+
+    @classmethod
+    def get_metrics(cls) -> BlobStorageMetrics | None:
+        """Get timeout, retry, hedging and circuit breaker counters, None if resilience is disabled."""
+        backend = get_blob_storage_backend()
+        return backend.metrics if isinstance(backend, ResilientBlobStorageBackend) else None
+
+    @classmethod
+    async def compact(cls) -> PackCompactionStats | None:
+        """Move small and aged blobs of the local backend into pack segments and reclaim space of deleted ones.
+
+        Returns:
+            What was packed and reclaimed, None for other backends or while another process is compacting
+        """
+        backend = _get_local_backend()
+        if backend is None:
+            return None
+        return await backend.compact()
+
+    @classmethod
+    async def list_blobs(cls, after: str | None, limit: int) -> list[BlobInfo] | None:
+        """List stored blobs in key order, a page at a time.
+
+        Args:
+            after: The key of the last blob of the previous page, None for the first page
+            limit: Maximum number of blobs to return
+
+        Returns:
+            Blobs with keys greater than after, None for backends that cannot list their blobs
+        """
+        backend = _get_local_backend()
+        if backend is None:
+            return None
+        return await backend.list_blobs(after, limit)
+
+    @classmethod
+    async def delete_orphan(cls, url: str, updated_before: dt.datetime) -> bool:
+        """Delete a blob no lead references, with all its references, unless it changed at or after updated_before.
+
+        Args:
+            url: The URL returned by list_blobs
+            updated_before: Blobs stored or referenced by an upload since then are kept
+
+        Returns:
+            True if the blob was deleted
+        """
+        if (cache := get_blob_cache()) is not None:
+            cache.pop(url)
+        backend = _get_local_backend()
+        if backend is None:
+            return False
+        return await backend.delete_orphan(url, updated_before)
@@ -0,0 +1,3 @@
+from .service import EmailOutboxService
+
+__all__ = ['EmailOutboxService']
@@ -0,0 +1,116 @@
+import datetime as dt
+import logging
+import uuid
+from collections.abc import Collection, Sequence
+
+import sqlalchemy as sa
+import sqlmodel as sm
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from service.database.models.email_outbox import OutboxEmail, OutboxEmailState
+from service.services.email_service import RenderedEmail
+from service.settings import EmailSettings
+from service.utils.date_utils import get_utc_now
+
+logger = logging.getLogger(__name__)
+
+
+class EmailOutboxService:
+    """Transactional outbox for emails sent by the scheduler after the transaction that queued them."""
+
+    def __init__(self, email_settings: EmailSettings):
+        self._settings = email_settings
+
+    @classmethod
+    def add_email(
+        cls, db_session: AsyncSession, lead_id: uuid.UUID, sender: str, receiver: str, rendered: RenderedEmail
+    ) -> OutboxEmail:
+        """Add an outbox row to the session; it is committed together with the status change of the lead."""
+        email = OutboxEmail(
+            id=uuid.uuid4(),
+            lead_id=lead_id,
+            sender=sender,
+            receiver=receiver,
+            subject=rendered.subject,
+            text=rendered.text,
+            state=OutboxEmailState.PENDING,
+        )
+        db_session.add(email)
+        return email
+
+    async def claim_due_emails(self, db_session: AsyncSession, limit: int) -> list[OutboxEmail]:
+        """Claim pending emails that are due and hide them from other workers for the lease timeout.
+
+        Due rows are locked with FOR UPDATE SKIP LOCKED and leased in one UPDATE ... RETURNING, so concurrent
+        dispatchers claim disjoint batches. The attempt is counted at claim time, so emails interrupted by a crash
+        still move towards max attempts.
+        """
+        now = get_utc_now()
+        due_ids = (
+            sa.select(OutboxEmail.id)
+            .where(sm.col(OutboxEmail.state) == OutboxEmailState.PENDING, sm.col(OutboxEmail.next_attempt_at) <= now)
+            .order_by(sm.col(OutboxEmail.next_attempt_at))
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await db_session.execute(
+            sa.update(OutboxEmail)
+            .where(sm.col(OutboxEmail.id).in_(due_ids.scalar_subquery()))
+            .values(
+                attempts=sm.col(OutboxEmail.attempts) + 1,
+                next_attempt_at=now + dt.timedelta(seconds=self._settings.outbox_lease_timeout),
+                updated_at=now,
+            )
+            .returning(OutboxEmail)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        emails = sorted(result.scalars().all(), key=lambda email: email.created_at)
+        await db_session.commit()
+        return emails
+
+    def get_retry_delay(self, attempts: int) -> float:
+        """Capped exponential backoff for the given number of attempts made so far."""
+        delay = self._settings.outbox_retry_base_delay * 2 ** max(attempts - 1, 0)
+        return min(delay, self._settings.outbox_retry_max_delay)
+
+    async def record_results(
+        self,
+        db_session: AsyncSession,
+        emails: Sequence[OutboxEmail],
+        errors: dict[uuid.UUID, str],
+        rejected_ids: Collection[uuid.UUID] = (),
+    ) -> None:
+        """Mark claimed emails as sent, or reschedule the ones in errors with backoff, in one executemany UPDATE.
+
+        An email that was rejected or failed max attempts times is given up on.
+
+        Args:
+            db_session: Database session
+            emails: Emails claimed by claim_due_emails
+            errors: Error message of each email that could not be sent, by email ID
+            rejected_ids: IDs of the emails in errors that the server refused with a 5xx reply, which are not retried
+        """
+        now = get_utc_now()
+        rows = []
+        for email in emails:
+            row = {
+                'id': email.id,
+                'state': OutboxEmailState.SENT,
+                'next_attempt_at': email.next_attempt_at,
+                'last_error': errors.get(email.id),
+                'updated_at': now,
+            }
+            if email.id in errors:
+                if email.id in rejected_ids:
+                    row['state'] = OutboxEmailState.FAILED
+                elif email.attempts >= self._settings.outbox_max_attempts:
+                    row['state'] = OutboxEmailState.FAILED
+                    logger.error(f'Email {email.id} failed after {email.attempts} attempts: {errors[email.id]}')
+                else:
+                    row['state'] = OutboxEmailState.PENDING
+                    row['next_attempt_at'] = now + dt.timedelta(seconds=self.get_retry_delay(email.attempts))
+            rows.append(row)
+        if rows:
+            # ORM bulk UPDATE by primary key, sent as a single executemany
+            await db_session.execute(sa.update(OutboxEmail), rows)
+        await db_session.commit()
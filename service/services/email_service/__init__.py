@@ -1,3 +1,14 @@
+from .errors import EmailRejectedError, EmailServiceError, EmailTemplateNotFoundError, EmailUnavailableError
+from .registry import EmailTemplate, EmailTemplateRegistry, RenderedEmail
 from .service import EmailService
 
-__all__ = ['EmailService']
+__all__ = [
+    'EmailRejectedError',
+    'EmailService',
+    'EmailServiceError',
+    'EmailTemplate',
+    'EmailTemplateNotFoundError',
+    'EmailTemplateRegistry',
+    'EmailUnavailableError',
+    'RenderedEmail',
+]
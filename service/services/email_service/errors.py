@@ -0,0 +1,14 @@
+class EmailServiceError(Exception):
+    pass
+
+
+class EmailUnavailableError(EmailServiceError):
+    """The SMTP server could not be reached, refused the login or answered with a transient 4xx reply."""
+
+
+class EmailRejectedError(EmailServiceError):
+    """The SMTP server permanently refused the sender, the recipient or the message with a 5xx reply."""
+
+
+class EmailTemplateNotFoundError(EmailServiceError):
+    pass
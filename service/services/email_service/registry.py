@@ -0,0 +1,94 @@
+import dataclasses
+import pathlib
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+import jinja2
+
+from service.services.email_service.errors import EmailTemplateNotFoundError
+
+TEMPLATES_DIR = pathlib.Path(__file__).parent / 'templates'
+
+
+@dataclasses.dataclass(frozen=True)
+class RenderedEmail:
+    subject: str
+    text: str
+
+
+class EmailTemplate:
+    """A compiled version of an email template: a subject and a plain text body."""
+
+    def __init__(self, name: str, version: int, subject: jinja2.Template, body: jinja2.Template):
+        self.name = name
+        self.version = version
+        self._subject = subject
+        self._body = body
+
+    def render(self, **context: Any) -> RenderedEmail:
+        return self._render(context)
+
+    def render_batch(self, contexts: Iterable[Mapping[str, Any]], **shared: Any) -> list[RenderedEmail]:
+        """Render one email per context; variables in shared are the same for all of them unless a context sets them."""
+        if not shared:
+            return [self._render(context) for context in contexts]
+        return [self._render({**shared, **context}) for context in contexts]
+
+    def _render(self, context: Mapping[str, Any]) -> RenderedEmail:
+        # A subject spans one line, whatever whitespace the template leaves around it
+        return RenderedEmail(subject=' '.join(self._subject.render(context).split()), text=self._body.render(context))
+
+
+class EmailTemplateRegistry:
+    """Email templates compiled once and cached by name and version.
+
+    A template version is a directory {templates_dir}/{name}/{version} with subject.j2 and body.j2. Every template is
+    compiled by load, which MainContainer calls on startup, or by the first get otherwise; rendering never parses
+    nor stats template files. Variables missing from the context fail the rendering instead of rendering empty.
+    """
+
+    def __init__(self, templates_dir: pathlib.Path = TEMPLATES_DIR):
+        self._templates_dir = templates_dir
+        self._environment = jinja2.Environment(
+            loader=jinja2.FileSystemLoader(templates_dir),
+            undefined=jinja2.StrictUndefined,
+            keep_trailing_newline=True,
+            auto_reload=False,
+        )
+        self._templates: dict[tuple[str, int], EmailTemplate] | None = None
+        self._latest_versions: dict[str, int] = {}
+
+    def load(self) -> None:
+        templates = {}
+        for version_dir in sorted(self._templates_dir.glob('*/*')):
+            if not version_dir.is_dir() or not version_dir.name.isdigit():
+                continue
+            name, version = version_dir.parent.name, int(version_dir.name)
+            templates[name, version] = EmailTemplate(
+                name,
+                version,
+                subject=self._environment.get_template(f'{name}/{version_dir.name}/subject.j2'),
+                body=self._environment.get_template(f'{name}/{version_dir.name}/body.j2'),
+            )
+            self._latest_versions[name] = max(version, self._latest_versions.get(name, version))
+        self._templates = templates
+
+    def get(self, name: str, version: int | None = None) -> EmailTemplate:
+        """Return a version of a template, the latest one by default.
+
+        Raises:
+            EmailTemplateNotFoundError: There is no such template or version.
+        """
+        if self._templates is None:
+            self.load()
+        if version is None:
+            version = self._latest_versions.get(name)
+        template = self._templates.get((name, version))
+        if template is None:
+            raise EmailTemplateNotFoundError(f'Email template {name} version {version} not found')
+        return template
+
+    def render_batch(
+        self, name: str, contexts: Iterable[Mapping[str, Any]], version: int | None = None, **shared: Any
+    ) -> list[RenderedEmail]:
+        return self.get(name, version).render_batch(contexts, **shared)
@@ -1,11 +1,51 @@
+import logging
+from email.message import EmailMessage
+
+from service.services.email_service.smtp import SmtpConnectionPool
+from service.settings import EmailSettings
+
+logger = logging.getLogger(__name__)
+
+
 class EmailService:
-    """Service for handling email operations."""
+    """Service for handling email operations; the backend is selected by EmailSettings.backend.
+
+    The smtp backend sends through a pool of SMTP sessions. The pool's health checks run between start and stop,
+    which MainContainer calls on startup and shutdown.
+    """
 
-    def send(self, sender: str, receiver: str, text: str) -> None:
+    def __init__(self, settings: EmailSettings):
+        self._settings = settings
+        self._pool = SmtpConnectionPool(settings) if settings.backend == 'smtp' else None
+
+    async def start(self) -> None:
+        if self._pool is not None:
+            await self._pool.start()
+
+    async def stop(self) -> None:
+        if self._pool is not None:
+            await self._pool.stop()
+
+    async def send(self, sender: str, receiver: str, text: str, subject: str | None = None) -> None:
         """Send an email.
 
         Args:
-            email: The email address to send to.
+            sender: The email address to send from.
+            receiver: The email address to send to.
+            text: The plain text body.
+            subject: The subject; EmailSettings.subject by default.
+
+        Raises:
+            EmailUnavailableError: The SMTP server could not be reached, refused the login or asked to try later.
+            EmailRejectedError: The SMTP server permanently refused the email.
         """
-        # TODO: Implement email sending logic
-        pass
+        message = EmailMessage()
+        message['From'] = sender
+        message['To'] = receiver
+        message['Subject'] = subject if subject is not None else self._settings.subject
+        message.set_content(text)
+
+        if self._pool is None:
+            logger.info(f'Email to {receiver} from {sender} is only logged: {message["Subject"]}')
+            return
+        await self._pool.send(message)
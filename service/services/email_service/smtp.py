@@ -0,0 +1,195 @@
+import asyncio
+import collections
+import contextlib
+import dataclasses
+import logging
+import time
+from email.message import EmailMessage
+
+import aiosmtplib
+
+from service.services.email_service.errors import EmailRejectedError, EmailUnavailableError
+from service.settings import EmailSettings
+
+logger = logging.getLogger(__name__)
+
+# Reply of a server that is closing the session, e.g. on shutdown or after too many messages
+_SERVICE_NOT_AVAILABLE = 421
+
+
+def _is_rejection(error: aiosmtplib.SMTPException) -> bool:
+    """Whether the server permanently refused the message with a 5xx reply, so sending it again cannot succeed."""
+    if isinstance(error, aiosmtplib.SMTPRecipientsRefused):
+        return bool(error.recipients) and all(_is_rejection(recipient) for recipient in error.recipients)
+    # A refused login is a fault of the configuration rather than of the message
+    return (
+        isinstance(error, aiosmtplib.SMTPResponseException)
+        and not isinstance(error, aiosmtplib.SMTPAuthenticationError)
+        and 500 <= error.code < 600
+    )
+
+
+@dataclasses.dataclass
+class _Connection:
+    client: aiosmtplib.SMTP
+    last_used: float
+    sent_count: int = 0
+
+
+class SmtpConnectionPool:
+    """Pool of authenticated SMTP sessions, each one reused for many messages.
+
+    At most pool_size messages are sent at a time. Connections are opened on demand, so a pool whose server is down
+    does not fail on startup. A connection idle for health_check_interval seconds is checked with NOOP before it is
+    handed out, and a background task closes idle connections that fail the check or outlive idle_timeout.
+    A message whose connection fails is sent again on a new connection, up to send_attempts times; a connection
+    dropped after the message was accepted can therefore deliver it twice. Only 5xx replies to the message raise
+    EmailRejectedError; transient 4xx replies, refused logins and connection failures raise EmailUnavailableError.
+    """
+
+    def __init__(self, settings: EmailSettings):
+        self._settings = settings
+        self._idle: collections.deque[_Connection] = collections.deque()
+        self._slots = asyncio.Semaphore(settings.pool_size)
+        self._task: asyncio.Task | None = None
+
+    @property
+    def idle_count(self) -> int:
+        return len(self._idle)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_health_checks())
+
+    async def stop(self) -> None:
+        """Stop the health checks and end the idle sessions."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        while self._idle:
+            await self._close(self._idle.pop())
+
+    async def send(self, message: EmailMessage) -> None:
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self._settings.pool_timeout)
+        except TimeoutError as e:
+            raise EmailUnavailableError('No free SMTP connection') from e
+
+        try:
+            for attempt in range(1, self._settings.send_attempts + 1):
+                connection = None
+                try:
+                    # Idle connections may have been dropped along with the failed one, so retries open a new one
+                    connection = await self._acquire() if attempt == 1 else await self._connect()
+                    await connection.client.send_message(message)
+                except (OSError, aiosmtplib.SMTPException) as e:
+                    if connection is not None:
+                        await self._close(connection)
+                    if not isinstance(e, OSError) and _is_rejection(e):
+                        raise EmailRejectedError(str(e)) from e
+                    reconnect = isinstance(e, OSError) or (
+                        isinstance(e, aiosmtplib.SMTPResponseException) and e.code == _SERVICE_NOT_AVAILABLE
+                    )
+                    if not reconnect or attempt == self._settings.send_attempts:
+                        raise EmailUnavailableError(str(e)) from e
+                    logger.warning(f'SMTP connection failed, sending again on a new one: {e!s}')
+                except BaseException:
+                    # Cancelled in the middle of a command, the session is in an unknown state and cannot be reused
+                    if connection is not None:
+                        connection.client.close()
+                    raise
+                else:
+                    await self._release(connection)
+                    return
+        finally:
+            self._slots.release()
+
+    async def check_idle(self) -> int:
+        """Close idle connections that outlived idle_timeout or fail a NOOP and return how many were closed."""
+        closed_count = 0
+        for _ in range(len(self._idle)):
+            # Sends may take idle connections while one is being checked
+            if not self._idle:
+                break
+            # Taken from the pool while it is checked, so it is not handed out meanwhile
+            connection = self._idle.popleft()
+            if time.monotonic() - connection.last_used >= self._settings.idle_timeout or not await self._is_healthy(
+                connection
+            ):
+                await self._close(connection)
+                closed_count += 1
+            else:
+                self._idle.append(connection)
+        return closed_count
+
+    async def _run_health_checks(self) -> None:
+        while True:
+            await asyncio.sleep(self._settings.health_check_interval)
+            try:
+                closed_count = await self.check_idle()
+            except (OSError, aiosmtplib.SMTPException) as e:
+                logger.error(f'SMTP health check failed: {e!s}')
+            except Exception:
+                # The loop must outlive a bug in one check, or idle connections would never be checked again
+                logger.exception('SMTP health check failed unexpectedly')
+            else:
+                if closed_count:
+                    logger.info(f'Closed {closed_count} idle SMTP connections')
+
+    async def _acquire(self) -> _Connection:
+        while self._idle:
+            # The most recently used connection first, so connections left over after a burst age out
+            connection = self._idle.pop()
+            if time.monotonic() - connection.last_used < self._settings.health_check_interval:
+                return connection
+            try:
+                is_healthy = await self._is_healthy(connection)
+            except BaseException:
+                connection.client.close()
+                raise
+            if is_healthy:
+                return connection
+            await self._close(connection)
+        return await self._connect()
+
+    async def _release(self, connection: _Connection) -> None:
+        connection.sent_count += 1
+        if connection.sent_count >= self._settings.max_messages_per_connection:
+            await self._close(connection)
+            return
+        connection.last_used = time.monotonic()
+        self._idle.append(connection)
+
+    async def _connect(self) -> _Connection:
+        password = self._settings.smtp_password
+        client = aiosmtplib.SMTP(
+            hostname=self._settings.smtp_host,
+            port=self._settings.smtp_port,
+            username=self._settings.smtp_username,
+            password=password.get_secret_value() if password is not None else None,
+            use_tls=self._settings.smtp_use_tls,
+            start_tls=self._settings.smtp_start_tls,
+            timeout=self._settings.smtp_timeout,
+        )
+        # Says EHLO, upgrades to TLS and logs in
+        await client.connect()
+        return _Connection(client=client, last_used=time.monotonic())
+
+    @staticmethod
+    async def _is_healthy(connection: _Connection) -> bool:
+        if not connection.client.is_connected:
+            return False
+        try:
+            await connection.client.noop()
+        except (OSError, aiosmtplib.SMTPException):
+            return False
+        return True
+
+    @staticmethod
+    async def _close(connection: _Connection) -> None:
+        if connection.client.is_connected:
+            with contextlib.suppress(OSError, aiosmtplib.SMTPException):
+                await connection.client.quit()
+        connection.client.close()
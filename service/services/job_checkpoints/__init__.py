@@ -0,0 +1,3 @@
+from .service import JobCheckpointService
+
+__all__ = ['JobCheckpointService']
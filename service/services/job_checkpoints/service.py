@@ -0,0 +1,31 @@
+import sqlalchemy as sa
+import sqlmodel as sm
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from service.database.models.job_checkpoints import JobCheckpoint
+from service.utils.date_utils import get_utc_now
+
+
+class JobCheckpointService:
+    @classmethod
+    async def acquire(cls, db_session: AsyncSession, name: str) -> JobCheckpoint | None:
+        """Lock the checkpoint of a job until the transaction ends, creating it on the first run.
+
+        Returns:
+            The checkpoint, or None if another worker holds it and this run should be skipped
+        """
+        await db_session.execute(
+            pg_insert(JobCheckpoint).values(name=name).on_conflict_do_nothing(index_elements=['name'])
+        )
+        query = sa.select(JobCheckpoint).where(sm.col(JobCheckpoint.name) == name).with_for_update(skip_locked=True)
+        return (await db_session.execute(query)).scalar_one_or_none()
+
+    @classmethod
+    def advance(cls, checkpoint: JobCheckpoint, position: str | None) -> None:
+        """Move the checkpoint; it is saved with the work done up to position when the session is committed.
+
+        None starts the job over from the beginning.
+        """
+        checkpoint.position = position
+        checkpoint.updated_at = get_utc_now()
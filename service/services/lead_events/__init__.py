@@ -0,0 +1,4 @@
+from .service import LeadEventService
+from .writer import LeadEventWriter
+
+__all__ = ['LeadEventService', 'LeadEventWriter']
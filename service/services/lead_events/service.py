@@ -0,0 +1,37 @@
+from uuid import UUID
+
+import sqlalchemy as sa
+import sqlmodel as sm
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from service.database.models.lead_events import LeadEvent
+
+
+class LeadEventService:
+    @classmethod
+    async def get_lead_events(
+        cls, db_session: AsyncSession, lead_id: UUID, limit: int, after_id: int | None = None
+    ) -> tuple[list[LeadEvent], int | None]:
+        """Get a page of lead events in the order they happened.
+
+        Keyset pagination over the (lead_id, id) index, so the cost of a page does not depend on its position.
+
+        Args:
+            db_session: Database session
+            lead_id: Lead to get the history for
+            limit: Maximum number of events to return
+            after_id: ID of the last event of the previous page
+
+        Returns:
+            Events of the page and the cursor for the next page, None if this is the last page
+        """
+        query = sa.select(LeadEvent).where(sm.col(LeadEvent.lead_id) == lead_id)
+        if after_id is not None:
+            query = query.where(sm.col(LeadEvent.id) > after_id)
+        query = query.order_by(sm.col(LeadEvent.id).asc()).limit(limit + 1)
+
+        events = list((await db_session.execute(query)).scalars().all())
+        if len(events) > limit:
+            events = events[:limit]
+            return events, events[-1].id
+        return events, None
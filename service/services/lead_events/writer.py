@@ -0,0 +1,80 @@
+import asyncio
+import contextlib
+import logging
+
+import sqlalchemy as sa
+
+from service.database import Database, get_session_context
+from service.database.models.lead_events import LeadEvent, LeadEventBase
+from service.settings import LeadEventSettings
+from service.utils.date_utils import get_utc_now
+
+logger = logging.getLogger(__name__)
+
+
+class LeadEventWriter:
+    """Per-process buffer that writes lead events in multi-row inserts.
+
+    enqueue() never touches the database, so recording an event does not lengthen the request that caused it.
+    The buffer is flushed by a background task when it reaches flush_size or every flush_interval seconds.
+    Events not yet flushed are not visible in the history; a failed flush keeps them for the next one, up to
+    max_buffer_size.
+    """
+
+    def __init__(self, database: Database, settings: LeadEventSettings):
+        self._database = database
+        self._settings = settings
+        self._buffer: list[dict] = []
+        self._flush_lock = asyncio.Lock()
+        self._flush_requested = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._buffer)
+
+    def enqueue(self, event: LeadEventBase) -> None:
+        """Buffer an event for the next flush."""
+        self._buffer.append({**event.model_dump(), 'created_at': get_utc_now()})
+        if len(self._buffer) >= self._settings.flush_size:
+            self._flush_requested.set()
+
+    async def flush(self) -> int:
+        """Write all buffered events in one multi-row insert and return how many were written."""
+        async with self._flush_lock:
+            if not self._buffer:
+                return 0
+            rows, self._buffer = self._buffer, []
+            try:
+                async with get_session_context(self._database) as db_session:
+                    # Executemany is sent as multi-row inserts, compiled once rather than once per number of rows
+                    await db_session.execute(sa.insert(LeadEvent), rows)
+                    await db_session.commit()
+            except (OSError, sa.exc.SQLAlchemyError) as e:
+                # Put the events back ahead of the ones enqueued meanwhile; when they do not fit, the oldest are dropped
+                self._buffer = rows + self._buffer
+                dropped_count = max(len(self._buffer) - self._settings.max_buffer_size, 0)
+                del self._buffer[:dropped_count]
+                logger.error(f'Failed to write {len(rows)} lead events, dropped the {dropped_count} oldest: {e!s}')
+                return 0
+            return len(rows)
+
+    async def _run(self) -> None:
+        while True:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=self._settings.flush_interval)
+            self._flush_requested.clear()
+            await self.flush()
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task and flush what is left in the buffer."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
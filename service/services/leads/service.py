@@ -1,6 +1,9 @@
-import base64
+import asyncio
 import datetime as dt
+import functools
 import uuid
+from collections.abc import AsyncIterable, AsyncIterator, Coroutine
+from typing import Any
 from uuid import UUID
 
 import sqlalchemy as sa
@@ -12,9 +15,21 @@ from starlette.status import HTTP_500_INTERNAL_SERVER_ERROR
 from service.api import errors as api_errors
 from service.api.errors import HttpServiceException
 from service.database.helpers import AscDescEnum, get_list_with_count, get_model_by_id_or_none
+from service.database.models.lead_events import LeadEventBase
 from service.database.models.leads import Lead, LeadBase, LeadStatus
+from service.services.attorneys import AttorneyService
 from service.services.blob_storage.service import BlobStorageService
+from service.services.lead_events import LeadEventWriter
 from service.services.leads.errors import LeadServiceDuplicateLeadError
+from service.services.resume_uploads.service import PENDING_RESUME_URL_PREFIX, ResumeUploadService
+from service.services.resume_validation import ResumeValidationService
+from service.settings import ResumeSettings
+from service.utils.encoding import Base64DecodeError, Base64DecodedSizeError, decode_base64_chunked
+
+
+@functools.cache
+def get_resume_settings() -> ResumeSettings:
+    return ResumeSettings()
 
 
 class LeadCreate(LeadBase):
@@ -23,23 +38,35 @@ class LeadCreate(LeadBase):
     pass
 
 
-class LeadCreateWithResume(BaseModel):
-    """Schema for creating a new lead with resume bytes."""
+class LeadCreateForm(BaseModel):
+    """Schema for the applicant fields of a new lead; the resume is streamed separately."""
 
     first_name: str
     last_name: str
     email: EmailStr
+
+
+class LeadCreateWithResume(LeadCreateForm):
+    """Schema for creating a new lead with resume bytes."""
+
     resume: bytes
 
     @field_validator('resume', mode='before')
     @classmethod
     def decode_base64_resume(cls, v):
-        """Decode base64 string to bytes if needed."""
+        """Decode base64 string to bytes if needed, rejecting resumes above the configured size."""
+        resume_settings = get_resume_settings()
         if isinstance(v, str):
             try:
-                return base64.b64decode(v)
-            except Exception:
+                return decode_base64_chunked(
+                    v, max_size=resume_settings.max_size, chunk_size=resume_settings.base64_decode_chunk_size
+                )
+            except Base64DecodedSizeError:
+                raise ValueError(f'Resume exceeds the maximum size of {resume_settings.max_size} bytes')
+            except Base64DecodeError:
                 raise ValueError('Invalid base64 encoded resume data')
+        if isinstance(v, bytes) and len(v) > resume_settings.max_size:
+            raise ValueError(f'Resume exceeds the maximum size of {resume_settings.max_size} bytes')
         return v
 
 
@@ -51,6 +78,11 @@ class LeadUpdate(BaseModel):
 
 
 class LeadService:
+    @classmethod
+    def _get_reached_out_attorney_id(cls, lead: Lead) -> UUID | None:
+        """Attorney whose reached out lead counter includes the lead."""
+        return lead.reached_out_by if lead.status == LeadStatus.REACHED_OUT else None
+
     @classmethod
     async def _check_lead_exists(cls, db_session: AsyncSession, email: str | EmailStr) -> bool:
         # Check if lead with this email already exists
@@ -71,21 +103,16 @@ class LeadService:
 
         # Add to database
         db_session.add(lead)
+        await AttorneyService.move_reached_out_lead(db_session, None, cls._get_reached_out_attorney_id(lead))
         await db_session.commit()
         await db_session.refresh(lead)
 
         return lead
 
     @classmethod
-    async def create_lead_with_resume(cls, db_session: AsyncSession, lead_data: LeadCreateWithResume) -> Lead:
-        """Create a new lead with resume bytes and persist to database."""
-
-        lead_exists = await cls._check_lead_exists(db_session, lead_data.email)
-        if lead_exists:
-            raise LeadServiceDuplicateLeadError(f'Lead with email {lead_data.email} already exists')
-
-        # Upload resume to blob storage
-        resume_url = await BlobStorageService.upload(lead_data.resume)
+    async def _create_registered_lead(
+        cls, db_session: AsyncSession, lead_data: LeadCreateForm, resume_url: str
+    ) -> Lead:
         if not resume_url:
             raise HttpServiceException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, message='Cannot upload the document')
 
@@ -101,11 +128,163 @@ class LeadService:
 
         # Add to database
         db_session.add(lead)
-        await db_session.commit()
+        try:
+            await db_session.commit()
+        except Exception:
+            # No lead references the uploaded resume, so nothing would ever delete it
+            await BlobStorageService.delete(resume_url)
+            raise
         await db_session.refresh(lead)
 
         return lead
 
+    @classmethod
+    async def _delete_uploaded_resume(cls, upload_task: asyncio.Task[str]) -> None:
+        if upload_task.cancelled() or upload_task.exception() is not None or not upload_task.result():
+            return
+        await BlobStorageService.delete(upload_task.result())
+
+    @classmethod
+    async def _check_lead_and_upload_resume(
+        cls, db_session: AsyncSession, email: str | EmailStr, upload: Coroutine[Any, Any, str]
+    ) -> str:
+        """Run the duplicate check and the resume upload concurrently and return the resume URL.
+
+        The upload starts speculatively, so latency is the slower of the two instead of their sum. If no URL is
+        returned, the upload is cancelled, or the uploaded blob is deleted if it has already finished.
+        """
+        lead_exists = False
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                upload_task = task_group.create_task(upload)
+                lead_exists = await cls._check_lead_exists(db_session, email)
+                if lead_exists:
+                    upload_task.cancel()
+        except BaseException as e:
+            # The upload may have finished before the check failed or the request was cancelled
+            await cls._delete_uploaded_resume(upload_task)
+            if not isinstance(e, ExceptionGroup):
+                raise
+            # Keep the error contract of the sequential path: a duplicate wins over an upload error,
+            # otherwise callers see the original exception
+            if not lead_exists:
+                raise e.exceptions[0]
+
+        if lead_exists:
+            await cls._delete_uploaded_resume(upload_task)
+            raise LeadServiceDuplicateLeadError(f'Lead with email {email} already exists')
+
+        return upload_task.result()
+
+    @classmethod
+    async def create_lead_with_resume(
+        cls,
+        db_session: AsyncSession,
+        lead_data: LeadCreateWithResume,
+        speculative_upload: bool = True,
+        resume_validator: ResumeValidationService | None = None,
+    ) -> Lead:
+        """Create a new lead with resume bytes and persist to database.
+
+        With a resume_validator the resume content is validated before anything is checked or uploaded.
+        """
+
+        if resume_validator is not None:
+            await resume_validator.validate(lead_data.resume)
+
+        if speculative_upload:
+            resume_url = await cls._check_lead_and_upload_resume(
+                db_session, lead_data.email, BlobStorageService.upload(lead_data.resume)
+            )
+            return await cls._create_registered_lead(db_session, lead_data, resume_url)
+
+        lead_exists = await cls._check_lead_exists(db_session, lead_data.email)
+        if lead_exists:
+            raise LeadServiceDuplicateLeadError(f'Lead with email {lead_data.email} already exists')
+
+        # Upload resume to blob storage
+        resume_url = await BlobStorageService.upload(lead_data.resume)
+        return await cls._create_registered_lead(db_session, lead_data, resume_url)
+
+    @classmethod
+    async def create_lead_with_resume_stream(
+        cls,
+        db_session: AsyncSession,
+        lead_data: LeadCreateForm,
+        resume_chunks: AsyncIterator[bytes],
+        speculative_upload: bool = True,
+        resume_validator: ResumeValidationService | None = None,
+    ) -> Lead:
+        """Create a new lead streaming the resume chunks to blob storage and persist to database.
+
+        With a resume_validator the format of the resume is sniffed from its first chunks before anything is checked
+        or uploaded; the rest of the document is never held in memory, so its structure is not validated.
+        """
+
+        if resume_validator is not None:
+            resume_chunks = await resume_validator.sniff_stream(resume_chunks)
+
+        # Stream resume to blob storage without buffering the whole file
+        if speculative_upload:
+            resume_url = await cls._check_lead_and_upload_resume(
+                db_session, lead_data.email, BlobStorageService.upload_stream(resume_chunks)
+            )
+            return await cls._create_registered_lead(db_session, lead_data, resume_url)
+
+        lead_exists = await cls._check_lead_exists(db_session, lead_data.email)
+        if lead_exists:
+            raise LeadServiceDuplicateLeadError(f'Lead with email {lead_data.email} already exists')
+
+        resume_url = await BlobStorageService.upload_stream(resume_chunks)
+        return await cls._create_registered_lead(db_session, lead_data, resume_url)
+
+    @classmethod
+    async def create_lead_with_staged_resume(
+        cls,
+        db_session: AsyncSession,
+        lead_data: LeadCreateForm,
+        resume: bytes | AsyncIterable[bytes],
+        resume_upload_service: ResumeUploadService,
+        resume_validator: ResumeValidationService | None = None,
+    ) -> Lead:
+        """Create a new lead whose resume is staged locally and uploaded later by the scheduler.
+
+        The lead gets a pending resume URL and is inserted together with its outbox row in one transaction. With a
+        resume_validator resume bytes are validated first, and a streamed resume once it is staged, before the lead
+        is inserted.
+        """
+
+        if resume_validator is not None and isinstance(resume, bytes):
+            await resume_validator.validate(resume)
+
+        lead_exists = await cls._check_lead_exists(db_session, lead_data.email)
+        if lead_exists:
+            raise LeadServiceDuplicateLeadError(f'Lead with email {lead_data.email} already exists')
+
+        staged_path = await resume_upload_service.stage(resume)
+        try:
+            if resume_validator is not None and not isinstance(resume, bytes):
+                await resume_validator.validate(await resume_upload_service.read_staged(staged_path))
+            lead_id = uuid.uuid4()
+            lead = Lead(
+                id=lead_id,
+                first_name=lead_data.first_name,
+                last_name=lead_data.last_name,
+                email=lead_data.email,
+                resume_url=f'{PENDING_RESUME_URL_PREFIX}{lead_id}',
+                status=LeadStatus.REGISTERED,
+            )
+            db_session.add(lead)
+            await db_session.flush()
+            resume_upload_service.add_upload(db_session, lead_id=lead_id, staged_path=staged_path)
+            await db_session.commit()
+        except BaseException:
+            await resume_upload_service.remove_staged(staged_path)
+            raise
+
+        await db_session.refresh(lead)
+        return lead
+
     @classmethod
     async def get_leads_paginated(cls, db_session: AsyncSession, page: int, page_size: int) -> tuple[int, list[Lead]]:
         """Get paginated list of leads."""
@@ -126,6 +305,34 @@ class LeadService:
 
         return total, leads
 
+    @classmethod
+    async def claim_registered_leads(
+        cls, db_session: AsyncSession, after: tuple[dt.datetime, UUID] | None, limit: int
+    ) -> list[Lead]:
+        """Lock the oldest registered leads that no other transaction has locked, oldest first.
+
+        Leads locked by another worker are skipped rather than waited for, so workers claim disjoint chunks. The
+        claim holds until the transaction ends.
+
+        Args:
+            db_session: Database session
+            after: Creation time and ID of the last lead claimed by the caller, to claim only the ones after it
+            limit: Maximum number of leads to claim
+
+        Returns:
+            Claimed leads ordered by creation time and ID
+        """
+        query = sa.select(Lead).where(Lead.status == LeadStatus.REGISTERED)
+        if after is not None:
+            query = query.where(sa.tuple_(sm.col(Lead.created_at), sm.col(Lead.id)) > sa.tuple_(*after))
+        query = (
+            query.order_by(sm.col(Lead.created_at), sm.col(Lead.id))
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .execution_options(populate_existing=True)
+        )
+        return list((await db_session.execute(query)).scalars().all())
+
     @classmethod
     async def get_lead_by_id(cls, db_session: AsyncSession, lead_id: UUID) -> Lead | None:
         """Get a single lead by ID."""
@@ -136,13 +343,28 @@ class LeadService:
         )
 
     @classmethod
-    async def update_lead(cls, db_session: AsyncSession, lead_id: UUID, update_data: LeadUpdate) -> Lead:
-        """Update lead status and reach out information."""
-        lead = await get_model_by_id_or_none(
-            db_session=db_session,
-            db_model_class=Lead,
-            id_value=lead_id,
-        )
+    async def update_lead(
+        cls,
+        db_session: AsyncSession,
+        lead_id: UUID,
+        update_data: LeadUpdate,
+        event_writer: LeadEventWriter | None = None,
+        actor: str | None = None,
+    ) -> Lead:
+        """Update lead status and reach out information.
+
+        A status change is recorded in the lead history through event_writer after the update is committed. The
+        reached out lead counters of attorneys are moved in the same transaction.
+        """
+        # Locked and reloaded, so concurrent updates of the lead move the attorney counters one after another
+        lead = (
+            await db_session.execute(
+                sa.select(Lead)
+                .where(sm.col(Lead.id) == lead_id)
+                .with_for_update()
+                .execution_options(populate_existing=True)
+            )
+        ).scalar_one_or_none()
 
         if not lead:
             raise api_errors.HttpServiceException(
@@ -152,6 +374,8 @@ class LeadService:
 
         # Update only the allowed fields
         update_dict = update_data.model_dump(exclude_unset=True)
+        from_status = lead.status
+        from_attorney_id = cls._get_reached_out_attorney_id(lead)
 
         patched_fields = {'status', 'reached_out_by'}
         for field, value in update_dict.items():
@@ -161,7 +385,21 @@ class LeadService:
         # Update the updated_at timestamp
         lead.updated_at = dt.datetime.now(dt.UTC)
 
+        await AttorneyService.move_reached_out_lead(
+            db_session, from_attorney_id, cls._get_reached_out_attorney_id(lead)
+        )
         await db_session.commit()
         await db_session.refresh(lead)
 
+        if event_writer is not None and lead.status != from_status:
+            event_writer.enqueue(
+                LeadEventBase(
+                    lead_id=lead.id,
+                    from_status=from_status,
+                    to_status=lead.status,
+                    reached_out_by=lead.reached_out_by,
+                    actor=actor,
+                )
+            )
+
         return lead
@@ -0,0 +1,3 @@
+from .service import ResumeTextService
+
+__all__ = ['ResumeTextService']
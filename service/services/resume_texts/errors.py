@@ -0,0 +1,11 @@
+class ResumeTextBaseError(Exception):
+    pass
+
+
+class ResumeTextExtractionError(ResumeTextBaseError):
+    pass
+
+
+# Raised when a resume could not be processed for a reason unrelated to its content, e.g. a crashed worker
+class ResumeTextUnavailableError(ResumeTextBaseError):
+    pass
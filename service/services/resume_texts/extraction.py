@@ -0,0 +1,130 @@
+import html
+import io
+import re
+import zipfile
+import zlib
+from collections.abc import Iterator
+
+from service.services.resume_texts.errors import ResumeTextExtractionError
+from service.services.resume_validation.validators import PDF_MAGIC, ZIP_MAGIC
+from service.utils.time_limit import TimeLimitExceededError, call_with_time_limit
+
+# Streams are inflated up to this many bytes each, so a compression bomb cannot exhaust a worker's memory
+_MAX_PDF_STREAM_SIZE = 16 * 1024 * 1024
+_MAX_DOCX_DOCUMENT_SIZE = 64 * 1024 * 1024
+
+_PDF_STREAM_PATTERN = re.compile(rb'(?<!end)stream\r?\n(.*?)\r?\n?endstream', re.DOTALL)
+_PDF_TEXT_OBJECT_PATTERN = re.compile(rb'(?<![A-Za-z])BT(?![A-Za-z])(.*?)(?<![A-Za-z])ET(?![A-Za-z])', re.DOTALL)
+# Literal strings, numbers inside TJ arrays and the operators that move to a new word or line
+_PDF_TEXT_TOKEN_PATTERN = re.compile(
+    rb"\((?:\\.|[^\\)])*\)|-?\d*\.?\d+|(?<![A-Za-z])(?:T[dDm*]|TJ|Tj)(?![A-Za-z])|'|\"", re.DOTALL
+)
+_PDF_ESCAPE_PATTERN = re.compile(rb'\\([0-7]{1,3}|.)', re.DOTALL)
+_PDF_ESCAPES = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'\b', b'f': b'\f', b'\n': b''}
+# A TJ offset below this (in thousandths of a text unit) is wide enough to be a space between words
+_PDF_WORD_GAP = -200
+
+_DOCX_TOKEN_PATTERN = re.compile(rb'<w:t(?:\s[^>]*)?>([^<]*)</w:t>|<w:tab/>|<w:br/>|</w:p>')
+_WHITESPACE_PATTERN = re.compile(r'[ \t\r\f\v]+')
+_LINE_BREAK_PATTERN = re.compile(r'\s*\n\s*')
+
+
+def _unescape_pdf_string(literal: bytes) -> str:
+    def _replace(match: re.Match) -> bytes:
+        escape = match.group(1)
+        if escape[:1].isdigit():
+            return bytes([int(escape, 8) & 0xFF])
+        return _PDF_ESCAPES.get(escape, escape)
+
+    # Fonts with custom encodings cannot be decoded without their maps; latin-1 keeps the common ASCII text
+    return _PDF_ESCAPE_PATTERN.sub(_replace, literal[1:-1]).decode('latin-1')
+
+
+def _iter_pdf_streams(data: bytes) -> Iterator[bytes]:
+    for match in _PDF_STREAM_PATTERN.finditer(data):
+        # The stream dictionary follows the "obj" keyword of the object the stream belongs to
+        dictionary = data[max(match.start() - 512, 0) : match.start()]
+        dictionary = dictionary[dictionary.rfind(b'obj') :]
+        if b'/Filter' not in dictionary:
+            yield match.group(1)
+        elif b'/FlateDecode' in dictionary:
+            try:
+                yield zlib.decompressobj().decompress(match.group(1), _MAX_PDF_STREAM_SIZE)
+            except zlib.error:
+                continue
+
+
+def extract_pdf_text(data: bytes) -> str:
+    """Best-effort text of a PDF: literal strings shown by the text operators of its content streams."""
+    parts = []
+    for content in _iter_pdf_streams(data):
+        for text_object in _PDF_TEXT_OBJECT_PATTERN.finditer(content):
+            for token in _PDF_TEXT_TOKEN_PATTERN.finditer(text_object.group(1)):
+                value = token.group()
+                if value.startswith(b'('):
+                    parts.append(_unescape_pdf_string(value))
+                elif value in (b'Td', b'TD', b'Tm', b'T*', b"'", b'"'):
+                    parts.append('\n')
+                elif value in (b'Tj', b'TJ'):
+                    continue
+                elif float(value) < _PDF_WORD_GAP:
+                    parts.append(' ')
+            parts.append('\n')
+    return ''.join(parts)
+
+
+def extract_docx_text(data: bytes) -> str:
+    try:
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            if archive.getinfo('word/document.xml').file_size > _MAX_DOCX_DOCUMENT_SIZE:
+                raise ResumeTextExtractionError('Resume DOCX is too large')
+            document = archive.read('word/document.xml')
+    except (KeyError, zipfile.BadZipFile, zipfile.LargeZipFile, EOFError, NotImplementedError, ValueError) as e:
+        raise ResumeTextExtractionError(f'Resume DOCX is corrupted: {e}')
+
+    parts = []
+    for token in _DOCX_TOKEN_PATTERN.finditer(document):
+        if (text := token.group(1)) is not None:
+            parts.append(html.unescape(text.decode('utf-8', errors='replace')))
+        elif token.group() == b'<w:tab/>':
+            parts.append(' ')
+        else:
+            parts.append('\n')
+    return ''.join(parts)
+
+
+def _normalize(text: str, max_length: int) -> str:
+    # PostgreSQL text cannot hold NUL characters
+    text = text.replace('\x00', '')
+    text = _WHITESPACE_PATTERN.sub(' ', text)
+    text = _LINE_BREAK_PATTERN.sub('\n', text)
+    return text.strip()[:max_length]
+
+
+def extract_text(data: bytes, max_length: int) -> str:
+    """Extract the text of a PDF, DOCX or plain text resume, at most max_length characters of it.
+
+    Raises:
+        ResumeTextExtractionError: The resume is in another format or is corrupted
+    """
+    if data.startswith(ZIP_MAGIC):
+        text = extract_docx_text(data)
+    elif data.find(PDF_MAGIC, 0, 1024) >= 0:
+        text = extract_pdf_text(data)
+    else:
+        # Resumes stored before validation was introduced may be plain text
+        try:
+            text = data.decode('utf-8')
+        except UnicodeDecodeError:
+            raise ResumeTextExtractionError('Unsupported resume format')
+        if '\x00' in text:
+            raise ResumeTextExtractionError('Unsupported resume format')
+    return _normalize(text, max_length)
+
+
+def extract_text_with_time_limit(data: bytes, max_length: int, timeout: float) -> str:
+    """Run extract_text in a process pool worker, giving up after timeout seconds."""
+    try:
+        return call_with_time_limit(timeout, extract_text, data, max_length)
+    except TimeLimitExceededError:
+        raise ResumeTextExtractionError('Resume text extraction timed out')
@@ -0,0 +1,171 @@
+import asyncio
+import datetime as dt
+import logging
+import multiprocessing
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import sqlalchemy as sa
+import sqlmodel as sm
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from service.database.models.leads import Lead
+from service.database.models.resume_texts import RESUME_TEXT_SEARCH_CONFIG, ResumeText, ResumeTextState
+from service.services.resume_texts.errors import ResumeTextUnavailableError
+from service.services.resume_texts.extraction import extract_text_with_time_limit
+from service.services.resume_uploads.service import PENDING_RESUME_URL_PREFIX
+from service.settings import ResumeTextSettings
+from service.utils.date_utils import get_utc_now
+
+logger = logging.getLogger(__name__)
+
+
+class ResumeTextService:
+    """Extracts resume text in a bounded process pool and searches leads by it."""
+
+    def __init__(self, settings: ResumeTextSettings):
+        self._settings = settings
+        self._executor: ProcessPoolExecutor | None = None
+
+    async def start(self) -> None:
+        # Workers are started on the first extraction, so processes that never extract do not pay for them
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._settings.extraction_workers, mp_context=multiprocessing.get_context('spawn')
+            )
+
+    async def stop(self) -> None:
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+    async def extract(self, data: bytes) -> str:
+        """Extract the text of a resume in a worker process.
+
+        Raises:
+            ResumeTextExtractionError: The resume format is not supported, it is corrupted or its extraction took longer
+                than extraction_timeout seconds in the worker
+            ResumeTextUnavailableError: A worker crashed; the resume may be extracted by a later attempt
+        """
+        if self._executor is None:
+            raise RuntimeError('ResumeTextService is not started')
+
+        executor = self._executor
+        try:
+            # Only the run in the worker is timed: a resume waiting behind the rest of a batch has not failed
+            return await asyncio.get_running_loop().run_in_executor(
+                executor,
+                extract_text_with_time_limit,
+                data,
+                self._settings.max_content_length,
+                self._settings.extraction_timeout,
+            )
+        except BrokenProcessPool as e:
+            logger.error(f'Resume text extraction worker crashed: {e!s}')
+            if self._executor is executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+                await self.start()
+            raise ResumeTextUnavailableError('Resume text extraction is unavailable')
+
+    @staticmethod
+    def encode_position(lead: Lead) -> str:
+        return f'{lead.updated_at.isoformat()}|{lead.id}'
+
+    @staticmethod
+    def decode_position(position: str) -> tuple[dt.datetime, uuid.UUID]:
+        updated_at, lead_id = position.split('|')
+        return dt.datetime.fromisoformat(updated_at), uuid.UUID(lead_id)
+
+    @classmethod
+    async def get_leads_to_index(
+        cls, db_session: AsyncSession, position: str | None, updated_before: dt.datetime, limit: int
+    ) -> list[Lead]:
+        """Get leads after position, in (updated_at, id) order, whose uploaded resume has not been indexed yet.
+
+        Leads updated at or after updated_before are left for a later run, so rows of transactions that commit late
+        are not skipped.
+        """
+        query = (
+            sa.select(Lead)
+            .outerjoin(ResumeText, sm.col(ResumeText.lead_id) == sm.col(Lead.id))
+            .where(
+                sm.col(Lead.updated_at) < updated_before,
+                sa.not_(sm.col(Lead.resume_url).startswith(PENDING_RESUME_URL_PREFIX)),
+                sa.or_(
+                    sm.col(ResumeText.lead_id).is_(None),
+                    sm.col(ResumeText.resume_url) != sm.col(Lead.resume_url),
+                ),
+            )
+            .order_by(sm.col(Lead.updated_at).asc(), sm.col(Lead.id).asc())
+            .limit(limit)
+        )
+        if position is not None:
+            updated_at, lead_id = cls.decode_position(position)
+            query = query.where(sa.tuple_(sm.col(Lead.updated_at), sm.col(Lead.id)) > sa.tuple_(updated_at, lead_id))
+        return list((await db_session.execute(query)).scalars().all())
+
+    @classmethod
+    async def save_texts(cls, db_session: AsyncSession, texts: list[ResumeText]) -> None:
+        """Insert or replace the texts of leads in one statement; the session is not committed."""
+        if not texts:
+            return
+
+        now = get_utc_now()
+        rows = [
+            {
+                'lead_id': text.lead_id,
+                'resume_url': text.resume_url,
+                'state': text.state,
+                'content': text.content,
+                'error': text.error,
+                'created_at': now,
+                'updated_at': now,
+            }
+            for text in texts
+        ]
+        statement = pg_insert(ResumeText).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=['lead_id'],
+            set_={
+                'resume_url': statement.excluded.resume_url,
+                'state': statement.excluded.state,
+                'content': statement.excluded.content,
+                'error': statement.excluded.error,
+                'updated_at': statement.excluded.updated_at,
+            },
+        )
+        await db_session.execute(statement)
+
+    @classmethod
+    async def search_leads(
+        cls, db_session: AsyncSession, query: str, offset: int, limit: int
+    ) -> list[tuple[Lead, float]]:
+        """Search leads by the text of their resumes, best matches first.
+
+        Args:
+            db_session: Database session
+            query: Web search style query: words, "quoted phrases", OR and -excluded words
+            offset: Number of matches to skip
+            limit: Maximum number of matches to return
+
+        Returns:
+            Leads with the rank of their resume
+        """
+        ts_query = sa.func.websearch_to_tsquery(sa.cast(RESUME_TEXT_SEARCH_CONFIG, REGCONFIG), query)
+        rank = sa.func.ts_rank_cd(sm.col(ResumeText.search_vector), ts_query).label('rank')
+        statement = (
+            sa.select(Lead, rank)
+            .join(ResumeText, sm.col(ResumeText.lead_id) == sm.col(Lead.id))
+            .where(
+                sm.col(ResumeText.state) == ResumeTextState.INDEXED,
+                sm.col(ResumeText.search_vector).op('@@')(ts_query),
+            )
+            .order_by(rank.desc(), sm.col(Lead.id).asc())
+            .offset(offset)
+            .limit(limit)
+        )
+        return [(lead, float(lead_rank)) for lead, lead_rank in (await db_session.execute(statement)).all()]
@@ -0,0 +1,3 @@
+from .service import ResumeUploadService
+
+__all__ = ['ResumeUploadService']
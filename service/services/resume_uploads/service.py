@@ -0,0 +1,138 @@
+import asyncio
+import datetime as dt
+import logging
+import pathlib
+import uuid
+from collections.abc import AsyncIterable, AsyncIterator
+
+import sqlalchemy as sa
+import sqlmodel as sm
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from service.database.models.leads import Lead
+from service.database.models.resume_uploads import ResumeUpload, ResumeUploadState
+from service.settings import ResumeSettings
+from service.utils.date_utils import get_utc_now
+
+logger = logging.getLogger(__name__)
+
+PENDING_RESUME_URL_PREFIX = 'pending://'
+
+
+class ResumeUploadService:
+    """Transactional outbox for resumes that are uploaded to blob storage outside the request."""
+
+    def __init__(self, resume_settings: ResumeSettings):
+        self._settings = resume_settings
+
+    @property
+    def staging_dir(self) -> pathlib.Path:
+        return pathlib.Path(self._settings.staging_dir)
+
+    async def stage(self, resume: bytes | AsyncIterable[bytes]) -> str:
+        """Write the resume to a new file in the staging directory.
+
+        Args:
+            resume: Resume bytes or an async stream of resume chunks
+
+        Returns:
+            Path of the staged file
+        """
+        await asyncio.to_thread(self.staging_dir.mkdir, parents=True, exist_ok=True)
+        staged_path = self.staging_dir / uuid.uuid4().hex
+        staged_file = await asyncio.to_thread(staged_path.open, 'wb')
+        try:
+            if isinstance(resume, bytes):
+                await asyncio.to_thread(staged_file.write, resume)
+            else:
+                async for chunk in resume:
+                    await asyncio.to_thread(staged_file.write, chunk)
+        except BaseException:
+            await asyncio.to_thread(staged_file.close)
+            await self.remove_staged(str(staged_path))
+            raise
+        await asyncio.to_thread(staged_file.close)
+        return str(staged_path)
+
+    async def iter_staged(self, staged_path: str) -> AsyncIterator[bytes]:
+        """Read a staged resume in chunks without blocking the event loop."""
+        staged_file = await asyncio.to_thread(open, staged_path, 'rb')
+        try:
+            while chunk := await asyncio.to_thread(staged_file.read, self._settings.staging_chunk_size):
+                yield chunk
+        finally:
+            await asyncio.to_thread(staged_file.close)
+
+    async def read_staged(self, staged_path: str) -> bytes:
+        """Read a whole staged resume; its size is bounded by the request body limit."""
+        return await asyncio.to_thread(pathlib.Path(staged_path).read_bytes)
+
+    async def remove_staged(self, staged_path: str) -> None:
+        await asyncio.to_thread(pathlib.Path(staged_path).unlink, missing_ok=True)
+
+    @classmethod
+    def add_upload(cls, db_session: AsyncSession, lead_id: uuid.UUID, staged_path: str) -> ResumeUpload:
+        """Add an outbox row to the session; it is committed together with the lead."""
+        upload = ResumeUpload(
+            id=uuid.uuid4(),
+            lead_id=lead_id,
+            staged_path=staged_path,
+            state=ResumeUploadState.PENDING,
+        )
+        db_session.add(upload)
+        return upload
+
+    async def claim_due_uploads(self, db_session: AsyncSession, limit: int) -> list[ResumeUpload]:
+        """Claim pending uploads that are due and hide them from other workers for the lease timeout.
+
+        The attempt is counted at claim time, so uploads interrupted by a crash still move towards max attempts.
+        """
+        now = get_utc_now()
+        query = (
+            sa.select(ResumeUpload)
+            .where(
+                ResumeUpload.state == ResumeUploadState.PENDING,
+                sm.col(ResumeUpload.next_attempt_at) <= now,
+            )
+            .order_by(sm.col(ResumeUpload.next_attempt_at).asc())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        uploads = list((await db_session.execute(query)).scalars().all())
+        for upload in uploads:
+            upload.attempts += 1
+            upload.next_attempt_at = now + dt.timedelta(seconds=self._settings.upload_lease_timeout)
+            upload.updated_at = now
+        await db_session.commit()
+        return uploads
+
+    @classmethod
+    async def complete_upload(cls, db_session: AsyncSession, upload: ResumeUpload, resume_url: str) -> None:
+        """Fill in the lead resume URL and mark the upload as done in one transaction."""
+        now = get_utc_now()
+        await db_session.execute(
+            sa.update(Lead).where(sm.col(Lead.id) == upload.lead_id).values(resume_url=resume_url, updated_at=now)
+        )
+        await db_session.execute(
+            sa.update(ResumeUpload)
+            .where(sm.col(ResumeUpload.id) == upload.id)
+            .values(state=ResumeUploadState.DONE, last_error=None, updated_at=now)
+        )
+        await db_session.commit()
+
+    def get_retry_delay(self, attempts: int) -> float:
+        """Capped exponential backoff for the given number of attempts made so far."""
+        delay = self._settings.upload_retry_base_delay * 2 ** max(attempts - 1, 0)
+        return min(delay, self._settings.upload_retry_max_delay)
+
+    async def fail_upload(self, db_session: AsyncSession, upload: ResumeUpload, error: str) -> None:
+        """Reschedule a failed upload with backoff, or give up after the maximum number of attempts."""
+        now = get_utc_now()
+        values = {'last_error': error, 'updated_at': now}
+        if upload.attempts >= self._settings.upload_max_attempts:
+            values['state'] = ResumeUploadState.FAILED
+            logger.error(f'Resume upload {upload.id} failed after {upload.attempts} attempts: {error}')
+        else:
+            values['next_attempt_at'] = now + dt.timedelta(seconds=self.get_retry_delay(upload.attempts))
+        await db_session.execute(sa.update(ResumeUpload).where(sm.col(ResumeUpload.id) == upload.id).values(**values))
+        await db_session.commit()
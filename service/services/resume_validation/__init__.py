@@ -0,0 +1,3 @@
+from .service import ResumeValidationMetrics, ResumeValidationService
+
+__all__ = ['ResumeValidationMetrics', 'ResumeValidationService']
@@ -0,0 +1,16 @@
+class ResumeValidationBaseError(Exception):
+    pass
+
+
+class ResumeValidationError(ResumeValidationBaseError):
+    pass
+
+
+# Raised when checking the resume itself takes too long, which only a pathological document does
+class ResumeValidationTimeoutError(ResumeValidationError):
+    pass
+
+
+# Raised when the resume is neither accepted nor rejected: it waited too long for a worker or a worker crashed
+class ResumeValidationUnavailableError(ResumeValidationBaseError):
+    pass
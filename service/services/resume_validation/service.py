@@ -0,0 +1,168 @@
+import asyncio
+import dataclasses
+import logging
+import multiprocessing
+from collections.abc import AsyncIterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from service.services.resume_validation.errors import (
+    ResumeValidationError,
+    ResumeValidationTimeoutError,
+    ResumeValidationUnavailableError,
+)
+from service.services.resume_validation.validators import (
+    PDF_HEADER_WINDOW,
+    ResumeValidationResult,
+    sniff_resume,
+    validate_resume_with_time_limit,
+)
+from service.settings import ResumeSettings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class ResumeValidationMetrics:
+    accepted: int = 0
+    rejected: int = 0
+    timeouts: int = 0
+    refused: int = 0  # not validated because max_pending resumes were already in flight
+    worker_failures: int = 0
+    pending: int = 0  # resumes queued or being validated right now
+    max_pending: int = 0  # the highest pending seen
+
+
+class ResumeValidationService:
+    """Validates resume content in a bounded process pool, so CPU-bound checks never block the event loop.
+
+    Validation fails closed: a resume whose check runs longer than validation_timeout is rejected, and one that
+    waits longer than validation_timeout for a worker is refused as unavailable. When more than
+    validation_max_pending resumes are in flight new ones are refused instead of queueing without bound.
+    """
+
+    def __init__(self, resume_settings: ResumeSettings):
+        self._settings = resume_settings
+        self._executor: ProcessPoolExecutor | None = None
+        self.metrics = ResumeValidationMetrics()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of resumes waiting for a free worker."""
+        return max(self.metrics.pending - self._settings.validation_workers, 0)
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        # Forking a process that runs an event loop and its threads is unsafe, so workers are spawned
+        return ProcessPoolExecutor(
+            max_workers=self._settings.validation_workers, mp_context=multiprocessing.get_context('spawn')
+        )
+
+    async def start(self) -> None:
+        # Workers are started on the first validation, not here
+        if self._settings.validation_enabled and self._executor is None:
+            self._executor = self._create_executor()
+
+    async def stop(self) -> None:
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+    async def _wait_for_verdict(self, submitted: Future) -> ResumeValidationResult:
+        future = asyncio.wrap_future(submitted)
+        done, _ = await asyncio.wait({future}, timeout=self._settings.validation_timeout)
+        # A resume still waiting for a worker says nothing about the file, the pool is overloaded
+        if not done and not submitted.cancel():
+            # Already being validated: the worker stops itself after the same time limit with a verdict
+            done, _ = await asyncio.wait({future}, timeout=self._settings.validation_timeout)
+        if not done:
+            raise ResumeValidationUnavailableError('Resume validation is overloaded')
+        return future.result()
+
+    async def validate(self, data: bytes) -> ResumeValidationResult | None:
+        """Check that the resume is a well-formed PDF or DOCX document within the page limit.
+
+        Args:
+            data: The resume bytes
+
+        Returns:
+            The detected content type and page count, None if validation is disabled
+
+        Raises:
+            ResumeValidationError: The resume is rejected, ResumeValidationTimeoutError if checking it took too long
+            ResumeValidationUnavailableError: Too many resumes are in flight, the resume waited too long for a
+                worker or a worker crashed
+        """
+        if not self._settings.validation_enabled:
+            return None
+        if self._executor is None:
+            raise RuntimeError('ResumeValidationService is not started')
+        if self.metrics.pending >= self._settings.validation_max_pending:
+            self.metrics.refused += 1
+            raise ResumeValidationUnavailableError('Resume validation is overloaded')
+
+        executor = self._executor
+        self.metrics.pending += 1
+        self.metrics.max_pending = max(self.metrics.max_pending, self.metrics.pending)
+        try:
+            submitted = executor.submit(
+                validate_resume_with_time_limit,
+                data,
+                self._settings.validation_max_pages,
+                self._settings.validation_max_uncompressed_size,
+                self._settings.validation_timeout,
+            )
+            try:
+                result = await self._wait_for_verdict(submitted)
+            finally:
+                # A cancelled request does not leave its resume queued
+                submitted.cancel()
+        except (ResumeValidationTimeoutError, ResumeValidationUnavailableError):
+            self.metrics.timeouts += 1
+            raise
+        except ResumeValidationError:
+            self.metrics.rejected += 1
+            raise
+        except BrokenProcessPool as e:
+            self.metrics.worker_failures += 1
+            logger.error(f'Resume validation worker crashed: {e!s}')
+            # Every pending validation of a broken pool fails; only the first one replaces it
+            if self._executor is executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._create_executor()
+            raise ResumeValidationUnavailableError('Resume validation is unavailable')
+        finally:
+            self.metrics.pending -= 1
+
+        self.metrics.accepted += 1
+        return result
+
+    async def sniff_stream(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """Check the format of a streamed resume from its first bytes and return the whole stream.
+
+        Only the magic bytes are checked, as the rest of the document has not arrived yet; this is cheap enough to
+        run in the event loop. Resumes that can be read in full are checked by validate instead.
+
+        Raises:
+            ResumeValidationError: The resume is neither a PDF nor a DOCX document
+        """
+        if not self._settings.validation_enabled:
+            return chunks
+
+        head = b''
+        async for chunk in chunks:
+            head += chunk
+            if len(head) >= PDF_HEADER_WINDOW:
+                break
+        try:
+            sniff_resume(head)
+        except ResumeValidationError:
+            self.metrics.rejected += 1
+            raise
+        return _prepend(head, chunks)
+
+
+async def _prepend(head: bytes, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    if head:
+        yield head
+    async for chunk in chunks:
+        yield chunk
@@ -0,0 +1,112 @@
+import dataclasses
+import enum
+import io
+import re
+import zipfile
+
+from service.services.resume_validation.errors import ResumeValidationError, ResumeValidationTimeoutError
+from service.utils.time_limit import TimeLimitExceededError, call_with_time_limit
+
+PDF_MAGIC = b'%PDF-'
+ZIP_MAGIC = b'PK\x03\x04'
+
+# The PDF header may be preceded by garbage and the trailer followed by it, within these limits
+PDF_HEADER_WINDOW = 1024
+_PDF_TRAILER_WINDOW = 1024
+
+_PDF_PAGE_PATTERN = re.compile(rb'/Type\s*/Page(?![A-Za-z])')
+_PDF_PAGE_COUNT_PATTERN = re.compile(rb'/Type\s*/Pages\b[^>]*?/Count\s+(\d+)|/Count\s+(\d+)[^>]*?/Type\s*/Pages\b')
+_DOCX_PAGES_PATTERN = re.compile(rb'<Pages>(\d+)</Pages>')
+_DOCX_REQUIRED_MEMBERS = ('[Content_Types].xml', 'word/document.xml')
+
+
+class ResumeContentType(str, enum.Enum):
+    PDF = 'application/pdf'
+    DOCX = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+    def __str__(self) -> str:
+        return self.value
+
+
+@dataclasses.dataclass(frozen=True)
+class ResumeValidationResult:
+    content_type: ResumeContentType
+    page_count: int | None  # None when the document does not state it
+
+
+def _count_pdf_pages(data: bytes) -> int | None:
+    # Page objects are only visible in uncompressed PDFs; the page tree root states the total in its /Count
+    page_count = len(_PDF_PAGE_PATTERN.findall(data))
+    for match in _PDF_PAGE_COUNT_PATTERN.finditer(data):
+        page_count = max(page_count, int(match.group(1) or match.group(2)))
+    return page_count or None
+
+
+def validate_pdf(data: bytes, max_pages: int) -> ResumeValidationResult:
+    if data.find(PDF_MAGIC, 0, PDF_HEADER_WINDOW) < 0:
+        raise ResumeValidationError('Resume is not a PDF document')
+    if data.find(b'%%EOF', max(len(data) - _PDF_TRAILER_WINDOW, 0)) < 0:
+        raise ResumeValidationError('Resume PDF is truncated')
+
+    page_count = _count_pdf_pages(data)
+    if page_count is not None and page_count > max_pages:
+        raise ResumeValidationError(f'Resume exceeds the maximum of {max_pages} pages')
+    return ResumeValidationResult(content_type=ResumeContentType.PDF, page_count=page_count)
+
+
+def validate_docx(data: bytes, max_pages: int, max_uncompressed_size: int) -> ResumeValidationResult:
+    try:
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            members = archive.infolist()
+            names = {member.filename for member in members}
+            if not all(name in names for name in _DOCX_REQUIRED_MEMBERS):
+                raise ResumeValidationError('Resume is not a DOCX document')
+            # Checked before anything is decompressed, so a zip bomb is rejected cheaply
+            if sum(member.file_size for member in members) > max_uncompressed_size:
+                raise ResumeValidationError('Resume DOCX is too large when uncompressed')
+            if archive.testzip() is not None:
+                raise ResumeValidationError('Resume DOCX is corrupted')
+            app_properties = archive.read('docProps/app.xml') if 'docProps/app.xml' in names else b''
+    except (zipfile.BadZipFile, zipfile.LargeZipFile, EOFError, NotImplementedError, ValueError) as e:
+        raise ResumeValidationError(f'Resume DOCX is corrupted: {e}')
+
+    page_count = None
+    if match := _DOCX_PAGES_PATTERN.search(app_properties):
+        page_count = int(match.group(1))
+        if page_count > max_pages:
+            raise ResumeValidationError(f'Resume exceeds the maximum of {max_pages} pages')
+    return ResumeValidationResult(content_type=ResumeContentType.DOCX, page_count=page_count)
+
+
+def sniff_resume(head: bytes) -> ResumeContentType:
+    """Detect the resume format from the magic bytes at the start of the document.
+
+    Raises:
+        ResumeValidationError: The resume is neither a PDF nor a DOCX document
+    """
+    if head.startswith(ZIP_MAGIC):
+        return ResumeContentType.DOCX
+    if head.find(PDF_MAGIC, 0, PDF_HEADER_WINDOW) >= 0:
+        return ResumeContentType.PDF
+    raise ResumeValidationError('Resume must be a PDF or DOCX document')
+
+
+def validate_resume(data: bytes, max_pages: int, max_uncompressed_size: int) -> ResumeValidationResult:
+    """Sniff the resume format from its magic bytes and check the document structure and page count.
+
+    Raises:
+        ResumeValidationError: The resume is not a well-formed PDF or DOCX document within the limits
+    """
+    if sniff_resume(data) is ResumeContentType.DOCX:
+        return validate_docx(data, max_pages, max_uncompressed_size)
+    return validate_pdf(data, max_pages)
+
+
+def validate_resume_with_time_limit(
+    data: bytes, max_pages: int, max_uncompressed_size: int, timeout: float
+) -> ResumeValidationResult:
+    """Run validate_resume in a process pool worker, giving up after timeout seconds."""
+    try:
+        return call_with_time_limit(timeout, validate_resume, data, max_pages, max_uncompressed_size)
+    except TimeLimitExceededError:
+        raise ResumeValidationTimeoutError('Resume validation timed out')
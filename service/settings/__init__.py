@@ -4,7 +4,13 @@ from typing import Literal, cast
 from pydantic import SecretBytes, HttpUrl
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from service.settings.blob_gc_settings import BlobGcSettings  # noqa
+from service.settings.blob_storage_settings import BlobStorageSettings  # noqa
 from service.settings.database_settings import DatabaseSettings  # noqa
+from service.settings.email_settings import EmailSettings  # noqa
+from service.settings.lead_event_settings import LeadEventSettings  # noqa
+from service.settings.resume_settings import ResumeSettings  # noqa
+from service.settings.resume_text_settings import ResumeTextSettings  # noqa
 from service.settings.scheduler_settings import SchedulerSettings  # noqa
 
 
@@ -0,0 +1,10 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class BlobGcSettings(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix='BLOB_GC_')
+
+    grace_period: float = 24 * 3600.0  # seconds; blobs stored or uploaded again more recently are kept
+    batch_size: int = 1000  # blob keys anti-joined against leads in one query
+    max_batches_per_run: int = 100  # caps the work of one scheduled run
+    io_budget: float = 500.0  # storage operations per second, blobs listed plus blobs deleted; 0 disables pacing
@@ -0,0 +1,57 @@
+from typing import Literal
+
+from pydantic import SecretStr
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class BlobStorageSettings(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix='BLOB_STORAGE_')
+
+    # fake: fabricated URLs and random bytes; local: files on disk under local_dir; http: an HTTP object store
+    backend: Literal['fake', 'local', 'http'] = 'fake'
+
+    # local_dir must be shared between the web app and the scheduler
+    local_dir: str = '/tmp/blob-storage'
+    local_shard_depth: int = 2  # levels of two-hex-digit directories above each blob
+    read_chunk_size: int = 256 * 1024
+
+    # Pack segments of the local backend: the compact_blob_storage job moves small and aged blobs out of their own
+    # files into large append-only segment files
+    pack_segment_size: int = 1024 * 1024 * 1024
+    pack_small_blob_size: int = 256 * 1024  # stored bytes
+    pack_min_age: float = 3600.0  # seconds before a small blob is packed
+    pack_aged_blob_age: float = 30 * 24 * 3600.0  # seconds before a blob of any size is packed
+    pack_max_blobs_per_run: int = 10_000
+    pack_max_dead_ratio: float = 0.5  # older segments with a larger share of deleted blobs are rewritten
+
+    # HTTP object store; one pooled client is shared by all calls of a process
+    http_base_url: str = 'http://blob-storage:8080/blobs'
+    http_auth_token: SecretStr | None = None
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 60.0  # seconds an idle connection is kept open
+    http_connect_timeout: float = 5.0  # seconds
+    http_pool_timeout: float = 5.0  # seconds to wait for a free connection
+
+    # In-process cache for get; 0 disables it
+    cache_max_bytes: int = 64 * 1024 * 1024
+    cache_max_item_size: int = 2 * 1024 * 1024  # larger blobs bypass the cache
+
+    # Compression of stored blobs; zstd falls back to gzip when zstandard is not installed
+    compression_codec: Literal['zstd', 'gzip', 'none'] = 'zstd'
+    compression_level: int = 3
+    compression_min_size: int = 4 * 1024  # smaller blobs are stored as is
+
+    # Resilience of calls to the backend
+    resilience_enabled: bool = True
+    call_timeout: float = 30.0  # seconds per attempt
+    deadline: float = 60.0  # seconds per call, retries included
+    retry_max_attempts: int = 3
+    retry_base_delay: float = 0.1  # seconds
+    retry_max_delay: float = 2.0  # seconds
+    hedge_enabled: bool = True
+    hedge_delay: float = 0.5  # seconds before a duplicate read until enough latencies are sampled for the p95
+    hedge_min_samples: int = 20
+    hedge_latency_window: int = 200
+    circuit_failure_threshold: int = 5  # consecutive failed calls
+    circuit_reset_timeout: float = 30.0  # seconds before a trial call is let through
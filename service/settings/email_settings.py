@@ -0,0 +1,39 @@
+from typing import Literal
+
+from pydantic import Field, SecretStr
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class EmailSettings(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix='EMAIL_')
+
+    # log: emails are only logged; smtp: emails are sent through the SMTP server at smtp_host
+    backend: Literal['log', 'smtp'] = 'log'
+    subject: str = 'Your application'  # for emails sent without a template
+
+    # Template of the outreach email to registered leads; None renders its latest version
+    outreach_template: str = 'lead_outreach'
+    outreach_template_version: int | None = None
+
+    smtp_host: str = 'localhost'
+    smtp_port: int = 587
+    smtp_username: str | None = None
+    smtp_password: SecretStr | None = None
+    smtp_use_tls: bool = False  # TLS from the first byte, usually on port 465
+    smtp_start_tls: bool | None = None  # None upgrades with STARTTLS when the server offers it
+    smtp_timeout: float = 10.0  # seconds per SMTP command
+
+    # Authenticated SMTP sessions are pooled per process and each one carries many messages
+    pool_size: int = Field(default=10, gt=0)
+    pool_timeout: float = 30.0  # seconds to wait for a free connection
+    max_messages_per_connection: int = 100  # servers often end a session after a number of messages
+    health_check_interval: float = 30.0  # seconds a connection stays idle before it is checked with NOOP
+    idle_timeout: float = 300.0  # seconds before an idle connection is closed
+    send_attempts: int = Field(default=2, gt=0)  # a failed connection is replaced and the message sent again
+
+    # Outbox of emails queued by send_emails_to_leads and sent by dispatch_outbox_emails
+    outbox_batch_size: int = Field(default=100, gt=0)
+    outbox_max_attempts: int = 8
+    outbox_retry_base_delay: float = 60.0  # seconds
+    outbox_retry_max_delay: float = 6 * 3600.0  # seconds
+    outbox_lease_timeout: float = 300.0  # seconds a claimed email stays invisible to other workers
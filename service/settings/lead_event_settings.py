@@ -0,0 +1,9 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class LeadEventSettings(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix='LEAD_EVENTS_')
+
+    flush_size: int = 500
+    flush_interval: float = 1.0  # seconds
+    max_buffer_size: int = 10000  # events kept for retry when the database is unavailable
@@ -0,0 +1,37 @@
+import math
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class ResumeSettings(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix='RESUME_')
+
+    max_size: int = 10 * 1024 * 1024  # 10MB of decoded resume bytes
+    base64_decode_chunk_size: int = 64 * 1024
+    request_overhead_size: int = 64 * 1024  # Other lead fields, JSON or multipart framing
+    download_cache_max_age: int = 3600  # seconds clients may reuse a downloaded resume
+
+    # Validation of resume content in a process pool; resumes that time out are rejected
+    validation_enabled: bool = True
+    validation_workers: int = 2
+    validation_max_pending: int = 64  # resumes queued or being validated before new ones are refused
+    validation_timeout: float = 5.0  # seconds a resume may wait for a worker, and then take to be checked
+    validation_max_pages: int = 50
+    validation_max_uncompressed_size: int = 100 * 1024 * 1024  # DOCX members in total
+
+    # Deferred upload: stage resumes on local disk and upload them from the scheduler.
+    # staging_dir must be shared between the web app and the scheduler.
+    deferred_upload_enabled: bool = False
+    staging_dir: str = '/tmp/resume-staging'
+    staging_chunk_size: int = 256 * 1024
+    upload_batch_size: int = 100
+    upload_concurrency: int = 4
+    upload_max_attempts: int = 5
+    upload_retry_base_delay: float = 30.0  # seconds
+    upload_retry_max_delay: float = 3600.0  # seconds
+    upload_lease_timeout: float = 300.0  # seconds a claimed upload stays invisible to other workers
+
+    @property
+    def max_request_body_size(self) -> int:
+        # base64 inflates the payload by 4/3
+        return 4 * math.ceil(self.max_size / 3) + self.request_overhead_size
@@ -0,0 +1,13 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class ResumeTextSettings(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix='RESUME_TEXTS_')
+
+    extraction_workers: int = 2
+    extraction_timeout: float = 30.0  # seconds a worker may spend on one resume, not counting the queue
+    fetch_concurrency: int = 4  # resumes downloaded from blob storage at once
+    batch_size: int = 50  # leads extracted and committed together with the checkpoint
+    max_batches_per_run: int = 20  # caps the work of one scheduled run during a backfill
+    settle_delay: float = 60.0  # seconds; leads updated more recently wait for the next run
+    max_content_length: int = 100_000  # characters of extracted text kept per resume
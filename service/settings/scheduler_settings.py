@@ -8,6 +8,29 @@ class SchedulerSettings(BaseSettings):
 
     send_emails_enabled: bool = True
     send_emails_schedule: str = Field(default='0/30 * * * *')  # Every 30 minutes
+    # Registered leads claimed, assigned and queued in the email outbox together; a crashed run loses at most one
+    # chunk of progress
+    send_emails_chunk_size: int = Field(default=100, gt=0)
+
+    dispatch_emails_enabled: bool = True
+    dispatch_emails_schedule: str = Field(default='* * * * *')  # Every minute
+    # Outbox emails in flight at a time; throughput is about this many divided by the latency of the mail provider
+    send_emails_concurrency: int = Field(default=10, gt=0)
+
+    upload_resumes_enabled: bool = True
+    upload_resumes_schedule: str = Field(default='* * * * *')  # Every minute
+
+    index_resume_texts_enabled: bool = True
+    index_resume_texts_schedule: str = Field(default='* * * * *')  # Every minute
+
+    compact_blob_storage_enabled: bool = True
+    compact_blob_storage_schedule: str = Field(default='15 * * * *')  # Every hour
+
+    collect_orphaned_blobs_enabled: bool = True
+    collect_orphaned_blobs_schedule: str = Field(default='45 * * * *')  # Every hour
+
+    reconcile_attorney_workloads_enabled: bool = True
+    reconcile_attorney_workloads_schedule: str = Field(default='30 3 * * *')  # Every day at 03:30
 
     class Config:
         env_prefix = 'SCHEDULER_'
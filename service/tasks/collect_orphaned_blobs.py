@@ -0,0 +1,84 @@
+import asyncio
+import datetime as dt
+import logging
+import pathlib
+
+from service.container import MainContainer
+from service.database import get_session_context
+from service.services.job_checkpoints import JobCheckpointService
+from service.utils.date_utils import get_utc_now
+from service.utils.decorators import set_context_for_scheduled
+from service.utils.throttle import IoBudget
+
+logger = logging.getLogger(__name__)
+
+JOB_NAME = 'collect_orphaned_blobs'
+
+
+@set_context_for_scheduled
+async def collect_orphaned_blobs(container: MainContainer) -> None:
+    """
+    Delete blobs that no lead references, such as resumes uploaded by requests that failed afterwards.
+
+    Blob keys are listed in order a batch at a time and anti-joined against leads.resume_url. Only blobs not stored
+    or uploaded again within the grace period are deleted, so uploads whose lead is not committed yet are kept.
+    Each batch is committed together with the job checkpoint, the run is paced by the I/O budget, and once all
+    keys have been walked the next run starts over.
+    """
+    settings = container.blob_gc_settings
+    budget = IoBudget(settings.io_budget)
+    listed_count = deleted_count = 0
+    for _ in range(settings.max_batches_per_run):
+        async with get_session_context(container.database) as db_session:
+            checkpoint = await JobCheckpointService.acquire(db_session, JOB_NAME)
+            if checkpoint is None:
+                logger.info('Orphaned blobs are being collected by another worker')
+                return
+
+            blobs = await container.blob_storage_service.list_blobs(checkpoint.position, settings.batch_size)
+            if blobs is None:
+                logger.info('Orphaned blobs are not collected: blob storage cannot list its blobs')
+                return
+            if not blobs:
+                JobCheckpointService.advance(checkpoint, None)
+                await db_session.commit()
+                logger.info('All blobs have been checked, the next run starts over')
+                break
+
+            updated_before = get_utc_now() - dt.timedelta(seconds=settings.grace_period)
+            candidate_urls = [blob.url for blob in blobs if blob.updated_at < updated_before]
+            orphan_urls = await container.blob_gc_service.find_orphans(db_session, candidate_urls)
+            for url in orphan_urls:
+                if await container.blob_storage_service.delete_orphan(url, updated_before):
+                    deleted_count += 1
+
+            JobCheckpointService.advance(checkpoint, blobs[-1].key)
+            await db_session.commit()
+            listed_count += len(blobs)
+
+        # Outside the transaction, so the checkpoint is not held while waiting
+        await budget.spend(len(blobs) + len(orphan_urls))
+
+    logger.info(f'Checked {listed_count} blobs, deleted {deleted_count} orphaned blobs')
+
+
+async def run_task():
+    from service.utils.loggers import prepare_logger
+
+    async with MainContainer() as container:
+        prepare_logger(app_settings=container.app_settings)
+        await collect_orphaned_blobs(container)
+
+
+if __name__ == '__main__':
+    from dotenv import load_dotenv
+
+    from service import settings
+
+    base_path = pathlib.Path(__file__)
+
+    if settings.ENVIRONMENT == 'dev':
+        load_dotenv(base_path.parent.parent.parent / 'configs/.env.dev')
+        load_dotenv(base_path.parent.parent.parent / 'configs/overrides/.env.dev', override=True)
+
+    asyncio.run(run_task())
@@ -0,0 +1,47 @@
+import asyncio
+import logging
+import pathlib
+
+from service.container import MainContainer
+from service.utils.decorators import set_context_for_scheduled
+
+logger = logging.getLogger(__name__)
+
+
+@set_context_for_scheduled
+async def compact_blob_storage(container: MainContainer) -> None:
+    """
+    Move small and aged blobs into pack segments and rewrite segments taken up mostly by deleted blobs.
+
+    Only the local backend keeps a file per blob; for other backends there is nothing to do.
+    """
+    stats = await container.blob_storage_service.compact()
+    if stats is None:
+        logger.info('Blob storage is not compacted: not a local backend or another worker is compacting it')
+        return
+    logger.info(
+        f'Packed {stats.packed_blobs} blobs ({stats.packed_bytes} bytes), rewrote {stats.rewritten_segments} '
+        f'segments and reclaimed {stats.reclaimed_bytes} bytes'
+    )
+
+
+async def run_task():
+    from service.utils.loggers import prepare_logger
+
+    async with MainContainer() as container:
+        prepare_logger(app_settings=container.app_settings)
+        await compact_blob_storage(container)
+
+
+if __name__ == '__main__':
+    from dotenv import load_dotenv
+
+    from service import settings
+
+    base_path = pathlib.Path(__file__)
+
+    if settings.ENVIRONMENT == 'dev':
+        load_dotenv(base_path.parent.parent.parent / 'configs/.env.dev')
+        load_dotenv(base_path.parent.parent.parent / 'configs/overrides/.env.dev', override=True)
+
+    asyncio.run(run_task())
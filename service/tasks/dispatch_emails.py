@@ -0,0 +1,102 @@
+import asyncio
+import logging
+import pathlib
+import uuid
+
+from service.container import MainContainer
+from service.database import get_session_context
+from service.database.models.email_outbox import OutboxEmail
+from service.services.email_service import EmailRejectedError, EmailUnavailableError
+from service.utils.decorators import set_context_for_scheduled
+
+logger = logging.getLogger(__name__)
+
+
+async def _send_outbox_email(
+    container: MainContainer,
+    email: OutboxEmail,
+    semaphore: asyncio.Semaphore,
+    errors: dict[uuid.UUID, str],
+    rejected_ids: set[uuid.UUID],
+) -> None:
+    async with semaphore:
+        try:
+            await container.email_service.send(
+                sender=email.sender, receiver=email.receiver, text=email.text, subject=email.subject
+            )
+        except EmailRejectedError as e:
+            # A 5xx reply, sending the same email again would be refused again
+            logger.error(f'Email {email.id} to lead {email.lead_id} was rejected: {e!s}')
+            errors[email.id] = str(e)
+            rejected_ids.add(email.id)
+            return
+        except EmailUnavailableError as e:
+            logger.warning(f'Error sending email {email.id} to lead {email.lead_id} (attempt {email.attempts}): {e!s}')
+            errors[email.id] = str(e)
+            return
+
+    logger.info(f'Sent email to lead {email.receiver} from attorney {email.sender}')
+
+
+@set_context_for_scheduled
+async def dispatch_outbox_emails(container: MainContainer) -> None:
+    """
+    Send due emails of the email outbox and reschedule the failed ones with capped exponential backoff.
+
+    Emails the server could not be reached for, or answered with a transient 4xx reply or a refused login, are
+    retried; emails it rejected with a 5xx reply are marked failed straight away.
+
+    Due emails are claimed in batches of EMAIL_OUTBOX_BATCH_SIZE with FOR UPDATE SKIP LOCKED and a lease, so
+    dispatchers of several scheduler replicas send disjoint batches. Each batch is sent with up to
+    SCHEDULER_SEND_EMAILS_CONCURRENCY sends in flight and its results are recorded in one statement. A run stops once
+    a claim comes back short; emails rescheduled by it are due again only after their backoff.
+    """
+    batch_size = container.email_settings.outbox_batch_size
+    semaphore = asyncio.Semaphore(container.scheduler_settings.send_emails_concurrency)
+    sent_count = 0
+    failed_count = 0
+    while True:
+        async with get_session_context(container.database) as db_session:
+            emails = await container.email_outbox_service.claim_due_emails(db_session, limit=batch_size)
+        if not emails:
+            break
+
+        errors: dict[uuid.UUID, str] = {}
+        rejected_ids: set[uuid.UUID] = set()
+        async with asyncio.TaskGroup() as task_group:
+            for email in emails:
+                task_group.create_task(_send_outbox_email(container, email, semaphore, errors, rejected_ids))
+
+        async with get_session_context(container.database) as db_session:
+            await container.email_outbox_service.record_results(db_session, emails, errors, rejected_ids)
+        sent_count += len(emails) - len(errors)
+        failed_count += len(errors)
+        if len(emails) < batch_size:
+            break
+
+    if sent_count or failed_count:
+        logger.info(f'Sent {sent_count} outbox emails, {failed_count} failed')
+    else:
+        logger.info('No outbox emails to send')
+
+
+async def run_task():
+    from service.utils.loggers import prepare_logger
+
+    async with MainContainer() as container:
+        prepare_logger(app_settings=container.app_settings)
+        await dispatch_outbox_emails(container)
+
+
+if __name__ == '__main__':
+    from dotenv import load_dotenv
+
+    from service import settings
+
+    base_path = pathlib.Path(__file__)
+
+    if settings.ENVIRONMENT == 'dev':
+        load_dotenv(base_path.parent.parent.parent / 'configs/.env.dev')
+        load_dotenv(base_path.parent.parent.parent / 'configs/overrides/.env.dev', override=True)
+
+    asyncio.run(run_task())
@@ -0,0 +1,107 @@
+import asyncio
+import datetime as dt
+import logging
+import pathlib
+
+from service.container import MainContainer
+from service.database import get_session_context
+from service.database.models.leads import Lead
+from service.database.models.resume_texts import ResumeText, ResumeTextState
+from service.services.blob_storage.errors import BlobStorageBaseError
+from service.services.job_checkpoints import JobCheckpointService
+from service.services.resume_texts.errors import ResumeTextExtractionError, ResumeTextUnavailableError
+from service.utils.date_utils import get_utc_now
+from service.utils.decorators import set_context_for_scheduled
+
+logger = logging.getLogger(__name__)
+
+JOB_NAME = 'index_resume_texts'
+
+
+async def _extract_resume_text(container: MainContainer, lead: Lead, semaphore: asyncio.Semaphore) -> ResumeText:
+    async with semaphore:
+        data = await container.blob_storage_service.get(lead.resume_url)
+
+    text = ResumeText(lead_id=lead.id, resume_url=lead.resume_url, state=ResumeTextState.INDEXED)
+    if data is None:
+        text.state, text.error = ResumeTextState.FAILED, 'Resume not found'
+        return text
+    try:
+        text.content = await container.resume_text_service.extract(data)
+    except ResumeTextExtractionError as e:
+        text.state, text.error = ResumeTextState.FAILED, str(e)
+    return text
+
+
+async def _extract_resume_texts(container: MainContainer, leads: list[Lead]) -> list[ResumeText]:
+    # Downloads are bounded here, extraction by the size of the process pool
+    semaphore = asyncio.Semaphore(container.resume_text_settings.fetch_concurrency)
+    async with asyncio.TaskGroup() as task_group:
+        tasks = [task_group.create_task(_extract_resume_text(container, lead, semaphore)) for lead in leads]
+    return [task.result() for task in tasks]
+
+
+@set_context_for_scheduled
+async def index_resume_texts(container: MainContainer) -> None:
+    """
+    Extract the text of new and replaced resumes into resume_texts for full-text search.
+
+    Leads are processed in batches in (updated_at, id) order. Each batch is committed together with the job
+    checkpoint, so a backfill of a large table proceeds a bounded number of batches per run and resumes after the
+    last committed batch.
+    """
+    settings = container.resume_text_settings
+    indexed_count = 0
+    for _ in range(settings.max_batches_per_run):
+        async with get_session_context(container.database) as db_session:
+            checkpoint = await JobCheckpointService.acquire(db_session, JOB_NAME)
+            if checkpoint is None:
+                logger.info('Resume texts are being indexed by another worker')
+                return
+
+            updated_before = get_utc_now() - dt.timedelta(seconds=settings.settle_delay)
+            leads = await container.resume_text_service.get_leads_to_index(
+                db_session, checkpoint.position, updated_before, limit=settings.batch_size
+            )
+            if not leads:
+                await db_session.commit()
+                break
+
+            try:
+                texts = await _extract_resume_texts(container, leads)
+            except ExceptionGroup as e:
+                error = e.exceptions[0]
+                if not isinstance(error, (BlobStorageBaseError, ResumeTextUnavailableError)):
+                    raise error
+                # The batch is retried from the same checkpoint by the next run
+                logger.warning(f'Resume text indexing stopped: {error!s}')
+                break
+
+            await container.resume_text_service.save_texts(db_session, texts)
+            JobCheckpointService.advance(checkpoint, container.resume_text_service.encode_position(leads[-1]))
+            await db_session.commit()
+            indexed_count += len(texts)
+
+    logger.info(f'Indexed {indexed_count} resume texts')
+
+
+async def run_task():
+    from service.utils.loggers import prepare_logger
+
+    async with MainContainer() as container:
+        prepare_logger(app_settings=container.app_settings)
+        await index_resume_texts(container)
+
+
+if __name__ == '__main__':
+    from dotenv import load_dotenv
+
+    from service import settings
+
+    base_path = pathlib.Path(__file__)
+
+    if settings.ENVIRONMENT == 'dev':
+        load_dotenv(base_path.parent.parent.parent / 'configs/.env.dev')
+        load_dotenv(base_path.parent.parent.parent / 'configs/overrides/.env.dev', override=True)
+
+    asyncio.run(run_task())
@@ -0,0 +1,59 @@
+import asyncio
+import logging
+import pathlib
+
+import sqlalchemy as sa
+
+from service.container import MainContainer
+from service.database import get_session_context
+from service.utils.decorators import set_context_for_scheduled
+
+logger = logging.getLogger(__name__)
+
+SERIALIZATION_FAILURE = '40001'
+
+
+@set_context_for_scheduled
+async def reconcile_attorney_workloads(container: MainContainer) -> None:
+    """
+    Repair the reached out lead counters of attorneys that drifted from the leads, e.g. after manual data fixes.
+
+    A counter moved by a lead update while the leads are being counted makes the run roll back; the counters are
+    checked again by the next run.
+    """
+    async with get_session_context(container.database) as db_session:
+        try:
+            repaired_count = await container.attorney_service.reconcile_reached_out_counts(db_session)
+            await db_session.commit()
+        except sa.exc.DBAPIError as e:
+            if getattr(e.orig, 'sqlstate', None) != SERIALIZATION_FAILURE:
+                raise
+            logger.warning('Attorney workloads are not reconciled: leads were updated while they were counted')
+            return
+
+    if repaired_count:
+        logger.warning(f'Repaired the reached out lead counters of {repaired_count} attorneys')
+    else:
+        logger.info('Reached out lead counters of attorneys are up to date')
+
+
+async def run_task():
+    from service.utils.loggers import prepare_logger
+
+    async with MainContainer() as container:
+        prepare_logger(app_settings=container.app_settings)
+        await reconcile_attorney_workloads(container)
+
+
+if __name__ == '__main__':
+    from dotenv import load_dotenv
+
+    from service import settings
+
+    base_path = pathlib.Path(__file__)
+
+    if settings.ENVIRONMENT == 'dev':
+        load_dotenv(base_path.parent.parent.parent / 'configs/.env.dev')
+        load_dotenv(base_path.parent.parent.parent / 'configs/overrides/.env.dev', override=True)
+
+    asyncio.run(run_task())
@@ -1,68 +1,89 @@
 import asyncio
 import logging
 import pathlib
+from collections.abc import Sequence
 
-import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from service.container import MainContainer
 from service.database import get_session_context
+from service.database.models.lead_events import LeadEventBase
 from service.database.models.leads import Lead, LeadStatus
-from service.services.leads.service import LeadUpdate
-from service.utils.date_utils import get_utc_now
 from service.utils.decorators import set_context_for_scheduled
 
 logger = logging.getLogger(__name__)
 
 
+async def _reach_out_to_leads(container: MainContainer, db_session: AsyncSession, leads: Sequence[Lead]) -> int:
+    """Assign claimed leads to balanced attorneys and queue their emails; returns how many leads are reached out to.
+
+    The status changes, the attorney counters and the outbox rows of the rendered emails are committed in one
+    transaction, so a lead is reached out to if and only if its email is queued. Emails are sent by
+    dispatch_outbox_emails, which retries failed sends without touching the leads again.
+    """
+    assignments = await container.attorney_service.assign_batch(db_session, leads)
+    reached_out_leads = [lead for lead in leads if lead.id in assignments]
+    rendered_emails = container.email_template_registry.render_batch(
+        container.email_settings.outreach_template,
+        [{'lead': lead, 'attorney': assignments[lead.id]} for lead in reached_out_leads],
+        version=container.email_settings.outreach_template_version,
+    )
+    for lead, rendered in zip(reached_out_leads, rendered_emails):
+        container.email_outbox_service.add_email(
+            db_session, lead.id, sender=assignments[lead.id].email, receiver=lead.email, rendered=rendered
+        )
+    await db_session.commit()
+
+    for lead in reached_out_leads:
+        container.lead_event_writer.enqueue(
+            LeadEventBase(
+                lead_id=lead.id,
+                from_status=LeadStatus.REGISTERED,
+                to_status=LeadStatus.REACHED_OUT,
+                reached_out_by=assignments[lead.id].id,
+                actor='scheduler',
+            )
+        )
+    return len(reached_out_leads)
+
+
 @set_context_for_scheduled
 async def send_emails_to_leads(container: MainContainer) -> None:
     """
-    Send emails to leads with status 'registered' and update their status to 'reached_out'.
-    """
-    async with get_session_context(container.database) as db_session:
-        try:
-            # Get all leads with status 'registered'
-            query = sa.select(Lead).where(Lead.status == LeadStatus.REGISTERED)
-            result = await db_session.execute(query)
-            leads = result.scalars().all()
-
-            if not leads:
-                logger.info('No leads with status REGISTERED found')
-                return
+    Queue emails to leads with status 'registered' in the email outbox and update their status to 'reached_out'.
 
-            logger.info(f'Found {len(leads)} leads to process')
+    Leads are claimed oldest first in chunks with FOR UPDATE SKIP LOCKED, so overlapping runs and scheduler replicas
+    reach out to disjoint leads. Each chunk is assigned to attorneys in one balanced batch and committed on its own
+    together with its outbox rows, so a crash loses at most one chunk of progress. A run walks the registered leads
+    once and sends nothing itself: the emails are sent by dispatch_outbox_emails.
+    """
+    chunk_size = container.scheduler_settings.send_emails_chunk_size
+    position = None
+    reached_out_count = 0
+    try:
+        while True:
+            async with get_session_context(container.database) as db_session:
+                leads = await container.lead_service.claim_registered_leads(db_session, position, chunk_size)
+                if not leads:
+                    break
+
+                logger.info(f'Claimed {len(leads)} leads to process')
+                position = (leads[-1].created_at, leads[-1].id)
 
-            for lead in leads:
                 try:
-                    # Get the least busy attorney
-                    attorney = await container.attorney_service.get_least_busy_attorney(db_session)
-
-                    # Send email
-                    email_text = (
-                        "Thank you for submitting your resume. We'll review your application and return back soon."
-                    )
-                    await container.email_service.send(sender=attorney.email, receiver=lead.email, text=email_text)
-
-                    await container.lead_service.update_lead(
-                        db_session=db_session,
-                        lead_id=lead.id,
-                        lead_data=LeadUpdate(
-                            status=LeadStatus.REACHED_OUT,
-                            reached_out_by=attorney.id,
-                            reached_out_at=get_utc_now(),
-                        ),
-                    )
-
-                    logger.info(f'Sent email to lead {lead.email} from attorney {attorney.email}')
-
-                except Exception as e:
-                    logger.error(f'Error processing lead {lead.id}: {str(e)}')
-                    await db_session.rollback()
-                    continue
-
-        except Exception as e:
-            logger.error(f'Error in send_emails_to_leads task: {str(e)}')
-            raise
+                    reached_out_count += await _reach_out_to_leads(container, db_session, leads)
+                except ValueError as e:
+                    logger.error(f'Leads are not reached out to: {str(e)}')
+                    return
+
+    except Exception as e:
+        logger.error(f'Error in send_emails_to_leads task: {str(e)}')
+        raise
+
+    if position is None:
+        logger.info('No leads with status REGISTERED found')
+    else:
+        logger.info(f'Reached out to {reached_out_count} leads')
 
 
 async def run_task():
@@ -0,0 +1,76 @@
+import asyncio
+import logging
+import pathlib
+
+from service.container import MainContainer
+from service.database import get_session_context
+from service.database.models.resume_uploads import ResumeUpload
+from service.utils.decorators import set_context_for_scheduled
+
+logger = logging.getLogger(__name__)
+
+
+async def _upload_staged_resume(container: MainContainer, upload: ResumeUpload, semaphore: asyncio.Semaphore) -> None:
+    async with semaphore:
+        resume_upload_service = container.resume_upload_service
+        try:
+            resume_url = await container.blob_storage_service.upload_stream(
+                resume_upload_service.iter_staged(upload.staged_path)
+            )
+            if not resume_url:
+                raise ValueError('Blob storage returned an empty URL')
+        # Backends raise their own client errors; whatever the failure, the attempt is recorded and retried with backoff
+        except Exception as e:  # noqa: BLE001
+            logger.warning(f'Error uploading staged resume {upload.id} (attempt {upload.attempts}): {e!s}')
+            async with get_session_context(container.database) as db_session:
+                await resume_upload_service.fail_upload(db_session, upload, str(e))
+            return
+
+        async with get_session_context(container.database) as db_session:
+            await resume_upload_service.complete_upload(db_session, upload, resume_url)
+        await resume_upload_service.remove_staged(upload.staged_path)
+        logger.info(f'Uploaded staged resume {upload.id} for lead {upload.lead_id}')
+
+
+@set_context_for_scheduled
+async def upload_staged_resumes(container: MainContainer) -> None:
+    """
+    Upload resumes staged by POST /leads to blob storage and fill in the lead resume URLs.
+    """
+    resume_settings = container.resume_settings
+    async with get_session_context(container.database) as db_session:
+        uploads = await container.resume_upload_service.claim_due_uploads(
+            db_session, limit=resume_settings.upload_batch_size
+        )
+
+    if not uploads:
+        logger.info('No staged resumes to upload')
+        return
+
+    logger.info(f'Uploading {len(uploads)} staged resumes')
+    semaphore = asyncio.Semaphore(resume_settings.upload_concurrency)
+    async with asyncio.TaskGroup() as task_group:
+        for upload in uploads:
+            task_group.create_task(_upload_staged_resume(container, upload, semaphore))
+
+
+async def run_task():
+    from service.utils.loggers import prepare_logger
+
+    async with MainContainer() as container:
+        prepare_logger(app_settings=container.app_settings)
+        await upload_staged_resumes(container)
+
+
+if __name__ == '__main__':
+    from dotenv import load_dotenv
+
+    from service import settings
+
+    base_path = pathlib.Path(__file__)
+
+    if settings.ENVIRONMENT == 'dev':
+        load_dotenv(base_path.parent.parent.parent / 'configs/.env.dev')
+        load_dotenv(base_path.parent.parent.parent / 'configs/overrides/.env.dev', override=True)
+
+    asyncio.run(run_task())
@@ -0,0 +1,66 @@
+import base64
+import binascii
+
+_WHITESPACE = ' \t\n\r\v\f'
+_WHITESPACE_TABLE = str.maketrans('', '', _WHITESPACE)
+
+
+class Base64DecodeError(ValueError):
+    pass
+
+
+class Base64DecodedSizeError(Base64DecodeError):
+    pass
+
+
+def decode_base64_chunked(data: str, max_size: int, chunk_size: int = 64 * 1024) -> bytes:
+    """Validate base64 text chunk by chunk and then decode it in one pass.
+
+    An upper bound of the decoded size is derived from the encoded length, so oversized payloads are rejected before
+    anything is decoded, and malformed input fails at the first bad chunk instead of after a full decode. Neither the
+    text nor the decoded bytes are ever copied as a whole: whitespace is stripped one chunk at a time while
+    validating, and the final decode skips it and writes straight into the returned bytes.
+
+    Args:
+        data: Base64 encoded text; whitespace, such as the line breaks of base64 wrapped at 76 columns, is ignored
+        max_size: Maximum allowed size of the decoded data in bytes
+        chunk_size: Number of encoded characters validated at once, rounded down to a multiple of 4
+
+    Returns:
+        Decoded bytes
+
+    Raises:
+        Base64DecodedSizeError: If the decoded data would exceed max_size
+        Base64DecodeError: If data is not valid base64
+    """
+    encoded_size = len(data) - sum(map(data.count, _WHITESPACE))
+    if encoded_size % 4:
+        raise Base64DecodeError('Invalid base64 data length')
+    # At most two padding characters are not counted yet
+    if encoded_size // 4 * 3 - 2 > max_size:
+        raise Base64DecodedSizeError(
+            f'Decoded data size {encoded_size // 4 * 3 - 2} exceeds the limit of {max_size} bytes'
+        )
+
+    chunk_size = max(chunk_size - chunk_size % 4, 4)
+    decoded_size = 0
+    pending = ''
+    for start in range(0, len(data), chunk_size):
+        # Chunks are kept aligned to 4 characters across the whitespace removed from them
+        pending += data[start : start + chunk_size].translate(_WHITESPACE_TABLE)
+        aligned_size = len(pending) - len(pending) % 4
+        chunk, pending = pending[:aligned_size], pending[aligned_size:]
+        if not chunk:
+            continue
+        # Padding is only allowed at the very end of the data
+        if decoded_size % 3:
+            raise Base64DecodeError('Unexpected base64 padding')
+        try:
+            decoded_size += len(base64.b64decode(chunk, validate=True))
+        except ValueError as e:
+            raise Base64DecodeError('Invalid base64 data') from e
+        if decoded_size > max_size:
+            raise Base64DecodedSizeError(f'Decoded data size exceeds the limit of {max_size} bytes')
+
+    # Validated above, so the whitespace is all that the non-strict decoder skips
+    return binascii.a2b_base64(data)
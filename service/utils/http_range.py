@@ -0,0 +1,44 @@
+import re
+
+_BYTE_RANGE_PATTERN = re.compile(r'bytes=(\d*)-(\d*)', re.IGNORECASE)
+
+
+class RangeNotSatisfiableError(ValueError):
+    pass
+
+
+def parse_range_header(header: str, size: int) -> tuple[int, int] | None:
+    """Parse a single byte range from a Range header.
+
+    Multiple ranges and units other than bytes are not supported; for those the whole content should be sent,
+    which RFC 9110 allows.
+
+    Args:
+        header: Value of the Range header, e.g. ``bytes=0-1023``, ``bytes=1024-`` or ``bytes=-500``
+        size: Size of the content in bytes
+
+    Returns:
+        Start and end (exclusive) offsets of the range, None if the header should be ignored
+
+    Raises:
+        RangeNotSatisfiableError: The range does not overlap the content
+    """
+    match = _BYTE_RANGE_PATTERN.fullmatch(header.replace(' ', ''))
+    if match is None or match.group(1) == match.group(2) == '':
+        return None
+    first, last = match.groups()
+
+    if not first:
+        # Suffix range: the last N bytes
+        suffix_length = int(last)
+        if suffix_length == 0 or size == 0:
+            raise RangeNotSatisfiableError(f'Range {header} is not satisfiable')
+        return max(size - suffix_length, 0), size
+
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiableError(f'Range {header} is not satisfiable')
+    end = min(int(last) + 1, size) if last else size
+    return start, end
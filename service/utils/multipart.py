@@ -0,0 +1,170 @@
+import codecs
+import collections
+import enum
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+from python_multipart.multipart import MultipartParser, parse_options_header
+from starlette.datastructures import Headers
+
+
+class MultipartStreamError(Exception):
+    pass
+
+
+class _Event(enum.Enum):
+    HEADERS = 'headers'
+    DATA = 'data'
+    PART_END = 'part_end'
+
+
+@dataclass
+class MultipartField:
+    name: str
+    value: str
+
+
+@dataclass
+class MultipartFile:
+    name: str
+    filename: str
+    content_type: str | None
+    chunks: AsyncIterator[bytes]
+
+
+class MultipartStreamReader:
+    """Incremental multipart/form-data reader.
+
+    Unlike ``Request.form()`` it never spools file parts: their data is handed out chunk by chunk as it arrives
+    from the request stream, so memory stays bounded by the size of a single network chunk. A file part must be
+    fully consumed (or abandoned) before the next part is read.
+    """
+
+    def __init__(self, headers: Headers, stream: AsyncIterator[bytes], max_field_size: int = 64 * 1024):
+        self._headers = headers
+        self._stream = stream
+        self._max_field_size = max_field_size
+        self._events: collections.deque[tuple] = collections.deque()
+        self._parser: MultipartParser | None = None
+        self._charset = 'utf-8'
+        self._is_finished = False
+        self._header_name = b''
+        self._header_value = b''
+        self._part_headers: dict[bytes, bytes] = {}
+
+    def _on_part_begin(self) -> None:
+        self._part_headers = {}
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        self._part_headers[self._header_name.lower()] = self._header_value
+        self._header_name = b''
+        self._header_value = b''
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._part_headers.get(b'content-disposition', b''))
+        if b'name' not in options:
+            raise MultipartStreamError('The Content-Disposition header field "name" must be provided')
+        filename = options.get(b'filename')
+        content_type = self._part_headers.get(b'content-type')
+        self._events.append(
+            (
+                _Event.HEADERS,
+                self._decode(options[b'name']),
+                self._decode(filename) if filename is not None else None,
+                self._decode(content_type) if content_type is not None else None,
+            )
+        )
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        self._events.append((_Event.DATA, data[start:end]))
+
+    def _on_part_end(self) -> None:
+        self._events.append((_Event.PART_END,))
+
+    def _decode(self, value: bytes) -> str:
+        try:
+            return value.decode(self._charset)
+        except (UnicodeDecodeError, LookupError):
+            return value.decode('latin-1')
+
+    def _create_parser(self) -> MultipartParser:
+        _, params = parse_options_header(self._headers.get('content-type', ''))
+        boundary = params.get(b'boundary')
+        if not boundary:
+            raise MultipartStreamError('Missing boundary in multipart')
+
+        charset = params.get(b'charset', b'utf-8').decode('latin-1')
+        try:
+            self._charset = codecs.lookup(charset).name
+        except LookupError:
+            self._charset = 'latin-1'
+
+        callbacks = {
+            'on_part_begin': self._on_part_begin,
+            'on_part_data': self._on_part_data,
+            'on_part_end': self._on_part_end,
+            'on_header_field': self._on_header_field,
+            'on_header_value': self._on_header_value,
+            'on_header_end': self._on_header_end,
+            'on_headers_finished': self._on_headers_finished,
+        }
+        return MultipartParser(boundary, callbacks)
+
+    async def _next_event(self) -> tuple | None:
+        if self._parser is None:
+            self._parser = self._create_parser()
+
+        while not self._events:
+            if self._is_finished:
+                return None
+            try:
+                chunk = await anext(self._stream)
+            except StopAsyncIteration:
+                self._parser.finalize()
+                self._is_finished = True
+                continue
+            try:
+                self._parser.write(chunk)
+            except MultipartStreamError:
+                raise
+            except Exception as e:
+                raise MultipartStreamError(f'Malformed multipart body: {e}') from e
+
+        return self._events.popleft()
+
+    async def _iter_part_data(self) -> AsyncIterator[bytes]:
+        while (event := await self._next_event()) is not None:
+            if event[0] is _Event.PART_END:
+                return
+            if event[0] is _Event.DATA and event[1]:
+                yield event[1]
+        raise MultipartStreamError('Unexpected end of multipart body')
+
+    async def iter_parts(self) -> AsyncIterator[MultipartField | MultipartFile]:
+        """Yield form fields and file parts in the order they appear in the body."""
+        while (event := await self._next_event()) is not None:
+            if event[0] is not _Event.HEADERS:
+                continue
+
+            _, name, filename, content_type = event
+            chunks = self._iter_part_data()
+            if filename is None:
+                value = bytearray()
+                async for chunk in chunks:
+                    if len(value) + len(chunk) > self._max_field_size:
+                        raise MultipartStreamError(
+                            f'Field {name} exceeded maximum size of {self._max_field_size} bytes'
+                        )
+                    value.extend(chunk)
+                yield MultipartField(name=name, value=self._decode(bytes(value)))
+            else:
+                yield MultipartFile(name=name, filename=filename, content_type=content_type, chunks=chunks)
+                # Skip whatever the consumer left unread so the next part starts at its headers
+                async for _ in chunks:
+                    pass
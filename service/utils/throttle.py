@@ -0,0 +1,25 @@
+import asyncio
+import time
+from collections.abc import Callable
+
+
+class IoBudget:
+    """Paces a background job to an average of ops_per_second storage operations.
+
+    The job reports the operations it made with spend, which sleeps for as long as the job is ahead of its budget,
+    so bursts are allowed but the average rate over the run is not exceeded.
+    """
+
+    def __init__(self, ops_per_second: float, clock: Callable[[], float] = time.monotonic):
+        self._ops_per_second = ops_per_second
+        self._clock = clock
+        self._started_at = clock()
+        self._spent = 0
+
+    async def spend(self, ops: int) -> None:
+        self._spent += ops
+        if self._ops_per_second <= 0:
+            return
+        ahead = self._spent / self._ops_per_second - (self._clock() - self._started_at)
+        if ahead > 0:
+            await asyncio.sleep(ahead)
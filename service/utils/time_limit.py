@@ -0,0 +1,25 @@
+import signal
+from collections.abc import Callable
+
+
+class TimeLimitExceededError(Exception):
+    pass
+
+
+def call_with_time_limit[**P, T](timeout: float, func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+    """Call func, interrupting it with TimeLimitExceededError after timeout seconds.
+
+    Uses a timer signal, so it must be called in the main thread. Process pool workers run one task at a time in
+    their main thread, which lets a task that takes too long be stopped without killing the worker.
+    """
+
+    def _raise_timeout(signum, frame) -> None:
+        raise TimeLimitExceededError(f'{func.__name__} did not finish in {timeout} seconds')
+
+    previous_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
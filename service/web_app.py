@@ -70,6 +70,7 @@ def init_middleware(app: FastAPI):
                 message=exc.message,
                 error_items=exc.error_items,
             ),
+            headers=exc.headers,
         )
 
 
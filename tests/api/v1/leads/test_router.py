@@ -1,17 +1,39 @@
 import base64
+import pathlib
+from unittest.mock import AsyncMock, patch
 from uuid import uuid4
 
+import pytest
+
 import sqlalchemy as sa
+from fastapi import FastAPI
 from httpx import AsyncClient
-from starlette.status import HTTP_200_OK, HTTP_201_CREATED, HTTP_401_UNAUTHORIZED, HTTP_404_NOT_FOUND, HTTP_409_CONFLICT
+from starlette.status import (
+    HTTP_200_OK,
+    HTTP_201_CREATED,
+    HTTP_206_PARTIAL_CONTENT,
+    HTTP_304_NOT_MODIFIED,
+    HTTP_401_UNAUTHORIZED,
+    HTTP_404_NOT_FOUND,
+    HTTP_409_CONFLICT,
+    HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+    HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+    HTTP_422_UNPROCESSABLE_ENTITY,
+    HTTP_503_SERVICE_UNAVAILABLE,
+)
 
 from service.database.models.leads import LeadStatus, Lead
+from service.services.blob_storage.errors import BlobStorageUnavailableError
+from service.services.blob_storage.local import LocalBlobStorageBackend
+from service.services.resume_validation.errors import ResumeValidationUnavailableError
+from service.settings import BlobStorageSettings, ResumeSettings
+from tests.documents import make_pdf
 
 
 async def test_create_lead_success(db_session, not_auth_test_client: AsyncClient):
     """Test successful lead creation with resume."""
     # Prepare test data similar to LeadCreateWithResume
-    resume_data = b'This is a test resume content with some binary data'
+    resume_data = make_pdf()
     lead_data = {
         'first_name': 'Jane',
         'last_name': 'Smith',
@@ -60,7 +82,7 @@ async def test_create_lead_duplicate_error(not_auth_test_client: AsyncClient, cr
     )
 
     # Try to create second lead with same email
-    resume_data = b'Second resume content'
+    resume_data = make_pdf()
     data = {
         'first_name': 'Jane',
         'last_name': 'Smith',
@@ -76,6 +98,235 @@ async def test_create_lead_duplicate_error(not_auth_test_client: AsyncClient, cr
     assert response_data['message'] == 'Application already exists'
 
 
+async def test_create_lead_body_too_large(app: FastAPI, not_auth_test_client: AsyncClient):
+    """Test lead creation with a body above the resume size limit returns 413 error."""
+    app.state.container.resume_settings = ResumeSettings(max_size=1024, request_overhead_size=1024)
+    lead_data = {
+        'first_name': 'Jane',
+        'last_name': 'Smith',
+        'email': 'jane.large@example.com',
+        'resume': base64.b64encode(b'x' * 4096).decode('utf-8'),
+    }
+
+    response = await not_auth_test_client.post('/api/v1/leads', json=lead_data)
+
+    assert response.status_code == HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    assert 'Request body exceeds the maximum size' in response.json()['message']
+
+
+async def test_create_lead_multipart_body_too_large(app: FastAPI, not_auth_test_client: AsyncClient):
+    """Test multipart lead creation with a resume above the size limit returns 413 error."""
+    app.state.container.resume_settings = ResumeSettings(max_size=1024, request_overhead_size=1024)
+    form_data = {'first_name': 'Jane', 'last_name': 'Smith', 'email': 'jane.large@example.com'}
+    files = {'resume': ('resume.pdf', b'x' * 4096, 'application/pdf')}
+
+    response = await not_auth_test_client.post('/api/v1/leads/multipart', data=form_data, files=files)
+
+    assert response.status_code == HTTP_413_REQUEST_ENTITY_TOO_LARGE
+
+
+@pytest.mark.parametrize('deferred_upload_enabled', [False, True])
+async def test_create_lead_multipart_resume_too_large(
+    app: FastAPI, db_session, not_auth_test_client: AsyncClient, tmp_path: pathlib.Path, deferred_upload_enabled: bool
+):
+    """Test that a streamed resume above max_size returns 413 error even if the body fits the request limit."""
+    app.state.container.resume_settings = ResumeSettings(
+        max_size=4096, deferred_upload_enabled=deferred_upload_enabled, staging_dir=str(tmp_path)
+    )
+    form_data = {'first_name': 'Jane', 'last_name': 'Smith', 'email': 'multipart.large@example.com'}
+    files = {'resume': ('resume.pdf', b'%PDF-1.4 resume' * 1000, 'application/pdf')}
+
+    response = await not_auth_test_client.post('/api/v1/leads/multipart', data=form_data, files=files)
+
+    assert response.status_code == HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    assert response.json()['message'] == 'Resume exceeds the maximum size of 4096 bytes'
+    assert list(tmp_path.iterdir()) == []
+    result = await db_session.execute(sa.select(Lead).where(Lead.email == 'multipart.large@example.com'))
+    assert result.scalar_one_or_none() is None
+
+
+async def test_create_lead_invalid_base64(not_auth_test_client: AsyncClient):
+    """Test lead creation with malformed base64 resume returns 422 error."""
+    lead_data = {
+        'first_name': 'Jane',
+        'last_name': 'Smith',
+        'email': 'jane.invalid@example.com',
+        'resume': 'not base64!',
+    }
+
+    response = await not_auth_test_client.post('/api/v1/leads', json=lead_data)
+
+    assert response.status_code == HTTP_422_UNPROCESSABLE_ENTITY
+
+
+async def test_create_lead_blob_storage_unavailable(not_auth_test_client: AsyncClient):
+    """Test that a failing blob store returns 503 error instead of holding the request."""
+    lead_data = {
+        'first_name': 'Jane',
+        'last_name': 'Smith',
+        'email': 'storage.down@example.com',
+        'resume': base64.b64encode(make_pdf()).decode('utf-8'),
+    }
+
+    with patch(
+        'service.services.leads.service.BlobStorageService.upload',
+        AsyncMock(side_effect=BlobStorageUnavailableError('Blob storage is unavailable')),
+    ):
+        response = await not_auth_test_client.post('/api/v1/leads', json=lead_data)
+
+    assert response.status_code == HTTP_503_SERVICE_UNAVAILABLE
+    assert response.json()['message'] == 'Resume storage is unavailable, try again later'
+
+
+async def test_create_lead_invalid_resume(app: FastAPI, not_auth_test_client: AsyncClient):
+    """Test lead creation with a resume that is not a PDF or DOCX document returns 422 error."""
+    lead_data = {
+        'first_name': 'Jane',
+        'last_name': 'Smith',
+        'email': 'invalid.resume@example.com',
+        'resume': base64.b64encode(b'This is not a document').decode('utf-8'),
+    }
+
+    response = await not_auth_test_client.post('/api/v1/leads', json=lead_data)
+
+    assert response.status_code == HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json()['message'] == 'Resume must be a PDF or DOCX document'
+    assert app.state.container.resume_validation_service.metrics.rejected == 1
+
+
+async def test_create_lead_resume_validation_unavailable(not_auth_test_client: AsyncClient):
+    """Test that an overloaded validation pool returns 503 error instead of accepting the resume."""
+    lead_data = {
+        'first_name': 'Jane',
+        'last_name': 'Smith',
+        'email': 'validation.down@example.com',
+        'resume': base64.b64encode(make_pdf()).decode('utf-8'),
+    }
+
+    with patch(
+        'service.services.resume_validation.service.ResumeValidationService.validate',
+        AsyncMock(side_effect=ResumeValidationUnavailableError('Resume validation is overloaded')),
+    ):
+        response = await not_auth_test_client.post('/api/v1/leads', json=lead_data)
+
+    assert response.status_code == HTTP_503_SERVICE_UNAVAILABLE
+    assert response.json()['message'] == 'Resume validation is unavailable, try again later'
+
+
+async def test_create_lead_multipart_success(db_session, not_auth_test_client: AsyncClient):
+    """Test successful lead creation with resume streamed as multipart/form-data."""
+    form_data = {'first_name': 'Jane', 'last_name': 'Smith', 'email': 'jane.multipart@example.com'}
+    files = {'resume': ('resume.pdf', b'%PDF-1.4 resume' * 10000, 'application/pdf')}
+
+    response = await not_auth_test_client.post('/api/v1/leads/multipart', data=form_data, files=files)
+
+    assert response.status_code == HTTP_201_CREATED
+    response_data = response.json()
+    assert response_data['email'] == 'jane.multipart@example.com'
+    assert response_data['status'] == LeadStatus.REGISTERED.value
+    assert response_data['resume_url'].startswith('https://blob-storage.example.com/')
+
+    # Cleanup
+    await db_session.execute(sa.delete(Lead).where(Lead.id == response_data['id']))
+    await db_session.commit()
+
+
+async def test_create_lead_multipart_duplicate_error(not_auth_test_client: AsyncClient, create_lead):
+    """Test duplicate multipart lead creation returns 409 error."""
+    await create_lead(email='multipart.duplicate@example.com', status=LeadStatus.REGISTERED)
+
+    form_data = {'first_name': 'Jane', 'last_name': 'Smith', 'email': 'multipart.duplicate@example.com'}
+    files = {'resume': ('resume.pdf', make_pdf(), 'application/pdf')}
+
+    response = await not_auth_test_client.post('/api/v1/leads/multipart', data=form_data, files=files)
+
+    assert response.status_code == HTTP_409_CONFLICT
+    assert response.json()['message'] == 'Application already exists'
+
+
+async def test_create_lead_multipart_invalid_resume(db_session, not_auth_test_client: AsyncClient):
+    """Test that a streamed resume that is not a PDF or DOCX document is rejected before anything is stored."""
+    form_data = {'first_name': 'Jane', 'last_name': 'Smith', 'email': 'multipart.invalid@example.com'}
+    files = {'resume': ('resume.pdf', b'This is not a document', 'application/pdf')}
+
+    with patch('service.services.leads.service.BlobStorageService.upload_stream', AsyncMock()) as upload_mock:
+        response = await not_auth_test_client.post('/api/v1/leads/multipart', data=form_data, files=files)
+
+    assert response.status_code == HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json()['message'] == 'Resume must be a PDF or DOCX document'
+    upload_mock.assert_not_called()
+    result = await db_session.execute(sa.select(Lead).where(Lead.email == 'multipart.invalid@example.com'))
+    assert result.scalar_one_or_none() is None
+
+
+async def test_create_lead_multipart_deferred_validates_staged_resume(
+    app: FastAPI, db_session, not_auth_test_client: AsyncClient, tmp_path: pathlib.Path
+):
+    """Test that a staged resume is validated in full before the lead is stored."""
+    app.state.container.resume_settings = ResumeSettings(deferred_upload_enabled=True, staging_dir=str(tmp_path))
+    form_data = {'first_name': 'Jane', 'last_name': 'Smith', 'email': 'multipart.truncated@example.com'}
+    # Passes the format sniffing but has no trailer
+    files = {'resume': ('resume.pdf', make_pdf()[:-64], 'application/pdf')}
+
+    response = await not_auth_test_client.post('/api/v1/leads/multipart', data=form_data, files=files)
+
+    assert response.status_code == HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json()['message'] == 'Resume PDF is truncated'
+    assert list(tmp_path.iterdir()) == []
+    result = await db_session.execute(sa.select(Lead).where(Lead.email == 'multipart.truncated@example.com'))
+    assert result.scalar_one_or_none() is None
+
+
+async def test_create_lead_multipart_ignores_parts_after_resume(db_session, not_auth_test_client: AsyncClient):
+    """Test that a malformed body after the resume part does not fail a lead that was created."""
+    boundary = 'lead-boundary'
+    fields = {'first_name': 'Jane', 'last_name': 'Smith', 'email': 'multipart.trailing@example.com'}
+    body = b''.join(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        for name, value in fields.items()
+    )
+    body += (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="resume"; filename="resume.pdf"\r\n'
+        'Content-Type: application/pdf\r\n\r\n'
+    ).encode()
+    # The body ends in the middle of a part after the resume instead of with the closing boundary
+    body += make_pdf() + f'\r\n--{boundary}\r\nContent-Disposition: form-data; name="extra"\r\n\r\ntrunc'.encode()
+
+    response = await not_auth_test_client.post(
+        '/api/v1/leads/multipart',
+        content=body,
+        headers={'Content-Type': f'multipart/form-data; boundary={boundary}'},
+    )
+
+    assert response.status_code == HTTP_201_CREATED
+    assert response.json()['email'] == 'multipart.trailing@example.com'
+
+    # Cleanup
+    await db_session.execute(sa.delete(Lead).where(Lead.id == response.json()['id']))
+    await db_session.commit()
+
+
+async def test_create_lead_multipart_missing_resume(not_auth_test_client: AsyncClient):
+    """Test multipart lead creation without resume file returns 422 error."""
+    form_data = {'first_name': 'Jane', 'last_name': 'Smith', 'email': 'multipart.noresume@example.com'}
+
+    response = await not_auth_test_client.post(
+        '/api/v1/leads/multipart', data=form_data, files={'other': ('a.txt', b'a', 'text/plain')}
+    )
+
+    assert response.status_code == HTTP_422_UNPROCESSABLE_ENTITY
+
+
+async def test_create_lead_multipart_invalid_fields(not_auth_test_client: AsyncClient):
+    """Test multipart lead creation with invalid email returns 422 error."""
+    form_data = {'first_name': 'Jane', 'last_name': 'Smith', 'email': 'not-an-email'}
+    files = {'resume': ('resume.pdf', b'resume content', 'application/pdf')}
+
+    response = await not_auth_test_client.post('/api/v1/leads/multipart', data=form_data, files=files)
+
+    assert response.status_code == HTTP_422_UNPROCESSABLE_ENTITY
+
+
 async def test_get_leads_success(auth_jwt_test_client: AsyncClient, create_lead):
     """Test successful retrieval of leads list with authentication."""
     # Create test leads using fixture
@@ -122,6 +373,44 @@ async def test_get_leads_auth_error(not_auth_test_client: AsyncClient):
     assert response.status_code == HTTP_401_UNAUTHORIZED
 
 
+async def test_search_leads(auth_jwt_test_client: AsyncClient, create_lead, create_resume_text):
+    """Test that leads are searched by resume text, best matches first."""
+    # Resume texts of other tests stay in the database; a word of this test keeps its results apart
+    word = f'x{uuid4().hex[:12]}'
+    best_lead = await create_lead()
+    other_lead = await create_lead()
+    await create_resume_text(lead_id=best_lead.id, content=f'{word} Immigration lawyer, visa and immigration appeals')
+    await create_resume_text(lead_id=other_lead.id, content=f'{word} Tax lawyer')
+
+    response = await auth_jwt_test_client.get(
+        '/api/v1/internal/leads/search', params={'q': f'{word} immigration lawyer'}
+    )
+
+    assert response.status_code == HTTP_200_OK
+    response_data = response.json()
+    assert [item['id'] for item in response_data['items']] == [str(best_lead.id)]
+    assert response_data['items'][0]['email'] == best_lead.email
+    assert response_data['items'][0]['rank'] > 0
+
+    pages = [
+        await auth_jwt_test_client.get(
+            '/api/v1/internal/leads/search', params={'q': f'{word} lawyer', 'page': page, 'page_size': 1}
+        )
+        for page in (1, 2)
+    ]
+    assert {item['id'] for response in pages for item in response.json()['items']} == {
+        str(best_lead.id),
+        str(other_lead.id),
+    }
+
+
+async def test_search_leads_unauthorized(not_auth_test_client: AsyncClient):
+    """Test that resume search requires authentication."""
+    response = await not_auth_test_client.get('/api/v1/internal/leads/search', params={'q': 'lawyer'})
+
+    assert response.status_code == HTTP_401_UNAUTHORIZED
+
+
 async def test_get_lead_by_id_success(auth_jwt_test_client: AsyncClient, create_lead):
     """Test successful retrieval of single lead by ID with authentication."""
     # Create test lead using fixture
@@ -248,3 +537,162 @@ async def test_update_lead_status_auth_error(not_auth_test_client: AsyncClient):
 
     # Verify authentication error
     assert response.status_code == HTTP_401_UNAUTHORIZED
+
+
+async def test_update_lead_status_records_event(app: FastAPI, auth_jwt_test_client: AsyncClient, create_lead):
+    """Test that a status update appears in the lead history once the event buffer is flushed."""
+    created_lead = await create_lead(
+        first_name='History', last_name='Test', email='history.test@example.com', status=LeadStatus.PENDING
+    )
+
+    response = await auth_jwt_test_client.patch(
+        f'/api/v1/internal/leads/{created_lead.id}', json={'status': LeadStatus.REACHED_OUT.value}
+    )
+    assert response.status_code == HTTP_200_OK
+
+    await app.state.container.lead_event_writer.flush()
+
+    response = await auth_jwt_test_client.get(f'/api/v1/internal/leads/{created_lead.id}/events')
+
+    assert response.status_code == HTTP_200_OK
+    response_data = response.json()
+    assert len(response_data['items']) == 1
+    assert response_data['items'][0]['from_status'] == LeadStatus.PENDING.value
+    assert response_data['items'][0]['to_status'] == LeadStatus.REACHED_OUT.value
+    assert response_data['items'][0]['actor'] == 'test_user_123'
+    assert response_data['next_after_id'] is None
+
+
+async def test_get_lead_events_pagination(auth_jwt_test_client: AsyncClient, create_lead_event):
+    """Test that lead events are paginated with the next_after_id cursor."""
+    lead_id = uuid4()
+    created_events = [await create_lead_event(lead_id=lead_id) for _ in range(3)]
+
+    response = await auth_jwt_test_client.get(f'/api/v1/internal/leads/{lead_id}/events', params={'limit': 2})
+    assert response.status_code == HTTP_200_OK
+    first_page = response.json()
+    assert [item['id'] for item in first_page['items']] == [event.id for event in created_events[:2]]
+
+    response = await auth_jwt_test_client.get(
+        f'/api/v1/internal/leads/{lead_id}/events',
+        params={'limit': 2, 'after_id': first_page['next_after_id']},
+    )
+    assert response.status_code == HTTP_200_OK
+    second_page = response.json()
+    assert [item['id'] for item in second_page['items']] == [created_events[2].id]
+    assert second_page['next_after_id'] is None
+
+
+async def test_get_lead_events_auth_error(not_auth_test_client: AsyncClient):
+    """Test get lead events without authentication returns 401 error."""
+    response = await not_auth_test_client.get(f'/api/v1/internal/leads/{uuid4()}/events')
+
+    assert response.status_code == HTTP_401_UNAUTHORIZED
+
+
+@pytest.fixture
+def local_blob_storage(tmp_path: pathlib.Path):
+    backend = LocalBlobStorageBackend(
+        BlobStorageSettings(backend='local', local_dir=str(tmp_path), read_chunk_size=1000, compression_min_size=1024)
+    )
+    with (
+        patch('service.services.blob_storage.service.get_blob_storage_backend', return_value=backend),
+        patch('service.services.blob_storage.service.get_blob_cache', return_value=None),
+    ):
+        yield backend
+
+
+@pytest.mark.parametrize('resume', [bytes(range(256)) * 20, b'Resume text. ' * 1000], ids=['raw', 'compressed'])
+async def test_get_lead_resume(auth_jwt_test_client: AsyncClient, create_lead, local_blob_storage, resume):
+    """Test that the whole resume is streamed with length and caching headers."""
+    created_lead = await create_lead(resume_url=await local_blob_storage.upload(resume))
+
+    response = await auth_jwt_test_client.get(f'/api/v1/internal/leads/{created_lead.id}/resume')
+
+    assert response.status_code == HTTP_200_OK
+    assert response.content == resume
+    assert response.headers['content-length'] == str(len(resume))
+    assert response.headers['accept-ranges'] == 'bytes'
+    assert response.headers['cache-control'].startswith('private, max-age=')
+    assert response.headers['etag']
+
+
+@pytest.mark.parametrize(
+    'range_header,start,end',
+    [('bytes=0-99', 0, 100), ('bytes=2500-', 2500, 5120), ('bytes=-20', 5100, 5120), ('bytes=5000-9999', 5000, 5120)],
+)
+@pytest.mark.parametrize(
+    'resume', [bytes(range(256)) * 20, b'Resume text ' * 426 + b'!!!!!!!!'], ids=['raw', 'compressed']
+)
+async def test_get_lead_resume_range(
+    auth_jwt_test_client: AsyncClient, create_lead, local_blob_storage, resume, range_header, start, end
+):
+    """Test that a byte range of the resume is returned as partial content."""
+    created_lead = await create_lead(resume_url=await local_blob_storage.upload(resume))
+
+    response = await auth_jwt_test_client.get(
+        f'/api/v1/internal/leads/{created_lead.id}/resume', headers={'Range': range_header}
+    )
+
+    assert response.status_code == HTTP_206_PARTIAL_CONTENT
+    assert response.content == resume[start:end]
+    assert response.headers['content-length'] == str(end - start)
+    assert response.headers['content-range'] == f'bytes {start}-{end - 1}/{len(resume)}'
+
+
+async def test_get_lead_resume_range_not_satisfiable(
+    auth_jwt_test_client: AsyncClient, create_lead, local_blob_storage
+):
+    """Test that a range starting after the end of the resume is rejected."""
+    created_lead = await create_lead(resume_url=await local_blob_storage.upload(b'short resume'))
+
+    response = await auth_jwt_test_client.get(
+        f'/api/v1/internal/leads/{created_lead.id}/resume', headers={'Range': 'bytes=100-200'}
+    )
+
+    assert response.status_code == HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+    assert response.headers['content-range'] == 'bytes */12'
+
+
+async def test_get_lead_resume_outdated_if_range(auth_jwt_test_client: AsyncClient, create_lead, local_blob_storage):
+    """Test that the whole resume is returned when If-Range does not match the current ETag."""
+    created_lead = await create_lead(resume_url=await local_blob_storage.upload(b'resume content'))
+
+    response = await auth_jwt_test_client.get(
+        f'/api/v1/internal/leads/{created_lead.id}/resume', headers={'Range': 'bytes=0-5', 'If-Range': '"outdated"'}
+    )
+
+    assert response.status_code == HTTP_200_OK
+    assert response.content == b'resume content'
+
+
+async def test_get_lead_resume_not_modified(auth_jwt_test_client: AsyncClient, create_lead, local_blob_storage):
+    """Test that a matching If-None-Match gets an empty 304 response."""
+    created_lead = await create_lead(resume_url=await local_blob_storage.upload(b'resume content'))
+    url = f'/api/v1/internal/leads/{created_lead.id}/resume'
+    etag = (await auth_jwt_test_client.get(url)).headers['etag']
+
+    response = await auth_jwt_test_client.get(url, headers={'If-None-Match': etag})
+
+    assert response.status_code == HTTP_304_NOT_MODIFIED
+    assert response.content == b''
+
+
+@pytest.mark.parametrize('resume_url', ['local://' + '0' * 64, 'pending://lead'])
+async def test_get_lead_resume_not_found(
+    auth_jwt_test_client: AsyncClient, create_lead, local_blob_storage, resume_url
+):
+    """Test that a missing or not yet uploaded resume returns 404 error."""
+    created_lead = await create_lead(resume_url=resume_url)
+
+    response = await auth_jwt_test_client.get(f'/api/v1/internal/leads/{created_lead.id}/resume')
+
+    assert response.status_code == HTTP_404_NOT_FOUND
+    assert response.json()['message'] == 'Resume not found'
+
+
+async def test_get_lead_resume_auth_error(not_auth_test_client: AsyncClient):
+    """Test get lead resume without authentication returns 401 error."""
+    response = await not_auth_test_client.get(f'/api/v1/internal/leads/{uuid4()}/resume')
+
+    assert response.status_code == HTTP_401_UNAUTHORIZED
@@ -18,6 +18,18 @@ from tests.database.fixtures import (
 from tests.database.attorneys.fixtures import (
     create_attorney,  # noqa: F401
 )
+from tests.database.email_outbox.fixtures import (
+    create_outbox_email,  # noqa: F401
+)
+from tests.database.lead_events.fixtures import (
+    create_lead_event,  # noqa: F401
+)
+from tests.database.resume_texts.fixtures import (
+    create_resume_text,  # noqa: F401
+)
+from tests.database.resume_uploads.fixtures import (
+    create_resume_upload,  # noqa: F401
+)
 
 
 @pytest.fixture(scope='session')
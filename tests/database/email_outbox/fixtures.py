@@ -0,0 +1,57 @@
+import datetime as dt
+import uuid
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+import pytest
+
+from service.database.models.email_outbox import OutboxEmail, OutboxEmailState
+from service.utils.date_utils import get_utc_now
+from tests.database.factory import model_factory
+
+
+@pytest.fixture(scope='function')
+async def create_outbox_email(
+    db_session_factory,
+) -> AsyncIterator[Callable[..., Awaitable[OutboxEmail]]]:
+    """Create an email outbox entry in the database.
+
+    Args:
+        db_session_factory: Database session factory fixture
+
+    Yields:
+        Async function that creates an outbox email with the given parameters or defaults if not provided
+    """
+
+    def _build_outbox_email(
+        lead_id: uuid.UUID,
+        receiver: str | None = None,
+        state: OutboxEmailState | None = None,
+        attempts: int = 0,
+        next_attempt_at: dt.datetime | None = None,
+    ) -> OutboxEmail:
+        """Build an outbox email entry.
+
+        Args:
+            lead_id: ID of the lead the email is sent to
+            receiver: Email address of the lead
+            state: Outbox state
+            attempts: Number of send attempts made so far
+            next_attempt_at: When the email becomes due
+
+        Returns:
+            OutboxEmail instance to create
+        """
+        return OutboxEmail(
+            id=uuid.uuid4(),
+            lead_id=lead_id,
+            sender='attorney@example.com',
+            receiver=receiver or f'{uuid.uuid4().hex}@example.com',
+            subject='Your application',
+            text='Thank you for submitting your resume.',
+            state=state or OutboxEmailState.PENDING,
+            attempts=attempts,
+            next_attempt_at=next_attempt_at or get_utc_now(),
+        )
+
+    async with model_factory(db_session_factory, _build_outbox_email) as create_outbox_email:
+        yield create_outbox_email
@@ -0,0 +1,45 @@
+import contextlib
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+import sqlalchemy as sa
+
+from service.database.models.base import SqlModelBase
+
+
+@contextlib.asynccontextmanager
+async def model_factory[M: SqlModelBase](
+    db_session_factory, build: Callable[..., M]
+) -> AsyncIterator[Callable[..., Awaitable[M]]]:
+    """Turn a function building a model instance into an async function that stores it.
+
+    Every stored instance is deleted by its primary key when the context exits.
+
+    Args:
+        db_session_factory: Database session factory fixture
+        build: Function building an unsaved instance from the arguments of the returned function
+
+    Yields:
+        Async function that builds, stores and returns an instance
+    """
+    created = []
+
+    async def _create(*args, **kwargs) -> M:
+        async with db_session_factory() as db_session:
+            instance = build(*args, **kwargs)
+            db_session.add(instance)
+            await db_session.commit()
+            await db_session.refresh(instance)
+            created.append(instance)
+            return instance
+
+    yield _create
+
+    # Cleanup after the test
+    async with db_session_factory() as db_session:
+        for instance in created:
+            mapper = sa.inspect(type(instance))
+            primary_key = zip(mapper.primary_key, mapper.primary_key_from_instance(instance), strict=True)
+            await db_session.execute(
+                sa.delete(type(instance)).where(*(column == value for column, value in primary_key))
+            )
+        await db_session.commit()
@@ -8,6 +8,7 @@ from faker import Faker
 
 from service.database.models.healthchecks import HealthCheck, ServiceType
 from service.database.models.leads import Lead, LeadStatus
+from service.services.attorneys import AttorneyService
 
 
 @pytest.fixture(scope='function')
@@ -115,6 +116,9 @@ async def create_lead(
                 reached_out_by=reached_out_by,
             )
             db_session.add(lead)
+            # Keep attorney workloads in step, as LeadService does
+            if status == LeadStatus.REACHED_OUT:
+                await AttorneyService.move_reached_out_lead(db_session, None, reached_out_by)
             await db_session.commit()
             await db_session.refresh(lead)
             created_leads.append(lead)
@@ -125,7 +129,12 @@ async def create_lead(
     async def _cleanup():
         async with db_session_factory() as db_session:
             for lead in created_leads:
-                await db_session.execute(sa.delete(Lead).where(Lead.id == lead.id))
+                stored_lead = await db_session.get(Lead, lead.id)
+                if stored_lead is None:
+                    continue
+                if stored_lead.status == LeadStatus.REACHED_OUT:
+                    await AttorneyService.move_reached_out_lead(db_session, stored_lead.reached_out_by, None)
+                await db_session.delete(stored_lead)
             await db_session.commit()
 
     yield _create_lead
@@ -0,0 +1,52 @@
+import uuid
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+import pytest
+
+from service.database.models.lead_events import LeadEvent
+from service.database.models.leads import LeadStatus
+from tests.database.factory import model_factory
+
+
+@pytest.fixture(scope='function')
+async def create_lead_event(
+    db_session_factory,
+) -> AsyncIterator[Callable[..., Awaitable[LeadEvent]]]:
+    """Create a lead event in the database.
+
+    Args:
+        db_session_factory: Database session factory fixture
+
+    Yields:
+        Async function that creates a lead event with the given parameters or defaults if not provided
+    """
+
+    def _build_lead_event(
+        lead_id: uuid.UUID,
+        from_status: LeadStatus | None = None,
+        to_status: LeadStatus | None = None,
+        reached_out_by: uuid.UUID | None = None,
+        actor: str | None = None,
+    ) -> LeadEvent:
+        """Build a lead event.
+
+        Args:
+            lead_id: ID of the lead the event belongs to
+            from_status: Status before the transition
+            to_status: Status after the transition
+            reached_out_by: ID of the attorney who reached out
+            actor: Who made the transition
+
+        Returns:
+            LeadEvent instance to create
+        """
+        return LeadEvent(
+            lead_id=lead_id,
+            from_status=from_status,
+            to_status=to_status or LeadStatus.EMAIL_SENT,
+            reached_out_by=reached_out_by,
+            actor=actor,
+        )
+
+    async with model_factory(db_session_factory, _build_lead_event) as create_lead_event:
+        yield create_lead_event
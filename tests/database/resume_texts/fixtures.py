@@ -0,0 +1,51 @@
+import uuid
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+import pytest
+
+from service.database.models.resume_texts import ResumeText, ResumeTextState
+from tests.database.factory import model_factory
+
+
+@pytest.fixture(scope='function')
+async def create_resume_text(
+    db_session_factory,
+) -> AsyncIterator[Callable[..., Awaitable[ResumeText]]]:
+    """Create an extracted resume text in the database.
+
+    Args:
+        db_session_factory: Database session factory fixture
+
+    Yields:
+        Async function that creates a resume text with the given parameters or defaults if not provided
+    """
+
+    def _build_resume_text(
+        lead_id: uuid.UUID,
+        content: str = '',
+        resume_url: str | None = None,
+        state: ResumeTextState | None = None,
+        error: str | None = None,
+    ) -> ResumeText:
+        """Build a resume text entry.
+
+        Args:
+            lead_id: ID of the lead the resume belongs to
+            content: Extracted text
+            resume_url: URL of the resume the text was extracted from
+            state: Extraction state
+            error: Extraction error
+
+        Returns:
+            ResumeText instance to create
+        """
+        return ResumeText(
+            lead_id=lead_id,
+            resume_url=resume_url or f'https://blob-storage.example.com/{uuid.uuid4()}.pdf',
+            state=state or ResumeTextState.INDEXED,
+            content=content,
+            error=error,
+        )
+
+    async with model_factory(db_session_factory, _build_resume_text) as create_resume_text:
+        yield create_resume_text
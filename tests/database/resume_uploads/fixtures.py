@@ -0,0 +1,54 @@
+import datetime as dt
+import uuid
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+import pytest
+
+from service.database.models.resume_uploads import ResumeUpload, ResumeUploadState
+from service.utils.date_utils import get_utc_now
+from tests.database.factory import model_factory
+
+
+@pytest.fixture(scope='function')
+async def create_resume_upload(
+    db_session_factory,
+) -> AsyncIterator[Callable[..., Awaitable[ResumeUpload]]]:
+    """Create a resume upload outbox entry in the database.
+
+    Args:
+        db_session_factory: Database session factory fixture
+
+    Yields:
+        Async function that creates a resume upload with the given parameters or defaults if not provided
+    """
+
+    def _build_resume_upload(
+        lead_id: uuid.UUID,
+        staged_path: str | None = None,
+        state: ResumeUploadState | None = None,
+        attempts: int = 0,
+        next_attempt_at: dt.datetime | None = None,
+    ) -> ResumeUpload:
+        """Build a resume upload entry.
+
+        Args:
+            lead_id: ID of the lead the resume belongs to
+            staged_path: Path of the staged resume file
+            state: Upload state
+            attempts: Number of upload attempts made so far
+            next_attempt_at: When the upload becomes due
+
+        Returns:
+            ResumeUpload instance to create
+        """
+        return ResumeUpload(
+            id=uuid.uuid4(),
+            lead_id=lead_id,
+            staged_path=staged_path or f'/tmp/resume-staging/{uuid.uuid4().hex}',
+            state=state or ResumeUploadState.PENDING,
+            attempts=attempts,
+            next_attempt_at=next_attempt_at or get_utc_now(),
+        )
+
+    async with model_factory(db_session_factory, _build_resume_upload) as create_resume_upload:
+        yield create_resume_upload
@@ -0,0 +1,42 @@
+import io
+import zipfile
+import zlib
+
+
+def make_pdf(pages: int = 1, text: str | None = None, compress: bool = False) -> bytes:
+    """Build a minimal PDF with the given number of pages; the first one shows text, one line per line of it."""
+    kids = ' '.join(f'{3 + page} 0 R' for page in range(pages))
+    contents = f' /Contents {3 + pages} 0 R' if text is not None else ''
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        f'<< /Type /Pages /Kids [{kids}] /Count {pages} >>'.encode(),
+        f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792]{contents} >>'.encode(),
+        *(b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] >>' for _ in range(pages - 1)),
+    ]
+    if text is not None:
+        lines = ' '.join(f'({line}) Tj 0 -14 Td' for line in text.splitlines())
+        stream = f'BT /F1 12 Tf 72 720 Td {lines} ET'.encode()
+        stream_filter = b''
+        if compress:
+            stream, stream_filter = zlib.compress(stream), b' /Filter /FlateDecode'
+        objects.append(b'<< /Length %d%s >>\nstream\n%s\nendstream' % (len(stream), stream_filter, stream))
+    body = b'%PDF-1.4\n'
+    for number, content in enumerate(objects, start=1):
+        body += f'{number} 0 obj\n'.encode() + content + b'\nendobj\n'
+    return body + f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n%%EOF\n'.encode()
+
+
+def make_docx(pages: int | None = 1, text: str = 'Resume') -> bytes:
+    """Build a minimal DOCX; pages is recorded in docProps/app.xml unless None."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', '<?xml version="1.0"?><Types/>')
+        archive.writestr(
+            'word/document.xml',
+            f'<?xml version="1.0"?><w:document><w:body><w:p><w:r><w:t>{text}</w:t></w:r></w:p></w:body></w:document>',
+        )
+        if pages is not None:
+            archive.writestr(
+                'docProps/app.xml', f'<?xml version="1.0"?><Properties><Pages>{pages}</Pages></Properties>'
+            )
+    return buffer.getvalue()
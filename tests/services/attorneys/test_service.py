@@ -1,8 +1,10 @@
 import uuid
 
 import pytest
+import sqlalchemy as sa
 
-from service.database.models.leads import LeadStatus
+from service.database.models.attorneys import Attorney
+from service.database.models.leads import Lead, LeadStatus
 from service.services.attorneys.service import AttorneyService
 
 
@@ -134,3 +136,112 @@ async def test_get_least_busy_attorney_no_active_attorneys(db_session, create_at
     # Should raise ValueError
     with pytest.raises(ValueError, match='No active attorneys found'):
         await AttorneyService.get_least_busy_attorney(db_session)
+
+
+async def test_move_reached_out_lead(db_session, create_attorney):
+    """Test that a reached out lead is moved between attorney counters, with either side optional."""
+    first_attorney = await create_attorney()
+    second_attorney = await create_attorney()
+
+    await AttorneyService.move_reached_out_lead(db_session, None, first_attorney.id)
+    await AttorneyService.move_reached_out_lead(db_session, None, first_attorney.id)
+    await AttorneyService.move_reached_out_lead(db_session, first_attorney.id, second_attorney.id)
+    await AttorneyService.move_reached_out_lead(db_session, second_attorney.id, second_attorney.id)
+    await db_session.commit()
+
+    query = sa.select(Attorney.id, Attorney.reached_out_count).where(
+        Attorney.id.in_([first_attorney.id, second_attorney.id])
+    )
+    assert dict((await db_session.execute(query)).all()) == {first_attorney.id: 1, second_attorney.id: 1}
+
+
+async def test_reconcile_reached_out_counts(db_session_factory, create_attorney, create_lead):
+    """Test that counters that drifted from the reached out leads are recounted and the others left as they are."""
+    drifted_attorney = await create_attorney()
+    zeroed_attorney = await create_attorney()
+    correct_attorney = await create_attorney()
+    await create_lead(status=LeadStatus.REACHED_OUT, reached_out_by=drifted_attorney.id)
+    await create_lead(status=LeadStatus.REACHED_OUT, reached_out_by=correct_attorney.id)
+    await create_lead(status=LeadStatus.PENDING, reached_out_by=zeroed_attorney.id)
+    async with db_session_factory() as db_session:
+        await db_session.execute(
+            sa.update(Attorney).where(Attorney.id == drifted_attorney.id).values(reached_out_count=5)
+        )
+        await db_session.execute(
+            sa.update(Attorney).where(Attorney.id == zeroed_attorney.id).values(reached_out_count=2)
+        )
+        await db_session.commit()
+
+    async with db_session_factory() as db_session:
+        assert await AttorneyService.reconcile_reached_out_counts(db_session) == 2
+        await db_session.commit()
+
+        query = sa.select(Attorney.id, Attorney.reached_out_count).where(
+            Attorney.id.in_([drifted_attorney.id, zeroed_attorney.id, correct_attorney.id])
+        )
+        assert dict((await db_session.execute(query)).all()) == {
+            drifted_attorney.id: 1,
+            zeroed_attorney.id: 0,
+            correct_attorney.id: 1,
+        }
+        assert await AttorneyService.reconcile_reached_out_counts(db_session) == 0
+
+
+async def test_assign_batch_matches_sequential_assignment(db_session, create_attorney, create_lead):
+    """Test that a batch ends with the counts of sequential least busy picks."""
+    attorneys = [await create_attorney() for _ in range(3)]
+    await create_attorney(is_active=False)
+    for _ in range(3):
+        await create_lead(status=LeadStatus.REACHED_OUT, reached_out_by=attorneys[0].id)
+    await create_lead(status=LeadStatus.REACHED_OUT, reached_out_by=attorneys[1].id)
+    leads = [await create_lead(status=LeadStatus.REGISTERED) for _ in range(6)]
+    reached_out_lead = await create_lead(status=LeadStatus.REACHED_OUT, reached_out_by=attorneys[2].id)
+
+    query = sa.select(Attorney.id, Attorney.reached_out_count).where(Attorney.id.in_([a.id for a in attorneys]))
+    expected_counts = dict((await db_session.execute(query)).all())
+    for _ in leads:
+        attorney_id = min(expected_counts, key=lambda attorney_id: (expected_counts[attorney_id], attorney_id))
+        expected_counts[attorney_id] += 1
+
+    assignments = await AttorneyService.assign_batch(db_session, [*leads, reached_out_lead])
+    await db_session.commit()
+
+    assert set(assignments) == {lead.id for lead in leads}
+    stored_leads = (
+        (
+            await db_session.execute(
+                sa.select(Lead).where(Lead.id.in_(assignments)).execution_options(populate_existing=True)
+            )
+        )
+        .scalars()
+        .all()
+    )
+    assert {lead.id: lead.reached_out_by for lead in stored_leads} == {
+        lead_id: attorney.id for lead_id, attorney in assignments.items()
+    }
+    assert {lead.status for lead in stored_leads} == {LeadStatus.REACHED_OUT}
+    assert dict((await db_session.execute(query)).all()) == expected_counts
+
+
+async def test_apply_batch_skips_reached_out_leads(db_session, create_attorney, create_lead):
+    """Test that a planned batch only counts the leads it actually marks as reached out."""
+    attorneys = [await create_attorney() for _ in range(2)]
+    leads = [await create_lead(status=LeadStatus.REGISTERED) for _ in range(3)]
+
+    assignments = await AttorneyService.plan_batch(db_session, [lead.id for lead in leads])
+
+    # Another worker reaches out to the first lead meanwhile
+    other_attorney = next(attorney for attorney in attorneys if attorney.id != assignments[leads[0].id].id)
+    await db_session.execute(
+        sa.update(Lead)
+        .where(Lead.id == leads[0].id)
+        .values(status=LeadStatus.REACHED_OUT, reached_out_by=other_attorney.id)
+    )
+    await AttorneyService.move_reached_out_lead(db_session, None, other_attorney.id)
+
+    assert await AttorneyService.apply_batch(db_session, assignments) == {leads[1].id, leads[2].id}
+    await db_session.commit()
+
+    query = sa.select(Attorney.id, Attorney.reached_out_count).where(Attorney.id.in_([a.id for a in attorneys]))
+    assert sum(dict((await db_session.execute(query)).all()).values()) == 3
+    assert await AttorneyService.reconcile_reached_out_counts(db_session) == 0
@@ -0,0 +1,52 @@
+import random
+import uuid
+
+import pytest
+
+from service.database.models.attorneys import Attorney
+from service.services.attorneys.workload import AttorneyWorkloadIndex
+
+
+def _attorney(number: int) -> Attorney:
+    return Attorney(id=uuid.UUID(int=number), email=f'attorney{number}@example.com')
+
+
+def _assign_sequentially(workloads: list[tuple[Attorney, int]], lead_count: int) -> dict[uuid.UUID, int]:
+    counts = {attorney.id: count for attorney, count in workloads}
+    for _ in range(lead_count):
+        attorney_id = min(counts, key=lambda attorney_id: (counts[attorney_id], attorney_id))
+        counts[attorney_id] += 1
+    return counts
+
+
+def test_add_leads_breaks_ties_by_id():
+    """Test that a lead goes to the attorney with the fewest leads, the lowest ID among equals."""
+    first, second, third = _attorney(1), _attorney(2), _attorney(3)
+    workload = AttorneyWorkloadIndex([(third, 1), (second, 1), (first, 2)])
+
+    assert workload.add_leads(1) == [second]
+
+
+def test_add_leads_matches_sequential_picks():
+    """Test that a batch of leads ends with the same counts as picking the least busy attorney for each lead."""
+    rng = random.Random(42)
+    for _ in range(500):
+        attorneys = [_attorney(rng.getrandbits(32)) for _ in range(rng.randint(1, 6))]
+        workloads = [(attorney, rng.randint(0, 8)) for attorney in attorneys]
+        lead_count = rng.randint(0, 30)
+        workload = AttorneyWorkloadIndex(workloads)
+
+        expected_counts = _assign_sequentially(workloads, lead_count)
+        assigned = workload.add_leads(lead_count)
+
+        assert len(assigned) == lead_count
+        for attorney, lead_count_before in workloads:
+            assert workload.get_lead_count(attorney.id) == expected_counts[attorney.id]
+            assert assigned.count(attorney) == expected_counts[attorney.id] - lead_count_before
+
+
+def test_add_leads_without_attorneys():
+    """Test that leads cannot be added to an empty index, while no leads can."""
+    assert AttorneyWorkloadIndex([]).add_leads(0) == []
+    with pytest.raises(ValueError, match='No active attorneys found'):
+        AttorneyWorkloadIndex([]).add_leads(1)
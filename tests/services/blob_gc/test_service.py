@@ -0,0 +1,14 @@
+from service.services.blob_gc import BlobGcService
+
+
+async def test_find_orphans(db_session, create_lead):
+    """Test that URLs no lead references are returned in order, also when called twice in a transaction."""
+    lead = await create_lead(resume_url='local://' + 'a' * 64)
+    orphan_urls = ['local://' + 'c' * 64, 'local://' + 'b' * 64]
+
+    assert await BlobGcService.find_orphans(db_session, [lead.resume_url, *orphan_urls]) == sorted(orphan_urls)
+    assert await BlobGcService.find_orphans(db_session, [lead.resume_url]) == []
+    assert await BlobGcService.find_orphans(db_session, []) == []
+    await db_session.commit()
+
+    assert await BlobGcService.find_orphans(db_session, orphan_urls[:1]) == orphan_urls[:1]
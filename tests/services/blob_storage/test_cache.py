@@ -0,0 +1,100 @@
+from unittest.mock import AsyncMock, patch
+
+from service.services.blob_storage.cache import BlobCache, BlobCacheStats
+from service.services.blob_storage.service import BlobStorageService
+
+
+def test_get_and_put():
+    """Test that a cached blob is returned and counted as a hit."""
+    cache = BlobCache(max_bytes=100, max_item_size=50)
+
+    assert cache.get('key') is None
+    cache.put('key', b'data')
+
+    assert cache.get('key') == b'data'
+    assert cache.stats == BlobCacheStats(hits=1, misses=1, hit_bytes=4, size_bytes=4)
+
+
+def test_evicts_least_recently_used_by_size():
+    """Test that the least recently used blobs are evicted once the total size exceeds max_bytes."""
+    cache = BlobCache(max_bytes=30, max_item_size=30)
+    cache.put('first', b'1' * 10)
+    cache.put('second', b'2' * 10)
+    cache.put('third', b'3' * 10)
+    # Reading makes 'first' the most recently used
+    cache.get('first')
+
+    cache.put('fourth', b'4' * 15)
+
+    assert cache.get('second') is None
+    assert cache.get('third') is None
+    assert cache.get('first') == b'1' * 10
+    assert cache.get('fourth') == b'4' * 15
+    assert cache.stats.evictions == 2
+    assert cache.stats.size_bytes == 25
+
+
+def test_large_blob_bypasses_cache():
+    """Test that blobs above max_item_size are not cached and do not evict anything."""
+    cache = BlobCache(max_bytes=100, max_item_size=10)
+    cache.put('small', b'small')
+
+    cache.put('large', b'x' * 11)
+
+    assert cache.get('large') is None
+    assert cache.get('small') == b'small'
+    assert cache.stats.bypasses == 1
+    assert cache.stats.size_bytes == 5
+
+
+def test_put_replaces_and_pop_removes():
+    """Test that the size accounting follows replaced and removed blobs."""
+    cache = BlobCache(max_bytes=100, max_item_size=100)
+    cache.put('key', b'old data')
+    cache.put('key', b'new')
+    assert cache.stats.size_bytes == 3
+
+    cache.pop('key')
+    cache.pop('missing')
+
+    assert cache.get('key') is None
+    assert cache.stats.size_bytes == 0
+
+
+async def test_service_get_uses_cache():
+    """Test that BlobStorageService.get reads a blob from the backend once and drops it on delete."""
+    backend = AsyncMock()
+    backend.get.return_value = b'resume content'
+    cache = BlobCache(max_bytes=1024, max_item_size=1024)
+
+    with (
+        patch('service.services.blob_storage.service.get_blob_storage_backend', return_value=backend),
+        patch('service.services.blob_storage.service.get_blob_cache', return_value=cache),
+    ):
+        assert await BlobStorageService.get('local://key') == b'resume content'
+        assert await BlobStorageService.get('local://key') == b'resume content'
+        await BlobStorageService.delete('local://key')
+        assert await BlobStorageService.get('local://key') == b'resume content'
+
+        assert BlobStorageService.get_cache_stats() is cache.stats
+
+    assert backend.get.await_count == 2
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 2
+
+
+async def test_service_get_does_not_cache_missing_blob():
+    """Test that a missing blob is looked up in the backend every time."""
+    backend = AsyncMock()
+    backend.get.return_value = None
+    cache = BlobCache(max_bytes=1024, max_item_size=1024)
+
+    with (
+        patch('service.services.blob_storage.service.get_blob_storage_backend', return_value=backend),
+        patch('service.services.blob_storage.service.get_blob_cache', return_value=cache),
+    ):
+        assert await BlobStorageService.get('local://missing') is None
+        assert await BlobStorageService.get('local://missing') is None
+
+    assert backend.get.await_count == 2
+    assert cache.stats.size_bytes == 0
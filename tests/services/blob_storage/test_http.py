@@ -0,0 +1,159 @@
+import httpx
+import pytest
+import respx
+
+from service.services.blob_storage.http import HttpBlobStorageBackend
+from service.settings import BlobStorageSettings
+
+BASE_URL = 'http://blob-storage.test/blobs'
+
+
+@pytest.fixture
+async def http_backend():
+    backend = HttpBlobStorageBackend(
+        BlobStorageSettings(backend='http', http_base_url=BASE_URL, http_auth_token='secret', read_chunk_size=4)
+    )
+    await backend.start()
+    yield backend
+    await backend.stop()
+
+
+@pytest.fixture
+def object_store():
+    """Serves PUT, GET (with Range), HEAD and DELETE from a dict, like a minimal object store."""
+    objects: dict[str, bytes] = {}
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        key = request.url.path.rsplit('/', 1)[-1]
+        if request.method == 'PUT':
+            objects[key] = request.read()
+            return httpx.Response(201)
+        if key not in objects:
+            return httpx.Response(404)
+        data = objects[key]
+        if request.method == 'DELETE':
+            del objects[key]
+            return httpx.Response(204)
+        if request.method == 'HEAD':
+            return httpx.Response(200, headers={'Content-Length': str(len(data))})
+        if range_header := request.headers.get('Range'):
+            start, end = (int(value) for value in range_header.removeprefix('bytes=').split('-'))
+            return httpx.Response(206, content=data[start : end + 1])
+        return httpx.Response(200, content=data)
+
+    with respx.mock(base_url=BASE_URL, assert_all_called=False) as router:
+        router.route().mock(side_effect=handle)
+        yield objects
+
+
+async def _chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def _read_range(backend: HttpBlobStorageBackend, url: str, start: int, end: int) -> bytes:
+    stream = await backend.get_stream(url)
+    return b''.join([chunk async for chunk in stream.iter_range(start, end)])
+
+
+async def test_upload_and_get(http_backend, object_store):
+    """Test that uploaded bytes are stored under a random key and read back by URL and by key."""
+    url = await http_backend.upload(b'resume content')
+
+    key = url.removeprefix(f'{BASE_URL}/')
+    assert len(key) == 32
+    assert object_store[key] == b'resume content'
+    assert await http_backend.get(url) == b'resume content'
+    assert await http_backend.get(key) == b'resume content'
+
+
+async def test_upload_stream(http_backend, object_store):
+    """Test that a stream of chunks is sent as a single object."""
+    url = await http_backend.upload_stream(_chunks(b'first ', b'second ', b'third'))
+
+    assert await http_backend.get(url) == b'first second third'
+
+
+async def test_requests_are_authorized(http_backend):
+    """Test that every request carries the configured bearer token."""
+    with respx.mock(base_url=BASE_URL) as router:
+        route = router.put().respond(201)
+        await http_backend.upload(b'data')
+
+    assert route.calls.last.request.headers['Authorization'] == 'Bearer secret'
+
+
+async def test_get_unknown_returns_none(http_backend, object_store):
+    """Test that missing objects and URLs of other stores are not found."""
+    assert await http_backend.get('a' * 64) is None
+    assert await http_backend.get('https://blob-storage.example.com/abc') is None
+    assert await http_backend.get_stream('a' * 64) is None
+
+
+async def test_get_raises_on_server_error(http_backend):
+    """Test that server errors are raised so they can be retried by the resilience layer."""
+    with respx.mock(base_url=BASE_URL) as router:
+        router.get().respond(503)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await http_backend.get('a' * 64)
+
+
+async def test_delete(http_backend, object_store):
+    """Test that delete removes the object and reports whether there was one."""
+    url = await http_backend.upload(b'data')
+
+    assert await http_backend.delete(url) is True
+    assert await http_backend.get(url) is None
+    assert await http_backend.delete(url) is False
+
+
+async def test_delete_keeps_identical_blob(http_backend, object_store):
+    """Test that deleting a blob does not delete another upload of the same bytes."""
+    first_url = await http_backend.upload(b'resume content')
+    second_url = await http_backend.upload(b'resume content')
+
+    assert first_url != second_url
+    assert await http_backend.delete(second_url) is True
+    assert await http_backend.get(first_url) == b'resume content'
+
+
+async def test_get_stream_ranges(http_backend, object_store):
+    """Test that get_stream reports the size and reads any byte range with a Range request."""
+    data = bytes(range(256)) * 4
+    url = await http_backend.upload(data)
+
+    stream = await http_backend.get_stream(url)
+
+    assert stream.size == len(data)
+    assert await _read_range(http_backend, url, 0, len(data)) == data
+    assert await _read_range(http_backend, url, 10, 21) == data[10:21]
+    assert await _read_range(http_backend, url, 5, 5) == b''
+
+
+async def test_get_stream_range_ignored_by_server(http_backend):
+    """Test that a range is cut out of a full response when the server does not support Range."""
+    data = b'0123456789abcdef'
+    with respx.mock(base_url=BASE_URL) as router:
+        router.head().respond(200, headers={'Content-Length': str(len(data))})
+        router.get().respond(200, content=data)
+
+        assert await _read_range(http_backend, 'a' * 64, 3, 13) == data[3:13]
+
+
+async def test_client_is_shared_and_closed_on_stop(object_store):
+    """Test that all calls go through one client which is created by start and closed by stop."""
+    backend = HttpBlobStorageBackend(BlobStorageSettings(backend='http', http_base_url=BASE_URL))
+    with pytest.raises(RuntimeError):
+        await backend.upload(b'data')
+
+    await backend.start()
+    client = backend.client
+    await backend.start()
+    await backend.upload(b'data')
+    assert backend.client is client
+
+    await backend.stop()
+    assert client.is_closed
+    with pytest.raises(RuntimeError):
+        await backend.upload(b'data')
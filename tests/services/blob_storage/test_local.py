@@ -0,0 +1,271 @@
+import asyncio
+import datetime as dt
+import hashlib
+import os
+import pathlib
+import time
+
+import pytest
+
+from service.services.blob_storage import service as blob_storage_service
+from service.services.blob_storage.compression import BlobCodec
+from service.services.blob_storage.local import BlobMetadata, LocalBlobStorageBackend
+from service.services.blob_storage.service import BlobStorageService
+from service.settings import BlobStorageSettings
+from service.utils.date_utils import get_utc_now
+
+
+@pytest.fixture
+def local_backend(tmp_path: pathlib.Path) -> LocalBlobStorageBackend:
+    return LocalBlobStorageBackend(BlobStorageSettings(backend='local', local_dir=str(tmp_path)))
+
+
+def _compressing_backend(tmp_path: pathlib.Path, codec: str) -> LocalBlobStorageBackend:
+    return LocalBlobStorageBackend(
+        BlobStorageSettings(
+            backend='local', local_dir=str(tmp_path), compression_codec=codec, compression_min_size=1024
+        )
+    )
+
+
+async def _chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def test_upload_and_get(local_backend):
+    """Test that uploaded bytes are read back by URL and by key."""
+    url = await local_backend.upload(b'resume content')
+
+    assert url.startswith('local://')
+    assert await local_backend.get(url) == b'resume content'
+    assert await local_backend.get(LocalBlobStorageBackend.parse_key(url)) == b'resume content'
+
+
+async def test_upload_writes_to_sharded_path(local_backend, tmp_path):
+    """Test that blobs are stored in two levels of directories named after the key."""
+    url = await local_backend.upload(b'data')
+    key = LocalBlobStorageBackend.parse_key(url)
+
+    assert local_backend.get_path(key) == tmp_path / key[:2] / key[2:4] / key
+    assert local_backend.get_path(key).read_bytes() == b'data'
+    # Nothing is left behind in the temporary directory
+    assert list((tmp_path / '.tmp').iterdir()) == []
+
+
+async def test_upload_empty_bytes(local_backend):
+    """Test that an empty blob is stored and read back."""
+    url = await local_backend.upload(b'')
+
+    assert await local_backend.get(url) == b''
+
+
+async def test_upload_stream(local_backend):
+    """Test that a stream of chunks is stored as a single blob."""
+    url = await local_backend.upload_stream(_chunks(b'first ', b'second ', b'third'))
+
+    assert await local_backend.get(url) == b'first second third'
+
+
+async def test_upload_stream_failure_leaves_no_files(local_backend, tmp_path):
+    """Test that a failed stream leaves neither a blob nor a temporary file."""
+
+    async def _failing_chunks():
+        yield b'partial'
+        raise RuntimeError('client disconnected')
+
+    with pytest.raises(RuntimeError):
+        await local_backend.upload_stream(_failing_chunks())
+
+    assert [path for path in tmp_path.rglob('*') if path.is_file()] == []
+
+
+async def test_delete(local_backend):
+    """Test that a deleted blob is no longer found."""
+    url = await local_backend.upload(b'data to delete')
+
+    assert await local_backend.delete(url) is True
+    assert await local_backend.get(url) is None
+    assert await local_backend.delete(url) is False
+
+
+async def test_upload_is_content_addressed(local_backend):
+    """Test that the blob key is the SHA-256 digest of the data for both upload variants."""
+    url = await local_backend.upload(b'resume content')
+    stream_url = await local_backend.upload_stream(_chunks(b'resume ', b'content'))
+
+    assert url == stream_url == f'local://{hashlib.sha256(b"resume content").hexdigest()}'
+
+
+async def test_duplicate_upload_is_stored_once(local_backend, tmp_path):
+    """Test that uploading the same data again adds a reference instead of a second file."""
+    urls = await asyncio.gather(*(local_backend.upload(b'same resume') for _ in range(5)))
+    await local_backend.upload_stream(_chunks(b'same ', b'resume'))
+
+    assert len(set(urls)) == 1
+    key = LocalBlobStorageBackend.parse_key(urls[0])
+    assert [path.name for path in tmp_path.rglob(key)] == [key]
+    assert (await local_backend.get_metadata(urls[0])).refs == 6
+
+
+async def test_delete_keeps_blob_until_last_reference(local_backend):
+    """Test that a shared blob survives until every upload of it has been deleted."""
+    url = await local_backend.upload(b'shared resume')
+    await local_backend.upload(b'shared resume')
+
+    assert await local_backend.delete(url) is True
+    assert await local_backend.get(url) == b'shared resume'
+
+    assert await local_backend.delete(url) is True
+    assert await local_backend.get(url) is None
+    assert await local_backend.delete(url) is False
+
+
+@pytest.mark.parametrize('codec', [BlobCodec.ZSTD, BlobCodec.GZIP])
+async def test_text_is_compressed(tmp_path, codec):
+    """Test that large text blobs are stored compressed and read back transparently."""
+    backend = _compressing_backend(tmp_path, codec.value)
+    text = b'Experienced immigration attorney. ' * 1000
+
+    url = await backend.upload(text)
+    stream_url = await backend.upload_stream(_chunks(*(text[offset : offset + 700] for offset in range(0, 34000, 700))))
+
+    assert url == stream_url
+    metadata = await backend.get_metadata(url)
+    assert metadata.codec == codec
+    assert metadata.size == len(text)
+    assert backend.get_path(LocalBlobStorageBackend.parse_key(url)).stat().st_size < len(text) // 10
+    assert await backend.get(url) == text
+
+
+async def test_small_blob_is_not_compressed(tmp_path):
+    """Test that blobs below compression_min_size are stored as is."""
+    backend = _compressing_backend(tmp_path, 'zstd')
+
+    url = await backend.upload(b'short resume')
+
+    assert (await backend.get_metadata(url)).codec is None
+    assert backend.get_path(LocalBlobStorageBackend.parse_key(url)).read_bytes() == b'short resume'
+
+
+async def test_compressed_format_is_not_compressed(tmp_path):
+    """Test that data in an already compressed format, like a DOCX (zip) file, is stored as is."""
+    backend = _compressing_backend(tmp_path, 'zstd')
+    docx = b'PK\x03\x04' + b'\x00' * 4096
+
+    url = await backend.upload(docx)
+
+    assert (await backend.get_metadata(url)).codec is None
+    assert await backend.get(url) == docx
+
+
+async def test_compression_disabled(tmp_path):
+    """Test that nothing is compressed with the none codec."""
+    backend = _compressing_backend(tmp_path, 'none')
+
+    url = await backend.upload(b'a' * 4096)
+
+    assert (await backend.get_metadata(url)).codec is None
+
+
+async def test_uncompressed_blob_without_metadata(local_backend):
+    """Test that a blob stored before metadata was recorded reads as uncompressed with a single reference."""
+    key = 'ab' * 32
+    path = local_backend.get_path(key)
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b'legacy resume')
+    url = LocalBlobStorageBackend.get_url(key)
+
+    assert await local_backend.get(url) == b'legacy resume'
+    assert await local_backend.get_metadata(url) == BlobMetadata(refs=1, codec=None, size=None)
+    assert await local_backend.delete(url) is True
+    assert not path.exists()
+
+
+@pytest.mark.parametrize('codec', ['none', 'zstd'])
+async def test_get_stream_reads_range_in_chunks(tmp_path, codec):
+    """Test that get_stream reports the uncompressed size and reads any range without loading the whole blob."""
+    backend = LocalBlobStorageBackend(
+        BlobStorageSettings(
+            backend='local',
+            local_dir=str(tmp_path),
+            compression_codec=codec,
+            compression_min_size=1024,
+            read_chunk_size=100,
+        )
+    )
+    data = b'0123456789' * 500
+    url = await backend.upload(data)
+
+    blob = await backend.get_stream(url)
+
+    assert blob.size == len(data)
+    raw_chunks = [chunk async for chunk in blob.iter_range(1234, 1789)]
+    assert b''.join(raw_chunks) == data[1234:1789]
+    if codec == 'none':
+        assert max(len(chunk) for chunk in raw_chunks) == 100
+    assert b''.join([chunk async for chunk in blob.iter_range(0, len(data))]) == data
+
+
+async def test_get_stream_missing_blob(local_backend):
+    """Test that get_stream returns None for an unknown blob."""
+    assert await local_backend.get_stream('local://' + 'a' * 64) is None
+
+
+@pytest.mark.parametrize('url', ['local://missing', 'local://../../etc/passwd', 'local://' + '0' * 32])
+async def test_invalid_or_missing_blob(local_backend, url):
+    """Test that malformed and unknown keys are not found."""
+    assert await local_backend.get(url) is None
+    assert await local_backend.delete(url) is False
+
+
+async def test_service_uses_local_backend_from_settings(monkeypatch, tmp_path):
+    """Test that BlobStorageService stores blobs on disk when the local backend is configured."""
+    monkeypatch.setenv('BLOB_STORAGE_BACKEND', 'local')
+    monkeypatch.setenv('BLOB_STORAGE_LOCAL_DIR', str(tmp_path))
+    blob_storage_service.get_blob_storage_backend.cache_clear()
+    try:
+        url = await BlobStorageService.upload(b'stored on disk')
+
+        assert await BlobStorageService.get(url) == b'stored on disk'
+    finally:
+        blob_storage_service.get_blob_storage_backend.cache_clear()
+
+
+def _set_updated_at(backend: LocalBlobStorageBackend, url: str, updated_at: float) -> None:
+    key = LocalBlobStorageBackend.parse_key(url)
+    for path in (backend.get_path(key), backend.get_path(key).with_name(f'{key}.meta')):
+        os.utime(path, (updated_at, updated_at))
+
+
+async def test_list_blobs_in_key_order(local_backend):
+    """Test that blobs are listed page by page in key order, each page starting after the last key."""
+    urls = sorted([await local_backend.upload(f'resume {number}'.encode()) for number in range(7)])
+
+    first_page = await local_backend.list_blobs(None, limit=3)
+    second_page = await local_backend.list_blobs(first_page[-1].key, limit=3)
+    last_page = await local_backend.list_blobs(second_page[-1].key, limit=3)
+
+    assert [blob.url for blob in first_page + second_page + last_page] == urls
+    assert await local_backend.list_blobs(last_page[-1].key, limit=3) == []
+    assert first_page[0].stored_size == len(b'resume 0')
+    assert first_page[0].updated_at <= get_utc_now()
+
+
+async def test_delete_orphan(local_backend):
+    """Test that an orphan is deleted with all its references unless it was stored or uploaded again since."""
+    url = await local_backend.upload(b'orphaned resume')
+    await local_backend.upload(b'orphaned resume')
+    recent_url = await local_backend.upload(b'recent resume')
+    _set_updated_at(local_backend, url, time.time() - 3600)
+    _set_updated_at(local_backend, recent_url, time.time() - 3600)
+    # Uploading the same data again counts as a new reference
+    await local_backend.upload(b'recent resume')
+
+    updated_before = get_utc_now() - dt.timedelta(minutes=30)
+    assert await local_backend.delete_orphan(url, updated_before) is True
+    assert await local_backend.delete_orphan(recent_url, updated_before) is False
+
+    assert await local_backend.get(url) is None
+    assert await local_backend.get(recent_url) == b'recent resume'
+    assert await local_backend.delete_orphan(url, updated_before) is False
@@ -0,0 +1,240 @@
+import asyncio
+import datetime as dt
+import os
+import pathlib
+import time
+
+import pytest
+
+from service.services.blob_storage import packs
+from service.services.blob_storage import service as blob_storage_service
+from service.services.blob_storage.compression import BlobCodec
+from service.services.blob_storage.local import LocalBlobStorageBackend
+from service.services.blob_storage.service import BlobStorageService
+from service.settings import BlobStorageSettings
+from service.utils.date_utils import get_utc_now
+
+
+def _packing_backend(tmp_path: pathlib.Path, **settings) -> LocalBlobStorageBackend:
+    return LocalBlobStorageBackend(
+        BlobStorageSettings(
+            **{
+                'backend': 'local',
+                'local_dir': str(tmp_path),
+                'compression_min_size': 1024,
+                'pack_small_blob_size': 1024,
+                'pack_min_age': 0,
+                **settings,
+            }
+        )
+    )
+
+
+@pytest.fixture
+def packing_backend(tmp_path: pathlib.Path) -> LocalBlobStorageBackend:
+    return _packing_backend(tmp_path)
+
+
+def _blob_files(tmp_path: pathlib.Path) -> list[pathlib.Path]:
+    return [path for path in tmp_path.glob('[0-9a-f]*/**/*') if path.is_file() and '.' not in path.name]
+
+
+async def test_compact_packs_small_blobs(packing_backend, tmp_path):
+    """Test that small blobs move into a segment, lose their files and are read back with their metadata."""
+    urls = [await packing_backend.upload(f'resume {number}'.encode()) for number in range(5)]
+    large_url = await packing_backend.upload(os.urandom(4096))
+
+    stats = await packing_backend.compact()
+
+    assert stats.packed_blobs == 5
+    assert stats.packed_bytes == sum(len(f'resume {number}') for number in range(5))
+    assert [path.name for path in _blob_files(tmp_path)] == [LocalBlobStorageBackend.parse_key(large_url)]
+    assert [path.name for path in (tmp_path / '.packs').glob('segment-*')] == ['segment-00000001.pack']
+    for number, url in enumerate(urls):
+        assert await packing_backend.get(url) == f'resume {number}'.encode()
+        assert (await packing_backend.get_metadata(url)).refs == 1
+
+
+async def test_compact_packs_aged_blobs(packing_backend, tmp_path):
+    """Test that blobs of any size are packed once they are older than pack_aged_blob_age."""
+    text = b'Experienced immigration attorney. ' * 1000
+    url = await packing_backend.upload(text)
+    recent_url = await packing_backend.upload(os.urandom(4096))
+    path = packing_backend.get_path(LocalBlobStorageBackend.parse_key(url))
+    aged = time.time() - packing_backend._settings.pack_aged_blob_age - 1
+    os.utime(path, (aged, aged))
+
+    stats = await packing_backend.compact()
+
+    assert stats.packed_blobs == 1
+    assert not path.exists()
+    assert await packing_backend.get(url) == text
+    assert (await packing_backend.get_metadata(url)).codec == BlobCodec.ZSTD
+    blob = await packing_backend.get_stream(url)
+    assert blob.size == len(text)
+    assert b''.join([chunk async for chunk in blob.iter_range(1234, 5678)]) == text[1234:5678]
+    assert await packing_backend.get_metadata(recent_url) is not None
+
+
+async def test_compact_leaves_recent_blobs(tmp_path):
+    """Test that small blobs are only packed once they are older than pack_min_age."""
+    backend = _packing_backend(tmp_path, pack_min_age=3600)
+    url = await backend.upload(b'just uploaded')
+
+    stats = await backend.compact()
+
+    assert stats.packed_blobs == 0
+    assert backend.get_path(LocalBlobStorageBackend.parse_key(url)).exists()
+
+
+async def test_get_stream_reads_packed_range(packing_backend):
+    """Test that any range of an uncompressed packed blob is read from its segment in chunks."""
+    packing_backend._settings.read_chunk_size = 100
+    data = b'0123456789' * 50
+    await packing_backend.upload(b'blob packed before')
+    url = await packing_backend.upload(data)
+    await packing_backend.compact()
+
+    blob = await packing_backend.get_stream(url)
+
+    assert blob.size == len(data)
+    chunks = [chunk async for chunk in blob.iter_range(123, 456)]
+    assert b''.join(chunks) == data[123:456]
+    assert max(len(chunk) for chunk in chunks) == 100
+
+
+async def test_packed_blob_references(packing_backend, tmp_path):
+    """Test that uploading packed data adds a reference without a file and delete removes it with the last one."""
+    url = await packing_backend.upload(b'shared resume')
+    await packing_backend.compact()
+
+    assert await packing_backend.upload(b'shared resume') == url
+    assert await packing_backend.upload_stream(_chunks(b'shared ', b'resume')) == url
+    assert _blob_files(tmp_path) == []
+    assert list((tmp_path / '.tmp').iterdir()) == []
+    assert (await packing_backend.get_metadata(url)).refs == 3
+
+    assert await asyncio.gather(*(packing_backend.delete(url) for _ in range(3))) == [True] * 3
+    assert await packing_backend.get(url) is None
+    assert await packing_backend.get_stream(url) is None
+    assert await packing_backend.delete(url) is False
+
+
+async def _chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def test_packs_are_shared_between_processes(tmp_path):
+    """Test that blobs packed and deleted through one backend are seen by another one on the same directory."""
+    web_backend = _packing_backend(tmp_path)
+    scheduler_backend = _packing_backend(tmp_path)
+    url = await web_backend.upload(b'resume')
+    other_url = await web_backend.upload(b'other resume')
+    assert await web_backend.get(url) == b'resume'
+
+    await scheduler_backend.compact()
+
+    assert await web_backend.get(url) == b'resume'
+    assert await web_backend.delete(other_url) is True
+    assert await scheduler_backend.get(other_url) is None
+    assert await scheduler_backend.get(url) == b'resume'
+
+
+async def test_compact_rewrites_sparse_segments(tmp_path):
+    """Test that a segment mostly taken up by deleted blobs is rewritten and its live blobs stay readable."""
+    backend = _packing_backend(tmp_path, pack_segment_size=100)
+    urls = [await backend.upload(f'resume number {number:02}'.encode()) for number in range(10)]
+    await backend.compact()
+    segments = sorted(path.name for path in (tmp_path / '.packs').glob('segment-*'))
+    assert len(segments) > 1
+
+    for url in urls[:8]:
+        await backend.delete(url)
+    stats = await backend.compact()
+
+    assert stats.packed_blobs == 0
+    assert stats.rewritten_segments >= 1
+    assert stats.reclaimed_bytes >= 5 * len(b'resume number 00')
+    assert not (tmp_path / '.packs' / segments[0]).exists()
+    for url in urls[8:]:
+        assert await backend.get(url) is not None
+    # A fresh process finds the moved blobs through the index
+    assert [await _packing_backend(tmp_path).get(url) for url in urls] == [None] * 8 + [
+        b'resume number 08',
+        b'resume number 09',
+    ]
+
+
+async def test_compact_rewrites_outdated_index(packing_backend, tmp_path, monkeypatch):
+    """Test that the index is replaced by one record per live blob once most of its records are outdated."""
+    monkeypatch.setattr(packs, '_INDEX_REWRITE_MIN_RECORDS', 0)
+    urls = [await packing_backend.upload(f'resume {number}'.encode()) for number in range(4)]
+    for url in urls[:2]:
+        await packing_backend.upload(await packing_backend.get(url))
+    await packing_backend.compact()
+    for url in urls[:3]:
+        await packing_backend.delete(url)
+
+    await packing_backend.compact()
+
+    assert len((tmp_path / '.packs' / 'index').read_bytes().splitlines()) == 3
+    assert (await packing_backend.get_metadata(urls[0])).refs == 1
+    assert await packing_backend.get(urls[2]) is None
+    assert await _packing_backend(tmp_path).get(urls[3]) == b'resume 3'
+
+
+async def test_torn_index_record_is_ignored(packing_backend, tmp_path):
+    """Test that a record left half-written by a crashed writer is skipped and overwritten by the next one."""
+    url = await packing_backend.upload(b'resume')
+    await packing_backend.compact()
+    with (tmp_path / '.packs' / 'index').open('ab') as index_file:
+        index_file.write(b'{"key": "ab')
+
+    assert await _packing_backend(tmp_path).get(url) == b'resume'
+    assert await packing_backend.upload(b'resume') == url
+    assert (await _packing_backend(tmp_path).get_metadata(url)).refs == 2
+
+
+async def test_compact_runs_one_at_a_time(packing_backend, tmp_path):
+    """Test that compaction is skipped while another process holds the compaction lock."""
+    await packing_backend.upload(b'resume')
+
+    with packs.PackStore(tmp_path / '.packs', segment_size=1024).open_writer() as writer:
+        assert writer is not None
+        assert await packing_backend.compact() is None
+
+    assert (await packing_backend.compact()).packed_blobs == 1
+
+
+async def test_list_and_delete_packed_orphans(packing_backend):
+    """Test that packed blobs are listed in key order with blob files and deleted as orphans by their index record."""
+    packed_urls = [await packing_backend.upload(f'packed resume {number}'.encode()) for number in range(4)]
+    await packing_backend.compact()
+    file_urls = [await packing_backend.upload(f'resume {number}'.encode()) for number in range(4)]
+
+    blobs = await packing_backend.list_blobs(None, limit=5)
+    blobs += await packing_backend.list_blobs(blobs[-1].key, limit=5)
+    assert [blob.url for blob in blobs] == sorted(packed_urls + file_urls)
+
+    assert await packing_backend.delete_orphan(packed_urls[0], get_utc_now() - dt.timedelta(minutes=1)) is False
+    assert await packing_backend.delete_orphan(packed_urls[0], get_utc_now() + dt.timedelta(minutes=1)) is True
+    assert await packing_backend.get(packed_urls[0]) is None
+    assert packed_urls[0] not in [blob.url for blob in await packing_backend.list_blobs(None, limit=10)]
+
+
+async def test_service_compacts_local_backend_only(monkeypatch, tmp_path):
+    """Test that BlobStorageService.compact packs blobs of the local backend and does nothing for others."""
+    assert await BlobStorageService.compact() is None
+
+    monkeypatch.setenv('BLOB_STORAGE_BACKEND', 'local')
+    monkeypatch.setenv('BLOB_STORAGE_LOCAL_DIR', str(tmp_path))
+    monkeypatch.setenv('BLOB_STORAGE_PACK_MIN_AGE', '0')
+    blob_storage_service.get_blob_storage_backend.cache_clear()
+    try:
+        url = await BlobStorageService.upload(b'stored on disk')
+
+        assert (await BlobStorageService.compact()).packed_blobs == 1
+        assert await BlobStorageService.get_stream(url) is not None
+    finally:
+        blob_storage_service.get_blob_storage_backend.cache_clear()
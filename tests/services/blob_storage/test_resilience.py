@@ -0,0 +1,251 @@
+import asyncio
+import time
+from collections import deque
+
+import pytest
+
+from service.services.blob_storage.base import BlobStorageBackend
+from service.services.blob_storage.errors import BlobStorageTimeoutError, BlobStorageUnavailableError
+from service.services.blob_storage.resilience import CircuitBreaker, CircuitState, ResilientBlobStorageBackend
+from service.settings import BlobStorageSettings
+
+
+class LatencyInjectingBlobStorage(BlobStorageBackend):
+    """In-memory store whose calls take the next scripted latency and then raise the next scripted error."""
+
+    def __init__(self, latencies: list[float] | None = None, errors: list[Exception | None] | None = None):
+        self.blobs: dict[str, bytes] = {}
+        self.latencies = deque(latencies or [])
+        self.errors = deque(errors or [])
+        self.calls = 0
+
+    async def _inject(self) -> None:
+        self.calls += 1
+        if self.latencies:
+            await asyncio.sleep(self.latencies.popleft())
+        if self.errors and (error := self.errors.popleft()) is not None:
+            raise error
+
+    async def upload(self, data: bytes) -> str:
+        await self._inject()
+        url = f'memory://{len(self.blobs)}'
+        self.blobs[url] = data
+        return url
+
+    async def upload_stream(self, chunks) -> str:
+        await self._inject()
+        return await self.upload(b''.join([chunk async for chunk in chunks]))
+
+    async def delete(self, url: str) -> bool:
+        await self._inject()
+        return self.blobs.pop(url, None) is not None
+
+    async def get(self, key: str) -> bytes | None:
+        await self._inject()
+        return self.blobs.get(key)
+
+
+def _resilient(store: BlobStorageBackend, **settings) -> ResilientBlobStorageBackend:
+    defaults = {
+        'call_timeout': 1.0,
+        'deadline': 5.0,
+        'retry_base_delay': 0.001,
+        'retry_max_delay': 0.01,
+        'hedge_delay': 1.0,
+    }
+    return ResilientBlobStorageBackend(store, BlobStorageSettings(**(defaults | settings)))
+
+
+async def test_call_timeout():
+    """Test that a slow call is cut off at call_timeout and counted as a timeout."""
+    backend = _resilient(LatencyInjectingBlobStorage(latencies=[1.0]), call_timeout=0.05, retry_max_attempts=1)
+
+    with pytest.raises(BlobStorageTimeoutError):
+        await backend.upload(b'resume')
+
+    assert backend.metrics.timeouts == 1
+    assert backend.metrics.failures == 1
+
+
+async def test_deadline_stops_retries():
+    """Test that retries stop once the deadline is reached."""
+    store = LatencyInjectingBlobStorage(latencies=[1.0] * 10)
+    backend = _resilient(store, call_timeout=0.05, deadline=0.12, retry_max_attempts=10, hedge_enabled=False)
+
+    started_at = time.monotonic()
+    with pytest.raises(BlobStorageTimeoutError):
+        await backend.get('memory://0')
+
+    assert time.monotonic() - started_at < 0.5
+    assert store.calls < 10
+
+
+async def test_read_retried_after_errors():
+    """Test that a read is retried with backoff until it succeeds."""
+    store = LatencyInjectingBlobStorage()
+    url = await store.upload(b'resume')
+    store.errors.extend([ConnectionError('reset'), ConnectionError('reset'), None])
+    backend = _resilient(store, retry_max_attempts=3)
+
+    assert await backend.get(url) == b'resume'
+
+    assert backend.metrics.retries == 2
+    assert backend.metrics.failures == 0
+
+
+@pytest.mark.parametrize('operation', ['upload', 'upload_stream', 'delete'])
+async def test_writes_are_not_retried(operation):
+    """Test that upload, upload_stream and delete run once even if they fail."""
+    store = LatencyInjectingBlobStorage(errors=[ConnectionError('reset')])
+    backend = _resilient(store, retry_max_attempts=3)
+
+    async def _chunks():
+        yield b'resume'
+
+    with pytest.raises(ConnectionError):
+        if operation == 'upload':
+            await backend.upload(b'resume')
+        elif operation == 'upload_stream':
+            await backend.upload_stream(_chunks())
+        else:
+            await backend.delete('memory://0')
+
+    assert store.calls == 1
+    assert backend.metrics.retries == 0
+
+
+async def test_upload_stream_input_errors_do_not_open_circuit():
+    """Test that errors raised by the uploaded chunks are re-raised without counting as store failures."""
+    store = LatencyInjectingBlobStorage()
+    backend = _resilient(store, circuit_failure_threshold=2)
+
+    async def _failing_chunks():
+        yield b'resume'
+        raise ValueError('malformed body')
+
+    for _ in range(3):
+        with pytest.raises(ValueError, match='malformed body'):
+            await backend.upload_stream(_failing_chunks())
+
+    assert backend.circuit_breaker.state == CircuitState.CLOSED
+    assert backend.metrics.failures == 0
+    assert await backend.upload(b'resume') == 'memory://0'
+
+
+async def test_upload_stream_stalled_client_does_not_open_circuit():
+    """Test that a timeout while waiting for the next chunk is not counted as a store failure."""
+    store = LatencyInjectingBlobStorage()
+    backend = _resilient(store, deadline=0.05, circuit_failure_threshold=1)
+
+    async def _stalled_chunks():
+        yield b'resume'
+        await asyncio.sleep(1.0)
+        yield b'never'
+
+    with pytest.raises(BlobStorageTimeoutError):
+        await backend.upload_stream(_stalled_chunks())
+
+    assert backend.circuit_breaker.state == CircuitState.CLOSED
+    assert backend.metrics.failures == 0
+
+
+async def test_slow_read_is_hedged():
+    """Test that a read slower than the hedge delay is duplicated and the faster answer is used."""
+    store = LatencyInjectingBlobStorage()
+    url = await store.upload(b'resume')
+    store.latencies.extend([1.0, 0.01])
+    backend = _resilient(store, hedge_delay=0.05)
+
+    started_at = time.monotonic()
+    assert await backend.get(url) == b'resume'
+
+    assert time.monotonic() - started_at < 0.5
+    assert backend.metrics.hedged_reads == 1
+    assert backend.metrics.hedge_wins == 1
+
+
+async def test_fast_read_is_not_hedged():
+    """Test that a read faster than the hedge delay is not duplicated."""
+    store = LatencyInjectingBlobStorage()
+    url = await store.upload(b'resume')
+    backend = _resilient(store, hedge_delay=0.5)
+
+    assert await backend.get(url) == b'resume'
+
+    assert store.calls == 2
+    assert backend.metrics.hedged_reads == 0
+
+
+async def test_hedge_delay_follows_read_latency_p95():
+    """Test that the hedge delay switches from the configured value to the p95 of sampled read latencies."""
+    store = LatencyInjectingBlobStorage()
+    url = await store.upload(b'resume')
+    backend = _resilient(store, hedge_delay=1.0, hedge_min_samples=20)
+
+    for _ in range(19):
+        await backend.get(url)
+    assert backend.hedge_delay == 1.0
+
+    await backend.get(url)
+    assert backend.hedge_delay < 0.1
+
+
+async def test_circuit_opens_and_fails_fast():
+    """Test that consecutive failures open the circuit and further calls do not reach the store."""
+    store = LatencyInjectingBlobStorage(errors=[ConnectionError('down')] * 2)
+    backend = _resilient(store, retry_max_attempts=1, circuit_failure_threshold=2, circuit_reset_timeout=60)
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            await backend.upload(b'resume')
+
+    with pytest.raises(BlobStorageUnavailableError):
+        await backend.upload(b'resume')
+
+    assert store.calls == 2
+    assert backend.circuit_breaker.state == CircuitState.OPEN
+    assert backend.metrics.circuit_opened == 1
+    assert backend.metrics.circuit_rejections == 1
+
+
+def test_circuit_breaker_half_open_trial():
+    """Test that an open circuit lets a single trial call through after the reset timeout."""
+    now = 0.0
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=lambda: now)
+
+    assert breaker.record_failure() is True
+    assert breaker.allow() is False
+
+    now = 10.0
+    assert breaker.allow() is True
+    assert breaker.state == CircuitState.HALF_OPEN
+    # Only one trial at a time
+    assert breaker.allow() is False
+
+    # A failed trial opens the circuit again
+    assert breaker.record_failure() is True
+    assert breaker.allow() is False
+
+    now = 20.0
+    assert breaker.allow() is True
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow() is True
+
+
+async def test_cancelled_trial_releases_circuit():
+    """Test that a cancelled half-open trial lets the next call through instead of keeping the circuit stuck."""
+    store = LatencyInjectingBlobStorage(errors=[ConnectionError('down')], latencies=[0, 1.0])
+    backend = _resilient(store, retry_max_attempts=1, circuit_failure_threshold=1, circuit_reset_timeout=0)
+    with pytest.raises(ConnectionError):
+        await backend.upload(b'resume')
+
+    trial = asyncio.create_task(backend.upload(b'resume'))
+    await asyncio.sleep(0.01)
+    assert backend.circuit_breaker.state == CircuitState.HALF_OPEN
+    trial.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await trial
+
+    assert await backend.upload(b'resume') == 'memory://0'
+    assert backend.circuit_breaker.state == CircuitState.CLOSED
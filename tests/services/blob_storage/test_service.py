@@ -30,6 +30,12 @@ class TestBlobStorageService:
         assert isinstance(result, str)
         assert result.startswith('https://blob-storage.example.com/')
 
+    async def test_delete_uploaded_url(self):
+        """Test that delete method reports success for an uploaded URL."""
+        url = await BlobStorageService.upload(b'data to delete')
+
+        assert await BlobStorageService.delete(url) is True
+
     async def test_get_returns_bytes_or_none(self):
         """Test that get method returns bytes or None."""
         test_key = 'test-key-123'
@@ -84,3 +90,28 @@ class TestBlobStorageService:
         assert isinstance(data2, bytes)
         # They should be different (very high probability with random data)
         assert data1 != data2
+
+    async def test_upload_stream_returns_string_url(self):
+        """Test that upload_stream method returns a string URL."""
+
+        async def _chunks():
+            for _ in range(3):
+                yield b'x' * 1024
+
+        result = await BlobStorageService.upload_stream(_chunks())
+
+        assert isinstance(result, str)
+        assert result.startswith('https://blob-storage.example.com/')
+
+    async def test_upload_stream_consumes_all_chunks(self):
+        """Test that upload_stream method reads the whole stream."""
+        consumed = []
+
+        async def _chunks():
+            for i in range(5):
+                consumed.append(i)
+                yield b'chunk'
+
+        await BlobStorageService.upload_stream(_chunks())
+
+        assert consumed == [0, 1, 2, 3, 4]
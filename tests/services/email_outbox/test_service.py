@@ -0,0 +1,64 @@
+import datetime as dt
+
+import pytest
+
+from service.database.models.email_outbox import OutboxEmailState
+from service.services.email_outbox.service import EmailOutboxService
+from service.settings import EmailSettings
+from service.utils.date_utils import get_utc_now
+
+
+@pytest.fixture
+def email_outbox_service() -> EmailOutboxService:
+    return EmailOutboxService(
+        EmailSettings(outbox_max_attempts=3, outbox_retry_base_delay=10, outbox_retry_max_delay=25)
+    )
+
+
+def test_get_retry_delay(email_outbox_service):
+    """Test that the retry delay doubles with every attempt up to the maximum."""
+    assert [email_outbox_service.get_retry_delay(attempts) for attempts in range(1, 5)] == [10, 20, 25, 25]
+
+
+async def test_claim_due_emails_skips_claimed(
+    email_outbox_service, db_session_factory, create_lead, create_outbox_email
+):
+    """Test that claimed emails are leased and neither a concurrent nor a later claim returns them again."""
+    lead = await create_lead()
+    emails = [
+        await create_outbox_email(lead_id=lead.id, next_attempt_at=get_utc_now() - dt.timedelta(minutes=minutes))
+        for minutes in (1, 3, 2)
+    ]
+    await create_outbox_email(lead_id=lead.id, state=OutboxEmailState.FAILED)
+
+    async with db_session_factory() as first_session, db_session_factory() as second_session:
+        first_claim = await email_outbox_service.claim_due_emails(first_session, limit=2)
+        second_claim = await email_outbox_service.claim_due_emails(second_session, limit=2)
+        third_claim = await email_outbox_service.claim_due_emails(second_session, limit=2)
+
+    # Longest due first
+    assert {email.id for email in first_claim} == {emails[1].id, emails[2].id}
+    assert all(email.attempts == 1 and email.next_attempt_at > get_utc_now() for email in first_claim)
+    assert [email.id for email in second_claim] == [emails[0].id]
+    assert third_claim == []
+
+
+async def test_record_results(email_outbox_service, db_session_factory, create_lead, create_outbox_email):
+    """Test that sent emails are marked as sent and failed ones rescheduled or given up on after max attempts."""
+    lead = await create_lead()
+    sent, retried, given_up = [await create_outbox_email(lead_id=lead.id, attempts=attempts) for attempts in (0, 0, 2)]
+
+    async with db_session_factory() as db_session:
+        emails = await email_outbox_service.claim_due_emails(db_session, limit=10)
+        await email_outbox_service.record_results(db_session, emails, {retried.id: 'timeout', given_up.id: 'refused'})
+        claimed = {email.id: email for email in emails}
+        for email in emails:
+            await db_session.refresh(email)
+
+    assert claimed[sent.id].state == OutboxEmailState.SENT
+    assert claimed[sent.id].last_error is None
+    assert claimed[retried.id].state == OutboxEmailState.PENDING
+    assert claimed[retried.id].last_error == 'timeout'
+    assert claimed[retried.id].next_attempt_at > get_utc_now() + dt.timedelta(seconds=9)
+    assert claimed[given_up.id].state == OutboxEmailState.FAILED
+    assert claimed[given_up.id].attempts == 3
@@ -0,0 +1,73 @@
+import pathlib
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import jinja2
+import pytest
+
+from service.services.email_service import EmailTemplateNotFoundError, EmailTemplateRegistry, RenderedEmail
+
+
+def _write_template(templates_dir: pathlib.Path, name: str, version: int, subject: str, body: str) -> None:
+    version_dir = templates_dir / name / str(version)
+    version_dir.mkdir(parents=True)
+    (version_dir / 'subject.j2').write_text(subject)
+    (version_dir / 'body.j2').write_text(body)
+
+
+@pytest.fixture
+def registry(tmp_path) -> EmailTemplateRegistry:
+    _write_template(tmp_path, 'welcome', 1, 'Welcome\n', 'Hello {{ name }}')
+    _write_template(tmp_path, 'welcome', 2, 'Welcome, {{ name }}\n', 'Hello {{ name }}, meet {{ attorney }}')
+    return EmailTemplateRegistry(tmp_path)
+
+
+def test_get_latest_and_pinned_versions(registry):
+    """Test that templates are cached by name and version and the latest version is the default."""
+    assert registry.get('welcome').version == 2
+    assert registry.get('welcome', 1).render(name='Ann') == RenderedEmail(subject='Welcome', text='Hello Ann')
+    assert registry.get('welcome') is registry.get('welcome', 2)
+
+    with pytest.raises(EmailTemplateNotFoundError):
+        registry.get('welcome', 3)
+    with pytest.raises(EmailTemplateNotFoundError):
+        registry.get('goodbye')
+
+
+def test_templates_are_compiled_once(registry, tmp_path):
+    """Test that rendering after load neither parses nor reads template files, even when they change."""
+    registry.load()
+    (tmp_path / 'welcome' / '2' / 'body.j2').write_text('Changed')
+
+    with patch.object(jinja2.Environment, 'parse', side_effect=AssertionError('parsed')):
+        rendered = registry.get('welcome').render(name='Ann', attorney='Bob')
+
+    assert rendered.text == 'Hello Ann, meet Bob'
+
+
+def test_render_batch(registry):
+    """Test that a batch renders one email per context, with shared variables overridden by a context."""
+    rendered = registry.render_batch('welcome', [{'name': 'Ann'}, {'name': 'Cid', 'attorney': 'Eve'}], attorney='Bob')
+
+    assert rendered == [
+        RenderedEmail(subject='Welcome, Ann', text='Hello Ann, meet Bob'),
+        RenderedEmail(subject='Welcome, Cid', text='Hello Cid, meet Eve'),
+    ]
+
+
+def test_render_missing_variable(registry):
+    """Test that a variable missing from the context fails the rendering."""
+    with pytest.raises(jinja2.UndefinedError):
+        registry.render_batch('welcome', [{'name': 'Ann'}])
+
+
+def test_lead_outreach_template():
+    """Test that the packaged outreach template is personalized with the lead and the attorney."""
+    lead = SimpleNamespace(first_name='John', last_name='Doe')
+    attorney = SimpleNamespace(email='attorney@example.com')
+
+    rendered = EmailTemplateRegistry().get('lead_outreach').render(lead=lead, attorney=attorney)
+
+    assert rendered.subject == 'Your application'
+    assert rendered.text.startswith('Dear John Doe,\n')
+    assert rendered.text.endswith('attorney@example.com\n')
@@ -0,0 +1,293 @@
+import asyncio
+import email
+import socket
+from unittest.mock import patch
+
+import aiosmtplib
+import pytest
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import AuthResult, LoginPassword
+
+from service.services.email_service import EmailRejectedError, EmailService, EmailUnavailableError
+from service.settings import EmailSettings
+
+
+class _Mailbox:
+    """aiosmtpd handler keeping delivered messages along with the client address of their session."""
+
+    def __init__(self):
+        self.messages: list[tuple[tuple, email.message.Message]] = []
+        self.logins: list[bytes] = []
+        self.delay = 0.0
+        self.recipient_reply: str | None = None
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options) -> str:
+        if self.recipient_reply is not None:
+            return self.recipient_reply
+        envelope.rcpt_tos.append(address)
+        return '250 OK'
+
+    async def handle_DATA(self, server, session, envelope) -> str:
+        await asyncio.sleep(self.delay)
+        self.messages.append((session.peer, email.message_from_bytes(envelope.original_content)))
+        return '250 Message accepted for delivery'
+
+    def authenticate(self, server, session, envelope, mechanism, auth_data) -> AuthResult:
+        if not isinstance(auth_data, LoginPassword) or auth_data.password != b'secret':
+            return AuthResult(success=False, handled=False)
+        self.logins.append(auth_data.login)
+        return AuthResult(success=True)
+
+    @property
+    def session_count(self) -> int:
+        return len({peer for peer, _ in self.messages})
+
+
+class _SmtpServer:
+    def __init__(self):
+        self.mailbox = _Mailbox()
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            self.port = sock.getsockname()[1]
+        self._controller: Controller | None = None
+
+    def start(self) -> None:
+        self._controller = Controller(
+            self.mailbox,
+            hostname='127.0.0.1',
+            port=self.port,
+            authenticator=self.mailbox.authenticate,
+            auth_require_tls=False,
+        )
+        self._controller.start()
+
+    def stop(self) -> None:
+        """Stop the server, which drops every open session."""
+        if self._controller is not None:
+            self._controller.stop()
+            self._controller = None
+
+
+@pytest.fixture
+def smtp_server():
+    server = _SmtpServer()
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+async def make_email_service(smtp_server):
+    email_services = []
+
+    async def _make_email_service(**settings) -> EmailService:
+        email_service = EmailService(
+            EmailSettings(
+                **{
+                    'backend': 'smtp',
+                    'smtp_host': '127.0.0.1',
+                    'smtp_port': smtp_server.port,
+                    'smtp_username': 'outreach',
+                    'smtp_password': 'secret',
+                    'smtp_start_tls': False,
+                    **settings,
+                }
+            )
+        )
+        await email_service.start()
+        email_services.append(email_service)
+        return email_service
+
+    yield _make_email_service
+    for email_service in email_services:
+        await email_service.stop()
+
+
+async def _send(email_service: EmailService, number: int = 0) -> None:
+    await email_service.send(
+        sender='attorney@example.com', receiver=f'lead-{number}@example.com', text=f'Thank you, lead {number}'
+    )
+
+
+async def test_send_reuses_authenticated_session(make_email_service, smtp_server):
+    """Test that consecutive emails are sent through one SMTP session logged in once."""
+    email_service = await make_email_service(subject='Your application')
+
+    for number in range(3):
+        await _send(email_service, number)
+
+    assert smtp_server.mailbox.session_count == 1
+    assert smtp_server.mailbox.logins == [b'outreach']
+    messages = [message for _, message in smtp_server.mailbox.messages]
+    assert [message['To'] for message in messages] == [f'lead-{number}@example.com' for number in range(3)]
+    assert messages[0]['From'] == 'attorney@example.com'
+    assert messages[0]['Subject'] == 'Your application'
+    assert messages[0].get_payload().strip() == 'Thank you, lead 0'
+
+
+async def test_send_concurrently_within_pool_size(make_email_service, smtp_server):
+    """Test that concurrent sends open at most pool_size sessions."""
+    email_service = await make_email_service(pool_size=2)
+
+    await asyncio.gather(*(_send(email_service, number) for number in range(6)))
+
+    assert len(smtp_server.mailbox.messages) == 6
+    assert smtp_server.mailbox.session_count == 2
+
+
+async def test_send_recycles_session_after_max_messages(make_email_service, smtp_server):
+    """Test that a session is ended after max_messages_per_connection emails and a new one is opened."""
+    email_service = await make_email_service(max_messages_per_connection=2)
+
+    for number in range(3):
+        await _send(email_service, number)
+
+    assert smtp_server.mailbox.session_count == 2
+
+
+async def test_send_reconnects_after_dropped_connection(make_email_service, smtp_server):
+    """Test that an email whose pooled connection was dropped is sent again on a new one."""
+    email_service = await make_email_service()
+    await _send(email_service, 0)
+
+    smtp_server.stop()
+    smtp_server.start()
+    await _send(email_service, 1)
+
+    assert [message['To'] for _, message in smtp_server.mailbox.messages] == [
+        'lead-0@example.com',
+        'lead-1@example.com',
+    ]
+    assert smtp_server.mailbox.session_count == 2
+
+
+async def test_cancelled_send_closes_connection(make_email_service, smtp_server):
+    """Test that a send cancelled mid-message closes its connection instead of leaking or reusing it."""
+    email_service = await make_email_service()
+    smtp_server.mailbox.delay = 1.0
+
+    with patch.object(aiosmtplib.SMTP, 'close', autospec=True, side_effect=aiosmtplib.SMTP.close) as close_mock:
+        send_task = asyncio.create_task(_send(email_service))
+        await asyncio.sleep(0.2)
+        send_task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await send_task
+
+    close_mock.assert_called_once()
+    assert email_service._pool.idle_count == 0
+
+    smtp_server.mailbox.delay = 0.0
+    await _send(email_service, 1)
+    assert 'lead-1@example.com' in [message['To'] for _, message in smtp_server.mailbox.messages]
+
+
+async def test_send_server_unavailable(make_email_service, smtp_server):
+    """Test that EmailUnavailableError is raised when no connection can be opened."""
+    email_service = await make_email_service()
+    smtp_server.stop()
+
+    with pytest.raises(EmailUnavailableError):
+        await _send(email_service)
+
+
+async def test_send_rejected_login(make_email_service, smtp_server):
+    """Test that a refused login raises EmailUnavailableError, so the email is tried again once it is fixed."""
+    email_service = await make_email_service(smtp_password='wrong')
+
+    with pytest.raises(EmailUnavailableError):
+        await _send(email_service)
+
+    assert smtp_server.mailbox.messages == []
+
+
+@pytest.mark.parametrize(
+    ('recipient_reply', 'error_class'),
+    [
+        ('450 Greylisted, try again later', EmailUnavailableError),
+        ('452 Insufficient system storage', EmailUnavailableError),
+        ('550 Mailbox does not exist', EmailRejectedError),
+    ],
+)
+async def test_send_refused_recipient(make_email_service, smtp_server, recipient_reply, error_class):
+    """Test that a 4xx reply to the recipient is reported as transient and only a 5xx one as a rejection."""
+    email_service = await make_email_service()
+    smtp_server.mailbox.recipient_reply = recipient_reply
+
+    with pytest.raises(error_class):
+        await _send(email_service)
+
+    assert smtp_server.mailbox.messages == []
+
+
+async def test_check_idle_closes_dropped_connections(make_email_service, smtp_server):
+    """Test that the health check closes idle connections that fail a NOOP and keeps healthy ones."""
+    email_service = await make_email_service()
+    await _send(email_service)
+    pool = email_service._pool
+
+    assert await pool.check_idle() == 0
+    assert pool.idle_count == 1
+
+    smtp_server.stop()
+    assert await pool.check_idle() == 1
+    assert pool.idle_count == 0
+
+
+async def test_check_idle_while_sends_take_connections(make_email_service):
+    """Test that the health check stops when concurrent sends took the rest of the idle connections."""
+    email_service = await make_email_service(pool_size=2)
+    await asyncio.gather(_send(email_service, 0), _send(email_service, 1))
+    pool = email_service._pool
+    assert pool.idle_count == 2
+
+    async def _is_healthy_while_sending(connection) -> bool:
+        # A send takes the other idle connection while this one is being checked
+        taken.append(pool._idle.pop())
+        return False
+
+    taken = []
+
+    with patch.object(pool, '_is_healthy', side_effect=_is_healthy_while_sending):
+        assert await pool.check_idle() == 1
+
+    assert pool.idle_count == 0
+    taken[0].client.close()
+
+
+async def test_health_checks_survive_unexpected_errors(make_email_service):
+    """Test that an unexpected error in one health check neither ends the loop nor fails stop."""
+    email_service = await make_email_service(health_check_interval=0.01)
+    pool = email_service._pool
+
+    check_results = iter([RuntimeError('bug')])
+
+    async def _check_idle() -> int:
+        if (error := next(check_results, None)) is not None:
+            raise error
+        return 0
+
+    with patch.object(pool, 'check_idle', side_effect=_check_idle) as check_idle_mock:
+        await asyncio.sleep(0.1)
+
+    assert check_idle_mock.call_count > 1
+    await pool.stop()
+
+
+async def test_health_checks_close_expired_connections(make_email_service):
+    """Test that the background health check closes connections idle for longer than idle_timeout."""
+    email_service = await make_email_service(health_check_interval=0.01, idle_timeout=0.01)
+    await _send(email_service)
+
+    await asyncio.sleep(0.1)
+
+    assert email_service._pool.idle_count == 0
+
+
+async def test_send_log_backend():
+    """Test that the log backend does not connect to any server."""
+    email_service = EmailService(EmailSettings(backend='log', smtp_host='smtp.invalid'))
+    await email_service.start()
+
+    await _send(email_service)
+
+    await email_service.stop()
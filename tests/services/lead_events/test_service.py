@@ -0,0 +1,34 @@
+import uuid
+
+from service.services.lead_events import LeadEventService
+
+
+async def test_get_lead_events_keyset_pagination(db_session, create_lead_event):
+    """Test that lead events are paginated by the ID of the last event of the previous page."""
+    lead_id = uuid.uuid4()
+    created_events = [await create_lead_event(lead_id=lead_id) for _ in range(5)]
+    # Events of other leads are not returned
+    await create_lead_event(lead_id=uuid.uuid4())
+
+    first_page, next_after_id = await LeadEventService.get_lead_events(db_session, lead_id, limit=2)
+    assert [event.id for event in first_page] == [event.id for event in created_events[:2]]
+    assert next_after_id == created_events[1].id
+
+    second_page, next_after_id = await LeadEventService.get_lead_events(
+        db_session, lead_id, limit=2, after_id=next_after_id
+    )
+    assert [event.id for event in second_page] == [event.id for event in created_events[2:4]]
+
+    last_page, next_after_id = await LeadEventService.get_lead_events(
+        db_session, lead_id, limit=2, after_id=next_after_id
+    )
+    assert [event.id for event in last_page] == [created_events[4].id]
+    assert next_after_id is None
+
+
+async def test_get_lead_events_empty(db_session):
+    """Test that a lead without history has an empty last page."""
+    events, next_after_id = await LeadEventService.get_lead_events(db_session, uuid.uuid4(), limit=10)
+
+    assert events == []
+    assert next_after_id is None
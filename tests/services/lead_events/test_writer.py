@@ -0,0 +1,117 @@
+import asyncio
+import uuid
+from unittest.mock import patch
+
+import pytest
+import sqlalchemy as sa
+
+from service.database.models.lead_events import LeadEvent, LeadEventBase
+from service.database.models.leads import LeadStatus
+from service.services.lead_events import LeadEventWriter
+from service.settings import LeadEventSettings
+
+
+@pytest.fixture
+def lead_id() -> uuid.UUID:
+    return uuid.uuid4()
+
+
+async def _get_events(db_session, lead_id: uuid.UUID) -> list[LeadEvent]:
+    result = await db_session.execute(sa.select(LeadEvent).where(LeadEvent.lead_id == lead_id).order_by(LeadEvent.id))
+    return list(result.scalars().all())
+
+
+def _event(lead_id: uuid.UUID, to_status: LeadStatus = LeadStatus.REACHED_OUT) -> LeadEventBase:
+    return LeadEventBase(lead_id=lead_id, from_status=LeadStatus.PENDING, to_status=to_status, actor='test')
+
+
+async def test_flush_writes_buffered_events(database, db_session, lead_id):
+    """Test that buffered events are written in order and the buffer is emptied."""
+    writer = LeadEventWriter(database, LeadEventSettings())
+    writer.enqueue(_event(lead_id, LeadStatus.EMAIL_SENT))
+    writer.enqueue(_event(lead_id, LeadStatus.REACHED_OUT))
+
+    assert await _get_events(db_session, lead_id) == []
+
+    assert await writer.flush() == 2
+    assert writer.pending_count == 0
+
+    events = await _get_events(db_session, lead_id)
+    assert [event.to_status for event in events] == [LeadStatus.EMAIL_SENT, LeadStatus.REACHED_OUT]
+    assert all(event.actor == 'test' and event.created_at is not None for event in events)
+
+
+async def test_flush_empty_buffer(database):
+    """Test that flushing an empty buffer does nothing."""
+    writer = LeadEventWriter(database, LeadEventSettings())
+
+    assert await writer.flush() == 0
+
+
+async def test_flush_failure_keeps_events(database, db_session, lead_id):
+    """Test that events survive a failed flush and are written by the next one."""
+    writer = LeadEventWriter(database, LeadEventSettings(max_buffer_size=2))
+    for _ in range(3):
+        writer.enqueue(_event(lead_id))
+
+    with patch('service.services.lead_events.writer.get_session_context', side_effect=OSError('db is down')):
+        assert await writer.flush() == 0
+
+    # The buffer is capped, so the oldest event that does not fit is dropped
+    assert writer.pending_count == 2
+
+    assert await writer.flush() == 2
+    assert len(await _get_events(db_session, lead_id)) == 2
+
+
+async def test_flush_failure_drops_oldest_events(database, db_session, lead_id):
+    """Test that a failed flush that overflows the buffer keeps the newest events in order."""
+    writer = LeadEventWriter(database, LeadEventSettings(max_buffer_size=3))
+    writer.enqueue(_event(lead_id, LeadStatus.PENDING))
+    writer.enqueue(_event(lead_id, LeadStatus.REGISTERED))
+
+    def _failing_session_context(database):
+        # Events enqueued while the flush is in flight are buffered behind the ones being written
+        writer.enqueue(_event(lead_id, LeadStatus.EMAIL_SENT))
+        writer.enqueue(_event(lead_id, LeadStatus.REACHED_OUT))
+        raise OSError('db is down')
+
+    with patch('service.services.lead_events.writer.get_session_context', side_effect=_failing_session_context):
+        assert await writer.flush() == 0
+
+    assert await writer.flush() == 3
+    events = await _get_events(db_session, lead_id)
+    assert [event.to_status for event in events] == [
+        LeadStatus.REGISTERED,
+        LeadStatus.EMAIL_SENT,
+        LeadStatus.REACHED_OUT,
+    ]
+
+
+async def test_background_flush_on_size_threshold(database, db_session, lead_id):
+    """Test that reaching flush_size triggers a flush without waiting for the interval."""
+    writer = LeadEventWriter(database, LeadEventSettings(flush_size=2, flush_interval=60))
+    await writer.start()
+    try:
+        writer.enqueue(_event(lead_id))
+        writer.enqueue(_event(lead_id))
+        for _ in range(50):
+            if writer.pending_count == 0:
+                break
+            await asyncio.sleep(0.05)
+
+        assert len(await _get_events(db_session, lead_id)) == 2
+    finally:
+        await writer.stop()
+
+
+async def test_stop_flushes_remaining_events(database, db_session, lead_id):
+    """Test that stopping the writer flushes events below the size threshold."""
+    writer = LeadEventWriter(database, LeadEventSettings(flush_size=100, flush_interval=60))
+    await writer.start()
+    writer.enqueue(_event(lead_id))
+
+    await writer.stop()
+
+    assert writer.pending_count == 0
+    assert len(await _get_events(db_session, lead_id)) == 1
@@ -1,12 +1,21 @@
+import asyncio
+import base64
+from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
 import pytest
+from pydantic import ValidationError
 import sqlalchemy as sa
 
 from service.api import errors as api_errors
+from service.database.models.attorneys import Attorney
 from service.database.models.leads import Lead, LeadStatus
-from service.services.leads.service import LeadService, LeadCreate, LeadCreateWithResume, LeadUpdate
+from service.database.models.resume_uploads import ResumeUpload, ResumeUploadState
 from service.services.leads.errors import LeadServiceDuplicateLeadError
+from service.services.resume_uploads.service import ResumeUploadService
+from service.services.resume_validation.errors import ResumeValidationError
+from service.settings import ResumeSettings
+from service.services.leads.service import LeadService, LeadCreate, LeadCreateForm, LeadCreateWithResume, LeadUpdate
 
 
 async def test_create_lead(db_session):
@@ -169,6 +178,253 @@ async def test_create_lead_with_resume_duplicate_email(db_session, create_lead):
     assert leads[0].status == LeadStatus.REGISTERED
 
 
+async def test_create_lead_with_resume_duplicate_deletes_speculative_upload(db_session, create_lead):
+    """Test that a resume uploaded speculatively for a duplicate email is deleted."""
+    await create_lead(email='speculative.duplicate@example.com', status=LeadStatus.REGISTERED)
+    data = LeadCreateWithResume(
+        first_name='Jane', last_name='Smith', email='speculative.duplicate@example.com', resume=b'resume'
+    )
+
+    with (
+        patch(
+            'service.services.leads.service.BlobStorageService.upload',
+            AsyncMock(return_value='https://blob-storage.example.com/speculative'),
+        ),
+        patch('service.services.leads.service.BlobStorageService.delete', AsyncMock()) as delete_mock,
+        pytest.raises(LeadServiceDuplicateLeadError),
+    ):
+        await LeadService.create_lead_with_resume(db_session, data)
+
+    delete_mock.assert_called_once_with('https://blob-storage.example.com/speculative')
+
+
+async def test_create_lead_with_resume_duplicate_cancels_speculative_upload(db_session, create_lead):
+    """Test that a slow speculative upload is cancelled when the email turns out to be a duplicate."""
+    await create_lead(email='speculative.cancel@example.com', status=LeadStatus.REGISTERED)
+    data = LeadCreateWithResume(
+        first_name='Jane', last_name='Smith', email='speculative.cancel@example.com', resume=b'resume'
+    )
+    upload_finished = False
+
+    async def _slow_upload(_data):
+        nonlocal upload_finished
+        await asyncio.sleep(10)
+        upload_finished = True
+        return 'https://blob-storage.example.com/slow'
+
+    with (
+        patch('service.services.leads.service.BlobStorageService.upload', _slow_upload),
+        patch('service.services.leads.service.BlobStorageService.delete', AsyncMock()) as delete_mock,
+        pytest.raises(LeadServiceDuplicateLeadError),
+    ):
+        await LeadService.create_lead_with_resume(db_session, data)
+
+    assert upload_finished is False
+    delete_mock.assert_not_called()
+
+
+async def test_create_lead_with_resume_check_error_deletes_speculative_upload(db_session):
+    """Test that a resume uploaded before the duplicate check failed is deleted."""
+    data = LeadCreateWithResume(first_name='Jane', last_name='Smith', email='check.error@example.com', resume=b'x')
+
+    async def _failing_check(_db_session, _email):
+        await asyncio.sleep(0.01)
+        raise ConnectionError('Database unavailable')
+
+    with (
+        patch.object(LeadService, '_check_lead_exists', _failing_check),
+        patch(
+            'service.services.leads.service.BlobStorageService.upload',
+            AsyncMock(return_value='https://blob-storage.example.com/check-error'),
+        ),
+        patch('service.services.leads.service.BlobStorageService.delete', AsyncMock()) as delete_mock,
+        pytest.raises(ConnectionError, match='Database unavailable'),
+    ):
+        await LeadService.create_lead_with_resume(db_session, data)
+
+    delete_mock.assert_called_once_with('https://blob-storage.example.com/check-error')
+
+
+async def test_create_lead_with_resume_commit_error_deletes_upload(db_session):
+    """Test that the uploaded resume is deleted when the lead cannot be stored."""
+    data = LeadCreateWithResume(first_name='Jane', last_name='Smith', email='commit.error@example.com', resume=b'x')
+
+    with (
+        patch.object(db_session, 'commit', AsyncMock(side_effect=ConnectionError('Database unavailable'))),
+        patch(
+            'service.services.leads.service.BlobStorageService.upload',
+            AsyncMock(return_value='https://blob-storage.example.com/commit-error'),
+        ),
+        patch('service.services.leads.service.BlobStorageService.delete', AsyncMock()) as delete_mock,
+        pytest.raises(ConnectionError, match='Database unavailable'),
+    ):
+        await LeadService.create_lead_with_resume(db_session, data)
+
+    delete_mock.assert_called_once_with('https://blob-storage.example.com/commit-error')
+    await db_session.rollback()
+
+
+async def test_create_lead_with_resume_upload_error(db_session):
+    """Test that an upload error is raised as is from the speculative path."""
+    data = LeadCreateWithResume(first_name='Jane', last_name='Smith', email='upload.error@example.com', resume=b'x')
+
+    with (
+        patch(
+            'service.services.leads.service.BlobStorageService.upload',
+            AsyncMock(side_effect=RuntimeError('Blob storage unavailable')),
+        ),
+        pytest.raises(RuntimeError, match='Blob storage unavailable'),
+    ):
+        await LeadService.create_lead_with_resume(db_session, data)
+
+    result = await db_session.execute(sa.select(Lead).where(Lead.email == 'upload.error@example.com'))
+    assert result.scalar_one_or_none() is None
+
+
+async def test_create_lead_with_resume_rejected_by_validator(db_session):
+    """Test that a resume rejected by the validator is neither uploaded nor stored."""
+    data = LeadCreateWithResume(first_name='Jane', last_name='Smith', email='invalid.resume@example.com', resume=b'x')
+    resume_validator = MagicMock(validate=AsyncMock(side_effect=ResumeValidationError('Resume is not a PDF')))
+
+    with (
+        patch('service.services.leads.service.BlobStorageService.upload', AsyncMock()) as upload_mock,
+        pytest.raises(ResumeValidationError),
+    ):
+        await LeadService.create_lead_with_resume(db_session, data, resume_validator=resume_validator)
+
+    resume_validator.validate.assert_awaited_once_with(b'x')
+    upload_mock.assert_not_called()
+    result = await db_session.execute(sa.select(Lead).where(Lead.email == 'invalid.resume@example.com'))
+    assert result.scalar_one_or_none() is None
+
+
+async def test_create_lead_with_resume_stream(db_session):
+    """Test create_lead_with_resume_stream method - happy path."""
+
+    async def _resume_chunks():
+        yield b'first chunk of the resume'
+        yield b'second chunk of the resume'
+
+    lead_data = LeadCreateForm(first_name='Stream', last_name='Resume', email='stream.resume@example.com')
+
+    created_lead = await LeadService.create_lead_with_resume_stream(db_session, lead_data, _resume_chunks())
+
+    assert created_lead.email == 'stream.resume@example.com'
+    assert created_lead.status == LeadStatus.REGISTERED
+    assert created_lead.resume_url.startswith('https://blob-storage.example.com/')
+
+    # Cleanup
+    await db_session.execute(sa.delete(Lead).where(Lead.id == created_lead.id))
+    await db_session.commit()
+
+
+async def test_create_lead_with_resume_stream_duplicate_email(db_session, create_lead):
+    """Test create_lead_with_resume_stream method raises exception for duplicate email."""
+    await create_lead(email='stream.duplicate@example.com', status=LeadStatus.REGISTERED)
+
+    async def _resume_chunks():
+        yield b'resume content'
+
+    lead_data = LeadCreateForm(first_name='Jane', last_name='Smith', email='stream.duplicate@example.com')
+
+    with pytest.raises(LeadServiceDuplicateLeadError):
+        await LeadService.create_lead_with_resume_stream(db_session, lead_data, _resume_chunks())
+
+
+async def test_create_lead_with_staged_resume(db_session, tmp_path):
+    """Test create_lead_with_staged_resume stores a pending lead and its outbox row in one go."""
+    resume_upload_service = ResumeUploadService(ResumeSettings(staging_dir=str(tmp_path)))
+    lead_data = LeadCreateForm(first_name='Staged', last_name='Resume', email='staged.resume@example.com')
+
+    created_lead = await LeadService.create_lead_with_staged_resume(
+        db_session, lead_data, b'staged resume content', resume_upload_service
+    )
+
+    assert created_lead.status == LeadStatus.REGISTERED
+    assert created_lead.resume_url == f'pending://{created_lead.id}'
+
+    result = await db_session.execute(sa.select(ResumeUpload).where(ResumeUpload.lead_id == created_lead.id))
+    upload = result.scalar_one()
+    assert upload.state == ResumeUploadState.PENDING
+    assert await resume_upload_service.read_staged(upload.staged_path) == b'staged resume content'
+
+    # Cleanup
+    await db_session.execute(sa.delete(Lead).where(Lead.id == created_lead.id))
+    await db_session.commit()
+
+
+async def test_create_lead_with_staged_resume_duplicate_email(db_session, create_lead, tmp_path):
+    """Test create_lead_with_staged_resume does not stage anything for a duplicate email."""
+    await create_lead(email='staged.duplicate@example.com', status=LeadStatus.REGISTERED)
+    resume_upload_service = ResumeUploadService(ResumeSettings(staging_dir=str(tmp_path)))
+    lead_data = LeadCreateForm(first_name='Jane', last_name='Smith', email='staged.duplicate@example.com')
+
+    with pytest.raises(LeadServiceDuplicateLeadError):
+        await LeadService.create_lead_with_staged_resume(db_session, lead_data, b'resume', resume_upload_service)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_lead_create_with_resume_decodes_base64_in_chunks():
+    """Test that base64 resume spanning several decode chunks is decoded correctly."""
+    resume_data = bytes(range(256)) * 100
+    resume_settings = ResumeSettings(base64_decode_chunk_size=1024)
+
+    with patch('service.services.leads.service.get_resume_settings', return_value=resume_settings):
+        lead_data = LeadCreateWithResume(
+            first_name='Jane',
+            last_name='Smith',
+            email='jane.smith@example.com',
+            resume=base64.b64encode(resume_data).decode(),
+        )
+
+    assert lead_data.resume == resume_data
+
+
+def test_lead_create_with_resume_decodes_wrapped_base64():
+    """Test that base64 wrapped in lines, as MIME encoders do, is decoded with its whitespace ignored."""
+    resume_data = bytes(range(256)) * 10
+    resume_settings = ResumeSettings(base64_decode_chunk_size=64)
+
+    with patch('service.services.leads.service.get_resume_settings', return_value=resume_settings):
+        lead_data = LeadCreateWithResume(
+            first_name='Jane',
+            last_name='Smith',
+            email='jane.smith@example.com',
+            resume=base64.encodebytes(resume_data).decode().replace('\n', '\r\n') + ' ',
+        )
+
+    assert lead_data.resume == resume_data
+
+
+@pytest.mark.parametrize(
+    'resume',
+    [
+        base64.b64encode(b'x' * 101).decode(),
+        b'x' * 101,
+    ],
+)
+def test_lead_create_with_resume_too_large(resume):
+    """Test that resumes above the configured maximum size are rejected."""
+    with (
+        patch('service.services.leads.service.get_resume_settings', return_value=ResumeSettings(max_size=100)),
+        pytest.raises(ValidationError, match='Resume exceeds the maximum size of 100 bytes'),
+    ):
+        LeadCreateWithResume(first_name='Jane', last_name='Smith', email='jane.smith@example.com', resume=resume)
+
+
+@pytest.mark.parametrize('resume', ['not base64!', 'YWJ', 'YQ==YWJj'])
+def test_lead_create_with_resume_invalid_base64(resume):
+    """Test that malformed base64 resume data is rejected."""
+    resume_settings = ResumeSettings(base64_decode_chunk_size=4)
+
+    with (
+        patch('service.services.leads.service.get_resume_settings', return_value=resume_settings),
+        pytest.raises(ValidationError, match='Invalid base64 encoded resume data'),
+    ):
+        LeadCreateWithResume(first_name='J', last_name='S', email='j.s@example.com', resume=resume)
+
+
 async def test_get_leads_paginated(db_session, create_lead):
     """Test get_leads_paginated method with multiple lead objects."""
     # Create multiple leads using the fixture
@@ -274,6 +530,65 @@ async def test_update_lead_multiple_fields(db_session, create_attorney, create_l
     assert updated_lead.updated_at > created_lead.updated_at
 
 
+async def test_update_lead_records_status_change(db_session, create_attorney, create_lead):
+    """Test that update_lead records a status change in the lead history."""
+    created_attorney = await create_attorney(email='history@company.com')
+    created_lead = await create_lead(first_name='History', last_name='User', status=LeadStatus.EMAIL_SENT)
+    event_writer = MagicMock()
+
+    await LeadService.update_lead(
+        db_session,
+        created_lead.id,
+        LeadUpdate(status=LeadStatus.REACHED_OUT, reached_out_by=created_attorney.id),
+        event_writer=event_writer,
+        actor='test_user',
+    )
+
+    event_writer.enqueue.assert_called_once()
+    event = event_writer.enqueue.call_args.args[0]
+    assert event.lead_id == created_lead.id
+    assert event.from_status == LeadStatus.EMAIL_SENT
+    assert event.to_status == LeadStatus.REACHED_OUT
+    assert event.reached_out_by == created_attorney.id
+    assert event.actor == 'test_user'
+
+
+async def test_update_lead_without_status_change_records_nothing(db_session, create_lead):
+    """Test that update_lead does not record an event when the status stays the same."""
+    created_lead = await create_lead(first_name='Same', last_name='Status', status=LeadStatus.PENDING)
+    event_writer = MagicMock()
+
+    await LeadService.update_lead(
+        db_session, created_lead.id, LeadUpdate(status=LeadStatus.PENDING), event_writer=event_writer
+    )
+
+    event_writer.enqueue.assert_not_called()
+
+
+async def test_update_lead_moves_attorney_workloads(db_session, create_attorney, create_lead):
+    """Test that update_lead moves reached out leads between attorney counters in the same transaction."""
+    first_attorney = await create_attorney()
+    second_attorney = await create_attorney()
+    created_lead = await create_lead(status=LeadStatus.EMAIL_SENT)
+
+    async def get_counts() -> list[int]:
+        query = sa.select(Attorney.reached_out_count).where(Attorney.id == first_attorney.id)
+        other_query = sa.select(Attorney.reached_out_count).where(Attorney.id == second_attorney.id)
+        return [(await db_session.execute(query)).scalar_one(), (await db_session.execute(other_query)).scalar_one()]
+
+    await LeadService.update_lead(db_session, created_lead.id, LeadUpdate(reached_out_by=first_attorney.id))
+    assert await get_counts() == [0, 0]
+
+    await LeadService.update_lead(db_session, created_lead.id, LeadUpdate(status=LeadStatus.REACHED_OUT))
+    assert await get_counts() == [1, 0]
+
+    await LeadService.update_lead(db_session, created_lead.id, LeadUpdate(reached_out_by=second_attorney.id))
+    assert await get_counts() == [0, 1]
+
+    await LeadService.update_lead(db_session, created_lead.id, LeadUpdate(status=LeadStatus.PENDING))
+    assert await get_counts() == [0, 0]
+
+
 async def test_update_lead_not_found(db_session):
     """Test update_lead method when lead doesn't exist."""
     # Use a random UUID that doesn't exist
@@ -286,3 +601,27 @@ async def test_update_lead_not_found(db_session):
 
     assert exc_info.value.status_code == 404
     assert exc_info.value.message == 'Lead not found'
+
+
+async def test_claim_registered_leads(db_session, db_session_factory, create_lead):
+    """Test that registered leads are claimed oldest first after a position, skipping leads locked elsewhere."""
+    leads = [await create_lead(status=LeadStatus.REGISTERED) for _ in range(4)]
+    await create_lead(status=LeadStatus.PENDING)
+    own_ids = {lead.id for lead in leads}
+
+    claimed = await LeadService.claim_registered_leads(db_session, None, limit=100)
+    assert [lead.id for lead in claimed if lead.id in own_ids] == [lead.id for lead in leads]
+    await db_session.rollback()
+
+    position = (leads[1].created_at, leads[1].id)
+    claimed = await LeadService.claim_registered_leads(db_session, position, limit=100)
+    assert [lead.id for lead in claimed if lead.id in own_ids] == [leads[2].id, leads[3].id]
+    await db_session.rollback()
+
+    # Leads claimed by another worker are skipped until its transaction ends
+    async with db_session_factory() as other_db_session:
+        other_claimed = await LeadService.claim_registered_leads(other_db_session, None, limit=100)
+        claimed = await LeadService.claim_registered_leads(db_session, None, limit=100)
+        assert not {lead.id for lead in claimed} & {lead.id for lead in other_claimed}
+        assert not own_ids & {lead.id for lead in claimed}
+    await db_session.rollback()
@@ -0,0 +1,61 @@
+import time
+import zlib
+
+import pytest
+
+from service.services.resume_texts import extraction
+from service.services.resume_texts.errors import ResumeTextExtractionError
+from service.services.resume_texts.extraction import extract_text, extract_text_with_time_limit
+from tests.documents import make_docx, make_pdf
+
+
+@pytest.mark.parametrize('compress', [False, True], ids=['raw', 'flate'])
+def test_extract_pdf_text(compress):
+    """Test that the text shown by the content stream is extracted, line by line."""
+    data = make_pdf(pages=2, text='Jane Smith\nSenior Python developer', compress=compress)
+
+    assert extract_text(data, max_length=1000) == 'Jane Smith\nSenior Python developer'
+
+
+def test_extract_pdf_text_operators():
+    """Test that TJ arrays, word gaps and escape sequences are decoded."""
+    content = rb'BT [(Dja) 20 (ngo) -250 (and) -250 (Postgre\123QL)] TJ T* (\(10 years\)) Tj ET'
+    stream = zlib.compress(content)
+    data = b'%%PDF-1.7\n1 0 obj\n<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream\nendobj\n%%%%EOF\n' % (
+        len(stream),
+        stream,
+    )
+
+    assert extract_text(data, max_length=1000) == 'Django and PostgreSQL\n(10 years)'
+
+
+def test_extract_docx_text():
+    """Test that DOCX text runs are extracted with XML entities decoded."""
+    data = make_docx(text='R&amp;D engineer')
+
+    assert extract_text(data, max_length=1000) == 'R&D engineer'
+
+
+def test_extract_plain_text():
+    """Test that plain text resumes are kept with whitespace collapsed and the length capped."""
+    assert extract_text(b'Data   scientist\n\n\n\tMachine learning', max_length=1000) == (
+        'Data scientist\nMachine learning'
+    )
+    assert extract_text(b'Data scientist', max_length=4) == 'Data'
+
+
+@pytest.mark.parametrize(
+    'data', [b'\x89PNG\r\n\x1a\n\x00\x00', b'\xff\xfe\x00binary', make_docx()[:-30]], ids=['png', 'binary', 'docx']
+)
+def test_extract_text_rejects(data):
+    """Test that unsupported and corrupted resumes are rejected."""
+    with pytest.raises(ResumeTextExtractionError):
+        extract_text(data, max_length=1000)
+
+
+def test_extract_text_with_time_limit(monkeypatch):
+    """Test that an extraction running longer than the time limit is interrupted."""
+    monkeypatch.setattr(extraction, 'extract_text', lambda *args: time.sleep(5))
+
+    with pytest.raises(ResumeTextExtractionError, match='timed out'):
+        extract_text_with_time_limit(b'text', 1000, timeout=0.05)
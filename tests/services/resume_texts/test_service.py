@@ -0,0 +1,124 @@
+import asyncio
+import datetime as dt
+import time
+
+import pytest
+import sqlalchemy as sa
+
+from service.database.models.resume_texts import ResumeText, ResumeTextState
+from service.services.resume_texts import ResumeTextService
+from service.services.resume_texts.errors import ResumeTextExtractionError
+from service.settings import ResumeTextSettings
+from service.utils.date_utils import get_utc_now
+from tests.documents import make_docx
+
+
+@pytest.fixture
+async def resume_text_service():
+    service = ResumeTextService(ResumeTextSettings(extraction_workers=1))
+    await service.start()
+    yield service
+    await service.stop()
+
+
+async def test_extract_in_worker_process(resume_text_service):
+    """Test that resume text is extracted by the process pool."""
+    assert await resume_text_service.extract(make_docx(text='Kubernetes operator')) == 'Kubernetes operator'
+
+    with pytest.raises(ResumeTextExtractionError):
+        await resume_text_service.extract(b'\x89PNG\r\n\x1a\n\x00')
+
+
+async def test_extract_timeout_excludes_queue_wait():
+    """Test that a resume queued behind a busy worker for longer than extraction_timeout is still extracted."""
+    service = ResumeTextService(ResumeTextSettings(extraction_workers=1, extraction_timeout=0.5))
+    await service.start()
+    try:
+        busy_worker = asyncio.get_running_loop().run_in_executor(service._executor, time.sleep, 1.0)
+
+        assert await service.extract(make_docx(text='Kubernetes operator')) == 'Kubernetes operator'
+        await busy_worker
+    finally:
+        await service.stop()
+
+
+async def test_get_leads_to_index(db_session, create_lead, create_resume_text):
+    """Test that only leads with an uploaded resume that has not been indexed yet are returned, in keyset order."""
+    new_lead = await create_lead()
+    replaced_lead = await create_lead()
+    indexed_lead = await create_lead()
+    pending_lead = await create_lead(resume_url='pending://resume')
+    await create_resume_text(lead_id=replaced_lead.id, resume_url='https://blob-storage.example.com/old.pdf')
+    await create_resume_text(lead_id=indexed_lead.id, resume_url=indexed_lead.resume_url)
+    updated_before = get_utc_now() + dt.timedelta(seconds=1)
+    own_ids = {new_lead.id, replaced_lead.id, indexed_lead.id, pending_lead.id}
+
+    leads = await ResumeTextService.get_leads_to_index(db_session, None, updated_before, limit=10)
+    assert [lead.id for lead in leads if lead.id in own_ids] == [new_lead.id, replaced_lead.id]
+
+    position = ResumeTextService.encode_position(new_lead)
+    leads = await ResumeTextService.get_leads_to_index(db_session, position, updated_before, limit=10)
+    assert [lead.id for lead in leads if lead.id in own_ids] == [replaced_lead.id]
+
+    # Leads updated too recently are left for a later run
+    leads = await ResumeTextService.get_leads_to_index(db_session, None, new_lead.updated_at, limit=10)
+    assert [lead.id for lead in leads if lead.id in own_ids] == []
+
+
+async def test_save_texts_replaces_existing(db_session, create_lead, create_resume_text):
+    """Test that saved texts are inserted or replace the text of an older resume, with the search vector."""
+    lead = await create_lead()
+    other_lead = await create_lead()
+    await create_resume_text(lead_id=lead.id, content='old text', resume_url='https://blob-storage.example.com/old')
+
+    await ResumeTextService.save_texts(
+        db_session,
+        [
+            ResumeText(lead_id=lead.id, resume_url=lead.resume_url, state=ResumeTextState.INDEXED, content='new'),
+            ResumeText(
+                lead_id=other_lead.id,
+                resume_url=other_lead.resume_url,
+                state=ResumeTextState.FAILED,
+                error='Unsupported resume format',
+            ),
+        ],
+    )
+    await db_session.commit()
+
+    texts = {
+        text.lead_id: text
+        for text in (
+            await db_session.execute(sa.select(ResumeText).where(ResumeText.lead_id.in_([lead.id, other_lead.id])))
+        ).scalars()
+    }
+    assert texts[lead.id].content == 'new'
+    assert texts[lead.id].resume_url == lead.resume_url
+    assert texts[lead.id].search_vector == "'new':1"
+    assert texts[other_lead.id].state == ResumeTextState.FAILED
+    assert texts[other_lead.id].error == 'Unsupported resume format'
+
+
+async def test_search_leads(db_session, create_lead, create_resume_text):
+    """Test that leads are found by stemmed resume words and ranked by how well they match."""
+    python_lead = await create_lead()
+    python_django_lead = await create_lead()
+    java_lead = await create_lead()
+    failed_lead = await create_lead()
+    await create_resume_text(lead_id=python_lead.id, content='Data analyst. Some Python scripting.')
+    await create_resume_text(lead_id=python_django_lead.id, content='Python developer building Django applications')
+    await create_resume_text(lead_id=java_lead.id, content='Java developer')
+    await create_resume_text(lead_id=failed_lead.id, state=ResumeTextState.FAILED)
+
+    results = await ResumeTextService.search_leads(db_session, 'python django', offset=0, limit=10)
+    assert [lead.id for lead, _ in results] == [python_django_lead.id]
+
+    results = await ResumeTextService.search_leads(db_session, 'python OR developers', offset=0, limit=10)
+    assert {lead.id for lead, _ in results} == {python_lead.id, python_django_lead.id, java_lead.id}
+    assert results[0][0].id == python_django_lead.id
+    assert results[0][1] > results[-1][1] > 0
+
+    results = await ResumeTextService.search_leads(db_session, 'developer -java', offset=0, limit=10)
+    assert [lead.id for lead, _ in results] == [python_django_lead.id]
+
+    results = await ResumeTextService.search_leads(db_session, 'python OR developers', offset=1, limit=1)
+    assert len(results) == 1
@@ -0,0 +1,128 @@
+import datetime as dt
+import pathlib
+
+import pytest
+import sqlalchemy as sa
+
+from service.database.models.leads import Lead, LeadStatus
+from service.database.models.resume_uploads import ResumeUpload, ResumeUploadState
+from service.services.resume_uploads.service import ResumeUploadService
+from service.settings import ResumeSettings
+from service.utils.date_utils import get_utc_now
+
+
+@pytest.fixture
+def resume_upload_service(tmp_path: pathlib.Path) -> ResumeUploadService:
+    return ResumeUploadService(
+        ResumeSettings(
+            staging_dir=str(tmp_path / 'staging'),
+            staging_chunk_size=4,
+            upload_max_attempts=3,
+            upload_retry_base_delay=10,
+            upload_retry_max_delay=25,
+        )
+    )
+
+
+async def test_stage_bytes_and_iter_staged(resume_upload_service):
+    """Test that staged resume bytes are read back in chunks."""
+    staged_path = await resume_upload_service.stage(b'resume content')
+
+    chunks = [chunk async for chunk in resume_upload_service.iter_staged(staged_path)]
+
+    assert b''.join(chunks) == b'resume content'
+    assert all(len(chunk) <= 4 for chunk in chunks)
+
+
+async def test_stage_stream(resume_upload_service):
+    """Test that a stream of resume chunks is staged to a single file."""
+
+    async def _chunks():
+        yield b'first '
+        yield b'second'
+
+    staged_path = await resume_upload_service.stage(_chunks())
+
+    assert pathlib.Path(staged_path).read_bytes() == b'first second'
+
+
+async def test_stage_stream_error_removes_file(resume_upload_service):
+    """Test that a partially staged file is removed when the stream fails."""
+
+    async def _chunks():
+        yield b'first'
+        raise RuntimeError('Client disconnected')
+
+    with pytest.raises(RuntimeError):
+        await resume_upload_service.stage(_chunks())
+
+    assert list(resume_upload_service.staging_dir.iterdir()) == []
+
+
+async def test_remove_staged(resume_upload_service):
+    """Test that removing a staged file is idempotent."""
+    staged_path = await resume_upload_service.stage(b'resume')
+
+    await resume_upload_service.remove_staged(staged_path)
+    await resume_upload_service.remove_staged(staged_path)
+
+    assert not pathlib.Path(staged_path).exists()
+
+
+@pytest.mark.parametrize('attempts,expected_delay', [(1, 10), (2, 20), (3, 25), (10, 25)])
+def test_get_retry_delay(resume_upload_service, attempts, expected_delay):
+    """Test capped exponential backoff for upload retries."""
+    assert resume_upload_service.get_retry_delay(attempts) == expected_delay
+
+
+async def test_claim_due_uploads(db_session, resume_upload_service, create_lead, create_resume_upload):
+    """Test that only due pending uploads are claimed, and claimed uploads are hidden from the next claim."""
+    lead = await create_lead(status=LeadStatus.REGISTERED)
+    due_upload = await create_resume_upload(lead_id=lead.id)
+    await create_resume_upload(lead_id=lead.id, next_attempt_at=get_utc_now() + dt.timedelta(hours=1))
+    await create_resume_upload(lead_id=lead.id, state=ResumeUploadState.DONE)
+
+    claimed = await resume_upload_service.claim_due_uploads(db_session, limit=10)
+
+    assert [upload.id for upload in claimed] == [due_upload.id]
+    assert claimed[0].attempts == 1
+    assert claimed[0].next_attempt_at > get_utc_now()
+
+    assert await resume_upload_service.claim_due_uploads(db_session, limit=10) == []
+
+
+async def test_complete_upload(db_session, resume_upload_service, create_lead, create_resume_upload):
+    """Test that completing an upload fills in the lead resume URL."""
+    lead = await create_lead(status=LeadStatus.REGISTERED, resume_url='pending://resume')
+    upload = await create_resume_upload(lead_id=lead.id)
+
+    await resume_upload_service.complete_upload(db_session, upload, 'https://blob-storage.example.com/resume')
+
+    db_lead = (await db_session.execute(sa.select(Lead).where(Lead.id == lead.id))).scalar_one()
+    db_upload = (await db_session.execute(sa.select(ResumeUpload).where(ResumeUpload.id == upload.id))).scalar_one()
+    assert db_lead.resume_url == 'https://blob-storage.example.com/resume'
+    assert db_upload.state == ResumeUploadState.DONE
+
+
+async def test_fail_upload_reschedules(db_session, resume_upload_service, create_lead, create_resume_upload):
+    """Test that a failed upload is rescheduled with backoff while attempts remain."""
+    lead = await create_lead(status=LeadStatus.REGISTERED)
+    upload = await create_resume_upload(lead_id=lead.id, attempts=1)
+
+    await resume_upload_service.fail_upload(db_session, upload, 'Blob storage unavailable')
+
+    db_upload = (await db_session.execute(sa.select(ResumeUpload).where(ResumeUpload.id == upload.id))).scalar_one()
+    assert db_upload.state == ResumeUploadState.PENDING
+    assert db_upload.last_error == 'Blob storage unavailable'
+    assert db_upload.next_attempt_at > get_utc_now() + dt.timedelta(seconds=5)
+
+
+async def test_fail_upload_gives_up(db_session, resume_upload_service, create_lead, create_resume_upload):
+    """Test that an upload is marked failed after the maximum number of attempts."""
+    lead = await create_lead(status=LeadStatus.REGISTERED)
+    upload = await create_resume_upload(lead_id=lead.id, attempts=3)
+
+    await resume_upload_service.fail_upload(db_session, upload, 'Blob storage unavailable')
+
+    db_upload = (await db_session.execute(sa.select(ResumeUpload).where(ResumeUpload.id == upload.id))).scalar_one()
+    assert db_upload.state == ResumeUploadState.FAILED
@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from service.services.resume_validation import ResumeValidationService
+from service.services.resume_validation.errors import (
+    ResumeValidationError,
+    ResumeValidationUnavailableError,
+)
+from service.services.resume_validation.validators import ResumeContentType
+from service.settings import ResumeSettings
+from tests.documents import make_docx, make_pdf
+
+
+@pytest.fixture
+async def resume_validation_service():
+    service = ResumeValidationService(ResumeSettings(validation_workers=1, validation_timeout=30))
+    await service.start()
+    yield service
+    await service.stop()
+
+
+async def test_validate_in_worker_process(resume_validation_service):
+    """Test that documents are validated by the pool and counted in the metrics."""
+    pdf_result, docx_result = await asyncio.gather(
+        resume_validation_service.validate(make_pdf(pages=2)),
+        resume_validation_service.validate(make_docx(pages=1)),
+    )
+    with pytest.raises(ResumeValidationError, match='must be a PDF or DOCX'):
+        await resume_validation_service.validate(b'not a resume')
+
+    assert pdf_result.content_type is ResumeContentType.PDF
+    assert pdf_result.page_count == 2
+    assert docx_result.content_type is ResumeContentType.DOCX
+    metrics = resume_validation_service.metrics
+    assert (metrics.accepted, metrics.rejected, metrics.pending, metrics.max_pending) == (2, 1, 0, 2)
+    assert resume_validation_service.queue_depth == 0
+
+
+async def test_validate_queue_timeout_is_unavailable():
+    """Test that a resume waiting too long for a worker is refused as unavailable, not rejected as invalid."""
+    service = ResumeValidationService(ResumeSettings(validation_workers=1, validation_timeout=0.001))
+    await service.start()
+    try:
+        # The first validation waits for the worker process to be spawned
+        with pytest.raises(ResumeValidationUnavailableError):
+            await service.validate(make_pdf())
+    finally:
+        await service.stop()
+
+    assert service.metrics.timeouts == 1
+    assert service.metrics.accepted == 0
+    assert service.metrics.rejected == 0
+
+
+async def test_validate_refuses_above_max_pending():
+    """Test that resumes above validation_max_pending are refused instead of queued."""
+    service = ResumeValidationService(ResumeSettings(validation_workers=1, validation_max_pending=1))
+    await service.start()
+    try:
+        first = asyncio.create_task(service.validate(make_pdf()))
+        await asyncio.sleep(0)
+        assert service.queue_depth == 0
+        assert service.metrics.pending == 1
+
+        with pytest.raises(ResumeValidationUnavailableError):
+            await service.validate(make_pdf())
+        await first
+    finally:
+        await service.stop()
+
+    assert service.metrics.refused == 1
+    assert service.metrics.accepted == 1
+
+
+async def test_validate_disabled():
+    """Test that nothing is validated or started when validation is disabled."""
+    service = ResumeValidationService(ResumeSettings(validation_enabled=False))
+    await service.start()
+
+    assert await service.validate(b'anything') is None
+    await service.stop()
+
+
+async def test_sniff_stream(resume_validation_service):
+    """Test that a streamed resume is sniffed from its first chunks and handed back whole."""
+    document = make_pdf()
+
+    async def _chunks(data: bytes):
+        for start in range(0, len(data), 100):
+            yield data[start : start + 100]
+
+    chunks = await resume_validation_service.sniff_stream(_chunks(document))
+    assert b''.join([chunk async for chunk in chunks]) == document
+
+    with pytest.raises(ResumeValidationError, match='must be a PDF or DOCX'):
+        await resume_validation_service.sniff_stream(_chunks(b'not a resume' * 200))
+    assert resume_validation_service.metrics.rejected == 1
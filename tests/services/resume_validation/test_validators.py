@@ -0,0 +1,86 @@
+import io
+import time
+import zipfile
+
+import pytest
+
+from service.services.resume_validation import validators
+from service.services.resume_validation.errors import ResumeValidationError, ResumeValidationTimeoutError
+from service.services.resume_validation.validators import (
+    ResumeContentType,
+    validate_resume,
+    validate_resume_with_time_limit,
+)
+from tests.documents import make_docx, make_pdf
+
+MAX_UNCOMPRESSED_SIZE = 1024 * 1024
+
+
+def test_validate_pdf():
+    """Test that a PDF is accepted and its pages are counted."""
+    result = validate_resume(make_pdf(pages=3), max_pages=10, max_uncompressed_size=MAX_UNCOMPRESSED_SIZE)
+
+    assert result.content_type is ResumeContentType.PDF
+    assert result.page_count == 3
+
+
+def test_validate_pdf_page_count_from_page_tree():
+    """Test that the page tree /Count is used when page objects are not visible, e.g. in object streams."""
+    data = b'%PDF-1.7\n1 0 obj\n<< /Type /Pages /Count 12 /Kids [] >>\nendobj\n%%EOF\n'
+
+    result = validate_resume(data, max_pages=50, max_uncompressed_size=MAX_UNCOMPRESSED_SIZE)
+
+    assert result.page_count == 12
+
+
+def test_validate_docx():
+    """Test that a DOCX is accepted with the page count from its properties, if there is one."""
+    result = validate_resume(make_docx(pages=2), max_pages=10, max_uncompressed_size=MAX_UNCOMPRESSED_SIZE)
+    assert result.content_type is ResumeContentType.DOCX
+    assert result.page_count == 2
+
+    result = validate_resume(make_docx(pages=None), max_pages=10, max_uncompressed_size=MAX_UNCOMPRESSED_SIZE)
+    assert result.page_count is None
+
+
+def _zip(**members: str) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in members.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize(
+    'data, message',
+    [
+        (b'', 'must be a PDF or DOCX'),
+        (b'plain text resume', 'must be a PDF or DOCX'),
+        (b'\x89PNG\r\n\x1a\n' + b'\x00' * 100, 'must be a PDF or DOCX'),
+        (make_pdf()[:-20], 'truncated'),
+        (make_pdf(pages=11), 'maximum of 10 pages'),
+        (make_docx(pages=11), 'maximum of 10 pages'),
+        (_zip(**{'mimetype': 'application/zip', 'data.txt': 'not a document'}), 'not a DOCX'),
+        (make_docx()[:-30], 'corrupted'),
+        (make_docx(text='x' * 2 * MAX_UNCOMPRESSED_SIZE), 'too large when uncompressed'),
+    ],
+    ids=['empty', 'text', 'png', 'truncated_pdf', 'pdf_pages', 'docx_pages', 'zip', 'corrupted_docx', 'zip_bomb'],
+)
+def test_validate_resume_rejects(data, message):
+    """Test that malformed documents and documents above the limits are rejected."""
+    with pytest.raises(ResumeValidationError, match=message):
+        validate_resume(data, max_pages=10, max_uncompressed_size=MAX_UNCOMPRESSED_SIZE)
+
+
+def test_validate_resume_with_time_limit(monkeypatch):
+    """Test that a check running longer than the time limit is interrupted and the timer is cleared."""
+    monkeypatch.setattr(validators, 'validate_resume', lambda *args: time.sleep(5))
+
+    started_at = time.monotonic()
+    with pytest.raises(ResumeValidationTimeoutError):
+        validate_resume_with_time_limit(make_pdf(), 10, MAX_UNCOMPRESSED_SIZE, timeout=0.05)
+    assert time.monotonic() - started_at < 1
+
+    monkeypatch.undo()
+    result = validate_resume_with_time_limit(make_pdf(), 10, MAX_UNCOMPRESSED_SIZE, timeout=0.05)
+    assert result.page_count == 1
@@ -0,0 +1,79 @@
+import os
+import time
+
+import pytest
+import sqlalchemy as sa
+
+from service.database.models.job_checkpoints import JobCheckpoint
+from service.services.blob_storage import service as blob_storage_service
+from service.services.blob_storage.local import LocalBlobStorageBackend
+from service.settings import BlobGcSettings
+from service.tasks.collect_orphaned_blobs import JOB_NAME, collect_orphaned_blobs
+
+
+@pytest.fixture
+async def gc_container(container, db_session_factory, monkeypatch, tmp_path):
+    monkeypatch.setenv('BLOB_STORAGE_BACKEND', 'local')
+    monkeypatch.setenv('BLOB_STORAGE_LOCAL_DIR', str(tmp_path))
+    blob_storage_service.get_blob_storage_backend.cache_clear()
+    container.blob_gc_settings = BlobGcSettings(grace_period=600, batch_size=2, io_budget=0)
+    yield container
+    blob_storage_service.get_blob_storage_backend.cache_clear()
+    async with db_session_factory() as db_session:
+        await db_session.execute(sa.delete(JobCheckpoint).where(JobCheckpoint.name == JOB_NAME))
+        await db_session.commit()
+
+
+async def _upload(container, data: bytes, age: float = 0) -> str:
+    url = await container.blob_storage_service.upload(data)
+    if age:
+        key = LocalBlobStorageBackend.parse_key(url)
+        path = blob_storage_service.get_blob_storage_backend().backend.get_path(key)
+        updated_at = time.time() - age
+        for blob_path in (path, path.with_name(f'{key}.meta')):
+            os.utime(blob_path, (updated_at, updated_at))
+    return url
+
+
+async def _get_checkpoint(db_session) -> JobCheckpoint | None:
+    query = sa.select(JobCheckpoint).where(JobCheckpoint.name == JOB_NAME).execution_options(populate_existing=True)
+    return (await db_session.execute(query)).scalar_one_or_none()
+
+
+async def test_collect_orphaned_blobs(gc_container, db_session, create_lead):
+    """Test that only unreferenced blobs older than the grace period are deleted and a full pass starts over."""
+    referenced_url = await _upload(gc_container, b'referenced resume', age=3600)
+    await create_lead(resume_url=referenced_url)
+    orphan_urls = [await _upload(gc_container, f'orphaned resume {number}'.encode(), age=3600) for number in range(3)]
+    recent_url = await _upload(gc_container, b'resume of a lead being created')
+
+    await collect_orphaned_blobs(gc_container)
+
+    storage = gc_container.blob_storage_service
+    assert await storage.get(referenced_url) == b'referenced resume'
+    assert await storage.get(recent_url) == b'resume of a lead being created'
+    assert [await storage.get(url) for url in orphan_urls] == [None] * 3
+    checkpoint = await _get_checkpoint(db_session)
+    assert checkpoint.position is None
+
+
+async def test_collect_orphaned_blobs_continues_from_checkpoint(gc_container, db_session):
+    """Test that a run stops after max_batches_per_run and the next run continues after the last checked key."""
+    gc_container.blob_gc_settings.max_batches_per_run = 1
+    urls = sorted([await _upload(gc_container, f'orphan {number}'.encode(), age=3600) for number in range(3)])
+
+    await collect_orphaned_blobs(gc_container)
+
+    storage = gc_container.blob_storage_service
+    assert [await storage.get(url) is None for url in urls] == [True, True, False]
+    checkpoint = await _get_checkpoint(db_session)
+    assert checkpoint.position == LocalBlobStorageBackend.parse_key(urls[1])
+
+    await collect_orphaned_blobs(gc_container)
+
+    assert await storage.get(urls[2]) is None
+
+
+async def test_collect_orphaned_blobs_without_listing(container):
+    """Test that nothing is done for backends that cannot list their blobs."""
+    await collect_orphaned_blobs(container)
@@ -0,0 +1,27 @@
+from unittest.mock import AsyncMock
+
+from service.services.blob_storage.packs import PackCompactionStats
+from service.tasks.compact_blob_storage import compact_blob_storage
+
+
+async def test_compact_blob_storage(container, caplog):
+    """Test that the job compacts blob storage and logs what was packed."""
+    container.blob_storage_service.compact = AsyncMock(
+        return_value=PackCompactionStats(packed_blobs=3, packed_bytes=300, rewritten_segments=1, reclaimed_bytes=50)
+    )
+
+    with caplog.at_level('INFO'):
+        await compact_blob_storage(container)
+
+    container.blob_storage_service.compact.assert_awaited_once()
+    assert 'Packed 3 blobs (300 bytes), rewrote 1 segments and reclaimed 50 bytes' in caplog.text
+
+
+async def test_compact_blob_storage_not_local(container, caplog):
+    """Test that the job does nothing for backends without blob files."""
+    container.blob_storage_service.compact = AsyncMock(return_value=None)
+
+    with caplog.at_level('INFO'):
+        await compact_blob_storage(container)
+
+    assert 'Blob storage is not compacted' in caplog.text
@@ -0,0 +1,175 @@
+import asyncio
+import datetime as dt
+from unittest.mock import AsyncMock
+
+import sqlalchemy as sa
+import sqlmodel as sm
+
+from service.database.models.email_outbox import OutboxEmail, OutboxEmailState
+from service.database.models.leads import LeadStatus
+from service.services.email_service import EmailRejectedError, EmailUnavailableError
+from service.settings import EmailSettings, SchedulerSettings
+from service.tasks.dispatch_emails import dispatch_outbox_emails
+from service.tasks.send_email import send_emails_to_leads
+from service.utils.date_utils import get_utc_now
+
+
+async def _get_emails(db_session, emails) -> dict:
+    query = (
+        sa.select(OutboxEmail)
+        .where(sm.col(OutboxEmail.id).in_([email.id for email in emails]))
+        .execution_options(populate_existing=True)
+    )
+    return {email.id: email for email in (await db_session.execute(query)).scalars()}
+
+
+async def test_dispatch_outbox_emails_success(container, db_session, create_lead, create_outbox_email):
+    """Test that due emails are sent and marked as sent, while emails not yet due are left for later."""
+    lead = await create_lead()
+    due_email = await create_outbox_email(lead_id=lead.id, receiver='due@test.com')
+    later_email = await create_outbox_email(
+        lead_id=lead.id, receiver='later@test.com', next_attempt_at=get_utc_now() + dt.timedelta(hours=1)
+    )
+    sent_email = await create_outbox_email(lead_id=lead.id, receiver='sent@test.com', state=OutboxEmailState.SENT)
+    container.email_service.send = AsyncMock()
+
+    await dispatch_outbox_emails(container)
+
+    container.email_service.send.assert_called_once_with(
+        sender=due_email.sender, receiver='due@test.com', text=due_email.text, subject=due_email.subject
+    )
+    emails = await _get_emails(db_session, [due_email, later_email, sent_email])
+    assert emails[due_email.id].state == OutboxEmailState.SENT
+    assert emails[due_email.id].attempts == 1
+    assert emails[later_email.id].state == OutboxEmailState.PENDING
+    assert emails[later_email.id].attempts == 0
+
+
+async def test_dispatch_outbox_emails_failure_is_rescheduled(container, db_session, create_lead, create_outbox_email):
+    """Test that a failed send is rescheduled with backoff and the other emails of the batch are sent."""
+    container.email_settings = EmailSettings(outbox_retry_base_delay=60)
+    lead = await create_lead()
+    emails = [await create_outbox_email(lead_id=lead.id, receiver=f'lead{number}@test.com') for number in range(3)]
+
+    async def send(sender: str, receiver: str, text: str, subject: str) -> None:
+        if receiver == 'lead1@test.com':
+            raise EmailUnavailableError('Mailbox unavailable')
+
+    container.email_service.send = AsyncMock(side_effect=send)
+    started_at = get_utc_now()
+
+    await dispatch_outbox_emails(container)
+
+    stored_emails = await _get_emails(db_session, emails)
+    assert [stored_emails[email.id].state for email in emails] == [
+        OutboxEmailState.SENT,
+        OutboxEmailState.PENDING,
+        OutboxEmailState.SENT,
+    ]
+    failed_email = stored_emails[emails[1].id]
+    assert failed_email.attempts == 1
+    assert failed_email.last_error == 'Mailbox unavailable'
+    assert failed_email.next_attempt_at >= started_at + dt.timedelta(seconds=60)
+
+    # Not due again within the same run nor right after it
+    container.email_service.send.reset_mock()
+    await dispatch_outbox_emails(container)
+    container.email_service.send.assert_not_called()
+
+
+async def test_dispatch_outbox_emails_gives_up(container, db_session, create_lead, create_outbox_email):
+    """Test that an email failing its last attempt is marked as failed."""
+    container.email_settings = EmailSettings(outbox_max_attempts=3)
+    lead = await create_lead()
+    email = await create_outbox_email(lead_id=lead.id, attempts=2)
+    container.email_service.send = AsyncMock(side_effect=EmailUnavailableError('Mailbox unavailable'))
+
+    await dispatch_outbox_emails(container)
+
+    stored_email = (await _get_emails(db_session, [email]))[email.id]
+    assert stored_email.state == OutboxEmailState.FAILED
+    assert stored_email.attempts == 3
+
+
+async def test_dispatch_outbox_emails_rejected_is_not_retried(container, db_session, create_lead, create_outbox_email):
+    """Test that an email refused by the server is marked as failed on its first attempt."""
+    lead = await create_lead()
+    email = await create_outbox_email(lead_id=lead.id)
+    container.email_service.send = AsyncMock(side_effect=EmailRejectedError('550 Mailbox does not exist'))
+
+    await dispatch_outbox_emails(container)
+
+    stored_email = (await _get_emails(db_session, [email]))[email.id]
+    assert stored_email.state == OutboxEmailState.FAILED
+    assert stored_email.attempts == 1
+    assert stored_email.last_error == '550 Mailbox does not exist'
+
+
+async def test_dispatch_outbox_emails_in_batches(container, db_session, create_lead, create_outbox_email):
+    """Test that a run claims due emails in batches until none are left."""
+    container.email_settings = EmailSettings(outbox_batch_size=2)
+    lead = await create_lead()
+    emails = [await create_outbox_email(lead_id=lead.id) for _ in range(5)]
+    container.email_outbox_service.claim_due_emails = AsyncMock(wraps=container.email_outbox_service.claim_due_emails)
+    container.email_service.send = AsyncMock()
+
+    await dispatch_outbox_emails(container)
+
+    assert container.email_outbox_service.claim_due_emails.call_count == 3
+    assert container.email_service.send.call_count == 5
+    assert {email.state for email in (await _get_emails(db_session, emails)).values()} == {OutboxEmailState.SENT}
+
+
+async def test_dispatch_outbox_emails_bounded_concurrency(container, create_lead, create_outbox_email):
+    """Test that no more than send_emails_concurrency emails are in flight."""
+    container.scheduler_settings = SchedulerSettings(send_emails_concurrency=2)
+    lead = await create_lead()
+    for _ in range(7):
+        await create_outbox_email(lead_id=lead.id)
+    in_flight = 0
+    max_in_flight = 0
+
+    async def send(sender: str, receiver: str, text: str, subject: str) -> None:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+    container.email_service.send = AsyncMock(side_effect=send)
+
+    await dispatch_outbox_emails(container)
+
+    assert max_in_flight == 2
+    assert container.email_service.send.call_count == 7
+
+
+async def test_dispatch_outbox_emails_concurrent_runs(container, create_lead, create_outbox_email):
+    """Test that overlapping dispatchers send every due email exactly once."""
+    container.email_settings = EmailSettings(outbox_batch_size=2)
+    lead = await create_lead()
+    emails = [await create_outbox_email(lead_id=lead.id) for _ in range(9)]
+
+    async def send(sender: str, receiver: str, text: str, subject: str) -> None:
+        await asyncio.sleep(0.01)
+
+    container.email_service.send = AsyncMock(side_effect=send)
+
+    await asyncio.gather(dispatch_outbox_emails(container), dispatch_outbox_emails(container))
+
+    receivers = [call.kwargs['receiver'] for call in container.email_service.send.call_args_list]
+    assert sorted(receivers) == sorted(email.receiver for email in emails)
+
+
+async def test_queued_emails_are_dispatched(container, db_session, create_attorney, create_lead):
+    """Test that emails queued by send_emails_to_leads are sent by the dispatcher."""
+    attorney = await create_attorney()
+    lead = await create_lead(status=LeadStatus.REGISTERED)
+    container.email_service.send = AsyncMock()
+
+    await send_emails_to_leads(container)
+    await dispatch_outbox_emails(container)
+
+    container.email_service.send.assert_called_once()
+    assert container.email_service.send.call_args.kwargs['sender'] == attorney.email
+    assert container.email_service.send.call_args.kwargs['receiver'] == lead.email
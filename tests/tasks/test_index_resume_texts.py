@@ -0,0 +1,91 @@
+from unittest.mock import AsyncMock
+
+import pytest
+import sqlalchemy as sa
+
+from service.database.models.job_checkpoints import JobCheckpoint
+from service.database.models.resume_texts import ResumeText, ResumeTextState
+from service.services.blob_storage.errors import BlobStorageUnavailableError
+from service.settings import ResumeTextSettings
+from service.tasks.index_resume_texts import JOB_NAME, index_resume_texts
+from tests.documents import make_docx, make_pdf
+
+
+@pytest.fixture
+async def indexing_container(container, db_session_factory):
+    container.resume_text_settings = ResumeTextSettings(settle_delay=0, batch_size=2, extraction_workers=1)
+    await container.resume_text_service.start()
+    yield container
+    await container.resume_text_service.stop()
+    async with db_session_factory() as db_session:
+        await db_session.execute(sa.delete(JobCheckpoint).where(JobCheckpoint.name == JOB_NAME))
+        await db_session.commit()
+
+
+async def _get_texts(db_session, leads) -> dict:
+    query = sa.select(ResumeText).where(ResumeText.lead_id.in_([lead.id for lead in leads]))
+    return {text.lead_id: text for text in (await db_session.execute(query)).scalars()}
+
+
+async def _get_checkpoint(db_session) -> JobCheckpoint | None:
+    query = sa.select(JobCheckpoint).where(JobCheckpoint.name == JOB_NAME).execution_options(populate_existing=True)
+    return (await db_session.execute(query)).scalar_one_or_none()
+
+
+async def test_index_resume_texts(indexing_container, db_session, create_lead):
+    """Test that resumes are extracted in batches and the checkpoint follows the last indexed lead."""
+    pdf_lead = await create_lead()
+    docx_lead = await create_lead()
+    image_lead = await create_lead()
+    missing_lead = await create_lead()
+    pending_lead = await create_lead(resume_url='pending://resume')
+    resumes = {
+        pdf_lead.resume_url: make_pdf(text='Python developer'),
+        docx_lead.resume_url: make_docx(text='Immigration lawyer'),
+        image_lead.resume_url: b'\x89PNG\r\n\x1a\n\x00',
+    }
+    indexing_container.blob_storage_service.get = AsyncMock(side_effect=lambda url: resumes.get(url))
+
+    await index_resume_texts(indexing_container)
+
+    texts = await _get_texts(db_session, [pdf_lead, docx_lead, image_lead, missing_lead, pending_lead])
+    assert texts[pdf_lead.id].content == 'Python developer'
+    assert texts[pdf_lead.id].state == ResumeTextState.INDEXED
+    assert texts[docx_lead.id].content == 'Immigration lawyer'
+    assert texts[image_lead.id].state == ResumeTextState.FAILED
+    assert texts[image_lead.id].error == 'Unsupported resume format'
+    assert texts[missing_lead.id].error == 'Resume not found'
+    assert pending_lead.id not in texts
+
+    checkpoint = await _get_checkpoint(db_session)
+    assert checkpoint.position == indexing_container.resume_text_service.encode_position(missing_lead)
+
+    # Nothing is downloaded again by the next run
+    indexing_container.blob_storage_service.get.reset_mock()
+    await index_resume_texts(indexing_container)
+    indexing_container.blob_storage_service.get.assert_not_called()
+
+
+async def test_index_resume_texts_limits_batches_per_run(indexing_container, db_session, create_lead):
+    """Test that a run stops after max_batches_per_run and the next run continues from the checkpoint."""
+    indexing_container.resume_text_settings.max_batches_per_run = 1
+    leads = [await create_lead() for _ in range(3)]
+    indexing_container.blob_storage_service.get = AsyncMock(return_value=b'Paralegal')
+
+    await index_resume_texts(indexing_container)
+    assert set(await _get_texts(db_session, leads)) == {leads[0].id, leads[1].id}
+
+    await index_resume_texts(indexing_container)
+    assert set(await _get_texts(db_session, leads)) == {lead.id for lead in leads}
+
+
+async def test_index_resume_texts_storage_unavailable(indexing_container, db_session, create_lead):
+    """Test that a batch is not saved nor the checkpoint moved when blob storage is unavailable."""
+    lead = await create_lead()
+    indexing_container.blob_storage_service.get = AsyncMock(side_effect=BlobStorageUnavailableError('down'))
+
+    await index_resume_texts(indexing_container)
+
+    assert await _get_texts(db_session, [lead]) == {}
+    checkpoint = await _get_checkpoint(db_session)
+    assert checkpoint is None or checkpoint.position is None
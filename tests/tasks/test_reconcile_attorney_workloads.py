@@ -0,0 +1,57 @@
+import asyncio
+
+import sqlalchemy as sa
+
+from service.database.models.attorneys import Attorney
+from service.database.models.leads import LeadStatus
+from service.tasks.reconcile_attorney_workloads import reconcile_attorney_workloads
+
+
+async def _get_count(db_session_factory, attorney: Attorney) -> int:
+    async with db_session_factory() as db_session:
+        query = sa.select(Attorney.reached_out_count).where(Attorney.id == attorney.id)
+        return (await db_session.execute(query)).scalar_one()
+
+
+async def test_reconcile_attorney_workloads(container, db_session_factory, create_attorney, create_lead):
+    """Test that the job repairs a counter that drifted from the reached out leads."""
+    attorney = await create_attorney()
+    await create_lead(status=LeadStatus.REACHED_OUT, reached_out_by=attorney.id)
+    async with db_session_factory() as db_session:
+        await db_session.execute(sa.update(Attorney).where(Attorney.id == attorney.id).values(reached_out_count=0))
+        await db_session.commit()
+
+    await reconcile_attorney_workloads(container)
+
+    assert await _get_count(db_session_factory, attorney) == 1
+
+
+async def test_reconcile_attorney_workloads_concurrent_update(
+    container, db_session_factory, create_attorney, create_lead
+):
+    """Test that a counter moved while the leads are counted is not overwritten with the outdated count."""
+    attorney = await create_attorney()
+    await create_lead(status=LeadStatus.REACHED_OUT, reached_out_by=attorney.id)
+    async with db_session_factory() as db_session:
+        await db_session.execute(sa.update(Attorney).where(Attorney.id == attorney.id).values(reached_out_count=5))
+        await db_session.commit()
+
+    async with db_session_factory() as db_session:
+        # A lead update in progress holds the attorney row when the job counts the leads
+        await db_session.execute(
+            sa.update(Attorney)
+            .where(Attorney.id == attorney.id)
+            .values(reached_out_count=Attorney.reached_out_count + 1)
+        )
+        reconcile_task = asyncio.create_task(reconcile_attorney_workloads(container))
+        await asyncio.sleep(0.2)
+        assert not reconcile_task.done()
+        await db_session.commit()
+
+    await reconcile_task
+
+    # Left for the next run instead of being set to the count taken before the update
+    assert await _get_count(db_session_factory, attorney) == 6
+
+    await reconcile_attorney_workloads(container)
+    assert await _get_count(db_session_factory, attorney) == 1
@@ -1,11 +1,34 @@
-from unittest.mock import AsyncMock
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
 
-from service.database.models.leads import LeadStatus
+import pytest
+import sqlalchemy as sa
+import sqlmodel as sm
+
+from service.database.models.attorneys import Attorney
+from service.database.models.email_outbox import OutboxEmail, OutboxEmailState
+from service.database.models.leads import Lead, LeadStatus
+from service.settings import SchedulerSettings
 from service.tasks.send_email import send_emails_to_leads
 
 
-async def test_send_emails_to_leads_success(container, create_lead, create_attorney):
-    """Test successful email sending to registered leads."""
+async def _get_leads(db_session, leads) -> dict:
+    query = sa.select(Lead).where(sm.col(Lead.id).in_([lead.id for lead in leads]))
+    return {lead.id: lead for lead in (await db_session.execute(query)).scalars()}
+
+
+async def _get_outbox_emails(db_session, leads) -> dict:
+    query = sa.select(OutboxEmail).where(sm.col(OutboxEmail.lead_id).in_([lead.id for lead in leads]))
+    return {email.lead_id: email for email in (await db_session.execute(query)).scalars()}
+
+
+async def _get_reached_out_count(db_session, attorney) -> int:
+    query = sa.select(Attorney.reached_out_count).where(Attorney.id == attorney.id)
+    return (await db_session.execute(query)).scalar_one()
+
+
+async def test_send_emails_to_leads_success(container, db_session, create_attorney, create_lead):
+    """Test that emails to registered leads are queued in the outbox together with their status change."""
     # Create test data
     attorney = await create_attorney(email='attorney@test.com', is_active=True)
     lead1 = await create_lead(
@@ -15,154 +38,202 @@ async def test_send_emails_to_leads_success(container, create_lead, create_attor
         first_name='Jane', last_name='Smith', email='jane.smith@test.com', status=LeadStatus.REGISTERED
     )
     # Create a lead with different status that should be ignored
-    await create_lead(first_name='Bob', last_name='Wilson', email='bob.wilson@test.com', status=LeadStatus.PENDING)
+    pending_lead = await create_lead(
+        first_name='Bob', last_name='Wilson', email='bob.wilson@test.com', status=LeadStatus.PENDING
+    )
 
     # Mock the services
-    container.attorney_service.get_least_busy_attorney = AsyncMock(return_value=attorney)
     container.email_service.send = AsyncMock()
-    container.lead_service.update_lead = AsyncMock()
+    container.lead_event_writer.enqueue = MagicMock()
 
     # Execute the task
     await send_emails_to_leads(container)
 
-    # Verify attorney service was called twice (for each registered lead)
-    assert container.attorney_service.get_least_busy_attorney.call_count == 2
-
-    # Verify email service was called twice
-    assert container.email_service.send.call_count == 2
-
-    # Verify email calls
-    email_calls = container.email_service.send.call_args_list
-    assert len(email_calls) == 2
-
-    # Check first email call
-    first_call = email_calls[0]
-    assert first_call.kwargs['sender'] == attorney.email
-    assert first_call.kwargs['receiver'] in [lead1.email, lead2.email]
-    assert 'Thank you for submitting your resume' in first_call.kwargs['text']
-
-    # Check second email call
-    second_call = email_calls[1]
-    assert second_call.kwargs['sender'] == attorney.email
-    assert second_call.kwargs['receiver'] in [lead1.email, lead2.email]
-    assert 'Thank you for submitting your resume' in second_call.kwargs['text']
-
-    # Verify lead service was called twice to update status
-    assert container.lead_service.update_lead.call_count == 2
-
-    # Verify lead update calls
-    update_calls = container.lead_service.update_lead.call_args_list
-    assert len(update_calls) == 2
-
-    for call in update_calls:
-        lead_data = call.kwargs['lead_data']
-        assert lead_data.status == LeadStatus.REACHED_OUT
-        assert lead_data.reached_out_by == attorney.id
+    # Verify the emails are queued rather than sent
+    container.email_service.send.assert_not_called()
+    emails = await _get_outbox_emails(db_session, [lead1, lead2, pending_lead])
+    assert set(emails) == {lead1.id, lead2.id}
+    for lead in (lead1, lead2):
+        email = emails[lead.id]
+        assert email.state == OutboxEmailState.PENDING
+        assert email.attempts == 0
+        assert email.sender == attorney.email
+        assert email.receiver == lead.email
+        assert email.subject == 'Your application'
+        assert email.text.startswith(f'Dear {lead.first_name} {lead.last_name},')
+        assert 'Thank you for submitting your resume' in email.text
+        assert attorney.email in email.text
+
+    # Verify the leads were reached out to by the attorney
+    leads = await _get_leads(db_session, [lead1, lead2, pending_lead])
+    for lead in (lead1, lead2):
+        assert leads[lead.id].status == LeadStatus.REACHED_OUT
+        assert leads[lead.id].reached_out_by == attorney.id
+    assert leads[pending_lead.id].status == LeadStatus.PENDING
+    assert await _get_reached_out_count(db_session, attorney) == 2
+
+    # Verify the status changes were recorded in the lead history
+    events = [call.args[0] for call in container.lead_event_writer.enqueue.call_args_list]
+    assert {event.lead_id for event in events} == {lead1.id, lead2.id}
+    for event in events:
+        assert event.from_status == LeadStatus.REGISTERED
+        assert event.to_status == LeadStatus.REACHED_OUT
+        assert event.reached_out_by == attorney.id
+        assert event.actor == 'scheduler'
 
 
 async def test_send_emails_to_leads_no_registered_leads(container, create_lead):
     """Test when no leads have REGISTERED status."""
     # Create leads with different statuses
     await create_lead(first_name='John', last_name='Doe', email='john.doe@test.com', status=LeadStatus.PENDING)
-    await create_lead(first_name='Jane', last_name='Smith', email='jane.smith@test.com', status=LeadStatus.REACHED_OUT)
+    await create_lead(first_name='Jane', last_name='Smith', email='jane.smith@test.com', status=LeadStatus.EMAIL_SENT)
 
     # Mock the services
-    container.attorney_service.get_least_busy_attorney = AsyncMock()
+    container.attorney_service.assign_batch = AsyncMock()
     container.email_service.send = AsyncMock()
-    container.lead_service.update_lead = AsyncMock()
 
     # Execute the task
     await send_emails_to_leads(container)
 
     # Verify no services were called since no registered leads exist
-    container.attorney_service.get_least_busy_attorney.assert_not_called()
+    container.attorney_service.assign_batch.assert_not_called()
     container.email_service.send.assert_not_called()
-    container.lead_service.update_lead.assert_not_called()
 
 
-async def test_send_emails_to_leads_attorney_service_error(container, create_lead, create_attorney):
-    """Test error handling when attorney service fails."""
-    # Create test data
-    await create_lead(first_name='John', last_name='Doe', email='john.doe@test.com', status=LeadStatus.REGISTERED)
+async def test_send_emails_to_leads_no_active_attorneys(container, db_session, create_attorney, create_lead):
+    """Test error handling when there is no active attorney to reach out to leads."""
+    # Create test data, without any active attorney
+    await create_attorney(is_active=False)
+    lead = await create_lead(
+        first_name='John', last_name='Doe', email='john.doe@test.com', status=LeadStatus.REGISTERED
+    )
 
-    # Mock attorney service to raise an exception
-    container.attorney_service.get_least_busy_attorney = AsyncMock(side_effect=Exception('Attorney service error'))
+    # Mock services
     container.email_service.send = AsyncMock()
-    container.lead_service.update_lead = AsyncMock()
 
     # Execute the task - should not raise exception due to error handling
     await send_emails_to_leads(container)
 
-    # Verify attorney service was called
-    container.attorney_service.get_least_busy_attorney.assert_called_once()
-
-    # Verify email and lead update services were not called due to error
-    container.email_service.send.assert_not_called()
-    container.lead_service.update_lead.assert_not_called()
+    # Verify no email was queued and the lead is left as it is
+    assert await _get_outbox_emails(db_session, [lead]) == {}
+    assert (await _get_leads(db_session, [lead]))[lead.id].status == LeadStatus.REGISTERED
 
 
-async def test_send_emails_to_leads_email_service_error(container, create_lead, create_attorney):
-    """Test error handling when email service fails."""
+async def test_send_emails_to_leads_outbox_error(container, db_session, create_attorney, create_lead):
+    """Test that a lead whose email cannot be queued is not reached out to either."""
     # Create test data
     attorney = await create_attorney(email='attorney@test.com', is_active=True)
-    await create_lead(first_name='John', last_name='Doe', email='john.doe@test.com', status=LeadStatus.REGISTERED)
+    lead = await create_lead(
+        first_name='John', last_name='Doe', email='john.doe@test.com', status=LeadStatus.REGISTERED
+    )
 
     # Mock services
-    container.attorney_service.get_least_busy_attorney = AsyncMock(return_value=attorney)
-    container.email_service.send = AsyncMock(side_effect=Exception('Email service error'))
-    container.lead_service.update_lead = AsyncMock()
+    container.email_outbox_service.add_email = MagicMock(side_effect=RuntimeError('Outbox error'))
+    container.lead_event_writer.enqueue = MagicMock()
 
-    # Execute the task - should not raise exception due to error handling
-    await send_emails_to_leads(container)
+    # Execute the task - the error is logged and raised
+    with pytest.raises(RuntimeError, match='Outbox error'):
+        await send_emails_to_leads(container)
 
-    # Verify services were called appropriately
-    container.attorney_service.get_least_busy_attorney.assert_called_once()
-    container.email_service.send.assert_called_once()
+    # Verify the status change was rolled back with the email
+    stored_lead = (await _get_leads(db_session, [lead]))[lead.id]
+    assert stored_lead.status == LeadStatus.REGISTERED
+    assert stored_lead.reached_out_by is None
+    assert await _get_reached_out_count(db_session, attorney) == 0
+    container.lead_event_writer.enqueue.assert_not_called()
 
-    # Verify lead update was not called due to email error
-    container.lead_service.update_lead.assert_not_called()
 
-
-async def test_send_emails_to_leads_lead_update_error(container, create_lead, create_attorney):
-    """Test error handling when lead update fails."""
+async def test_send_emails_to_leads_assignment_error(container, create_lead):
+    """Test that an error assigning the leads fails the task."""
     # Create test data
-    attorney = await create_attorney(email='attorney@test.com', is_active=True)
     await create_lead(first_name='John', last_name='Doe', email='john.doe@test.com', status=LeadStatus.REGISTERED)
 
     # Mock services
-    container.attorney_service.get_least_busy_attorney = AsyncMock(return_value=attorney)
-    container.email_service.send = AsyncMock()
-    container.lead_service.update_lead = AsyncMock(side_effect=Exception('Lead update error'))
+    container.attorney_service.assign_batch = AsyncMock(side_effect=RuntimeError('Database error'))
 
-    # Execute the task - should not raise exception due to error handling
-    await send_emails_to_leads(container)
+    # Execute the task - the error is logged and raised
+    with pytest.raises(RuntimeError, match='Database error'):
+        await send_emails_to_leads(container)
 
-    # Verify all services were called
-    container.attorney_service.get_least_busy_attorney.assert_called_once()
-    container.email_service.send.assert_called_once()
-    container.lead_service.update_lead.assert_called_once()
 
+async def test_send_emails_to_leads_balances_attorneys(container, db_session, create_attorney, create_lead):
+    """Test that leads are spread as if each went to the least busy attorney, counting earlier leads."""
+    busy_attorney = await create_attorney(email='busy@test.com')
+    free_attorney = await create_attorney(email='free@test.com')
+    await create_lead(email='old.lead@test.com', status=LeadStatus.REACHED_OUT, reached_out_by=busy_attorney.id)
+    leads = [await create_lead(email=f'lead{number}@test.com', status=LeadStatus.REGISTERED) for number in range(3)]
 
-async def test_send_emails_to_leads_multiple_leads_partial_failure(container, create_lead, create_attorney):
-    """Test processing multiple leads where some fail and others succeed."""
-    # Create test data
-    attorney = await create_attorney(email='attorney@test.com', is_active=True)
-    await create_lead(first_name='John', last_name='Doe', email='john.doe@test.com', status=LeadStatus.REGISTERED)
-    await create_lead(first_name='Jane', last_name='Smith', email='jane.smith@test.com', status=LeadStatus.REGISTERED)
+    await send_emails_to_leads(container)
 
-    # Mock services - first call succeeds, second fails
-    container.attorney_service.get_least_busy_attorney = AsyncMock(return_value=attorney)
-    container.email_service.send = AsyncMock(side_effect=[None, Exception('Email failed for second lead')])
-    container.lead_service.update_lead = AsyncMock()
+    reached_out_by = [lead.reached_out_by for lead in (await _get_leads(db_session, leads)).values()]
+    assert reached_out_by.count(free_attorney.id) == 2
+    assert reached_out_by.count(busy_attorney.id) == 1
+    assert await _get_reached_out_count(db_session, busy_attorney) == 2
+    assert await _get_reached_out_count(db_session, free_attorney) == 2
 
-    # Execute the task
-    await send_emails_to_leads(container)
 
-    # Verify attorney service was called twice
-    assert container.attorney_service.get_least_busy_attorney.call_count == 2
+async def test_send_emails_to_leads_in_chunks(container, db_session, create_attorney, create_lead):
+    """Test that leads are claimed oldest first in chunks, each committed on its own."""
+    await create_attorney()
+    leads = [await create_lead(status=LeadStatus.REGISTERED) for _ in range(5)]
+    container.scheduler_settings = SchedulerSettings(send_emails_chunk_size=2)
+    container.attorney_service.assign_batch = AsyncMock(wraps=container.attorney_service.assign_batch)
 
-    # Verify email service was called twice (once successful, once failed)
-    assert container.email_service.send.call_count == 2
+    await send_emails_to_leads(container)
 
-    # Verify lead update was called only once (for the successful email)
-    assert container.lead_service.update_lead.call_count == 1
+    assert [[lead.id for lead in call.args[1]] for call in container.attorney_service.assign_batch.call_args_list] == [
+        [leads[0].id, leads[1].id],
+        [leads[2].id, leads[3].id],
+        [leads[4].id],
+    ]
+    assert {lead.status for lead in (await _get_leads(db_session, leads)).values()} == {LeadStatus.REACHED_OUT}
+    assert set(await _get_outbox_emails(db_session, leads)) == {lead.id for lead in leads}
+
+
+class _Crash(BaseException):
+    pass
+
+
+async def test_send_emails_to_leads_crash_loses_one_chunk(container, db_session, create_attorney, create_lead):
+    """Test that a run dying in the middle of a chunk keeps the chunks committed before it."""
+    await create_attorney()
+    leads = [await create_lead(status=LeadStatus.REGISTERED) for _ in range(4)]
+    container.scheduler_settings = SchedulerSettings(send_emails_chunk_size=2)
+    render_batch = container.email_template_registry.render_batch
+    rendered_chunks = 0
+
+    def render_first_chunk(*args, **kwargs):
+        nonlocal rendered_chunks
+        rendered_chunks += 1
+        if rendered_chunks > 1:
+            raise _Crash()
+        return render_batch(*args, **kwargs)
+
+    container.email_template_registry.render_batch = render_first_chunk
+
+    with pytest.raises(_Crash):
+        await send_emails_to_leads(container)
+
+    stored_leads = await _get_leads(db_session, leads)
+    assert [stored_leads[lead.id].status for lead in leads] == [
+        LeadStatus.REACHED_OUT,
+        LeadStatus.REACHED_OUT,
+        LeadStatus.REGISTERED,
+        LeadStatus.REGISTERED,
+    ]
+    assert set(await _get_outbox_emails(db_session, leads)) == {leads[0].id, leads[1].id}
+
+
+async def test_send_emails_to_leads_concurrent_runs(container, db_session, create_attorney, create_lead):
+    """Test that overlapping runs claim disjoint chunks and queue one email per lead."""
+    attorneys = [await create_attorney() for _ in range(2)]
+    leads = [await create_lead(status=LeadStatus.REGISTERED) for _ in range(9)]
+    container.scheduler_settings = SchedulerSettings(send_emails_chunk_size=2)
+
+    await asyncio.gather(send_emails_to_leads(container), send_emails_to_leads(container))
+
+    query = sa.select(OutboxEmail.receiver).where(sm.col(OutboxEmail.lead_id).in_([lead.id for lead in leads]))
+    receivers = (await db_session.execute(query)).scalars().all()
+    assert sorted(receivers) == sorted(lead.email for lead in leads)
+    assert {lead.status for lead in (await _get_leads(db_session, leads)).values()} == {LeadStatus.REACHED_OUT}
+    assert sum([await _get_reached_out_count(db_session, attorney) for attorney in attorneys]) == len(leads)
@@ -0,0 +1,54 @@
+from unittest.mock import AsyncMock
+
+import sqlalchemy as sa
+
+from service.database.models.leads import Lead, LeadStatus
+from service.database.models.resume_uploads import ResumeUpload, ResumeUploadState
+from service.settings import ResumeSettings
+from service.tasks.upload_resumes import upload_staged_resumes
+
+
+async def test_upload_staged_resumes_success(container, db_session, create_lead, create_resume_upload, tmp_path):
+    """Test that staged resumes are uploaded and lead resume URLs are filled in."""
+    container.resume_settings = ResumeSettings(staging_dir=str(tmp_path))
+    lead = await create_lead(status=LeadStatus.REGISTERED, resume_url='pending://resume')
+    staged_path = await container.resume_upload_service.stage(b'staged resume')
+    upload = await create_resume_upload(lead_id=lead.id, staged_path=staged_path)
+
+    await upload_staged_resumes(container)
+
+    db_lead = (await db_session.execute(sa.select(Lead).where(Lead.id == lead.id))).scalar_one()
+    db_upload = (await db_session.execute(sa.select(ResumeUpload).where(ResumeUpload.id == upload.id))).scalar_one()
+    assert db_lead.resume_url.startswith('https://blob-storage.example.com/')
+    assert db_upload.state == ResumeUploadState.DONE
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_upload_staged_resumes_failure_is_rescheduled(
+    container, db_session, create_lead, create_resume_upload, tmp_path
+):
+    """Test that a failed upload keeps the staged file and is rescheduled."""
+    container.resume_settings = ResumeSettings(staging_dir=str(tmp_path))
+    container.blob_storage_service.upload_stream = AsyncMock(side_effect=Exception('Blob storage unavailable'))
+    lead = await create_lead(status=LeadStatus.REGISTERED, resume_url='pending://resume')
+    staged_path = await container.resume_upload_service.stage(b'staged resume')
+    upload = await create_resume_upload(lead_id=lead.id, staged_path=staged_path)
+
+    await upload_staged_resumes(container)
+
+    db_lead = (await db_session.execute(sa.select(Lead).where(Lead.id == lead.id))).scalar_one()
+    db_upload = (await db_session.execute(sa.select(ResumeUpload).where(ResumeUpload.id == upload.id))).scalar_one()
+    assert db_lead.resume_url == 'pending://resume'
+    assert db_upload.state == ResumeUploadState.PENDING
+    assert db_upload.attempts == 1
+    assert db_upload.last_error == 'Blob storage unavailable'
+    assert list(tmp_path.iterdir()) != []
+
+
+async def test_upload_staged_resumes_nothing_due(container):
+    """Test that the task does nothing when no staged resumes are due."""
+    container.blob_storage_service.upload_stream = AsyncMock()
+
+    await upload_staged_resumes(container)
+
+    container.blob_storage_service.upload_stream.assert_not_called()
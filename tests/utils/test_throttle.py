@@ -0,0 +1,25 @@
+from unittest.mock import patch
+
+from service.utils.throttle import IoBudget
+
+
+async def test_io_budget_sleeps_when_ahead():
+    """Test that spend sleeps until the average rate is back within the budget, and not while it is behind."""
+    now = [0.0]
+    budget = IoBudget(100, clock=lambda: now[0])
+
+    with patch('service.utils.throttle.asyncio.sleep') as sleep:
+        await budget.spend(50)
+        sleep.assert_awaited_once_with(0.5)
+
+        now[0] = 2.0
+        sleep.reset_mock()
+        await budget.spend(100)
+        sleep.assert_not_awaited()
+
+
+async def test_io_budget_disabled():
+    """Test that a budget of 0 never sleeps."""
+    with patch('service.utils.throttle.asyncio.sleep') as sleep:
+        await IoBudget(0).spend(1_000_000)
+        sleep.assert_not_awaited()